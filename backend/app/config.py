@@ -9,6 +9,19 @@ class Settings(BaseSettings):
     # Database
     database_url: str = "postgresql+asyncpg://localhost:5432/the_referee"
 
+    # Connection pooling: "queue" (pooled, one pool per role) or "null" (new connection per session - serverless)
+    db_pool_mode: str = "queue"
+    # Max connections ONE process may open across its role pools (api / worker / maintenance, split
+    # by DB_POOL_SHARES in database.py). The worker's share must cover worker_peak_connections()
+    # (MAX_CONCURRENT_JOBS x 2 + overflow_partition_sessions x 2 + 6 = 58) - init_db logs an error if not.
+    # Every process (uvicorn worker x host) runs the API and a job worker, so keep
+    # db_max_connections_per_process x processes below Postgres max_connections minus
+    # superuser_reserved_connections and a few for psql/backups - e.g. 85 x 2 = 170 needs max_connections = 200.
+    db_max_connections_per_process: int = 85
+    db_pool_timeout: int = 60  # Seconds to wait for a free connection before erroring
+    db_pool_recycle: int = 1800  # Replace connections older than this (remote DB drops idle connections)
+    db_pool_pre_ping: bool = True  # Check connections are alive on checkout
+
     # Redis for background jobs
     redis_url: str = "redis://localhost:6379/0"
 
@@ -39,6 +52,69 @@ class Settings(BaseSettings):
     health_monitor_interval_minutes: int = 5
     health_monitor_dry_run: bool = False  # If True, diagnose but don't execute actions
 
+    # Scholar page cache (in-memory LRU + search_cache table, keyed on Scholar URL)
+    # Disable to force every page through Oxylabs (e.g. when debugging parsing)
+    scholar_cache_enabled: bool = True
+
+    # Scholar HTML parser: "selectolax" (fast, C-backed) or "bs4" (original BeautifulSoup)
+    # selectolax falls back to bs4 per page on errors or suspicious empty results
+    scholar_parser_engine: str = "selectolax"
+
+    # Where Scholar HTML is parsed: "process" (pool, default), "thread", or "inline" (on the event loop - tests/debugging)
+    scholar_parse_executor: str = "process"
+    scholar_parse_workers: int = 2  # Pool size for process/thread modes
+
+    # Write-behind citation ingestion (scrapers enqueue pages, one writer batches them into upserts)
+    ingest_queue_max_pages: int = 200  # Scrapers block (backpressure) only when this many pages are queued
+    ingest_batch_max_pages: int = 50  # Max pages coalesced into one write transaction
+    ingest_batch_wait_ms: int = 50  # How long the writer waits to fill a batch
+
+    # Local citation buffer (append-only segment log under CITATION_BUFFER_DIR)
+    citation_buffer_segment_mb: int = 8  # Roll to a new segment after this many MB
+    citation_buffer_segment_minutes: int = 15  # ...or after this long, so old segments can be deleted
+    citation_buffer_fsync: bool = False  # fsync every record (survives OS crash, not just process crash)
+
+    # Harvested-citation counters (editions/papers/thinkers) are delta-maintained on insert;
+    # a reconciler compares them with COUNT(*) ground truth this often and reports drift
+    citation_counter_reconcile_minutes: int = 60
+    citation_counter_reconcile_fix: bool = True  # Also correct drifted counters (False = report only)
+
+    # Harvest dashboard: served from an in-memory snapshot rebuilt this often (not per request)
+    dashboard_refresh_seconds: float = 15.0
+
+    # Job dispatch: the worker LISTENs for job_events (NOTIFY from a trigger on jobs) instead of polling
+    job_notify_enabled: bool = True
+    job_poll_interval_seconds: int = 60  # Safety-net poll while LISTEN is connected (5s while it isn't)
+
+    # Job progress: reports are kept in memory and written at most this often per job (one batched UPDATE)
+    job_progress_flush_seconds: float = 5.0
+
+    # Job scheduler: weighted fair share across tenants (thinker, else collection), per-type caps, aging
+    # Caps are "job_type=max_running" pairs, counted across all workers; types not listed are uncapped
+    scheduler_type_caps: str = "extract_citations=16,resolve=4,discover_editions=4,thinker_discover_works=2,thinker_harvest_citations=4,verify_and_repair=2,retry_failed_fetches=2"
+    scheduler_thinker_weight: float = 2.0  # Share of a thinker tenant relative to a collection (1.0)
+    scheduler_focus_weight: float = 20.0  # Weight focus mode gives the focused thinker
+    scheduler_aging_per_minute: float = 1.0  # Priority points a pending job gains per minute waited
+    scheduler_candidate_limit: int = 500  # Max pending jobs considered per scheduling round
+
+    # LLM gateway (all Anthropic calls): global concurrency cap, retries, opt-in response cache
+    llm_max_concurrency: int = 6
+    llm_max_retries: int = 4  # Rate limit / overload / 5xx / connection errors
+    llm_cache_ttl_hours: float = 168.0  # Cached responses (memory LRU + search_cache table)
+
+    # Oxylabs limiter (process-wide, shared by all jobs and endpoints)
+    oxylabs_rate_per_second: float = 3.0  # Sustained request rate
+    oxylabs_burst: int = 6  # Requests allowed back-to-back after an idle period
+    oxylabs_max_in_flight: int = 24  # Concurrent requests (including async job polling)
+
+    # Overflow harvesting: disjoint partitions of one edition (languages, letters) harvested at once
+    overflow_partition_concurrency: int = 4
+    overflow_partition_sessions: int = 6  # Partitions open at once across ALL jobs of a process (each holds worker connections)
+
+    # Incremental refresh: page newest-first and stop once this many consecutive pages hold only known citations
+    refresh_known_stop_pages: int = 2
+    refresh_date_sort_max_days: int = 330  # Scholar's date sort only lists ~the last year - older harvests re-page fully
+
     # Internal webhook for thinker harvest completion tracking
     # Used to trigger automatic profile pre-fetching after all citation jobs complete
     internal_base_url: str = "http://localhost:8000"  # Backend's self-referencing URL
@@ -54,6 +130,15 @@ class Settings(BaseSettings):
             return []
         return [k.strip() for k in self.api_keys.split(",") if k.strip()]
 
+    def get_scheduler_type_caps(self) -> dict[str, int]:
+        """Parse "job_type=max_running" pairs into a dict"""
+        caps = {}
+        for pair in self.scheduler_type_caps.split(","):
+            job_type, _, cap = pair.partition("=")
+            if job_type.strip() and cap.strip():
+                caps[job_type.strip()] = int(cap)
+        return caps
+
 
 @lru_cache()
 def get_settings() -> Settings:
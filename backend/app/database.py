@@ -1,42 +1,279 @@
 """
 Database connection and session management
+
+Connections come from one pool per role so a harvest storm can't starve the UI:
+- "api":         FastAPI request handlers (the default)
+- "worker":      job worker loop and every job it runs
+- "maintenance": api_logger flush, cache sweeper, health monitor, migrations
+
+The pools share one per-process budget (db_max_connections_per_process),
+split by DB_POOL_SHARES; half of each share is kept open, half is overflow.
+The worker's share has to cover worker_peak_connections(), derived from
+MAX_CONCURRENT_JOBS and overflow_partition_sessions - init_db checks it.
+Multiply the budget by the number of processes to get the deployment's
+worst case against Postgres max_connections.
+
+A task picks its pool with bind_db_role() (or `with db_role(...)`); tasks it
+spawns inherit the role. async_session() then opens a session on that pool.
+With db_pool_mode="null" every session opens a fresh connection (NullPool),
+which suits serverless deployments.
 """
 import logging
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy.pool import NullPool
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional, Dict, Any
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.pool import NullPool, AsyncAdaptedQueuePool
 from .config import get_settings
 from .models import Base
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
-# Create async engine with connection timeout
-# command_timeout: max time for a query (in seconds)
-# timeout: connection timeout (in seconds)
-engine = create_async_engine(
-    settings.database_url,
-    echo=settings.debug,
-    poolclass=NullPool,  # Better for serverless/Render
-    connect_args={
-        "command_timeout": 120,  # 120 second query timeout (increased for remote DB latency)
-        "timeout": 30,  # 30 second connection timeout
-    },
-)
-
-# Session factory
-async_session = async_sessionmaker(
-    engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-)
+DB_ROLES = ("api", "worker", "maintenance")
+# Fraction of db_max_connections_per_process per role pool; the worker gets what's left,
+# which must cover worker_peak_connections() (checked by init_db)
+DB_POOL_SHARES = {"api": 0.2, "maintenance": 0.1}
+MIN_ROLE_CONNECTIONS = 2
+WORKER_SESSIONS_PER_JOB = 2  # The job's own session plus a short-lived one (cache lookup, ingest flush)
+WORKER_SESSIONS_PER_PARTITION = 2  # An author letter's session plus the session of the pool it's harvesting
+# LISTEN connection, ingest writer, progress flusher, lease heartbeat, watchdog/claim loop, cache persists
+WORKER_SHARED_CONNECTIONS = 6
+
+_current_role: ContextVar[str] = ContextVar("db_role", default="api")
+
+
+@contextmanager
+def db_role(role: str):
+    """Use the given role's pool for sessions opened in the enclosed code (and tasks it spawns)"""
+    token = _current_role.set(role)
+    try:
+        yield
+    finally:
+        _current_role.reset(token)
+
+
+def bind_db_role(role: str):
+    """Bind the current task (and tasks it spawns) to a role's pool - call at the top of a background loop"""
+    _current_role.set(role)
+
+
+def current_db_role() -> str:
+    return _current_role.get()
+
+
+class PoolMetrics:
+    """Checkout wait times and connection churn for one pool"""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.checkout_failures = 0
+        self.connections_opened = 0
+        self.connections_closed = 0
+        self.invalidated = 0
+        self.waits = deque(maxlen=1000)  # Recent checkout waits (seconds)
+        self.max_wait = 0.0
+
+    def record_checkout(self, waited: float, ok: bool = True):
+        if not ok:
+            self.checkout_failures += 1
+            return
+        self.checkouts += 1
+        self.waits.append(waited)
+        self.max_wait = max(self.max_wait, waited)
+
+
+_pool_metrics: Dict[str, PoolMetrics] = {role: PoolMetrics() for role in DB_ROLES}
+
+
+class _TimedPoolMixin:
+    """Times every checkout (queue wait + connect for new connections)"""
+    role = "api"
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except Exception:
+            _pool_metrics[self.role].record_checkout(time.perf_counter() - start, ok=False)
+            raise
+        _pool_metrics[self.role].record_checkout(time.perf_counter() - start)
+        return conn
+
+
+def _pool_class(role: str, base):
+    # recreate() (on dispose/invalidate) builds a new pool of the same class, so the role lives on the class
+    return type(f"Timed{base.__name__}_{role}", (_TimedPoolMixin, base), {"role": role})
+
+
+def _role_connections(budget: Optional[int] = None) -> Dict[str, int]:
+    """Split the per-process connection budget between the role pools"""
+    budget = budget or settings.db_max_connections_per_process
+    connections = {
+        role: max(MIN_ROLE_CONNECTIONS, round(budget * share)) for role, share in DB_POOL_SHARES.items()
+    }
+    connections["worker"] = max(MIN_ROLE_CONNECTIONS, budget - sum(connections.values()))
+    return connections
+
+
+def worker_peak_connections() -> int:
+    """Connections the job worker can hold at once: every job slot, every partition slot, shared loops"""
+    from .services.job_worker import MAX_CONCURRENT_JOBS
+
+    return (
+        MAX_CONCURRENT_JOBS * WORKER_SESSIONS_PER_JOB
+        + settings.overflow_partition_sessions * WORKER_SESSIONS_PER_PARTITION
+        + WORKER_SHARED_CONNECTIONS
+    )
+
+
+def check_pool_budget():
+    """Log an error if the worker's share of the budget can't cover its peak (jobs would queue on checkout and time out)"""
+    if settings.db_pool_mode == "null":
+        return
+    connections = _role_connections()
+    peak = worker_peak_connections()
+    if connections["worker"] < peak:
+        needed = settings.db_max_connections_per_process
+        while _role_connections(needed)["worker"] < peak:
+            needed += 1
+        logger.error(
+            f"DB pool budget too small: worker pool has {connections['worker']} connections but can need {peak} "
+            f"(MAX_CONCURRENT_JOBS, overflow_partition_sessions) - raise db_max_connections_per_process to {needed} "
+            f"or lower the job/partition limits"
+        )
+
+
+def _role_pool_budget(role: str) -> Dict[str, int]:
+    connections = _role_connections()[role]
+    pool_size = (connections + 1) // 2
+    return {"pool_size": pool_size, "max_overflow": connections - pool_size}
+
+
+def _create_engine(role: str) -> AsyncEngine:
+    # Connection timeout settings
+    # command_timeout: max time for a query (in seconds)
+    # timeout: connection timeout (in seconds)
+    kwargs: Dict[str, Any] = {
+        "echo": settings.debug,
+        "connect_args": {
+            "command_timeout": 120,  # 120 second query timeout (increased for remote DB latency)
+            "timeout": 30,  # 30 second connection timeout
+        },
+    }
+    if settings.db_pool_mode == "null":
+        kwargs["poolclass"] = _pool_class(role, NullPool)
+    else:
+        kwargs.update(
+            poolclass=_pool_class(role, AsyncAdaptedQueuePool),
+            pool_timeout=settings.db_pool_timeout,
+            pool_recycle=settings.db_pool_recycle,
+            pool_pre_ping=settings.db_pool_pre_ping,
+            **_role_pool_budget(role),
+        )
+
+    new_engine = create_async_engine(settings.database_url, **kwargs)
+
+    metrics = _pool_metrics[role]
+
+    @event.listens_for(new_engine.sync_engine, "connect")
+    def _on_connect(dbapi_conn, conn_record):
+        metrics.connections_opened += 1
+
+    @event.listens_for(new_engine.sync_engine, "close")
+    def _on_close(dbapi_conn, conn_record):
+        metrics.connections_closed += 1
+
+    @event.listens_for(new_engine.sync_engine, "invalidate")
+    def _on_invalidate(dbapi_conn, conn_record, exception):
+        metrics.invalidated += 1
+
+    return new_engine
+
+
+if settings.db_pool_mode == "null":
+    # No pooling - per-role pools would be meaningless, share one engine
+    _shared = _create_engine("api")
+    _engines: Dict[str, AsyncEngine] = {role: _shared for role in DB_ROLES}
+else:
+    _engines = {role: _create_engine(role) for role in DB_ROLES}
+
+_sessionmakers = {
+    role: async_sessionmaker(eng, class_=AsyncSession, expire_on_commit=False)
+    for role, eng in _engines.items()
+}
+
+# Default engine (API pool) - kept for code that needs a raw engine
+engine = _engines["api"]
+
+
+def get_engine(role: Optional[str] = None) -> AsyncEngine:
+    return _engines[role or current_db_role()]
+
+
+def async_session() -> AsyncSession:
+    """Session factory - opens a session on the current role's pool"""
+    return _sessionmakers[current_db_role()]()
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    """Connection counts and checkout waits per role pool"""
+    pools = {}
+    for role in DB_ROLES:
+        eng = _engines[role]
+        pool = eng.pool
+        metrics = _pool_metrics[role]
+        waits = sorted(metrics.waits)
+        stats = {
+            "checkouts": metrics.checkouts,
+            "checkout_failures": metrics.checkout_failures,
+            "connections_opened": metrics.connections_opened,
+            "connections_closed": metrics.connections_closed,
+            "invalidated": metrics.invalidated,
+            "checkout_wait_ms": {
+                "avg": round(sum(waits) / len(waits) * 1000, 1) if waits else 0,
+                "p95": round(waits[min(len(waits) - 1, int(len(waits) * 0.95))] * 1000, 1) if waits else 0,
+                "max": round(metrics.max_wait * 1000, 1),
+                "samples": len(waits),
+            },
+        }
+        if isinstance(pool, AsyncAdaptedQueuePool):
+            stats.update({
+                "pool_size": pool.size(),
+                "max_overflow": pool._max_overflow,
+                "checked_out": pool.checkedout(),
+                "idle": pool.checkedin(),
+                "overflow": max(pool.overflow(), 0),
+            })
+        pools[role] = stats
+
+    return {
+        "mode": settings.db_pool_mode,
+        "max_connections_per_process": settings.db_max_connections_per_process if settings.db_pool_mode != "null" else None,
+        "worker_peak_connections": worker_peak_connections() if settings.db_pool_mode != "null" else None,
+        "recycle_seconds": settings.db_pool_recycle if settings.db_pool_mode != "null" else None,
+        "pre_ping": settings.db_pool_pre_ping if settings.db_pool_mode != "null" else None,
+        "pools": pools,
+    }
+
+
+async def close_db():
+    """Dispose all pools (closes idle connections)"""
+    for eng in set(_engines.values()):
+        await eng.dispose()
 
 
 async def init_db():
     """Initialize database tables"""
     logger.info("init_db: Starting database initialization...")
+    check_pool_budget()
     try:
         logger.info("init_db: Connecting to database...")
-        async with engine.begin() as conn:
+        async with get_engine("maintenance").begin() as conn:
             logger.info("init_db: Connected! Creating tables...")
             await conn.run_sync(Base.metadata.create_all)
             logger.info("init_db: Tables created successfully")
@@ -351,6 +588,256 @@ async def run_migrations():
         )""",
         "CREATE INDEX IF NOT EXISTS ix_edition_analysis_llm_calls_run ON edition_analysis_llm_calls(run_id)",
         "CREATE INDEX IF NOT EXISTS ix_edition_analysis_llm_calls_phase ON edition_analysis_llm_calls(phase)",
+        # Multi-worker job claiming: owner + lease expiry (zombie detection by expired lease)
+        "ALTER TABLE jobs ADD COLUMN IF NOT EXISTS worker_id VARCHAR(100) NULL",
+        "ALTER TABLE jobs ADD COLUMN IF NOT EXISTS lease_expires_at TIMESTAMP NULL",
+        "CREATE INDEX IF NOT EXISTS ix_jobs_status_lease ON jobs(status, lease_expires_at)",
+        # Job progress columns (previously packed into params / overloaded onto started_at)
+        "ALTER TABLE jobs ADD COLUMN IF NOT EXISTS progress_details TEXT NULL",
+        "ALTER TABLE jobs ADD COLUMN IF NOT EXISTS resume_state TEXT NULL",
+        "ALTER TABLE jobs ADD COLUMN IF NOT EXISTS heartbeat_at TIMESTAMP NULL",
+        # Push-based job dispatch: NOTIFY job_events when a job becomes pending or is cancelled,
+        # or a running job finishes (frees a per-type scheduler cap on every worker)
+        # (covers every code path that creates, re-queues or ends jobs; see services/job_notify.py)
+        """CREATE OR REPLACE FUNCTION notify_job_event() RETURNS trigger AS $$
+           BEGIN
+               IF NEW.status IN ('pending', 'cancelled')
+                  AND (TG_OP = 'INSERT' OR NEW.status IS DISTINCT FROM OLD.status) THEN
+                   PERFORM pg_notify('job_events', json_build_object(
+                       'id', NEW.id, 'status', NEW.status,
+                       'job_type', NEW.job_type, 'priority', NEW.priority
+                   )::text);
+               ELSIF TG_OP = 'UPDATE' AND OLD.status = 'running'
+                  AND NEW.status IN ('completed', 'failed') THEN
+                   PERFORM pg_notify('job_events', json_build_object(
+                       'id', NEW.id, 'status', 'finished', 'job_type', NEW.job_type
+                   )::text);
+               END IF;
+               RETURN NULL;
+           END;
+           $$ LANGUAGE plpgsql""",
+        """DO $$ BEGIN
+               IF NOT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = 'jobs_notify_event') THEN
+                   CREATE TRIGGER jobs_notify_event
+                   AFTER INSERT OR UPDATE OF status ON jobs
+                   FOR EACH ROW EXECUTE PROCEDURE notify_job_event();
+               END IF;
+           END $$""",
+        # Scheduler weight overrides (focus mode), shared by all workers
+        """CREATE TABLE IF NOT EXISTS scheduler_weights (
+            tenant VARCHAR(100) PRIMARY KEY,
+            weight FLOAT NOT NULL,
+            reason VARCHAR(50) NULL,
+            paper_count INTEGER NULL,
+            updated_at TIMESTAMP DEFAULT NOW()
+        )""",
+        # Auto-resume harvest gaps: per-edition table kept current by triggers (see services/harvest_gaps.py)
+        # Backfilled by rebuild_harvest_gaps() on the worker's first auto-resume check
+        """CREATE TABLE IF NOT EXISTS edition_harvest_gaps (
+            edition_id INTEGER PRIMARY KEY REFERENCES editions(id) ON DELETE CASCADE,
+            paper_id INTEGER NOT NULL,
+            citation_count INTEGER NOT NULL DEFAULT 0,
+            missing_count INTEGER NOT NULL DEFAULT 0,
+            harvestable BOOLEAN NOT NULL DEFAULT FALSE,
+            stall_count INTEGER NOT NULL DEFAULT 0,
+            paused BOOLEAN NOT NULL DEFAULT FALSE,
+            targets_total INTEGER NOT NULL DEFAULT 0,
+            targets_incomplete INTEGER NOT NULL DEFAULT 0,
+            active_jobs INTEGER NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT NOW()
+        )""",
+        "CREATE INDEX IF NOT EXISTS ix_edition_harvest_gaps_paper_id ON edition_harvest_gaps(paper_id)",
+        # Resume candidates, largest gap first (find_resume_candidates repeats this predicate)
+        """CREATE INDEX IF NOT EXISTS ix_edition_harvest_gaps_resumable
+           ON edition_harvest_gaps(missing_count DESC)
+           WHERE harvestable AND NOT paused AND active_jobs <= 0 AND missing_count > 0
+             AND (targets_total = 0 OR targets_incomplete > 0)""",
+        # editions -> gap row (insert computes the row; updates only touch edition-derived columns)
+        """CREATE OR REPLACE FUNCTION edition_gap_from_edition() RETURNS trigger AS $$
+           BEGIN
+               IF TG_OP = 'UPDATE' THEN
+                   IF (NEW.paper_id, NEW.selected, NEW.scholar_id, NEW.citation_count, NEW.harvested_citation_count,
+                       NEW.harvest_stall_count, NEW.harvest_complete)
+                      IS NOT DISTINCT FROM
+                      (OLD.paper_id, OLD.selected, OLD.scholar_id, OLD.citation_count, OLD.harvested_citation_count,
+                       OLD.harvest_stall_count, OLD.harvest_complete) THEN
+                       RETURN NULL;
+                   END IF;
+                   IF NEW.paper_id IS DISTINCT FROM OLD.paper_id THEN
+                       DELETE FROM edition_harvest_gaps WHERE edition_id = NEW.id;
+                   END IF;
+               END IF;
+
+               UPDATE edition_harvest_gaps SET
+                   paper_id = NEW.paper_id,
+                   citation_count = COALESCE(NEW.citation_count, 0),
+                   missing_count = COALESCE(NEW.citation_count, 0) - COALESCE(NEW.harvested_citation_count, 0),
+                   harvestable = (NEW.selected IS TRUE AND NEW.scholar_id IS NOT NULL
+                                  AND NEW.citation_count > 0 AND NEW.citation_count <= 50000
+                                  AND NEW.harvest_complete IS NOT TRUE),
+                   stall_count = COALESCE(NEW.harvest_stall_count, 0),
+                   updated_at = now() AT TIME ZONE 'utc'
+               WHERE edition_id = NEW.id;
+
+               IF NOT FOUND THEN
+                   INSERT INTO edition_harvest_gaps (
+                       edition_id, paper_id, citation_count, missing_count, harvestable, stall_count,
+                       paused, targets_total, targets_incomplete, active_jobs, updated_at
+                   )
+                   SELECT
+                       NEW.id,
+                       NEW.paper_id,
+                       COALESCE(NEW.citation_count, 0),
+                       COALESCE(NEW.citation_count, 0) - COALESCE(NEW.harvested_citation_count, 0),
+                       (NEW.selected IS TRUE AND NEW.scholar_id IS NOT NULL
+                        AND NEW.citation_count > 0 AND NEW.citation_count <= 50000
+                        AND NEW.harvest_complete IS NOT TRUE),
+                       COALESCE(NEW.harvest_stall_count, 0),
+                       COALESCE((SELECT harvest_paused FROM papers WHERE id = NEW.paper_id), FALSE),
+                       (SELECT count(*) FROM harvest_targets WHERE edition_id = NEW.id),
+                       (SELECT count(*) FROM harvest_targets
+                        WHERE edition_id = NEW.id AND status <> 'complete'
+                          AND (expected_count > 0 OR (expected_count = 0 AND actual_count = 0))),
+                       (SELECT count(*) FROM jobs
+                        WHERE paper_id = NEW.paper_id AND job_type = 'extract_citations'
+                          AND status IN ('pending', 'running')),
+                       now() AT TIME ZONE 'utc'
+                   ON CONFLICT (edition_id) DO NOTHING;
+               END IF;
+               RETURN NULL;
+           END;
+           $$ LANGUAGE plpgsql""",
+        # harvest_targets -> targets_total / targets_incomplete deltas (no-op when nothing relevant changed)
+        """CREATE OR REPLACE FUNCTION edition_gap_from_target() RETURNS trigger AS $$
+           DECLARE
+               old_incomplete INTEGER := 0;
+               new_incomplete INTEGER := 0;
+           BEGIN
+               IF TG_OP <> 'INSERT' THEN
+                   IF OLD.status <> 'complete'
+                      AND (OLD.expected_count > 0 OR (OLD.expected_count = 0 AND OLD.actual_count = 0)) THEN
+                       old_incomplete := 1;
+                   END IF;
+               END IF;
+               IF TG_OP <> 'DELETE' THEN
+                   IF NEW.status <> 'complete'
+                      AND (NEW.expected_count > 0 OR (NEW.expected_count = 0 AND NEW.actual_count = 0)) THEN
+                       new_incomplete := 1;
+                   END IF;
+               END IF;
+
+               IF TG_OP = 'UPDATE' THEN
+                   IF NEW.edition_id = OLD.edition_id THEN
+                       IF new_incomplete <> old_incomplete THEN
+                           UPDATE edition_harvest_gaps
+                           SET targets_incomplete = targets_incomplete + new_incomplete - old_incomplete,
+                               updated_at = now() AT TIME ZONE 'utc'
+                           WHERE edition_id = NEW.edition_id;
+                       END IF;
+                       RETURN NULL;
+                   END IF;
+               END IF;
+
+               IF TG_OP <> 'INSERT' THEN
+                   UPDATE edition_harvest_gaps
+                   SET targets_total = targets_total - 1,
+                       targets_incomplete = targets_incomplete - old_incomplete,
+                       updated_at = now() AT TIME ZONE 'utc'
+                   WHERE edition_id = OLD.edition_id;
+               END IF;
+               IF TG_OP <> 'DELETE' THEN
+                   UPDATE edition_harvest_gaps
+                   SET targets_total = targets_total + 1,
+                       targets_incomplete = targets_incomplete + new_incomplete,
+                       updated_at = now() AT TIME ZONE 'utc'
+                   WHERE edition_id = NEW.edition_id;
+               END IF;
+               RETURN NULL;
+           END;
+           $$ LANGUAGE plpgsql""",
+        # papers.harvest_paused -> paused on all the paper's gap rows
+        """CREATE OR REPLACE FUNCTION edition_gap_from_paper() RETURNS trigger AS $$
+           BEGIN
+               IF NEW.harvest_paused IS DISTINCT FROM OLD.harvest_paused THEN
+                   UPDATE edition_harvest_gaps
+                   SET paused = COALESCE(NEW.harvest_paused, FALSE),
+                       updated_at = now() AT TIME ZONE 'utc'
+                   WHERE paper_id = NEW.id;
+               END IF;
+               RETURN NULL;
+           END;
+           $$ LANGUAGE plpgsql""",
+        # jobs -> active_jobs deltas (only pending/running extract_citations jobs count)
+        """CREATE OR REPLACE FUNCTION edition_gap_from_job() RETURNS trigger AS $$
+           DECLARE
+               old_active INTEGER := 0;
+               new_active INTEGER := 0;
+           BEGIN
+               IF TG_OP <> 'INSERT' THEN
+                   IF OLD.job_type = 'extract_citations' AND OLD.status IN ('pending', 'running')
+                      AND OLD.paper_id IS NOT NULL THEN
+                       old_active := 1;
+                   END IF;
+               END IF;
+               IF TG_OP <> 'DELETE' THEN
+                   IF NEW.job_type = 'extract_citations' AND NEW.status IN ('pending', 'running')
+                      AND NEW.paper_id IS NOT NULL THEN
+                       new_active := 1;
+                   END IF;
+               END IF;
+
+               IF TG_OP = 'UPDATE' THEN
+                   IF NEW.paper_id IS NOT DISTINCT FROM OLD.paper_id THEN
+                       IF new_active <> old_active THEN
+                           UPDATE edition_harvest_gaps
+                           SET active_jobs = active_jobs + new_active - old_active,
+                               updated_at = now() AT TIME ZONE 'utc'
+                           WHERE paper_id = NEW.paper_id;
+                       END IF;
+                       RETURN NULL;
+                   END IF;
+               END IF;
+
+               IF old_active = 1 THEN
+                   UPDATE edition_harvest_gaps
+                   SET active_jobs = active_jobs - 1, updated_at = now() AT TIME ZONE 'utc'
+                   WHERE paper_id = OLD.paper_id;
+               END IF;
+               IF new_active = 1 THEN
+                   UPDATE edition_harvest_gaps
+                   SET active_jobs = active_jobs + 1, updated_at = now() AT TIME ZONE 'utc'
+                   WHERE paper_id = NEW.paper_id;
+               END IF;
+               RETURN NULL;
+           END;
+           $$ LANGUAGE plpgsql""",
+        """DO $$ BEGIN
+               IF NOT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = 'editions_harvest_gap') THEN
+                   CREATE TRIGGER editions_harvest_gap
+                   AFTER INSERT OR UPDATE OF paper_id, selected, scholar_id, citation_count, harvested_citation_count,
+                                             harvest_stall_count, harvest_complete ON editions
+                   FOR EACH ROW EXECUTE PROCEDURE edition_gap_from_edition();
+               END IF;
+               IF NOT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = 'harvest_targets_harvest_gap') THEN
+                   CREATE TRIGGER harvest_targets_harvest_gap
+                   AFTER INSERT OR UPDATE OF edition_id, status, expected_count, actual_count OR DELETE ON harvest_targets
+                   FOR EACH ROW EXECUTE PROCEDURE edition_gap_from_target();
+               END IF;
+               IF NOT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = 'papers_harvest_gap') THEN
+                   CREATE TRIGGER papers_harvest_gap
+                   AFTER UPDATE OF harvest_paused ON papers
+                   FOR EACH ROW EXECUTE PROCEDURE edition_gap_from_paper();
+               END IF;
+               IF NOT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = 'jobs_harvest_gap') THEN
+                   CREATE TRIGGER jobs_harvest_gap
+                   AFTER INSERT OR UPDATE OF paper_id, job_type, status OR DELETE ON jobs
+                   FOR EACH ROW EXECUTE PROCEDURE edition_gap_from_job();
+               END IF;
+           END $$""",
+        # Keyset pagination of a paper's citations by (citation_count, id) descending (backward index scan)
+        "CREATE INDEX IF NOT EXISTS ix_citations_paper_count_id ON citations(paper_id, citation_count, id)",
+        # Partition plan of an author-letter harvest (see services/partition_planner.py)
+        "ALTER TABLE partition_runs ADD COLUMN IF NOT EXISTS plan TEXT NULL",
     ]
 
     # Run each migration in its own transaction to avoid cascading failures
@@ -358,9 +845,10 @@ async def run_migrations():
     for i, migration in enumerate(migrations, 1):
         try:
             logger.info(f"Migration {i}/{len(migrations)}: {migration[:50]}...")
-            async with engine.begin() as conn:
+            async with get_engine("maintenance").begin() as conn:
                 # Set 2 second lock timeout to fail fast
-                await conn.execute(text("SET lock_timeout = '2s'"))
+                # (LOCAL: pooled connections must not keep it after this transaction)
+                await conn.execute(text("SET LOCAL lock_timeout = '2s'"))
                 await conn.execute(text(migration))
             logger.info(f"Migration {i} completed")
         except Exception as e:
@@ -19,7 +19,7 @@ from pydantic import BaseModel
 import json
 
 from .config import get_settings
-from .database import init_db, get_db
+from .database import init_db, get_db, close_db, get_pool_stats
 from .models import Paper, Edition, Citation, Job, RawSearchResult, Collection, Dossier, PaperAdditionalDossier, FailedFetch, HarvestTarget, Thinker, ThinkerWork, ThinkerHarvestRun, ThinkerLLMCall, ScholarAuthorProfile
 from .schemas import (
     PaperCreate, PaperResponse, PaperDetail, PaperSubmitBatch, PapersPaginatedResponse,
@@ -49,7 +49,6 @@ from .schemas import (
     BatchCollectionAssignment, BatchForeignEditionRequest, BatchForeignEditionResponse,
     # Dashboard schemas
     HarvestDashboardResponse, JobHistoryResponse, JobHistoryItem,
-    SystemHealthStats, ActiveHarvestInfo, RecentlyCompletedPaper, DashboardAlert, JobHistorySummary,
     # Thinker Bibliographies schemas
     ThinkerCreate, ThinkerUpdate, ThinkerResponse, ThinkerDetail, ThinkerConfirmRequest,
     ThinkerWorkResponse, ThinkerHarvestRunResponse, ThinkerLLMCallResponse,
@@ -65,6 +64,7 @@ from .schemas import (
     # Scholar Profile schemas
     ScholarAuthorProfileResponse,
 )
+from .services.oxylabs_limiter import oxylabs_lane
 
 # Configure logging with immediate flush for Render
 import sys
@@ -152,6 +152,26 @@ async def lifespan(app: FastAPI):
     """Initialize database on startup, start background worker"""
     await init_db()
 
+    # Start event loop lag monitor (first, so it sees everything below)
+    from .services.loop_monitor import start_loop_monitor, stop_loop_monitor
+    await start_loop_monitor()
+
+    # Start Scholar HTML parse pool (keeps page parsing off the event loop)
+    from .services.parse_executor import start_parse_executor, stop_parse_executor
+    await start_parse_executor()
+
+    # Start citation ingest writer (write-behind saves for scraped pages)
+    from .services.citation_ingest import start_ingest_writer, stop_ingest_writer
+    await start_ingest_writer()
+
+    # Start job event listener (LISTEN/NOTIFY - wakes the worker when jobs are queued)
+    from .services.job_notify import start_job_listener, stop_job_listener
+    await start_job_listener()
+
+    # Start job progress flusher (coalesced progress / heartbeat writes)
+    from .services.job_progress import start_progress_flusher, stop_progress_flusher
+    await start_progress_flusher()
+
     # Start background job worker
     from .services.job_worker import start_worker
     start_worker()
@@ -160,22 +180,54 @@ async def lifespan(app: FastAPI):
     from .services.api_logger import start_flush_task, stop_flush_task
     await start_flush_task()
 
+    # Start Scholar page cache sweeper (expires search_cache rows)
+    from .services.scholar_cache import start_cache_sweeper, stop_cache_sweeper
+    await start_cache_sweeper()
+
     # Start health monitor (LLM-powered autonomous diagnostics)
     from .services.health_monitor import start_health_monitor, stop_health_monitor
     await start_health_monitor()
 
+    # Start citation counter reconciler (checks delta-maintained totals against COUNT(*))
+    from .services.citation_counters import start_counter_reconciler, stop_counter_reconciler
+    await start_counter_reconciler()
+
+    # Start harvest dashboard snapshot refresher
+    from .services.dashboard_snapshot import start_dashboard_refresher, stop_dashboard_refresher
+    await start_dashboard_refresher()
+
     yield
 
-    # Stop health monitor
+    # Stop health monitor, counter reconciler and dashboard refresher
     await stop_health_monitor()
+    await stop_counter_reconciler()
+    await stop_dashboard_refresher()
 
     # Stop worker on shutdown
-    from .services.job_worker import stop_worker
+    from .services.job_worker import stop_worker, release_job_leases
     stop_worker()
+    await stop_job_listener()
+
+    # Flush queued citation pages before the DB pools close
+    await stop_ingest_writer()
+
+    # Write pending job progress / resume state, then hand this worker's running jobs back to the queue
+    await stop_progress_flusher()
+    await release_job_leases()
 
     # Stop API logger flush task
     await stop_flush_task()
 
+    # Stop cache sweeper
+    await stop_cache_sweeper()
+
+    # Stop parse pool and loop monitor
+    await stop_parse_executor()
+    await stop_loop_monitor()
+
+    # Close pooled DB connections
+    await close_db()
+
 
 app = FastAPI(
     title="The Referee",
@@ -191,6 +243,7 @@ app.add_middleware(
     allow_credentials=False,  # Must be False when allow_origins=["*"]
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],  # Keyset pagination cursor on citation lists
 )
 
 
@@ -1147,9 +1200,10 @@ async def quick_add_paper(
             detail=f"Paper with this Scholar ID already exists (paper_id={existing_edition.paper_id}, edition_id={existing_edition.id})"
         )
 
-    # Look up the paper metadata from Google Scholar
+    # Look up the paper metadata from Google Scholar (interactive lane - jumps the harvest queue)
     scholar_service = ScholarSearchService()
-    paper_data = await scholar_service.get_paper_by_scholar_id(scholar_id)
+    with oxylabs_lane("interactive"):
+        paper_data = await scholar_service.get_paper_by_scholar_id(scholar_id)
 
     if not paper_data:
         raise HTTPException(
@@ -1550,12 +1604,14 @@ async def discover_editions(
     service = PaperResolutionService(db)
 
     try:
-        discovery_result = await service.discover_editions(
-            paper_id=paper.id,
-            job_id=job.id,
-            language_strategy=request.language_strategy,
-            custom_languages=request.custom_languages,
-        )
+        # Interactive lane: user is waiting, so these requests jump the harvest queue
+        with oxylabs_lane("interactive"):
+            discovery_result = await service.discover_editions(
+                paper_id=paper.id,
+                job_id=job.id,
+                language_strategy=request.language_strategy,
+                custom_languages=request.custom_languages,
+            )
 
         # Get stored editions
         editions_result = await db.execute(
@@ -2249,8 +2305,8 @@ async def add_manual_edition(
 
     The LLM will parse the input and search Google Scholar to find the exact edition.
     """
-    import anthropic
     import re
+    from .services.llm_gateway import get_llm_gateway
 
     # Get the parent paper for context
     result = await db.execute(select(Paper).where(Paper.id == request.paper_id))
@@ -2345,8 +2401,6 @@ async def add_manual_edition(
         resolution_details["llm_used"] = True
 
         try:
-            client = anthropic.Anthropic(api_key=settings.anthropic_api_key)
-
             prompt = f"""You are helping to find a specific edition of an academic work on Google Scholar.
 
 PARENT WORK:
@@ -2374,7 +2428,9 @@ Respond in JSON format:
     "reasoning": "brief explanation of your interpretation"
 }}"""
 
-            response = client.messages.create(
+            response = await get_llm_gateway().create(
+                purpose="manual_edition.query",
+                cache=True,
                 model="claude-sonnet-4-5-20250929",
                 max_tokens=500,
                 messages=[{"role": "user", "content": prompt}]
@@ -2573,42 +2629,56 @@ async def get_paper_citations(
     limit: Optional[int] = None,  # No limit by default - return ALL citations
     language: Optional[str] = None,
     edition_id: Optional[int] = None,
+    cursor: Optional[str] = None,
+    page_size: Optional[int] = None,
+    fields: Optional[str] = None,
+    format: str = "json",
     db: AsyncSession = Depends(get_db)
 ):
-    """Get citations for a paper with optional language/edition filter"""
-    # Build query with edition join for language and title
-    query = (
-        select(
-            Citation,
-            Edition.language.label('edition_language'),
-            Edition.title.label('edition_title')
-        )
-        .outerjoin(Edition, Citation.edition_id == Edition.id)
-        .where(Citation.paper_id == paper_id)
+    """
+    Get citations for a paper with optional language/edition filter.
+
+    Ordered by (citation_count, id) descending. Modes:
+    - default: all citations (or skip/limit) as CitationResponse objects
+    - keyset page (cursor, page_size or fields given): up to page_size rows of the
+      requested fields; the next page's cursor is in the X-Next-Cursor header
+      (absent on the last page)
+    - format=ndjson or format=csv: every citation from cursor on, streamed
+    """
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse, StreamingResponse
+    from .services.citation_export import (
+        DEFAULT_FIELDS, EXPORT_FORMATS, MAX_PAGE_SIZE, MEDIA_TYPES,
+        citation_query, decode_cursor, export_chunks, fetch_page, resolve_fields,
     )
 
-    # Apply filters
-    if language:
-        query = query.where(Edition.language.ilike(f"%{language}%"))
-    if edition_id:
-        query = query.where(Citation.edition_id == edition_id)
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {', '.join(EXPORT_FORMATS)}")
+    try:
+        selected = resolve_fields(fields)
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-    query = query.order_by(Citation.citation_count.desc()).offset(skip)
-    if limit:
-        query = query.limit(limit)
+    query = citation_query(paper_id, selected, language=language, edition_id=edition_id, after=after)
 
-    result = await db.execute(query)
-    rows = result.all()
+    if format != "json":
+        return StreamingResponse(
+            export_chunks(query, selected, format),
+            media_type=MEDIA_TYPES[format],
+            headers={"Content-Disposition": f'attachment; filename="paper_{paper_id}_citations.{format}"'},
+        )
 
-    # Build response with edition info
-    citations = []
-    for citation, edition_lang, edition_title in rows:
-        citation_dict = {k: v for k, v in citation.__dict__.items() if not k.startswith('_')}
-        citation_dict['edition_language'] = edition_lang
-        citation_dict['edition_title'] = edition_title
-        citations.append(CitationResponse(**citation_dict))
+    if cursor or page_size or fields:
+        rows, next_cursor = await fetch_page(db, query, selected, min(page_size or 1000, MAX_PAGE_SIZE))
+        headers = {"X-Next-Cursor": next_cursor} if next_cursor else {}
+        return JSONResponse(content=jsonable_encoder(rows), headers=headers)
 
-    return citations
+    query = query.offset(skip)
+    if limit:
+        query = query.limit(limit)
+    result = await db.execute(query)
+    return [CitationResponse(**{f: row._mapping[f] for f in DEFAULT_FIELDS}) for row in result.all()]
 
 
 # TODO: Enable after adding 'reviewed' column to production DB
@@ -2639,18 +2709,21 @@ async def get_cross_citations(
     db: AsyncSession = Depends(get_db)
 ):
     """Get cross-citation analysis results"""
+    from .services.citation_export import EXPORT_FIELDS
+
+    # Only the CitationResponse columns - abstract / author_profiles are never shown here
+    response_fields = [f for f in CitationResponse.model_fields if f not in ("edition_language", "edition_title")]
     result = await db.execute(
-        select(Citation)
+        select(*[EXPORT_FIELDS[f].label(f) for f in response_fields])
         .where(Citation.paper_id == paper_id, Citation.intersection_count >= min_intersection)
-        .order_by(Citation.intersection_count.desc())
+        .order_by(Citation.intersection_count.desc(), Citation.id.desc())
     )
-    citations = result.scalars().all()
+    intersections = [CitationResponse(**row._mapping) for row in result.all()]
 
     # Group by intersection count
     by_count = {}
-    for c in citations:
-        count = c.intersection_count
-        by_count[count] = by_count.get(count, 0) + 1
+    for c in intersections:
+        by_count[c.intersection_count] = by_count.get(c.intersection_count, 0) + 1
 
     # Total unique
     total_result = await db.execute(
@@ -2660,7 +2733,7 @@ async def get_cross_citations(
     return CrossCitationResult(
         paper_id=paper_id,
         total_unique_citations=total_result.scalar() or 0,
-        intersections=[CitationResponse(**{k: v for k, v in c.__dict__.items() if not k.startswith('_')}) for c in citations],
+        intersections=intersections,
         by_intersection_count=by_count,
     )
 
@@ -2722,16 +2795,13 @@ async def list_jobs(
         # Combine: active jobs first, then recent inactive
         jobs = active_jobs + inactive_jobs
 
-    # Parse params for each job
+    # Parse params for each job (progress_details / resume_state columns folded back in)
+    from .services.job_progress import merged_job_params
+
     response = []
     for job in jobs:
         job_dict = {k: v for k, v in job.__dict__.items() if not k.startswith('_')}
-        # Parse params JSON
-        if job.params:
-            try:
-                job_dict['params'] = json.loads(job.params)
-            except:
-                job_dict['params'] = None
+        job_dict['params'] = merged_job_params(job)
         response.append(JobResponse(**job_dict))
     return response
 
@@ -2744,11 +2814,13 @@ async def get_job(job_id: int, db: AsyncSession = Depends(get_db)):
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
 
+    from .services.job_progress import merged_job_params
+
     # Build response dict, excluding internal fields
     job_dict = {k: v for k, v in job.__dict__.items() if not k.startswith('_') and k not in ('result', 'params')}
     # Parse JSON fields
     job_dict['result'] = json.loads(job.result) if job.result else None
-    job_dict['params'] = json.loads(job.params) if job.params else None
+    job_dict['params'] = merged_job_params(job)
 
     return JobDetail(**job_dict)
 
@@ -3558,396 +3630,38 @@ async def get_stats(db: AsyncSession = Depends(get_db)):
 
 from datetime import timedelta
 
-MAX_CONCURRENT_JOBS = 20  # Must match job_worker.py
-
 
 @app.get("/api/dashboard/harvest-stats", response_model=HarvestDashboardResponse)
-async def get_harvest_dashboard(db: AsyncSession = Depends(get_db)):
-    """Get comprehensive harvesting dashboard data"""
-    # Use naive UTC datetimes to match database TIMESTAMP WITHOUT TIME ZONE columns
-    now = datetime.utcnow()
-    one_hour_ago = now - timedelta(hours=1)
-    six_hours_ago = now - timedelta(hours=6)
-    twenty_four_hours_ago = now - timedelta(hours=24)
-
-    # === System Health ===
-
-    # Active jobs count
-    active_jobs_result = await db.execute(
-        select(func.count(Job.id)).where(Job.status.in_(["pending", "running"]))
-    )
-    active_jobs = active_jobs_result.scalar() or 0
-
-    # Citations in last hour
-    citations_last_hour_result = await db.execute(
-        select(func.count(Citation.id)).where(Citation.created_at >= one_hour_ago)
-    )
-    citations_last_hour = citations_last_hour_result.scalar() or 0
-
-    # Papers with active jobs
-    papers_with_jobs_result = await db.execute(
-        select(func.count(func.distinct(Job.paper_id))).where(
-            Job.status.in_(["pending", "running"]),
-            Job.paper_id.isnot(None)
-        )
-    )
-    papers_with_active_jobs = papers_with_jobs_result.scalar() or 0
-
-    # Job history counts for different time periods
-    async def get_job_counts(since: datetime) -> dict:
-        completed = await db.execute(
-            select(func.count(Job.id)).where(
-                Job.status == "completed",
-                Job.completed_at >= since
-            )
-        )
-        failed = await db.execute(
-            select(func.count(Job.id)).where(
-                Job.status == "failed",
-                Job.completed_at >= since
-            )
-        )
-        cancelled = await db.execute(
-            select(func.count(Job.id)).where(
-                Job.status == "cancelled",
-                Job.completed_at >= since
-            )
-        )
-        return {
-            "completed": completed.scalar() or 0,
-            "failed": failed.scalar() or 0,
-            "cancelled": cancelled.scalar() or 0,
-        }
-
-    jobs_24h = await get_job_counts(twenty_four_hours_ago)
-    jobs_6h = await get_job_counts(six_hours_ago)
-    jobs_1h = await get_job_counts(one_hour_ago)
-
-    # Calculate average duplicate rate from recent completed jobs
-    # Look at jobs completed in last hour with results containing duplicates info
-    recent_jobs_result = await db.execute(
-        select(Job).where(
-            Job.status == "completed",
-            Job.completed_at >= one_hour_ago,
-            Job.job_type == "extract_citations",
-            Job.result.isnot(None)
-        ).limit(20)
-    )
-    recent_jobs = recent_jobs_result.scalars().all()
-
-    total_saved = 0
-    total_duplicates = 0
-    for job in recent_jobs:
-        try:
-            result = json.loads(job.result) if isinstance(job.result, str) else job.result
-            if result:
-                total_saved += result.get("citations_saved", 0)
-                total_duplicates += result.get("duplicates_found", 0)
-        except:
-            pass
-
-    avg_duplicate_rate = 0.0
-    if total_saved + total_duplicates > 0:
-        avg_duplicate_rate = total_duplicates / (total_saved + total_duplicates)
-
-    system_health = SystemHealthStats(
-        active_jobs=active_jobs,
-        max_concurrent_jobs=MAX_CONCURRENT_JOBS,
-        citations_last_hour=citations_last_hour,
-        papers_with_active_jobs=papers_with_active_jobs,
-        jobs_24h=JobHistorySummary(**jobs_24h),
-        avg_duplicate_rate_1h=round(avg_duplicate_rate, 3),
-    )
-
-    # === Active Harvests (running jobs with details) ===
-    active_harvests = []
-    running_jobs_result = await db.execute(
-        select(Job).where(
-            Job.status == "running",
-            Job.job_type == "extract_citations"
-        ).order_by(Job.started_at.desc())
-    )
-    running_jobs_list = running_jobs_result.scalars().all()
-
-    for job in running_jobs_list:
-        # Get paper info
-        paper_result = await db.execute(select(Paper).where(Paper.id == job.paper_id))
-        paper = paper_result.scalar_one_or_none()
-        if not paper:
-            continue
-
-        # Parse job params for progress details
-        try:
-            params = json.loads(job.params) if isinstance(job.params, str) else (job.params or {})
-        except:
-            params = {}
-
-        progress_details = params.get("progress_details", {})
-
-        # Get edition info for this paper
-        editions_result = await db.execute(
-            select(Edition).where(
-                Edition.paper_id == paper.id,
-                Edition.selected == True
-            )
-        )
-        editions = editions_result.scalars().all()
-        edition_count = len(editions)
-
-        # Sum up expected and harvested across editions
-        expected_total = sum(e.citation_count or 0 for e in editions)
-        harvested_total = sum(e.harvested_citation_count or 0 for e in editions)
-        stall_count = max((e.harvest_stall_count or 0) for e in editions) if editions else 0
-
-        # Calculate citations saved this hour for this paper
-        citations_hour_result = await db.execute(
-            select(func.count(Citation.id)).where(
-                Citation.paper_id == paper.id,
-                Citation.created_at >= one_hour_ago
-            )
-        )
-        citations_saved_hour = citations_hour_result.scalar() or 0
-
-        # Parse result for saved/duplicates this job
-        try:
-            result = json.loads(job.result) if isinstance(job.result, str) else (job.result or {})
-        except:
-            result = {}
-
-        citations_saved_job = result.get("citations_saved", progress_details.get("citations_saved", 0))
-        duplicates_job = result.get("duplicates_found", 0)
-
-        duplicate_rate = 0.0
-        if citations_saved_job + duplicates_job > 0:
-            duplicate_rate = duplicates_job / (citations_saved_job + duplicates_job)
-
-        # Calculate running time (both now and started_at are naive UTC)
-        running_minutes = 0
-        if job.started_at:
-            running_minutes = int((now - job.started_at).total_seconds() / 60)
-
-        active_harvests.append(ActiveHarvestInfo(
-            paper_id=paper.id,
-            paper_title=paper.title[:80] if paper.title else f"Paper #{paper.id}",
-            job_id=job.id,
-            job_progress=job.progress or 0,
-            current_year=progress_details.get("current_year"),
-            current_page=progress_details.get("current_page"),
-            citations_saved_job=citations_saved_job,
-            citations_saved_hour=citations_saved_hour,
-            duplicates_job=duplicates_job,
-            duplicate_rate=round(duplicate_rate, 3),
-            gap_remaining=max(0, expected_total - harvested_total),
-            expected_total=expected_total,
-            harvested_total=harvested_total,
-            running_minutes=running_minutes,
-            stall_count=stall_count,
-            edition_count=edition_count,
-        ))
-
-    # === Recently Completed Papers (last 24h where gap < 5%) ===
-    recently_completed = []
-
-    # Find papers where the most recent extract_citations job completed in last 24h
-    # and the paper is "mostly done" (gap < 5%)
-    recent_completed_jobs = await db.execute(
-        select(Job).where(
-            Job.status == "completed",
-            Job.job_type == "extract_citations",
-            Job.completed_at >= twenty_four_hours_ago,
-            Job.paper_id.isnot(None)
-        ).order_by(Job.completed_at.desc()).limit(100)
-    )
-    completed_jobs = recent_completed_jobs.scalars().all()
-
-    seen_papers = set()
-    for job in completed_jobs:
-        if job.paper_id in seen_papers:
-            continue
-        seen_papers.add(job.paper_id)
-
-        # Get paper info
-        paper_result = await db.execute(select(Paper).where(Paper.id == job.paper_id))
-        paper = paper_result.scalar_one_or_none()
-        if not paper:
-            continue
+async def get_harvest_dashboard(request: Request):
+    """
+    Get comprehensive harvesting dashboard data.
 
-        # Get edition totals
-        editions_result = await db.execute(
-            select(Edition).where(
-                Edition.paper_id == paper.id,
-                Edition.selected == True
-            )
-        )
-        editions = editions_result.scalars().all()
-        expected_total = sum(e.citation_count or 0 for e in editions)
-        harvested_total = sum(e.harvested_citation_count or 0 for e in editions)
+    Served from a snapshot rebuilt every dashboard_refresh_seconds in the
+    background. Send the returned ETag as If-None-Match to get a 304 while the
+    snapshot hasn't changed.
+    """
+    from fastapi.responses import Response
+    from .services.dashboard_snapshot import get_dashboard_snapshot
 
-        if expected_total == 0:
-            continue
+    snapshot = get_dashboard_snapshot()
+    body, etag, built_at = await snapshot.get()
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "no-cache",
+        "X-Snapshot-Built-At": built_at.isoformat() + "Z",
+    }
+    if etag in [t.strip() for t in request.headers.get("if-none-match", "").split(",")]:
+        snapshot.record_not_modified()
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
-        gap_percent = harvested_total / expected_total if expected_total > 0 else 0
 
-        # Only include if >= 95% complete
-        if gap_percent >= 0.95:
-            recently_completed.append(RecentlyCompletedPaper(
-                paper_id=paper.id,
-                paper_title=paper.title[:80] if paper.title else f"Paper #{paper.id}",
-                total_harvested=harvested_total,
-                expected_total=expected_total,
-                gap_percent=round(gap_percent, 3),
-                completed_at=job.completed_at,
-            ))
-
-        if len(recently_completed) >= 20:
-            break
+@app.get("/api/dashboard/harvest-stats/status")
+async def get_harvest_dashboard_status():
+    """Dashboard snapshot stats: builds, build time, requests served / not modified"""
+    from .services.dashboard_snapshot import get_dashboard_snapshot
 
-    # === Alerts ===
-    alerts = []
-
-    # Alert: High duplicate rate papers (from active harvests)
-    for harvest in active_harvests:
-        if harvest.duplicate_rate > 0.6:
-            alerts.append(DashboardAlert(
-                type="high_duplicate_rate",
-                paper_id=harvest.paper_id,
-                paper_title=harvest.paper_title,
-                job_id=harvest.job_id,
-                value=harvest.duplicate_rate,
-                message=f"{int(harvest.duplicate_rate * 100)}% duplicates - possible resume bug",
-            ))
-
-    # Alert: Stalled papers (stall_count > 2) - no limit, show all stalled
-    # Only show papers with genuine gaps (> 5% remaining)
-    # Skip editions already marked as harvest_complete
-    stalled_editions_result = await db.execute(
-        select(Edition).where(
-            Edition.harvest_stall_count > 2,
-            Edition.selected == True,
-            # Handle case where harvest_complete column may not exist yet (migration pending)
-            or_(
-                Edition.harvest_complete.is_(None),
-                Edition.harvest_complete == False
-            )
-        ).order_by(Edition.harvest_stall_count.desc())
-    )
-    stalled_editions = stalled_editions_result.scalars().all()
-    for edition in stalled_editions:
-        paper_result = await db.execute(select(Paper).where(Paper.id == edition.paper_id))
-        paper = paper_result.scalar_one_or_none()
-        if paper:
-            # Get harvest stats
-            harvested = paper.total_harvested_citations or 0
-            expected = edition.citation_count or 0
-            gap = max(0, expected - harvested)
-
-            # Skip papers that are essentially complete (< 5% gap)
-            gap_percent = (gap / expected * 100) if expected > 0 else 0
-            if gap_percent < 5:
-                # Paper is complete, reset stall count and mark as complete
-                edition.harvest_stall_count = 0
-                edition.harvest_complete = True
-                edition.harvest_complete_reason = "exhausted"
-                continue
-
-            # Get year completion breakdown from HarvestTargets
-            targets_result = await db.execute(
-                select(HarvestTarget).where(HarvestTarget.edition_id == edition.id)
-            )
-            targets = targets_result.scalars().all()
-
-            years_complete = 0
-            years_incomplete = 0
-            years_harvesting = 0
-            has_overflow = False
-
-            for target in targets:
-                if target.year is not None:  # Skip the "all years" aggregate entry
-                    if target.status == "complete":
-                        years_complete += 1
-                    elif target.status == "incomplete":
-                        years_incomplete += 1
-                    else:  # harvesting
-                        years_harvesting += 1
-                    if target.expected_count > 1000:
-                        has_overflow = True
-
-            years_total = years_complete + years_incomplete + years_harvesting
-
-            # Determine diagnosis
-            if years_total == 0:
-                # No HarvestTargets - need to run harvest first
-                diagnosis = "no_data"
-            elif years_incomplete > 0 or years_harvesting > 0:
-                # Some years haven't been fully scraped - our fault
-                diagnosis = "needs_scraping"
-            else:
-                # All years complete but still have gap - GS's fault
-                diagnosis = "gs_fault"
-
-            alerts.append(DashboardAlert(
-                type="stalled_paper",
-                paper_id=paper.id,
-                paper_title=paper.title[:60] if paper.title else f"Paper #{paper.id}",
-                edition_id=edition.id,
-                value=float(edition.harvest_stall_count),
-                message=f"{edition.harvest_stall_count} consecutive zero-progress jobs",
-                harvested_count=harvested,
-                expected_count=expected,
-                gap_remaining=gap,
-                stall_count=edition.harvest_stall_count,
-                years_complete=years_complete,
-                years_incomplete=years_incomplete,
-                years_harvesting=years_harvesting,
-                years_total=years_total,
-                has_overflow_years=has_overflow,
-                diagnosis=diagnosis,
-            ))
-
-    # Alert: Long-running jobs (> 45 min)
-    for harvest in active_harvests:
-        if harvest.running_minutes > 45:
-            alerts.append(DashboardAlert(
-                type="long_running_job",
-                paper_id=harvest.paper_id,
-                paper_title=harvest.paper_title,
-                job_id=harvest.job_id,
-                value=float(harvest.running_minutes),
-                message=f"Running for {harvest.running_minutes} minutes",
-            ))
-
-    # Alert: Repeated failures (3+ failed jobs for same paper in 24h)
-    failed_counts_result = await db.execute(
-        select(Job.paper_id, func.count(Job.id).label("fail_count")).where(
-            Job.status == "failed",
-            Job.completed_at >= twenty_four_hours_ago,
-            Job.paper_id.isnot(None)
-        ).group_by(Job.paper_id).having(func.count(Job.id) >= 3)
-    )
-    failed_papers = failed_counts_result.all()
-    for paper_id, fail_count in failed_papers:
-        paper_result = await db.execute(select(Paper).where(Paper.id == paper_id))
-        paper = paper_result.scalar_one_or_none()
-        if paper:
-            alerts.append(DashboardAlert(
-                type="repeated_failures",
-                paper_id=paper.id,
-                paper_title=paper.title[:60] if paper.title else f"Paper #{paper.id}",
-                value=float(fail_count),
-                message=f"{fail_count} failed jobs in last 24h",
-            ))
-
-    return HarvestDashboardResponse(
-        system_health=system_health,
-        active_harvests=active_harvests,
-        recently_completed=recently_completed,
-        alerts=alerts,
-        job_history_summary={
-            "last_hour": jobs_1h,
-            "last_6h": jobs_6h,
-            "last_24h": jobs_24h,
-        },
-    )
+    return get_dashboard_snapshot().get_stats()
 
 
 @app.get("/api/dashboard/job-history", response_model=JobHistoryResponse)
@@ -5984,12 +5698,12 @@ async def parse_bibliography(request: BibliographyParseRequest):
     if not request.text.strip():
         return BibliographyParseResponse(success=False, error="text is required")
 
-    try:
-        import anthropic
-
-        client = anthropic.Anthropic(api_key=settings.anthropic_api_key)
+    from .services.llm_gateway import get_llm_gateway
 
-        response = client.messages.create(
+    try:
+        response = await get_llm_gateway().create(
+            purpose="bibliography_parse",
+            cache=True,
             model="claude-sonnet-4-5-20250929",
             max_tokens=16000,
             messages=[{
@@ -6349,13 +6063,15 @@ async def get_refresh_status(
     running = sum(1 for j in matching_jobs if j.status == "running")
     pending = sum(1 for j in matching_jobs if j.status == "pending")
 
-    # Sum new citations from completed jobs
+    # Sum new citations (and pages saved by early-stop refresh) from completed jobs
     new_citations = 0
+    pages_saved = 0
     for job in matching_jobs:
         if job.status == "completed" and job.result:
             try:
                 result = json.loads(job.result)
                 new_citations += result.get("new_citations_added", 0)
+                pages_saved += (result.get("refresh_early_stop") or {}).get("pages_saved", 0)
             except:
                 pass
 
@@ -6367,6 +6083,7 @@ async def get_refresh_status(
         running_jobs=running,
         pending_jobs=pending,
         new_citations_added=new_citations,
+        pages_saved=pages_saved,
         is_complete=(completed + failed == len(matching_jobs)),
     )
 
@@ -6807,8 +6524,8 @@ async def analyze_harvest_gaps_with_ai(
         paper_id: Paper ID
         edition_id: Optional - if provided, analyze gaps for this specific edition only
     """
-    import anthropic
     import asyncio
+    from .services.llm_gateway import get_llm_gateway
     from .services.scholar_search import get_scholar_service
 
     # Get paper
@@ -7032,7 +6749,6 @@ async def analyze_harvest_gaps_with_ai(
 
     if settings.anthropic_api_key:
         try:
-            client = anthropic.Anthropic(api_key=settings.anthropic_api_key)
 
             # Build analysis context for LLM
             gap_descriptions = "\n".join([
@@ -7078,7 +6794,8 @@ SUMMARY:
 RECOMMENDATIONS:
 [Your bullet-point recommendations]"""
 
-            response = client.messages.create(
+            response = await get_llm_gateway().create(
+                purpose="gap_analysis.summary",
                 model="claude-sonnet-4-5-20250929",
                 max_tokens=1000,
                 messages=[{"role": "user", "content": prompt}]
@@ -7875,6 +7592,29 @@ async def refresh_citation_counts(
         return {"status": "ok", "message": f"Refreshed citation counts for {updated} papers"}
 
 
+@app.get("/api/admin/citation-counters")
+async def get_citation_counter_status():
+    """
+    Get the citation counter reconciler's stats and its last drift report.
+
+    Edition, paper and thinker citation totals are delta-maintained as citations
+    are inserted; the reconciler compares them with COUNT(*) ground truth.
+    """
+    from .services.citation_counters import get_counter_reconciler
+
+    return get_counter_reconciler().get_stats()
+
+
+@app.post("/api/admin/citation-counters/reconcile")
+async def reconcile_citation_counters(fix: bool = True):
+    """
+    Run a counter reconciliation now. With fix=false, only report drift.
+    """
+    from .services.citation_counters import get_counter_reconciler
+
+    return await get_counter_reconciler().reconcile(fix=fix)
+
+
 @app.get("/api/admin/partition-runs")
 async def get_partition_runs(
     edition_id: int = None,
@@ -7984,6 +7724,7 @@ async def get_partition_run_details(run_id: int, db: AsyncSession = Depends(get_
             "terms_tried_count": run.terms_tried_count,
             "terms_kept_count": run.terms_kept_count,
             "final_exclusion_terms": json.loads(run.final_exclusion_terms) if run.final_exclusion_terms else None,
+            "plan": json.loads(run.plan) if run.plan else None,
             "exclusion_harvested": run.exclusion_harvested,
             "inclusion_harvested": run.inclusion_harvested,
             "total_harvested": run.total_harvested,
@@ -8259,67 +8000,85 @@ async def external_analyze_papers(
     )
 
 
+# Fields returned by the external citations endpoint when none are requested
+EXTERNAL_CITATION_FIELDS = ["scholar_id", "title", "authors", "year", "venue", "link", "citation_count", "abstract"]
+
+
 @app.get("/api/external/papers/{paper_id}/citations")
 async def external_get_paper_citations(
     paper_id: int,
     limit: int = 100,
     offset: int = 0,
     min_citation_count: int = 0,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    format: str = "json",
     db: AsyncSession = Depends(get_db),
     api_key: str = Depends(verify_api_key),
 ):
     """
     Get all citations for a paper with full Google Scholar data.
 
-    Returns citations sorted by their own citation count (most cited first).
+    Returns citations sorted by their own citation count (most cited first, then
+    by id). Page through them by passing the returned next_cursor as cursor
+    (offset is ignored when a cursor is given; total_citations is only counted on
+    the first page). fields selects which citation fields are returned, e.g.
+    fields=scholar_id,title,year to skip abstracts. format=ndjson or format=csv
+    streams every matching citation instead of one page.
     """
+    from fastapi.responses import StreamingResponse
+    from .services.citation_export import (
+        EXPORT_FORMATS, MAX_PAGE_SIZE, MEDIA_TYPES,
+        citation_query, decode_cursor, export_chunks, fetch_page, resolve_fields,
+    )
+
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {', '.join(EXPORT_FORMATS)}")
+    try:
+        selected = resolve_fields(fields, default=EXTERNAL_CITATION_FIELDS)
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
     # Verify paper exists
-    result = await db.execute(select(Paper).where(Paper.id == paper_id))
-    paper = result.scalar_one_or_none()
+    result = await db.execute(select(Paper.id, Paper.title).where(Paper.id == paper_id))
+    paper = result.one_or_none()
     if not paper:
         raise HTTPException(status_code=404, detail=f"Paper {paper_id} not found")
 
-    # Get citations with optional filtering
-    query = (
-        select(Citation)
-        .where(Citation.paper_id == paper_id)
-        .where(Citation.citation_count >= min_citation_count)
-        .order_by(Citation.citation_count.desc())
-        .offset(offset)
-        .limit(limit)
-    )
+    query = citation_query(paper_id, selected, min_citation_count=min_citation_count, after=after)
 
-    result = await db.execute(query)
-    citations = result.scalars().all()
+    if format != "json":
+        return StreamingResponse(
+            export_chunks(query, selected, format),
+            media_type=MEDIA_TYPES[format],
+            headers={"Content-Disposition": f'attachment; filename="paper_{paper_id}_citations.{format}"'},
+        )
 
-    # Get total count
-    count_result = await db.execute(
-        select(func.count(Citation.id))
-        .where(Citation.paper_id == paper_id)
-        .where(Citation.citation_count >= min_citation_count)
-    )
-    total_count = count_result.scalar() or 0
+    if not cursor and offset:
+        query = query.offset(offset)
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    citations, next_cursor = await fetch_page(db, query, selected, limit)
+
+    # Get total count (first page only - later pages already know it)
+    total_count = None
+    if not cursor:
+        count_result = await db.execute(
+            select(func.count(Citation.id))
+            .where(Citation.paper_id == paper_id)
+            .where(Citation.citation_count >= min_citation_count)
+        )
+        total_count = count_result.scalar() or 0
 
     return {
         "paper_id": paper_id,
         "paper_title": paper.title,
         "total_citations": total_count,
         "returned_count": len(citations),
-        "offset": offset,
+        "offset": 0 if cursor else offset,
         "limit": limit,
-        "citations": [
-            {
-                "scholar_id": c.scholar_id,
-                "title": c.title,
-                "authors": c.authors,
-                "year": c.year,
-                "venue": c.venue,
-                "link": c.link,
-                "citation_count": c.citation_count,
-                "abstract": c.abstract,
-            }
-            for c in citations
-        ],
+        "next_cursor": next_cursor,
+        "citations": citations,
     }
 
 
@@ -8383,7 +8142,7 @@ async def get_citation_buffer_stats():
 
     return {
         "buffer_stats": stats,
-        "description": "Citation buffer holds pages that failed DB save for retry",
+        "description": "Citation buffer holds pages not yet acknowledged by the DB writer, in an append-only segment log",
     }
 
 
@@ -8392,13 +8151,16 @@ async def retry_citation_buffer():
     """
     Manually trigger retry of failed citation saves from the buffer.
     """
-    from .services.citation_buffer import retry_failed_saves
+    from .services.citation_buffer import get_buffer, retry_failed_saves
 
     retried = await retry_failed_saves()
+    stats = get_buffer().get_buffer_stats()
 
     return {
         "success": True,
         "pages_retried": retried,
+        "failed_pending_retry": stats.get("failed_pending_retry"),
+        "segments": stats.get("log"),
         "message": f"Retried {retried} pages from citation buffer",
     }
 
@@ -8406,26 +8168,100 @@ async def retry_citation_buffer():
 @app.post("/api/admin/citation-buffer/cleanup")
 async def cleanup_citation_buffer(max_age_hours: int = 24):
     """
-    Clean up old buffer files (default: older than 24 hours).
+    Drop buffered pages older than max_age_hours (default 24), then delete
+    empty log segments and compact sparse ones.
     """
     from .services.citation_buffer import get_buffer
 
     buffer = get_buffer()
     removed = buffer.cleanup_old_buffers(max_age_hours=max_age_hours)
+    stats = buffer.get_buffer_stats()
 
     return {
         "success": True,
-        "files_removed": removed,
-        "message": f"Removed {removed} buffer files older than {max_age_hours} hours",
+        "pages_removed": removed,
+        "segments": stats.get("log"),
+        "message": f"Removed {removed} buffered pages older than {max_age_hours} hours",
     }
 
 
+# ============== Scholar Page Cache Admin Endpoints ==============
+
+@app.get("/api/admin/scholar-cache/stats")
+async def get_scholar_cache_stats():
+    """
+    Get hit/miss statistics for the Scholar page cache (memory LRU + search_cache table).
+    """
+    from .services.scholar_cache import get_page_cache
+
+    return {
+        "cache_stats": get_page_cache().get_stats(),
+        "description": "Parsed Scholar pages keyed on URL - every hit saves an Oxylabs request",
+    }
+
+
+@app.post("/api/admin/scholar-cache/sweep")
+async def sweep_scholar_cache():
+    """
+    Manually delete expired entries from the Scholar page cache.
+    """
+    from .services.scholar_cache import get_page_cache
+
+    deleted = await get_page_cache().sweep()
+
+    return {
+        "success": True,
+        "rows_deleted": deleted,
+        "message": f"Deleted {deleted} expired cache rows",
+    }
+
+
+@app.get("/api/admin/llm/stats")
+async def get_llm_stats():
+    """
+    Get LLM gateway stats: concurrency, retries, cache hits, tokens and latency per purpose.
+    """
+    from .services.llm_gateway import get_llm_gateway
+
+    return get_llm_gateway().get_stats()
+
+
+@app.get("/api/admin/db-pool/stats")
+async def get_db_pool_stats():
+    """
+    Get database connection pool stats per role (api / worker / maintenance).
+
+    Shows connection counts, overflow and checkout wait times - a rising worker
+    checkout wait with a flat API wait means the per-role budgets are doing their job.
+    """
+    return get_pool_stats()
+
+
 @app.get("/api/admin/worker/status")
 async def get_worker_status():
-    """Get detailed worker status."""
+    """Get detailed worker status, including Oxylabs limiter/breaker state, event loop lag and parse stage."""
     from .services.job_worker import is_worker_healthy
+    from .services.oxylabs_limiter import get_oxylabs_limiter
+    from .services.oxylabs_breaker import get_oxylabs_breaker
+    from .services.loop_monitor import get_loop_monitor
+    from .services.parse_executor import get_parse_executor
+    from .services.citation_ingest import get_ingest_queue
+    from .services.job_notify import get_job_listener
+    from .services.job_progress import get_progress_reporter
+    from .services.job_scheduler import get_job_scheduler
 
-    return is_worker_healthy()
+    return {
+        **is_worker_healthy(),
+        "oxylabs_limiter": get_oxylabs_limiter().get_stats(),
+        "oxylabs_breaker": get_oxylabs_breaker().get_stats(),
+        "event_loop": get_loop_monitor().get_stats(),
+        "parse_executor": get_parse_executor().get_stats(),
+        "db_pools": get_pool_stats()["pools"],
+        "citation_ingest": get_ingest_queue().get_stats(),
+        "job_dispatch": get_job_listener().get_stats(),
+        "job_progress": get_progress_reporter().get_stats(),
+        "scheduler": get_job_scheduler().get_stats(),
+    }
 
 
 @app.post("/api/admin/worker/restart")
@@ -8459,8 +8295,8 @@ async def restart_worker():
 
 # ============================================================================
 # FOCUS MODE ENDPOINTS
-# Enable focus mode to ONLY process jobs for a specific thinker
-# All other jobs are halted, auto-resume is disabled
+# Focus mode gives one thinker a heavy weight in the fair-share job scheduler
+# Other jobs keep running at a much smaller share
 # ============================================================================
 
 
@@ -8470,21 +8306,18 @@ async def enable_focus_mode_endpoint(thinker_id: int, db: AsyncSession = Depends
     Enable focus mode for a specific thinker.
 
     In focus mode:
-    - ONLY jobs for this thinker's papers will be processed
-    - All other pending/running jobs are effectively halted
-    - Auto-resume is completely disabled
-    - Useful for testing/debugging thinker harvesting without interference
-
-    Also cancels all pending/running jobs that are NOT for this thinker.
+    - This thinker's jobs get scheduler_focus_weight in the fair-share scheduler,
+      so they take most free slots while they have pending work
+    - Other jobs are not cancelled - they keep draining at their (smaller) share
+    - Enabling focus for another thinker moves the weight to them
     """
     from .services.job_worker import enable_focus_mode
 
-    # Get the thinker's paper IDs
     thinker = await db.get(Thinker, thinker_id)
     if not thinker:
         raise HTTPException(status_code=404, detail=f"Thinker {thinker_id} not found")
 
-    # Get all paper IDs for this thinker
+    # Paper IDs only for the response - the scheduler maps jobs to thinkers itself
     result = await db.execute(
         select(ThinkerWork.paper_id)
         .where(ThinkerWork.thinker_id == thinker_id)
@@ -8493,63 +8326,33 @@ async def enable_focus_mode_endpoint(thinker_id: int, db: AsyncSession = Depends
     )
     paper_ids = [row[0] for row in result.fetchall()]
 
-    if not paper_ids:
-        raise HTTPException(status_code=400, detail=f"Thinker {thinker_id} has no papers to focus on")
-
-    # Cancel all non-thinker pending jobs
-    from sqlalchemy import update, and_, not_
-    cancelled_pending = await db.execute(
-        update(Job)
-        .where(Job.status == "pending")
-        .where(not_(Job.paper_id.in_(paper_ids)))
-        .values(status="cancelled")
-        .returning(Job.id)
-    )
-    cancelled_pending_count = len(cancelled_pending.fetchall())
-
-    # Cancel all non-thinker running jobs
-    cancelled_running = await db.execute(
-        update(Job)
-        .where(Job.status == "running")
-        .where(not_(Job.paper_id.in_(paper_ids)))
-        .values(status="cancelled")
-        .returning(Job.id)
-    )
-    cancelled_running_count = len(cancelled_running.fetchall())
-
-    await db.commit()
-
-    # Enable focus mode
-    result = enable_focus_mode(thinker_id, paper_ids)
-    result["cancelled_pending"] = cancelled_pending_count
-    result["cancelled_running"] = cancelled_running_count
+    result = await enable_focus_mode(db, thinker_id, paper_ids)
     result["thinker_name"] = thinker.canonical_name
 
-    logger.info(f"[FOCUS MODE] Enabled for thinker {thinker_id} ({thinker.canonical_name}). Cancelled {cancelled_pending_count} pending, {cancelled_running_count} running non-thinker jobs.")
+    logger.info(f"[FOCUS MODE] Enabled for thinker {thinker_id} ({thinker.canonical_name}), weight {result['weight']}")
 
     return result
 
 
 @app.post("/api/admin/focus/disable")
-async def disable_focus_mode_endpoint():
+async def disable_focus_mode_endpoint(db: AsyncSession = Depends(get_db)):
     """
-    Disable focus mode. All jobs will run normally.
-    Auto-resume will be re-enabled.
+    Disable focus mode. The thinker goes back to the default thinker weight.
     """
     from .services.job_worker import disable_focus_mode
 
-    result = disable_focus_mode()
+    result = await disable_focus_mode(db)
     logger.info("[FOCUS MODE] Disabled")
     return result
 
 
 @app.get("/api/admin/focus/status")
-async def get_focus_mode_status_endpoint():
+async def get_focus_mode_status_endpoint(db: AsyncSession = Depends(get_db)):
     """
     Get current focus mode status.
     """
     from .services.job_worker import get_focus_mode_status
-    return get_focus_mode_status()
+    return await get_focus_mode_status(db)
 
 
 @app.post("/api/admin/cleanup-duplicate-jobs")
@@ -276,6 +276,8 @@ class Citation(Base):
     __table_args__ = (
         # Unique constraint required for ON CONFLICT (paper_id, scholar_id) DO NOTHING
         Index("ix_citations_paper_scholar_unique", "paper_id", "scholar_id", unique=True),
+        # Keyset pagination / streaming exports in (citation_count, id) order
+        Index("ix_citations_paper_count_id", "paper_id", "citation_count", "id"),
     )
 
 
@@ -330,6 +332,16 @@ class Job(Base):
     started_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
     completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
 
+    # Live progress, written by the coalescing progress reporter (services/job_progress.py)
+    progress_details: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # JSON - stage, edition, page, counts for the UI
+    resume_state: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # JSON - where to resume after a restart
+    heartbeat_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)  # Last progress write
+
+    # Worker lease: which worker process claimed the job, and until when
+    # The owner renews the lease from its heartbeat; an expired lease means the owner died
+    worker_id: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    lease_expires_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
     # Webhook callback (for external API integration)
     callback_url: Mapped[Optional[str]] = mapped_column(Text, nullable=True, default=None)
     callback_secret: Mapped[Optional[str]] = mapped_column(String(256), nullable=True, default=None)
@@ -341,6 +353,7 @@ class Job(Base):
 
     __table_args__ = (
         Index("ix_jobs_status_priority", "status", "priority"),
+        Index("ix_jobs_status_lease", "status", "lease_expires_at"),
     )
 
 
@@ -372,6 +385,20 @@ class RawSearchResult(Base):
     )
 
 
+class SchedulerWeight(Base):
+    """
+    Fair-share weight override for a scheduler tenant (e.g. focus mode), shared
+    by every worker - see services/job_scheduler.py
+    """
+    __tablename__ = "scheduler_weights"
+
+    tenant: Mapped[str] = mapped_column(String(100), primary_key=True)  # e.g. "thinker:12"
+    weight: Mapped[float] = mapped_column(Float)
+    reason: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)  # "focus"
+    paper_count: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)  # Focus mode: papers of the thinker
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
 class SearchCache(Base):
     """Cache for Google Scholar search results"""
     __tablename__ = "search_cache"
@@ -487,6 +514,37 @@ class HarvestTarget(Base):
     )
 
 
+class EditionHarvestGap(Base):
+    """
+    Per-edition harvest gap, maintained by triggers on editions, harvest_targets,
+    papers and jobs (see database.py migrations).
+
+    Auto-resume picks candidates with one scan of the partial index
+    ix_edition_harvest_gaps_resumable (missing_count DESC) instead of a big
+    query with NOT IN / EXISTS subqueries over editions, papers, jobs and
+    harvest_targets. services/harvest_gaps.py rebuilds it periodically to
+    correct any drift.
+    """
+    __tablename__ = "edition_harvest_gaps"
+
+    edition_id: Mapped[int] = mapped_column(ForeignKey("editions.id", ondelete="CASCADE"), primary_key=True)
+    paper_id: Mapped[int] = mapped_column(Integer, index=True)
+
+    citation_count: Mapped[int] = mapped_column(Integer, default=0)
+    missing_count: Mapped[int] = mapped_column(Integer, default=0)  # citation_count - harvested_citation_count
+    # selected, has scholar_id, 0 < citation_count <= 50000, not marked harvest_complete
+    harvestable: Mapped[bool] = mapped_column(Boolean, default=False)
+    stall_count: Mapped[int] = mapped_column(Integer, default=0)
+    paused: Mapped[bool] = mapped_column(Boolean, default=False)  # papers.harvest_paused
+
+    targets_total: Mapped[int] = mapped_column(Integer, default=0)
+    # Targets not complete with work left (expected > 0, or never queried)
+    targets_incomplete: Mapped[int] = mapped_column(Integer, default=0)
+    active_jobs: Mapped[int] = mapped_column(Integer, default=0)  # Pending/running extract_citations jobs for the paper
+
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
 class HarvestQuery(Base):
     """Universal query logging for ALL harvesting operations.
 
@@ -585,6 +643,9 @@ class PartitionRun(Base):
     final_inclusion_query: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     inclusion_set_count: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
 
+    # Partition plan (author-letter strategy): JSON tree of partitions with counts, sources and actions
+    plan: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
     # Harvest results
     exclusion_harvested: Mapped[int] = mapped_column(Integer, default=0)
     inclusion_harvested: Mapped[int] = mapped_column(Integer, default=0)
@@ -651,7 +712,7 @@ class PartitionTermAttempt(Base):
     order_tried: Mapped[int] = mapped_column(Integer)  # 1, 2, 3... in order tried
 
     # Source of this term
-    source: Mapped[str] = mapped_column(String(20))  # 'llm', 'fallback', 'manual', 'domain'
+    source: Mapped[str] = mapped_column(String(20))  # 'llm', 'index', 'fallback', 'manual', 'domain'
     llm_call_id: Mapped[Optional[int]] = mapped_column(
         ForeignKey("partition_llm_calls.id", ondelete="SET NULL"), nullable=True
     )
@@ -697,7 +758,7 @@ class PartitionQuery(Base):
 
     # Query details
     query_type: Mapped[str] = mapped_column(String(30), index=True)
-    # Types: 'initial_count', 'term_test', 'exclusion_harvest', 'inclusion_harvest', 'recursive_count'
+    # Types: 'initial_count', 'term_test', 'term_set_verify', 'exclusion_harvest', 'inclusion_harvest', 'recursive_count'
 
     scholar_id: Mapped[str] = mapped_column(String(50))
     year: Mapped[int] = mapped_column(Integer)
@@ -400,6 +400,7 @@ class JobResponse(BaseModel):
     created_at: datetime
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
+    heartbeat_at: Optional[datetime] = None  # Last progress write
     error: Optional[str] = None
 
     class Config:
@@ -472,6 +473,7 @@ class RefreshStatusResponse(BaseModel):
     running_jobs: int
     pending_jobs: int
     new_citations_added: int
+    pages_saved: int = 0  # Oxylabs page requests avoided by stopping refreshes at known citations
     is_complete: bool
 
 
@@ -1,12 +1,21 @@
 """
 Services for The Referee
+
+Exports resolve lazily, so importing one service module (e.g. scholar_parser in
+a parse pool worker) doesn't load every service.
 """
-from .scholar_search import ScholarSearchService
-from .edition_discovery import EditionDiscoveryService
-from .paper_resolution import PaperResolutionService
-
-__all__ = [
-    "ScholarSearchService",
-    "EditionDiscoveryService",
-    "PaperResolutionService",
-]
+from importlib import import_module
+
+_EXPORTS = {
+    "ScholarSearchService": ".scholar_search",
+    "EditionDiscoveryService": ".edition_discovery",
+    "PaperResolutionService": ".paper_resolution",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(_EXPORTS[name], __name__), name)
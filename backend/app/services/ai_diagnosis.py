@@ -9,7 +9,6 @@ import json
 import asyncio
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any, List
-import anthropic
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, desc, func
@@ -19,6 +18,7 @@ from ..models import (
     Paper, Edition, Job, HarvestTarget, FailedFetch,
     PartitionRun, PartitionQuery, Citation
 )
+from .llm_gateway import get_llm_gateway
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -28,8 +28,6 @@ class HarvestDiagnosisService:
     """AI-powered diagnosis of harvest issues"""
 
     def __init__(self):
-        # Use AsyncAnthropic for async context
-        self.client = anthropic.AsyncAnthropic(api_key=settings.anthropic_api_key)
         # Use Opus 4.5 for complex reasoning
         self.model = "claude-opus-4-5-20251101"
 
@@ -64,7 +62,8 @@ class HarvestDiagnosisService:
             full_thinking = ""
             full_response = ""
 
-            async with self.client.messages.stream(
+            async with get_llm_gateway().stream(
+                purpose="ai_diagnosis",
                 model=self.model,
                 max_tokens=thinking_budget + 16000,  # Must be > thinking budget
                 thinking={
@@ -198,6 +198,8 @@ async def start_flush_task():
     global _flush_task
 
     async def flush_loop():
+        from ..database import bind_db_role
+        bind_db_role("maintenance")
         while True:
             await asyncio.sleep(_FLUSH_INTERVAL)
             try:
@@ -17,7 +17,7 @@ import logging
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 
-from anthropic import Anthropic
+from .llm_gateway import get_llm_gateway
 
 logger = logging.getLogger(__name__)
 
@@ -31,8 +31,7 @@ class AuthorshipVerifier:
     - Profile-seeded works (new use case - may include wrong-person matches)
     """
 
-    def __init__(self, anthropic_client: Anthropic, model: str = "claude-sonnet-4-5-20250929"):
-        self.client = anthropic_client
+    def __init__(self, model: str = "claude-sonnet-4-5-20250929"):
         self.model = model
 
     async def verify_works(
@@ -162,7 +161,9 @@ Return a JSON array with one decision per work (same order as input):
 ONLY return the JSON array, no other text."""
 
         try:
-            response = self.client.messages.create(
+            response = await get_llm_gateway().create(
+                purpose="authorship_verifier",
+                cache=True,
                 model=self.model,
                 max_tokens=4096,
                 messages=[{"role": "user", "content": prompt}]
@@ -216,6 +217,4 @@ ONLY return the JSON array, no other text."""
 # Convenience function
 def get_authorship_verifier() -> AuthorshipVerifier:
     """Get a configured AuthorshipVerifier instance."""
-    import os
-    client = Anthropic(api_key=os.environ.get("ANTHROPIC_API_KEY"))
-    return AuthorshipVerifier(client)
+    return AuthorshipVerifier()
@@ -12,11 +12,11 @@ import asyncio
 from datetime import datetime
 from typing import Optional, List, Any
 from dataclasses import dataclass, field, asdict
-import anthropic
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..config import get_settings
+from .llm_gateway import get_llm_gateway
 from .scholar_search import ScholarSearchService
 
 logger = logging.getLogger(__name__)
@@ -123,7 +123,6 @@ class BibliographicAgent:
     """
 
     def __init__(self):
-        self.client = anthropic.AsyncAnthropic(api_key=settings.anthropic_api_key)
         self.model = "claude-opus-4-5-20251101"
         self.thinking_budget = 32000
         self.max_output_tokens = 16000
@@ -191,7 +190,8 @@ class BibliographicAgent:
 
             logger.info(f"Calling Claude Opus 4.5 with {self.thinking_budget} thinking tokens...")
 
-            async with self.client.messages.stream(
+            async with get_llm_gateway().stream(
+                purpose="bibliographic_agent",
                 model=self.model,
                 max_tokens=self.thinking_budget + self.max_output_tokens,
                 thinking={
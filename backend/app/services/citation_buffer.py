@@ -3,15 +3,40 @@ Local citation buffer for resilient saves.
 
 When database saves fail (e.g., TimeoutError to remote DB),
 citations are stored locally and retried later.
+
+Storage is a segmented, append-only log under BUFFER_DIR (slot_<n>/seg_<id>.wal):
+
+- Each process claims its own slot directory, held by an exclusive flock for
+  the life of the process, so workers on one host never share segment files.
+  A slot left by a dead process is claimed (and its unacked pages replayed)
+  by the next process to start
+
+- Each buffered page is one checksummed PAGE record appended to the active
+  segment. mark_saved / mark_failed append small ACK / FAIL records instead
+  of rewriting, moving or deleting per-page files
+- An in-memory index (record id -> segment + offset) answers get_pending_pages
+  without touching the disk unless there is something to retry
+- Segments roll by size or age. A sealed segment with no live records is
+  deleted; a mostly-dead one is compacted (live records copied forward)
+- On startup the segments are replayed: a torn or corrupt tail (crash mid-write)
+  is truncated, and pages that were never acknowledged become pending retries
+
+Record layout: [payload length u32][crc32 u32][type u8][record id u64][payload]
 """
+import fcntl
 import json
 import logging
 import os
 import asyncio
-from datetime import datetime
+import struct
+import time
+import zlib
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Dict, Optional, Set
-from dataclasses import dataclass, asdict
+from typing import List, Dict, Optional, Set, Tuple, Any
+from dataclasses import dataclass, fields
+
+from ..config import get_settings
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +44,23 @@ logger = logging.getLogger(__name__)
 # Falls back to local .citation_buffer for development
 BUFFER_DIR = Path(os.environ.get("CITATION_BUFFER_DIR", "/tmp/citation_buffer"))
 
+SLOT_PREFIX = "slot_"
+SLOT_LOCK_FILE = ".lock"
+SEGMENT_PREFIX = "seg_"
+SEGMENT_SUFFIX = ".wal"
+RECORD_HEADER = struct.Struct(">IIBQ")  # payload length, crc32, record type, record id
+
+REC_PAGE = 1  # Buffered page (payload: BufferedPage fields + state)
+REC_ACK = 2  # Page saved to DB (or dropped by cleanup) - no payload
+REC_FAIL = 3  # DB save failed (payload: retry_count, last_error, failed_at)
+REC_DEAD = 4  # Exceeded max retries - kept for inspection, no longer retried
+
+STATE_IN_PROGRESS = "in_progress"  # Buffered by this process, write queued
+STATE_PENDING = "pending"  # Failed (or recovered after a restart) - retried by retry_failed_saves
+STATE_DEAD = "dead"  # Permanent failure
+
+COMPACT_LIVE_RATIO = 0.25  # Compact a sealed segment once less than this fraction of its bytes is live
+
 
 @dataclass
 class BufferedPage:
@@ -33,6 +75,45 @@ class BufferedPage:
     retry_count: int = 0
     last_error: Optional[str] = None
     failed_at: Optional[str] = None  # Set when mark_failed is called
+    record_id: Optional[int] = None  # Log record id - pass back to mark_saved / mark_failed
+
+
+PAGE_FIELDS = tuple(f.name for f in fields(BufferedPage) if f.name != "record_id")
+
+
+@dataclass
+class _IndexEntry:
+    """Where a live page record is, plus its mutable retry state"""
+    segment_id: int
+    offset: int
+    length: int
+    job_id: int
+    page_num: int
+    created_at: str
+    state: str
+    retry_count: int = 0
+    last_error: Optional[str] = None
+    failed_at: Optional[str] = None
+
+
+class _Segment:
+    """One log file"""
+
+    def __init__(self, segment_id: int, path: Path, created_at: float):
+        self.id = segment_id
+        self.path = path
+        self.created_at = created_at
+        self.size = 0
+        self.records = 0
+        self.live: Set[int] = set()  # Record ids whose current PAGE copy is in this segment
+        self.live_bytes = 0
+        # Older segments holding records this one acks or supersedes - this segment
+        # must outlive them, or replay would resurrect those records
+        self.shadows: Set[int] = set()
+
+
+def _checksum(rtype: int, record_id: int, payload: bytes) -> int:
+    return zlib.crc32(payload, zlib.crc32(struct.pack(">BQ", rtype, record_id)))
 
 
 class CitationBuffer:
@@ -40,7 +121,7 @@ class CitationBuffer:
     Local buffer for citation saves with retry capability.
 
     Usage:
-        buffer = CitationBuffer()
+        buffer = get_buffer()
 
         # Save locally first
         buffer.save_page(job_id, paper_id, edition_id, target_edition_id, page_num, papers)
@@ -48,7 +129,7 @@ class CitationBuffer:
         # Try DB save
         try:
             await save_to_db(...)
-            buffer.mark_saved(job_id, page_num)  # Remove from buffer
+            buffer.mark_saved(job_id, page_num)  # Ack - record no longer live
         except Exception as e:
             buffer.mark_failed(job_id, page_num, str(e))  # Keep for retry
 
@@ -57,31 +138,401 @@ class CitationBuffer:
         for page in pending:
             try:
                 await save_to_db(page.papers, ...)
-                buffer.mark_saved(page.job_id, page.page_num)
+                buffer.mark_saved(page.job_id, page.page_num, record_id=page.record_id)
             except:
                 pass  # Will retry next time
     """
 
-    def __init__(self):
+    def __init__(self, segment_max_bytes: int = 8 * 1024 * 1024, segment_max_seconds: float = 900,
+                 fsync: bool = False):
+        self.segment_max_bytes = segment_max_bytes
+        self.segment_max_seconds = segment_max_seconds
+        self.fsync = fsync
+
+        self._segments: Dict[int, _Segment] = {}  # Log order
+        self._active: Optional[_Segment] = None
+        self._file = None
+        self._next_segment_id = 1
+        self._next_record_id = 1
+        self._compacting = False
+
+        self._index: Dict[int, _IndexEntry] = {}  # record id -> entry (every live record)
+        self._live: Dict[Tuple[int, int], int] = {}  # (job_id, page_num) -> record id, pages buffered by this process
+        self._pending: Dict[int, None] = {}  # Ordered set of record ids awaiting retry
+        self._dead: Dict[int, None] = {}
+
+        self._stats = {
+            "records_written": 0,
+            "bytes_written": 0,
+            "acks": 0,
+            "failures": 0,
+            "compactions": 0,
+            "records_compacted": 0,
+            "segments_deleted": 0,
+        }
+        self._replay_stats: Dict[str, Any] = {}
+
+        self.buffer_dir = BUFFER_DIR / f"{SLOT_PREFIX}0"
+        self._slot_lock = None
         self._ensure_buffer_dir()
+        try:
+            self._replay()
+            self._import_legacy_files()
+        except Exception as e:
+            logger.error(f"Failed to replay citation buffer log: {e}")
 
     def _ensure_buffer_dir(self):
-        """Create buffer directory if it doesn't exist."""
+        """Create the buffer directory and claim this process's slot in it."""
         try:
             BUFFER_DIR.mkdir(parents=True, exist_ok=True)
-            logger.info(f"Citation buffer directory: {BUFFER_DIR}")
+            self._claim_slot()
+            logger.info(f"Citation buffer directory: {self.buffer_dir}")
         except Exception as e:
             logger.error(f"Failed to create buffer directory: {e}")
 
-    def _page_path(self, job_id: int, page_num: int) -> Path:
-        """Path to a specific page's buffer file."""
-        return BUFFER_DIR / f"job_{job_id}_page_{page_num}.json"
+    def _claim_slot(self):
+        """Lock the first slot directory no other live process holds (the lock dies with the process)"""
+        n = 0
+        while True:
+            slot_dir = BUFFER_DIR / f"{SLOT_PREFIX}{n}"
+            slot_dir.mkdir(exist_ok=True)
+            lock = open(slot_dir / SLOT_LOCK_FILE, "a")
+            try:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                lock.close()
+                n += 1
+                continue
+            self.buffer_dir = slot_dir
+            self._slot_lock = lock
+            if n == 0:
+                self._adopt_unslotted_segments()
+            return
+
+    def _adopt_unslotted_segments(self):
+        """Move segments written before slots existed (directly under BUFFER_DIR) into slot 0"""
+        for path in BUFFER_DIR.glob(f"{SEGMENT_PREFIX}*{SEGMENT_SUFFIX}"):
+            target = self.buffer_dir / path.name
+            if not target.exists():
+                path.rename(target)
+
+    # ============== LOG I/O ==============
+
+    def _segment_path(self, segment_id: int) -> Path:
+        return self.buffer_dir / f"{SEGMENT_PREFIX}{segment_id:08d}{SEGMENT_SUFFIX}"
+
+    def _open_segment(self):
+        segment = _Segment(self._next_segment_id, self._segment_path(self._next_segment_id), time.time())
+        self._next_segment_id += 1
+        self._file = open(segment.path, "ab")
+        self._segments[segment.id] = segment
+        self._active = segment
+
+    def _seal_active(self):
+        """Close the active segment; it becomes eligible for deletion / compaction"""
+        segment = self._active
+        if segment is None:
+            return
+        try:
+            self._file.close()
+        except Exception:
+            pass
+        self._file = None
+        self._active = None
+        self._release(segment)
+
+    def _writable_segment(self, record_bytes: int) -> _Segment:
+        active = self._active
+        if active is not None and active.size > 0 and (
+            active.size + record_bytes > self.segment_max_bytes
+            or time.time() - active.created_at > self.segment_max_seconds
+        ):
+            self._seal_active()
+            self._open_segment()
+            self._compact_sparse()
+        elif active is None:
+            self._open_segment()
+        return self._active
+
+    def _append(self, rtype: int, record_id: int, payload: bytes = b"") -> Tuple[_Segment, int, int]:
+        """Append one record. Returns (segment, offset, record length)."""
+        record = RECORD_HEADER.pack(len(payload), _checksum(rtype, record_id, payload), rtype, record_id) + payload
+        segment = self._writable_segment(len(record))
+        offset = segment.size
+        try:
+            self._file.write(record)
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+        except Exception:
+            # A partial write can only be this segment's tail - seal it so replay truncates there
+            self._seal_active()
+            raise
+        segment.size += len(record)
+        segment.records += 1
+        self._stats["records_written"] += 1
+        self._stats["bytes_written"] += len(record)
+        return segment, offset, len(record)
+
+    def _read_payload(self, record_id: int, entry: _IndexEntry) -> Dict:
+        """Read and verify a PAGE record through the index"""
+        with open(self._segments[entry.segment_id].path, "rb") as f:
+            f.seek(entry.offset)
+            raw = f.read(entry.length)
+        length, crc, rtype, rid = RECORD_HEADER.unpack_from(raw)
+        payload = raw[RECORD_HEADER.size:]
+        if rid != record_id or rtype != REC_PAGE or len(payload) != length or _checksum(rtype, rid, payload) != crc:
+            raise ValueError(f"record {record_id} failed checksum in segment {entry.segment_id}")
+        return json.loads(payload)
+
+    # ============== INDEX ==============
+
+    def _add_page(self, page: BufferedPage, state: str) -> int:
+        record_id = self._next_record_id
+        self._next_record_id += 1
+
+        data = {name: getattr(page, name) for name in PAGE_FIELDS}
+        data["state"] = state
+        segment, offset, length = self._append(REC_PAGE, record_id, json.dumps(data).encode())
+
+        self._index[record_id] = _IndexEntry(
+            segment_id=segment.id, offset=offset, length=length,
+            job_id=page.job_id, page_num=page.page_num, created_at=page.created_at, state=state,
+            retry_count=page.retry_count, last_error=page.last_error, failed_at=page.failed_at,
+        )
+        segment.live.add(record_id)
+        segment.live_bytes += length
+        if state == STATE_PENDING:
+            self._pending[record_id] = None
+        elif state == STATE_DEAD:
+            self._dead[record_id] = None
+        return record_id
+
+    def _resolve(self, job_id: int, page_num: int, record_id: Optional[int]) -> Optional[int]:
+        if record_id is None:
+            return self._live.get((job_id, page_num))
+        return record_id if record_id in self._index else None
+
+    def _drop(self, record_id: int) -> _Segment:
+        """Remove a record from the index; returns the segment that held it"""
+        entry = self._index.pop(record_id)
+        self._pending.pop(record_id, None)
+        self._dead.pop(record_id, None)
+        key = (entry.job_id, entry.page_num)
+        if self._live.get(key) == record_id:
+            del self._live[key]
+        segment = self._segments[entry.segment_id]
+        segment.live.discard(record_id)
+        segment.live_bytes -= entry.length
+        return segment
+
+    def _tombstone(self, rtype: int, record_id: int, payload: bytes = b"") -> _Segment:
+        """Append a record about an existing page; returns the segment that holds the page"""
+        segment, _, _ = self._append(rtype, record_id, payload)
+        # Read after the append - a roll may have compacted the page forward
+        holder = self._segments[self._index[record_id].segment_id]
+        if holder is not segment:
+            segment.shadows.add(holder.id)
+        return holder
+
+    def _ack(self, record_id: int):
+        self._tombstone(REC_ACK, record_id)
+        self._release(self._drop(record_id))
+        self._stats["acks"] += 1
+
+    def _release(self, segment: _Segment):
+        """Delete a sealed segment once nothing in it (or shadowed by it) is live"""
+        if segment is self._active or segment.live or segment.id not in self._segments:
+            return
+        if any(older in self._segments for older in segment.shadows):
+            return
+        try:
+            segment.path.unlink(missing_ok=True)
+        except OSError as e:
+            logger.error(f"Failed to delete buffer segment {segment.path.name}: {e}")
+            return
+        del self._segments[segment.id]
+        self._stats["segments_deleted"] += 1
+        for other in list(self._segments.values()):
+            if segment.id in other.shadows:
+                other.shadows.discard(segment.id)
+                self._release(other)
+
+    # ============== COMPACTION ==============
+
+    def _compact_sparse(self) -> int:
+        """Copy live records out of mostly-dead sealed segments. Returns records moved."""
+        if self._compacting:
+            return 0
+        self._compacting = True
+        moved = 0
+        try:
+            for segment in list(self._segments.values()):
+                if segment is self._active or not segment.live or segment.id not in self._segments:
+                    continue
+                if segment.live_bytes >= segment.size * COMPACT_LIVE_RATIO:
+                    continue
+                try:
+                    moved += self._compact_segment(segment)
+                except Exception as e:
+                    logger.error(f"Failed to compact buffer segment {segment.path.name}: {e}")
+        finally:
+            self._compacting = False
+        return moved
+
+    def _compact_segment(self, segment: _Segment) -> int:
+        moved = 0
+        for record_id in sorted(segment.live):
+            entry = self._index[record_id]
+            data = self._read_payload(record_id, entry)
+            data.update(state=entry.state, retry_count=entry.retry_count,
+                        last_error=entry.last_error, failed_at=entry.failed_at)
+            target, offset, length = self._append(REC_PAGE, record_id, json.dumps(data).encode())
+            target.shadows.add(segment.id)
+
+            segment.live.discard(record_id)
+            segment.live_bytes -= entry.length
+            entry.segment_id, entry.offset, entry.length = target.id, offset, length
+            target.live.add(record_id)
+            target.live_bytes += length
+            moved += 1
+
+        self._stats["compactions"] += 1
+        self._stats["records_compacted"] += moved
+        logger.info(f"Compacted buffer segment {segment.path.name}: moved {moved} live pages")
+        self._release(segment)
+        return moved
+
+    # ============== REPLAY ==============
+
+    def _replay(self):
+        """Rebuild the index from the segments on disk"""
+        start = time.monotonic()
+        records = 0
+        truncated = 0
+        seen: Dict[int, int] = {}  # record id -> segment of its latest PAGE copy (acked or not)
+
+        for path in sorted(self.buffer_dir.glob(f"{SEGMENT_PREFIX}*{SEGMENT_SUFFIX}")):
+            try:
+                segment_id = int(path.stem[len(SEGMENT_PREFIX):])
+            except ValueError:
+                continue
+            segment = _Segment(segment_id, path, path.stat().st_mtime)
+            self._segments[segment_id] = segment
+            self._next_segment_id = max(self._next_segment_id, segment_id + 1)
+
+            data = path.read_bytes()
+            offset = 0
+            while offset < len(data):
+                if offset + RECORD_HEADER.size > len(data):
+                    break
+                length, crc, rtype, record_id = RECORD_HEADER.unpack_from(data, offset)
+                end = offset + RECORD_HEADER.size + length
+                payload = data[offset + RECORD_HEADER.size:end]
+                if end > len(data) or _checksum(rtype, record_id, payload) != crc:
+                    break
+                self._replay_record(segment, rtype, record_id, payload, offset, end - offset, seen)
+                self._next_record_id = max(self._next_record_id, record_id + 1)
+                segment.size = end
+                segment.records += 1
+                records += 1
+                offset = end
+
+            if segment.size < len(data):
+                # Torn write (crash mid-append) or corruption - drop everything after the last good record
+                truncated += 1
+                logger.warning(f"Truncating buffer segment {path.name} at byte {segment.size} "
+                               f"({len(data) - segment.size} bytes unreadable)")
+                with open(path, "r+b") as f:
+                    f.truncate(segment.size)
+
+        recovered = 0
+        for record_id, entry in self._index.items():
+            if entry.state == STATE_IN_PROGRESS:
+                # Buffered by a previous process but never acked - the write may not have happened
+                entry.state = STATE_PENDING
+                self._pending[record_id] = None
+                recovered += 1
+
+        for segment in list(self._segments.values()):
+            self._release(segment)
+
+        self._replay_stats = {
+            "segments": len(self._segments),
+            "records": records,
+            "torn_tails_truncated": truncated,
+            "recovered_pages": recovered,
+            "ms": round((time.monotonic() - start) * 1000, 1),
+        }
+        if records:
+            logger.info(f"Replayed citation buffer log: {records} records, {len(self._index)} live pages "
+                        f"({recovered} unacked pages queued for retry)")
+
+    def _replay_record(self, segment: _Segment, rtype: int, record_id: int, payload: bytes,
+                       offset: int, length: int, seen: Dict[int, int]):
+        previous = seen.get(record_id)
+        if previous is not None and previous != segment.id:
+            segment.shadows.add(previous)
+
+        if rtype == REC_PAGE:
+            data = json.loads(payload)
+            if record_id in self._index:
+                self._drop(record_id)  # Superseded by a compacted copy
+            self._index[record_id] = _IndexEntry(
+                segment_id=segment.id, offset=offset, length=length,
+                job_id=data["job_id"], page_num=data["page_num"], created_at=data["created_at"],
+                state=data.get("state", STATE_PENDING), retry_count=data.get("retry_count", 0),
+                last_error=data.get("last_error"), failed_at=data.get("failed_at"),
+            )
+            segment.live.add(record_id)
+            segment.live_bytes += length
+            if data.get("state") == STATE_DEAD:
+                self._dead[record_id] = None
+            elif data.get("state") == STATE_PENDING:
+                self._pending[record_id] = None
+            seen[record_id] = segment.id
+            return
+
+        entry = self._index.get(record_id)
+        if entry is None:
+            return
+        if rtype == REC_ACK:
+            self._drop(record_id)
+        elif rtype == REC_FAIL:
+            data = json.loads(payload)
+            entry.retry_count = data["retry_count"]
+            entry.last_error = data.get("last_error")
+            entry.failed_at = data.get("failed_at")
+            entry.state = STATE_PENDING
+            self._pending[record_id] = None
+        elif rtype == REC_DEAD:
+            entry.state = STATE_DEAD
+            self._pending.pop(record_id, None)
+            self._dead[record_id] = None
+
+    def _import_legacy_files(self):
+        """One-time import of per-page JSON files written by the previous buffer format (slot 0 only)"""
+        if self.buffer_dir != BUFFER_DIR / f"{SLOT_PREFIX}0":
+            return
+        legacy = [(p, STATE_PENDING) for p in BUFFER_DIR.glob("job_*.json")]
+        legacy += [(p, STATE_PENDING) for p in (BUFFER_DIR / "failed").glob("job_*.json")]
+        legacy += [(p, STATE_DEAD) for p in (BUFFER_DIR / "permanent_failed").glob("job_*.json")]
+        if not legacy:
+            return
+
+        imported = 0
+        for path, state in legacy:
+            try:
+                with open(path, 'r') as f:
+                    data = json.load(f)
+                self._add_page(BufferedPage(**{k: v for k, v in data.items() if k in PAGE_FIELDS}), state)
+                path.unlink()
+                imported += 1
+            except Exception as e:
+                logger.error(f"Failed to import legacy buffer file {path}: {e}")
+        logger.info(f"Imported {imported} legacy buffer files into the citation buffer log")
 
-    def _failed_dir(self) -> Path:
-        """Directory for failed saves that need retry."""
-        failed_dir = BUFFER_DIR / "failed"
-        failed_dir.mkdir(exist_ok=True)
-        return failed_dir
+    # ============== PUBLIC API ==============
 
     def save_page(
         self,
@@ -97,6 +548,11 @@ class CitationBuffer:
         Returns True if saved successfully.
         """
         try:
+            # Re-buffering the same page replaces it
+            previous = self._live.get((job_id, page_num))
+            if previous is not None:
+                self._ack(previous)
+
             buffered = BufferedPage(
                 job_id=job_id,
                 paper_id=paper_id,
@@ -106,10 +562,7 @@ class CitationBuffer:
                 papers=papers,
                 created_at=datetime.utcnow().isoformat(),
             )
-
-            path = self._page_path(job_id, page_num)
-            with open(path, 'w') as f:
-                json.dump(asdict(buffered), f)
+            self._live[(job_id, page_num)] = self._add_page(buffered, STATE_IN_PROGRESS)
 
             logger.debug(f"Buffered page {page_num} for job {job_id}: {len(papers)} papers")
             return True
@@ -118,54 +571,47 @@ class CitationBuffer:
             logger.error(f"Failed to buffer page {page_num} for job {job_id}: {e}")
             return False
 
-    def mark_saved(self, job_id: int, page_num: int) -> bool:
+    def mark_saved(self, job_id: int, page_num: int, record_id: Optional[int] = None) -> bool:
         """
-        Mark a page as successfully saved to DB.
-        Removes it from the buffer.
+        Mark a page as successfully saved to DB (appends an ACK record).
+        Pages returned by get_pending_pages are identified by their record_id.
         """
         try:
-            path = self._page_path(job_id, page_num)
-            if path.exists():
-                path.unlink()
-                logger.debug(f"Removed buffer for job {job_id} page {page_num} (saved to DB)")
-
-            # Also check failed dir
-            failed_path = self._failed_dir() / f"job_{job_id}_page_{page_num}.json"
-            if failed_path.exists():
-                failed_path.unlink()
-
+            record_id = self._resolve(job_id, page_num, record_id)
+            if record_id is not None:
+                self._ack(record_id)
+                logger.debug(f"Acked buffer for job {job_id} page {page_num} (saved to DB)")
             return True
         except Exception as e:
-            logger.error(f"Failed to remove buffer for job {job_id} page {page_num}: {e}")
+            logger.error(f"Failed to ack buffer for job {job_id} page {page_num}: {e}")
             return False
 
-    def mark_failed(self, job_id: int, page_num: int, error: str) -> bool:
+    def mark_failed(self, job_id: int, page_num: int, error: str, record_id: Optional[int] = None) -> bool:
         """
         Mark a page as failed to save to DB.
-        Moves it to the failed directory for retry.
+        Appends a FAIL record; the page is returned by get_pending_pages for retry.
         """
         try:
-            path = self._page_path(job_id, page_num)
-            if not path.exists():
+            record_id = self._resolve(job_id, page_num, record_id)
+            if record_id is None:
                 logger.warning(f"No buffer found for job {job_id} page {page_num}")
                 return False
 
-            # Load, update, and move to failed dir
-            with open(path, 'r') as f:
-                data = json.load(f)
-
-            data['retry_count'] = data.get('retry_count', 0) + 1
-            data['last_error'] = error
-            data['failed_at'] = datetime.utcnow().isoformat()
-
-            failed_path = self._failed_dir() / f"job_{job_id}_page_{page_num}.json"
-            with open(failed_path, 'w') as f:
-                json.dump(data, f)
-
-            # Remove from main buffer
-            path.unlink()
-
-            logger.warning(f"Marked page {page_num} for job {job_id} as failed (retry #{data['retry_count']}): {error[:100]}")
+            entry = self._index[record_id]
+            retry_count = entry.retry_count + 1
+            failed_at = datetime.utcnow().isoformat()
+            payload = json.dumps({"retry_count": retry_count, "last_error": error, "failed_at": failed_at})
+            self._tombstone(REC_FAIL, record_id, payload.encode())
+
+            entry.retry_count, entry.last_error, entry.failed_at = retry_count, error, failed_at
+            entry.state = STATE_PENDING
+            self._pending[record_id] = None
+            key = (job_id, page_num)
+            if self._live.get(key) == record_id:
+                del self._live[key]
+            self._stats["failures"] += 1
+
+            logger.warning(f"Marked page {page_num} for job {job_id} as failed (retry #{retry_count}): {error[:100]}")
             return True
 
         except Exception as e:
@@ -175,51 +621,71 @@ class CitationBuffer:
     def get_pending_pages(self, max_retries: int = 5) -> List[BufferedPage]:
         """
         Get all pages that failed to save and need retry.
-        Filters out pages that have exceeded max_retries.
+        Pages that have exceeded max_retries are moved to permanent failures.
         """
-        pending = []
-        try:
-            failed_dir = self._failed_dir()
-            for path in failed_dir.glob("job_*.json"):
-                try:
-                    with open(path, 'r') as f:
-                        data = json.load(f)
-
-                    if data.get('retry_count', 0) >= max_retries:
-                        # Move to permanent failed (don't retry anymore)
-                        permanent_dir = BUFFER_DIR / "permanent_failed"
-                        permanent_dir.mkdir(exist_ok=True)
-                        path.rename(permanent_dir / path.name)
-                        logger.warning(f"Page exceeded max retries, moved to permanent_failed: {path.name}")
-                        continue
-
-                    pending.append(BufferedPage(**data))
-
-                except Exception as e:
-                    logger.error(f"Failed to load buffer file {path}: {e}")
-
-            logger.info(f"Found {len(pending)} pending pages to retry")
-            return pending
-
-        except Exception as e:
-            logger.error(f"Failed to get pending pages: {e}")
+        if not self._pending:
             return []
 
+        pending = []
+        for record_id in list(self._pending):
+            entry = self._index[record_id]
+            try:
+                if entry.retry_count >= max_retries:
+                    self._tombstone(REC_DEAD, record_id)
+                    entry.state = STATE_DEAD
+                    del self._pending[record_id]
+                    self._dead[record_id] = None
+                    logger.warning(f"Page exceeded max retries, moved to permanent_failed: "
+                                   f"job {entry.job_id} page {entry.page_num}")
+                    continue
+
+                data = self._read_payload(record_id, entry)
+                page = BufferedPage(**{k: v for k, v in data.items() if k in PAGE_FIELDS})
+                page.retry_count, page.last_error, page.failed_at = entry.retry_count, entry.last_error, entry.failed_at
+                page.record_id = record_id
+                pending.append(page)
+
+            except Exception as e:
+                logger.error(f"Failed to load buffered page record {record_id}: {e}")
+
+        logger.info(f"Found {len(pending)} pending pages to retry")
+        return pending
+
     def get_buffer_stats(self) -> Dict:
-        """Get statistics about the buffer."""
+        """Get statistics about the buffer and its log segments."""
         try:
-            # Count files in each directory
-            main_count = len(list(BUFFER_DIR.glob("job_*.json")))
-            failed_count = len(list(self._failed_dir().glob("job_*.json")))
-
-            permanent_dir = BUFFER_DIR / "permanent_failed"
-            permanent_count = len(list(permanent_dir.glob("job_*.json"))) if permanent_dir.exists() else 0
-
+            now = time.time()
+            segments = list(self._segments.values())
             return {
-                "in_progress": main_count,
-                "failed_pending_retry": failed_count,
-                "permanent_failed": permanent_count,
-                "buffer_dir": str(BUFFER_DIR),
+                "in_progress": len(self._index) - len(self._pending) - len(self._dead),
+                "failed_pending_retry": len(self._pending),
+                "permanent_failed": len(self._dead),
+                "buffer_dir": str(self.buffer_dir),
+                "log": {
+                    "segments": len(segments),
+                    "active_segment": self._active.id if self._active else None,
+                    "total_bytes": sum(s.size for s in segments),
+                    "live_bytes": sum(s.live_bytes for s in segments),
+                    "live_records": len(self._index),
+                    "segment_max_bytes": self.segment_max_bytes,
+                    "segment_max_seconds": self.segment_max_seconds,
+                    "fsync": self.fsync,
+                    **self._stats,
+                    "replay": self._replay_stats,
+                    "per_segment": [
+                        {
+                            "id": s.id,
+                            "bytes": s.size,
+                            "records": s.records,
+                            "live_records": len(s.live),
+                            "live_ratio": round(s.live_bytes / s.size, 3) if s.size else 0,
+                            "sealed": s is not self._active,
+                            "pinned_by_older": sorted(o for o in s.shadows if o in self._segments),
+                            "age_seconds": round(now - s.created_at),
+                        }
+                        for s in segments[:50]
+                    ],
+                },
             }
         except Exception as e:
             logger.error(f"Failed to get buffer stats: {e}")
@@ -227,22 +693,24 @@ class CitationBuffer:
 
     def cleanup_old_buffers(self, max_age_hours: int = 24) -> int:
         """
-        Remove buffer files older than max_age_hours.
-        Returns count of removed files.
+        Drop buffered pages older than max_age_hours, then delete / compact
+        segments that no longer hold live records.
+        Returns count of removed pages.
         """
         removed = 0
         try:
-            cutoff = datetime.utcnow().timestamp() - (max_age_hours * 3600)
-
-            for path in BUFFER_DIR.rglob("job_*.json"):
-                try:
-                    if path.stat().st_mtime < cutoff:
-                        path.unlink()
-                        removed += 1
-                except Exception:
-                    pass
-
-            logger.info(f"Cleaned up {removed} old buffer files")
+            cutoff = (datetime.utcnow() - timedelta(hours=max_age_hours)).isoformat()
+            for record_id, entry in list(self._index.items()):
+                if entry.created_at < cutoff:
+                    self._ack(record_id)
+                    removed += 1
+
+            # An idle active segment only rolls on the next write - seal it if nothing in it is live
+            if self._active is not None and not self._active.live:
+                self._seal_active()
+            self._compact_sparse()
+
+            logger.info(f"Cleaned up {removed} old buffered pages ({len(self._segments)} segments remain)")
             return removed
 
         except Exception as e:
@@ -258,7 +726,12 @@ def get_buffer() -> CitationBuffer:
     """Get the global citation buffer instance."""
     global _buffer
     if _buffer is None:
-        _buffer = CitationBuffer()
+        settings = get_settings()
+        _buffer = CitationBuffer(
+            segment_max_bytes=settings.citation_buffer_segment_mb * 1024 * 1024,
+            segment_max_seconds=settings.citation_buffer_segment_minutes * 60,
+            fsync=settings.citation_buffer_fsync,
+        )
     return _buffer
 
 
@@ -283,10 +756,10 @@ async def retry_failed_saves():
     for page in pending:
         try:
             await save_buffered_citations(page)
-            buffer.mark_saved(page.job_id, page.page_num)
+            buffer.mark_saved(page.job_id, page.page_num, record_id=page.record_id)
             success_count += 1
         except Exception as e:
-            buffer.mark_failed(page.job_id, page.page_num, str(e))
+            buffer.mark_failed(page.job_id, page.page_num, str(e), record_id=page.record_id)
             logger.warning(f"Retry failed for job {page.job_id} page {page.page_num}: {e}")
 
         # Small delay between retries to avoid overwhelming DB
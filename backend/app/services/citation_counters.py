@@ -0,0 +1,253 @@
+"""
+Citation Counters - delta-maintained harvested-citation totals
+
+editions.harvested_citation_count, papers.total_harvested_citations and
+thinkers.total_citations used to be recomputed with COUNT(*) / COUNT(DISTINCT)
+over citations while harvesting - for big thinkers that scanned hundreds of
+thousands of rows per page saved. Now whoever inserts citations adds the number
+of rows it actually inserted (RETURNING xmax = 0 for upserts) in the same
+transaction, via apply_citation_deltas().
+
+Totals:
+- edition: citations whose edition_id is the edition
+- paper: citations whose paper_id is the paper
+- thinker: citations of the thinker's accepted works (a paper linked by two
+  works of the same thinker counts once)
+
+Code that deletes or moves citations (dedupe, edition merges) doesn't adjust
+the counters, so a reconciler recomputes the ground truth every
+citation_counter_reconcile_minutes, reports drift and (with
+citation_counter_reconcile_fix) corrects it.
+"""
+import asyncio
+import logging
+import sys
+import time
+from datetime import datetime
+from typing import Optional, Dict, Any, Tuple
+
+from sqlalchemy import bindparam, func, select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config import get_settings
+from ..models import Edition, Paper, Thinker, ThinkerWork
+
+logger = logging.getLogger(__name__)
+
+
+def log_now(msg: str, level: str = "info"):
+    """Log message and immediately flush to stdout"""
+    timestamp = datetime.utcnow().strftime("%H:%M:%S")
+    print(f"{timestamp} | citation_counters | {level.upper()} | {msg}", flush=True)
+    sys.stdout.flush()
+
+
+RECONCILE_STARTUP_DELAY = 300  # Let startup (migrations, auto-resume backfill) settle first
+DRIFT_EXAMPLES = 10
+
+
+# ============== DELTAS ==============
+
+_editions = Edition.__table__
+_papers = Paper.__table__
+_thinkers = Thinker.__table__
+
+_EDITION_DELTA = (
+    update(_editions)
+    .where(_editions.c.id == bindparam("b_id"))
+    .values(harvested_citation_count=func.coalesce(_editions.c.harvested_citation_count, 0) + bindparam("b_delta"))
+)
+_PAPER_DELTA = (
+    update(_papers)
+    .where(_papers.c.id == bindparam("b_id"))
+    .values(total_harvested_citations=func.coalesce(_papers.c.total_harvested_citations, 0) + bindparam("b_delta"))
+)
+_THINKER_DELTA = (
+    update(_thinkers)
+    .where(_thinkers.c.id == bindparam("b_id"))
+    .values(total_citations=func.coalesce(_thinkers.c.total_citations, 0) + bindparam("b_delta"))
+)
+
+
+async def apply_citation_deltas(db: AsyncSession, inserted: Dict[Tuple[int, Optional[int]], int]):
+    """
+    Add newly inserted citation counts to the edition, paper and thinker totals.
+
+    inserted maps (paper_id, edition_id) -> rows actually inserted. Call it in the
+    transaction that inserted them; does not commit. Rows are updated in id order
+    so concurrent writers can't deadlock on each other.
+    """
+    by_edition: Dict[int, int] = {}
+    by_paper: Dict[int, int] = {}
+    for (paper_id, edition_id), count in inserted.items():
+        if count <= 0:
+            continue
+        by_paper[paper_id] = by_paper.get(paper_id, 0) + count
+        if edition_id is not None:
+            by_edition[edition_id] = by_edition.get(edition_id, 0) + count
+    if not by_paper:
+        return
+
+    if by_edition:
+        await db.execute(_EDITION_DELTA, [{"b_id": k, "b_delta": v} for k, v in sorted(by_edition.items())])
+    await db.execute(_PAPER_DELTA, [{"b_id": k, "b_delta": v} for k, v in sorted(by_paper.items())])
+
+    result = await db.execute(
+        select(ThinkerWork.thinker_id, ThinkerWork.paper_id)
+        .where(ThinkerWork.paper_id.in_(list(by_paper)), ThinkerWork.decision == "accepted")
+        .distinct()
+    )
+    by_thinker: Dict[int, int] = {}
+    for thinker_id, paper_id in result.all():
+        by_thinker[thinker_id] = by_thinker.get(thinker_id, 0) + by_paper[paper_id]
+    if by_thinker:
+        await db.execute(_THINKER_DELTA, [{"b_id": k, "b_delta": v} for k, v in sorted(by_thinker.items())])
+
+
+# ============== RECONCILIATION ==============
+
+# Each query yields (id, stored, actual) for counters that differ from the ground truth
+_TRUTH = {
+    "editions": """
+        SELECT e.id, COALESCE(e.harvested_citation_count, 0) AS stored, COALESCE(c.n, 0) AS actual
+        FROM editions e
+        LEFT JOIN (SELECT edition_id, count(*) AS n FROM citations
+                   WHERE edition_id IS NOT NULL GROUP BY edition_id) c ON c.edition_id = e.id
+        WHERE COALESCE(e.harvested_citation_count, 0) <> COALESCE(c.n, 0)
+    """,
+    "papers": """
+        SELECT p.id, COALESCE(p.total_harvested_citations, 0) AS stored, COALESCE(c.n, 0) AS actual
+        FROM papers p
+        LEFT JOIN (SELECT paper_id, count(*) AS n FROM citations GROUP BY paper_id) c ON c.paper_id = p.id
+        WHERE COALESCE(p.total_harvested_citations, 0) <> COALESCE(c.n, 0)
+    """,
+    "thinkers": """
+        SELECT t.id, COALESCE(t.total_citations, 0) AS stored, COALESCE(c.n, 0) AS actual
+        FROM thinkers t
+        LEFT JOIN (SELECT tw.thinker_id, count(DISTINCT ci.id) AS n
+                   FROM thinker_works tw JOIN citations ci ON ci.paper_id = tw.paper_id
+                   WHERE tw.decision = 'accepted' GROUP BY tw.thinker_id) c ON c.thinker_id = t.id
+        WHERE COALESCE(t.total_citations, 0) <> COALESCE(c.n, 0)
+    """,
+}
+_COLUMNS = {
+    "editions": "harvested_citation_count",
+    "papers": "total_harvested_citations",
+    "thinkers": "total_citations",
+}
+
+
+def _fix_sql(table: str) -> str:
+    # Only rows still holding the value we compared: if a writer added a delta
+    # after our snapshot, the row is left for the next run instead of losing it
+    column = _COLUMNS[table]
+    return f"""
+        WITH truth AS ({_TRUTH[table]})
+        UPDATE {table} SET {column} = truth.actual
+        FROM truth
+        WHERE {table}.id = truth.id AND COALESCE({table}.{column}, 0) = truth.stored
+        RETURNING {table}.id, truth.stored, truth.actual
+    """
+
+
+class CounterReconciler:
+    """Checks the counters against COUNT(*) ground truth and reports drift"""
+
+    def __init__(self, interval_minutes: int, fix: bool):
+        self.interval_minutes = interval_minutes
+        self.fix = fix
+        self._stats = {"runs": 0, "errors": 0, "rows_fixed": 0}
+        self._last_report: Optional[Dict[str, Any]] = None
+
+    async def reconcile(self, fix: Optional[bool] = None) -> Dict[str, Any]:
+        """One pass over editions, papers and thinkers. Returns the drift report."""
+        from ..database import async_session
+
+        fix = self.fix if fix is None else fix
+        start = time.monotonic()
+        report: Dict[str, Any] = {"at": datetime.utcnow().isoformat(), "fixed": fix}
+        async with async_session() as db:
+            for table in ("editions", "papers", "thinkers"):
+                sql = _fix_sql(table) if fix else _TRUTH[table]
+                rows = (await db.execute(text(sql))).all()
+                rows.sort(key=lambda r: abs(r[2] - r[1]), reverse=True)
+                report[table] = {
+                    "drifted": len(rows),
+                    "net_drift": sum(r[1] - r[2] for r in rows),  # stored - actual: > 0 means overcounted
+                    "abs_drift": sum(abs(r[1] - r[2]) for r in rows),
+                    "examples": [{"id": r[0], "stored": r[1], "actual": r[2]} for r in rows[:DRIFT_EXAMPLES]],
+                }
+                if fix:
+                    self._stats["rows_fixed"] += len(rows)
+            await db.commit()
+
+        report["duration_ms"] = round((time.monotonic() - start) * 1000)
+        self._stats["runs"] += 1
+        self._last_report = report
+
+        drifted = {t: report[t]["drifted"] for t in ("editions", "papers", "thinkers")}
+        if any(drifted.values()):
+            log_now(f"Counter drift ({'fixed' if fix else 'not fixed'}): " +
+                    ", ".join(f"{t} {n} rows / {report[t]['abs_drift']} citations" for t, n in drifted.items()) +
+                    f" in {report['duration_ms']}ms", "warn")
+        else:
+            log_now(f"Counters match ground truth ({report['duration_ms']}ms)")
+        return report
+
+    async def run(self):
+        from ..database import bind_db_role
+        bind_db_role("maintenance")
+        await asyncio.sleep(RECONCILE_STARTUP_DELAY)
+        while True:
+            try:
+                await self.reconcile()
+            except Exception as e:
+                self._stats["errors"] += 1
+                log_now(f"Reconciliation failed: {e}", "error")
+            await asyncio.sleep(self.interval_minutes * 60)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "interval_minutes": self.interval_minutes,
+            "fix": self.fix,
+            "last_report": self._last_report,
+        }
+
+
+# Singleton instance
+_reconciler: Optional[CounterReconciler] = None
+
+
+def get_counter_reconciler() -> CounterReconciler:
+    """Get the process-wide counter reconciler"""
+    global _reconciler
+    if _reconciler is None:
+        settings = get_settings()
+        _reconciler = CounterReconciler(
+            interval_minutes=settings.citation_counter_reconcile_minutes,
+            fix=settings.citation_counter_reconcile_fix,
+        )
+    return _reconciler
+
+
+# Background reconciliation task
+_reconcile_task = None
+
+async def start_counter_reconciler():
+    """Start the periodic counter reconciliation"""
+    global _reconcile_task
+    _reconcile_task = asyncio.create_task(get_counter_reconciler().run())
+    logger.info("Citation counter reconciler started")
+
+
+async def stop_counter_reconciler():
+    """Stop the periodic counter reconciliation"""
+    global _reconcile_task
+    if _reconcile_task:
+        _reconcile_task.cancel()
+        try:
+            await _reconcile_task
+        except asyncio.CancelledError:
+            pass
+        _reconcile_task = None
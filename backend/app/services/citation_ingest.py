@@ -0,0 +1,446 @@
+"""
+Citation Ingestion - write-behind stage between scraping and the database
+
+Scrapers used to wait on the remote DB inside on_page_complete after every page.
+Now a page is buffered locally (CitationBuffer), put on a bounded in-process
+queue, and the scraper moves on. One writer task drains the queue, coalescing
+pages from ALL running jobs into multi-row upserts.
+
+- Backpressure: submit() only blocks when the queue is full (DB far behind)
+- Acks: each page gets a future resolved after its batch commits, and an
+  optional on_ack callback run (in page order per job) after the commit - use it
+  to advance resume state / progress only once the write is durable
+- Failures: a failed batch is retried page by page; pages that still fail are
+  marked failed in CitationBuffer (retried later) and their ack raises
+- Counters: each batch adds its truly inserted rows to the edition / paper /
+  thinker citation totals in the same transaction (citation_counters.py)
+
+get_cited_by() waits for the acks of its pages before returning, so anything
+computed from its result (HarvestTarget counts, partition completion) reflects
+durable writes.
+"""
+import asyncio
+import logging
+import sys
+import time
+from collections import deque
+from datetime import datetime
+from typing import Optional, Dict, Any, List, Tuple, Callable, Awaitable
+
+from sqlalchemy import literal_column
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config import get_settings
+from ..models import Citation
+from .citation_counters import apply_citation_deltas
+
+logger = logging.getLogger(__name__)
+
+
+def log_now(msg: str, level: str = "info"):
+    """Log message and immediately flush to stdout"""
+    timestamp = datetime.utcnow().strftime("%H:%M:%S")
+    print(f"{timestamp} | ingest | {level.upper()} | {msg}", flush=True)
+    sys.stdout.flush()
+
+
+UPSERT_CHUNK_ROWS = 1000  # 13 params per row - stays well under asyncpg's 32767 bind limit
+
+
+# ============== BULK UPSERT ==============
+
+
+def citation_row(paper_id: int, edition_id: Optional[int], paper_data: Dict, now: datetime) -> Dict[str, Any]:
+    """Citation insert values for one scraped paper dict (camelCase keys from the parser)"""
+    return {
+        "paper_id": paper_id,
+        "edition_id": edition_id,  # May differ from the harvested edition for merged editions
+        "scholar_id": paper_data.get("scholarId"),
+        "title": paper_data.get("title", "Unknown"),
+        "authors": paper_data.get("authorsRaw"),
+        "year": paper_data.get("year"),
+        "venue": paper_data.get("venue"),
+        "abstract": paper_data.get("abstract"),
+        "link": paper_data.get("link"),
+        "citation_count": paper_data.get("citationCount", 0),
+        "intersection_count": 1,
+        "encounter_count": 1,
+        "created_at": now,  # MUST set explicitly for pg_insert (ORM defaults don't apply)
+    }
+
+
+async def upsert_citation_rows(db: AsyncSession, rows: List[Dict[str, Any]]) -> Dict[Tuple[int, str], bool]:
+    """
+    Upsert citation rows with one INSERT ... ON CONFLICT (paper_id, scholar_id)
+    DO UPDATE per chunk. Conflicts bump encounter_count.
+
+    Rows must be unique on (paper_id, scholar_id) - Postgres rejects updating the
+    same row twice in one statement. Does not commit.
+
+    Returns {(paper_id, scholar_id): inserted} where inserted comes from
+    RETURNING (xmax = 0): True for a new row, False for a duplicate encounter.
+    """
+    outcome = {}
+    for start in range(0, len(rows), UPSERT_CHUNK_ROWS):
+        stmt = pg_insert(Citation).values(rows[start:start + UPSERT_CHUNK_ROWS])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['paper_id', 'scholar_id'],
+            set_={'encounter_count': Citation.encounter_count + 1}
+        ).returning(Citation.paper_id, Citation.scholar_id, literal_column("(xmax = 0)").label("inserted"))
+
+        result = await db.execute(stmt)
+        for paper_id, scholar_id, inserted in result.all():
+            outcome[(paper_id, scholar_id)] = inserted
+    return outcome
+
+
+async def bulk_upsert_citations(
+    db: AsyncSession,
+    paper_id: int,
+    edition_id: Optional[int],
+    papers: List[Dict],
+) -> Tuple[List[str], List[str]]:
+    """
+    Upsert a page of citations in one statement. Entries without a scholarId are
+    skipped; repeats within the page are collapsed. Adds the inserted rows to the
+    citation counters. Does not commit.
+
+    Returns (inserted_scholar_ids, duplicate_scholar_ids).
+    """
+    now = datetime.utcnow()
+    rows = {}
+    for paper_data in papers:
+        if isinstance(paper_data, dict) and paper_data.get("scholarId") and paper_data["scholarId"] not in rows:
+            rows[paper_data["scholarId"]] = citation_row(paper_id, edition_id, paper_data, now)
+
+    outcome = await upsert_citation_rows(db, list(rows.values()))
+    inserted = [sid for (_, sid), was_inserted in outcome.items() if was_inserted]
+    duplicates = [sid for (_, sid), was_inserted in outcome.items() if not was_inserted]
+    await apply_citation_deltas(db, {(paper_id, edition_id): len(inserted)})
+    return inserted, duplicates
+
+
+# ============== INGEST QUEUE ==============
+
+
+class PageAck:
+    """Result of a durable page write"""
+
+    def __init__(self, inserted: List[str], duplicates: List[str]):
+        self.inserted = inserted
+        self.duplicates = duplicates
+
+    @property
+    def new_count(self) -> int:
+        return len(self.inserted)
+
+
+class IngestPage:
+    """A scraped page waiting for the writer"""
+
+    def __init__(self, job_id: int, paper_id: int, edition_id: Optional[int], page_num: int,
+                 papers: List[Dict], on_ack: Optional[Callable[["PageAck"], Awaitable[None]]],
+                 buffer_key: Optional[int]):
+        self.job_id = job_id
+        self.paper_id = paper_id
+        self.edition_id = edition_id
+        self.page_num = page_num
+        self.papers = papers
+        self.on_ack = on_ack
+        self.buffer_key = buffer_key  # CitationBuffer page key to clear after the write
+        self.ack: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.enqueued_at = time.monotonic()
+
+
+class CitationIngestQueue:
+    """Bounded page queue + a single batching writer task"""
+
+    def __init__(self, max_pages: int, batch_max_pages: int, batch_wait_seconds: float):
+        self.max_pages = max(max_pages, 1)
+        self.batch_max_pages = max(batch_max_pages, 1)
+        self.batch_wait = batch_wait_seconds
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        self._pending: Dict[int, set] = {}  # job_id -> unacked futures
+
+        self._stats = {
+            "pages_submitted": 0,
+            "pages_written": 0,
+            "pages_failed": 0,
+            "rows_written": 0,
+            "rows_inserted": 0,
+            "batches": 0,
+            "batch_retries": 0,
+            "backpressure_waits": 0,
+            "max_queue_depth": 0,
+        }
+        self._batch_ms = deque(maxlen=200)
+        self._ack_ms = deque(maxlen=500)  # Enqueue -> durable ack
+        self._backpressure_s = 0.0
+
+    def _ensure_writer(self):
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_pages)
+        if self._writer_task is None or self._writer_task.done():
+            self._writer_task = asyncio.create_task(self._writer_loop())
+
+    async def submit(
+        self,
+        job_id: int,
+        paper_id: int,
+        edition_id: Optional[int],
+        page_num: int,
+        papers: List[Dict],
+        on_ack: Optional[Callable[[PageAck], Awaitable[None]]] = None,
+        buffer_key: Optional[int] = None,
+    ) -> asyncio.Future:
+        """
+        Queue a page for writing. Blocks only while the queue is full.
+
+        Returns a future resolving to PageAck once the page is committed (and
+        on_ack has run), or raising if the write failed.
+        """
+        self._ensure_writer()
+        page = IngestPage(job_id, paper_id, edition_id, page_num, papers, on_ack, buffer_key)
+
+        if self._queue.full():
+            self._stats["backpressure_waits"] += 1
+            start = time.monotonic()
+            await self._queue.put(page)
+            self._backpressure_s += time.monotonic() - start
+        else:
+            self._queue.put_nowait(page)
+
+        self._stats["pages_submitted"] += 1
+        self._stats["max_queue_depth"] = max(self._stats["max_queue_depth"], self._queue.qsize())
+
+        pending = self._pending.setdefault(job_id, set())
+        pending.add(page.ack)
+        page.ack.add_done_callback(lambda f: self._forget(job_id, f))
+        return page.ack
+
+    def _forget(self, job_id: int, fut: asyncio.Future):
+        pending = self._pending.get(job_id)
+        if pending is not None:
+            pending.discard(fut)
+            if not pending:
+                del self._pending[job_id]
+
+    async def drain(self, job_id: Optional[int] = None):
+        """Wait until every queued page (for one job, or all) is acked"""
+        if job_id is None:
+            futures = [f for pending in self._pending.values() for f in pending]
+        else:
+            futures = list(self._pending.get(job_id, ()))
+        if futures:
+            await asyncio.gather(*futures, return_exceptions=True)
+
+    async def _collect_batch(self) -> List[IngestPage]:
+        batch = [await self._queue.get()]
+        deadline = time.monotonic() + self.batch_wait
+        while len(batch) < self.batch_max_pages:
+            try:
+                batch.append(self._queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _write_pages(self, pages: List[IngestPage]) -> List[PageAck]:
+        """Write pages in one transaction. Repeats of a citation across pages go in later rounds."""
+        from ..database import async_session
+
+        now = datetime.utcnow()
+        rounds: List[Dict[Tuple[int, str], Tuple[int, Dict]]] = []
+        for idx, page in enumerate(pages):
+            seen_in_page = set()
+            for paper_data in page.papers:
+                if not isinstance(paper_data, dict) or not paper_data.get("scholarId"):
+                    continue
+                key = (page.paper_id, paper_data["scholarId"])
+                if key in seen_in_page:
+                    continue
+                seen_in_page.add(key)
+                # First round this key isn't in yet - each page's encounter still counts once
+                for round_rows in rounds:
+                    if key not in round_rows:
+                        round_rows[key] = (idx, citation_row(page.paper_id, page.edition_id, paper_data, now))
+                        break
+                else:
+                    rounds.append({key: (idx, citation_row(page.paper_id, page.edition_id, paper_data, now))})
+
+        acks = [PageAck([], []) for _ in pages]
+        async with async_session() as db:
+            for round_rows in rounds:
+                outcome = await upsert_citation_rows(db, [row for _, row in round_rows.values()])
+                for key, (idx, _) in round_rows.items():
+                    if outcome.get(key):
+                        acks[idx].inserted.append(key[1])
+                    else:
+                        acks[idx].duplicates.append(key[1])
+
+            # Counters move in the same transaction as the rows they count
+            inserted: Dict[Tuple[int, Optional[int]], int] = {}
+            for page, ack in zip(pages, acks):
+                key = (page.paper_id, page.edition_id)
+                inserted[key] = inserted.get(key, 0) + ack.new_count
+            await apply_citation_deltas(db, inserted)
+            await db.commit()
+
+        self._stats["rows_written"] += sum(len(r) for r in rounds)
+        self._stats["rows_inserted"] += sum(a.new_count for a in acks)
+        return acks
+
+    async def _run_acks(self, pages: List[IngestPage], acks: List[PageAck]):
+        """Run on_ack callbacks (page order within a job, jobs concurrently), then resolve futures"""
+        by_job: Dict[int, List[Tuple[IngestPage, PageAck]]] = {}
+        for page, ack in zip(pages, acks):
+            by_job.setdefault(page.job_id, []).append((page, ack))
+
+        async def run_job(items):
+            for page, ack in items:
+                if page.on_ack:
+                    try:
+                        await page.on_ack(ack)
+                    except Exception as e:
+                        log_now(f"on_ack failed for job {page.job_id} page {page.page_num + 1}: {e}", "warn")
+                if not page.ack.done():
+                    page.ack.set_result(ack)
+                self._ack_ms.append((time.monotonic() - page.enqueued_at) * 1000)
+
+        await asyncio.gather(*(run_job(items) for items in by_job.values()))
+
+    def _clear_buffer(self, page: IngestPage):
+        if page.buffer_key is not None:
+            from .citation_buffer import get_buffer
+            get_buffer().mark_saved(page.job_id, page.buffer_key)
+
+    def _fail(self, page: IngestPage, error: Exception):
+        self._stats["pages_failed"] += 1
+        if page.buffer_key is not None:
+            from .citation_buffer import get_buffer
+            get_buffer().mark_failed(page.job_id, page.buffer_key, str(error))
+        if not page.ack.done():
+            page.ack.set_exception(error)
+
+    async def _writer_loop(self):
+        from ..database import bind_db_role
+        bind_db_role("worker")
+        log_now("Citation ingest writer started")
+
+        while True:
+            batch = await self._collect_batch()
+            start = time.monotonic()
+            try:
+                try:
+                    acks = await self._write_pages(batch)
+                    written = list(zip(batch, acks))
+                except Exception as e:
+                    # Isolate the bad page(s): retry one page per transaction
+                    self._stats["batch_retries"] += 1
+                    log_now(f"Batch of {len(batch)} pages failed ({type(e).__name__}: {e}) - retrying page by page", "warn")
+                    written = []
+                    for page in batch:
+                        try:
+                            written.append((page, (await self._write_pages([page]))[0]))
+                        except Exception as page_err:
+                            log_now(f"✗ Job {page.job_id} page {page.page_num + 1} not saved (kept in local buffer): {page_err}", "error")
+                            self._fail(page, page_err)
+
+                self._stats["batches"] += 1
+                self._stats["pages_written"] += len(written)
+                self._batch_ms.append((time.monotonic() - start) * 1000)
+                for page, _ in written:
+                    self._clear_buffer(page)
+
+                if written:
+                    await self._run_acks([p for p, _ in written], [a for _, a in written])
+            except BaseException as e:
+                # Cancelled (shutdown) or a bug - never leave a waiter hanging on an ack
+                for page in batch:
+                    if not page.ack.done():
+                        self._fail(page, e if isinstance(e, Exception) else RuntimeError("ingest writer stopped"))
+                if not isinstance(e, Exception):
+                    raise
+                log_now(f"Writer error (batch marked failed, pages kept in local buffer): {e}", "error")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def stop(self, timeout: float = 30.0):
+        """Flush queued pages (up to timeout), then stop the writer"""
+        if self._writer_task is None:
+            return
+        if self._queue is not None and not self._queue.empty():
+            log_now(f"Flushing {self._queue.qsize()} queued pages before shutdown...")
+            try:
+                await asyncio.wait_for(self._queue.join(), timeout)
+            except asyncio.TimeoutError:
+                log_now(f"Shutdown flush timed out - {self._queue.qsize()} pages remain in the local buffer", "warn")
+        self._writer_task.cancel()
+        try:
+            await self._writer_task
+        except asyncio.CancelledError:
+            pass
+        self._writer_task = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        batch_ms = list(self._batch_ms)
+        ack_ms = sorted(self._ack_ms)
+        return {
+            **self._stats,
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "queue_max_pages": self.max_pages,
+            "writer_running": self._writer_task is not None and not self._writer_task.done(),
+            "jobs_with_pending_pages": len(self._pending),
+            "avg_pages_per_batch": round(self._stats["pages_written"] / self._stats["batches"], 1) if self._stats["batches"] else 0,
+            "batch_write_ms_avg": round(sum(batch_ms) / len(batch_ms), 1) if batch_ms else 0,
+            "ack_latency_ms_p95": round(ack_ms[min(len(ack_ms) - 1, int(len(ack_ms) * 0.95))], 1) if ack_ms else 0,
+            "backpressure_seconds": round(self._backpressure_s, 1),
+        }
+
+
+def ack_new_count(result: Any) -> int:
+    """New-citation count from an on_page_complete result: an int, or a (done) ack future"""
+    if isinstance(result, int):
+        return result
+    if asyncio.isfuture(result) and result.done() and not result.cancelled() and result.exception() is None:
+        return result.result().new_count
+    return 0
+
+
+# Singleton instance
+_ingest_queue: Optional[CitationIngestQueue] = None
+
+
+def get_ingest_queue() -> CitationIngestQueue:
+    """Get the process-wide citation ingest queue"""
+    global _ingest_queue
+    if _ingest_queue is None:
+        settings = get_settings()
+        _ingest_queue = CitationIngestQueue(
+            max_pages=settings.ingest_queue_max_pages,
+            batch_max_pages=settings.ingest_batch_max_pages,
+            batch_wait_seconds=settings.ingest_batch_wait_ms / 1000,
+        )
+    return _ingest_queue
+
+
+async def start_ingest_writer():
+    """Start the citation ingest writer task"""
+    get_ingest_queue()._ensure_writer()
+    logger.info("Citation ingest writer started")
+
+
+async def stop_ingest_writer():
+    """Flush queued pages and stop the writer"""
+    if _ingest_queue is not None:
+        await _ingest_queue.stop()
@@ -0,0 +1,495 @@
+"""
+Dashboard Snapshot - cached harvest dashboard for /api/dashboard/harvest-stats
+
+The harvest dashboard used to be computed per request: a dozen sequential
+aggregate queries plus per-paper / per-edition lookups for every running job,
+recent completion, stalled edition and failing paper. Every open dashboard tab
+polled it, putting that load on the same database the harvesters write to.
+
+Now a background task builds one snapshot every dashboard_refresh_seconds and
+requests are served from memory. A snapshot is built with a handful of
+set-based queries: FILTER conditional aggregates for the job counts, GROUP BY
+for per-paper and per-edition totals, and one paper lookup for all titles.
+Each snapshot carries an ETag (hash of its JSON) so pollers can revalidate
+with If-None-Match and get a 304 while nothing has changed.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Optional, Dict, Any, List, Tuple
+
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config import get_settings
+from ..models import Citation, Edition, HarvestTarget, Job, Paper
+from ..schemas import (
+    ActiveHarvestInfo, DashboardAlert, HarvestDashboardResponse, JobHistorySummary,
+    RecentlyCompletedPaper, SystemHealthStats,
+)
+from .job_worker import MAX_CONCURRENT_JOBS
+
+logger = logging.getLogger(__name__)
+
+
+def log_now(msg: str, level: str = "info"):
+    """Log message and immediately flush to stdout"""
+    timestamp = datetime.utcnow().strftime("%H:%M:%S")
+    print(f"{timestamp} | dashboard_snapshot | {level.upper()} | {msg}", flush=True)
+    sys.stdout.flush()
+
+
+ACTIVE_STATUSES = ("pending", "running")
+FINISHED_STATUSES = ("completed", "failed", "cancelled")
+
+
+def _parse_result(raw) -> dict:
+    try:
+        result = json.loads(raw) if isinstance(raw, str) else raw
+    except (TypeError, ValueError):
+        return {}
+    return result if isinstance(result, dict) else {}
+
+
+def _title(paper_titles: Dict[int, Tuple[Optional[str], int]], paper_id: int, length: int) -> str:
+    title = paper_titles[paper_id][0]
+    return title[:length] if title else f"Paper #{paper_id}"
+
+
+async def build_dashboard(db: AsyncSession) -> HarvestDashboardResponse:
+    """
+    Compute the full harvest dashboard.
+
+    Also marks stalled editions that are within 5% of their expected count as
+    harvest_complete (as the per-request endpoint did) and commits that.
+    """
+    from .job_progress import merged_job_params
+
+    # Use naive UTC datetimes to match database TIMESTAMP WITHOUT TIME ZONE columns
+    now = datetime.utcnow()
+    windows = {
+        "last_hour": now - timedelta(hours=1),
+        "last_6h": now - timedelta(hours=6),
+        "last_24h": now - timedelta(hours=24),
+    }
+    one_hour_ago = windows["last_hour"]
+    twenty_four_hours_ago = windows["last_24h"]
+
+    # === Job counts: one pass over active jobs and jobs finished in the last 24h ===
+    active = Job.status.in_(ACTIVE_STATUSES)
+    columns = [
+        func.count(Job.id).filter(active).label("active_jobs"),
+        func.count(func.distinct(Job.paper_id)).filter(active, Job.paper_id.isnot(None)).label("active_papers"),
+    ]
+    for window, since in windows.items():
+        for status in FINISHED_STATUSES:
+            columns.append(
+                func.count(Job.id).filter(Job.status == status, Job.completed_at >= since).label(f"{window}_{status}")
+            )
+    counts = (await db.execute(
+        select(*columns).where(or_(active, Job.completed_at >= twenty_four_hours_ago))
+    )).one()._mapping
+    job_history = {
+        window: {status: counts[f"{window}_{status}"] or 0 for status in FINISHED_STATUSES}
+        for window in windows
+    }
+
+    # === Citations saved in the last hour, per paper (summed for the system total) ===
+    citations_hour_result = await db.execute(
+        select(Citation.paper_id, func.count(Citation.id))
+        .where(Citation.created_at >= one_hour_ago)
+        .group_by(Citation.paper_id)
+    )
+    citations_hour_by_paper = dict(citations_hour_result.all())
+
+    # === Duplicate rate from extract_citations jobs completed in the last hour ===
+    recent_results = await db.execute(
+        select(Job.result).where(
+            Job.status == "completed",
+            Job.completed_at >= one_hour_ago,
+            Job.job_type == "extract_citations",
+            Job.result.isnot(None)
+        ).limit(20)
+    )
+    total_saved = 0
+    total_duplicates = 0
+    for raw in recent_results.scalars():
+        result = _parse_result(raw)
+        total_saved += result.get("citations_saved", 0) or 0
+        total_duplicates += result.get("duplicates_found", 0) or 0
+    avg_duplicate_rate = 0.0
+    if total_saved + total_duplicates > 0:
+        avg_duplicate_rate = total_duplicates / (total_saved + total_duplicates)
+
+    # === Running extract_citations jobs ===
+    running_jobs = (await db.execute(
+        select(Job).where(
+            Job.status == "running",
+            Job.job_type == "extract_citations"
+        ).order_by(Job.started_at.desc())
+    )).scalars().all()
+
+    # === Latest completed extract_citations job per paper (last 24h) ===
+    completed_rows = (await db.execute(
+        select(Job.paper_id, Job.completed_at).where(
+            Job.status == "completed",
+            Job.job_type == "extract_citations",
+            Job.completed_at >= twenty_four_hours_ago,
+            Job.paper_id.isnot(None)
+        ).order_by(Job.completed_at.desc()).limit(100)
+    )).all()
+    latest_completion: Dict[int, datetime] = {}
+    for paper_id, completed_at in completed_rows:
+        latest_completion.setdefault(paper_id, completed_at)
+
+    # === Stalled editions (skip those already marked harvest_complete) ===
+    stalled_editions = (await db.execute(
+        select(Edition.id, Edition.paper_id, Edition.citation_count, Edition.harvest_stall_count).where(
+            Edition.harvest_stall_count > 2,
+            Edition.selected == True,
+            # Handle case where harvest_complete column may not exist yet (migration pending)
+            or_(
+                Edition.harvest_complete.is_(None),
+                Edition.harvest_complete == False
+            )
+        ).order_by(Edition.harvest_stall_count.desc())
+    )).all()
+
+    # === Papers with 3+ failed jobs in the last 24h ===
+    failed_papers = (await db.execute(
+        select(Job.paper_id, func.count(Job.id).label("fail_count")).where(
+            Job.status == "failed",
+            Job.completed_at >= twenty_four_hours_ago,
+            Job.paper_id.isnot(None)
+        ).group_by(Job.paper_id).having(func.count(Job.id) >= 3)
+    )).all()
+
+    # === Selected-edition totals for running and recently completed papers ===
+    harvest_paper_ids = {job.paper_id for job in running_jobs if job.paper_id is not None} | set(latest_completion)
+    edition_totals: Dict[int, Any] = {}
+    if harvest_paper_ids:
+        totals_result = await db.execute(
+            select(
+                Edition.paper_id,
+                func.count(Edition.id).label("edition_count"),
+                func.coalesce(func.sum(Edition.citation_count), 0).label("expected"),
+                func.coalesce(func.sum(Edition.harvested_citation_count), 0).label("harvested"),
+                func.coalesce(func.max(Edition.harvest_stall_count), 0).label("stall_count"),
+            ).where(
+                Edition.paper_id.in_(harvest_paper_ids),
+                Edition.selected == True
+            ).group_by(Edition.paper_id)
+        )
+        edition_totals = {row.paper_id: row for row in totals_result.all()}
+
+    # === Titles and totals for every paper shown ===
+    all_paper_ids = (
+        harvest_paper_ids
+        | {e.paper_id for e in stalled_editions}
+        | {paper_id for paper_id, _ in failed_papers}
+    )
+    paper_info: Dict[int, Tuple[Optional[str], int]] = {}
+    if all_paper_ids:
+        papers_result = await db.execute(
+            select(Paper.id, Paper.title, Paper.total_harvested_citations).where(Paper.id.in_(all_paper_ids))
+        )
+        paper_info = {pid: (title, total or 0) for pid, title, total in papers_result.all()}
+
+    # === Year completion breakdown for stalled editions ===
+    stalled_ids = [e.id for e in stalled_editions]
+    year_breakdown: Dict[int, Any] = {}
+    if stalled_ids:
+        per_year = HarvestTarget.year.isnot(None)  # Skip the "all years" aggregate entry
+        breakdown_result = await db.execute(
+            select(
+                HarvestTarget.edition_id,
+                func.count(HarvestTarget.id).filter(per_year, HarvestTarget.status == "complete").label("complete"),
+                func.count(HarvestTarget.id).filter(per_year, HarvestTarget.status == "incomplete").label("incomplete"),
+                func.count(HarvestTarget.id).filter(per_year).label("total"),
+                func.count(HarvestTarget.id).filter(per_year, HarvestTarget.expected_count > 1000).label("overflow"),
+            ).where(HarvestTarget.edition_id.in_(stalled_ids)).group_by(HarvestTarget.edition_id)
+        )
+        year_breakdown = {row.edition_id: row for row in breakdown_result.all()}
+
+    # === Assemble ===
+    system_health = SystemHealthStats(
+        active_jobs=counts["active_jobs"] or 0,
+        max_concurrent_jobs=MAX_CONCURRENT_JOBS,
+        citations_last_hour=sum(citations_hour_by_paper.values()),
+        papers_with_active_jobs=counts["active_papers"] or 0,
+        jobs_24h=JobHistorySummary(**job_history["last_24h"]),
+        avg_duplicate_rate_1h=round(avg_duplicate_rate, 3),
+    )
+
+    active_harvests: List[ActiveHarvestInfo] = []
+    for job in running_jobs:
+        if job.paper_id not in paper_info:
+            continue
+
+        # Progress details (column, or params for jobs from before it existed)
+        params = merged_job_params(job) or {}
+        progress_details = params.get("progress_details", {})
+        totals = edition_totals.get(job.paper_id)
+        expected_total = int(totals.expected) if totals else 0
+        harvested_total = int(totals.harvested) if totals else 0
+
+        result = _parse_result(job.result)
+        citations_saved_job = result.get("citations_saved", progress_details.get("citations_saved", 0))
+        duplicates_job = result.get("duplicates_found", 0)
+        duplicate_rate = 0.0
+        if citations_saved_job + duplicates_job > 0:
+            duplicate_rate = duplicates_job / (citations_saved_job + duplicates_job)
+
+        running_minutes = 0
+        if job.started_at:
+            running_minutes = int((now - job.started_at).total_seconds() / 60)
+
+        active_harvests.append(ActiveHarvestInfo(
+            paper_id=job.paper_id,
+            paper_title=_title(paper_info, job.paper_id, 80),
+            job_id=job.id,
+            job_progress=job.progress or 0,
+            current_year=progress_details.get("current_year"),
+            current_page=progress_details.get("current_page"),
+            citations_saved_job=citations_saved_job,
+            citations_saved_hour=citations_hour_by_paper.get(job.paper_id, 0),
+            duplicates_job=duplicates_job,
+            duplicate_rate=round(duplicate_rate, 3),
+            gap_remaining=max(0, expected_total - harvested_total),
+            expected_total=expected_total,
+            harvested_total=harvested_total,
+            running_minutes=running_minutes,
+            stall_count=int(totals.stall_count) if totals else 0,
+            edition_count=totals.edition_count if totals else 0,
+        ))
+
+    # Recently completed: latest completion per paper, only papers >= 95% harvested
+    recently_completed: List[RecentlyCompletedPaper] = []
+    for paper_id, completed_at in latest_completion.items():
+        totals = edition_totals.get(paper_id)
+        if paper_id not in paper_info or not totals or not totals.expected:
+            continue
+        gap_percent = int(totals.harvested) / int(totals.expected)
+        if gap_percent >= 0.95:
+            recently_completed.append(RecentlyCompletedPaper(
+                paper_id=paper_id,
+                paper_title=_title(paper_info, paper_id, 80),
+                total_harvested=int(totals.harvested),
+                expected_total=int(totals.expected),
+                gap_percent=round(gap_percent, 3),
+                completed_at=completed_at,
+            ))
+        if len(recently_completed) >= 20:
+            break
+
+    alerts: List[DashboardAlert] = []
+
+    # Alert: High duplicate rate papers (from active harvests)
+    for harvest in active_harvests:
+        if harvest.duplicate_rate > 0.6:
+            alerts.append(DashboardAlert(
+                type="high_duplicate_rate",
+                paper_id=harvest.paper_id,
+                paper_title=harvest.paper_title,
+                job_id=harvest.job_id,
+                value=harvest.duplicate_rate,
+                message=f"{int(harvest.duplicate_rate * 100)}% duplicates - possible resume bug",
+            ))
+
+    # Alert: Stalled papers (stall_count > 2) with genuine gaps (> 5% remaining)
+    now_complete: List[int] = []
+    for edition in stalled_editions:
+        if edition.paper_id not in paper_info:
+            continue
+        harvested = paper_info[edition.paper_id][1]
+        expected = edition.citation_count or 0
+        gap = max(0, expected - harvested)
+
+        # Paper is essentially complete (< 5% gap): reset stall count and mark as complete
+        gap_percent = (gap / expected * 100) if expected > 0 else 0
+        if gap_percent < 5:
+            now_complete.append(edition.id)
+            continue
+
+        breakdown = year_breakdown.get(edition.id)
+        years_complete = breakdown.complete if breakdown else 0
+        years_incomplete = breakdown.incomplete if breakdown else 0
+        years_total = breakdown.total if breakdown else 0
+        years_harvesting = years_total - years_complete - years_incomplete
+
+        if years_total == 0:
+            # No HarvestTargets - need to run harvest first
+            diagnosis = "no_data"
+        elif years_incomplete > 0 or years_harvesting > 0:
+            # Some years haven't been fully scraped - our fault
+            diagnosis = "needs_scraping"
+        else:
+            # All years complete but still have gap - GS's fault
+            diagnosis = "gs_fault"
+
+        alerts.append(DashboardAlert(
+            type="stalled_paper",
+            paper_id=edition.paper_id,
+            paper_title=_title(paper_info, edition.paper_id, 60),
+            edition_id=edition.id,
+            value=float(edition.harvest_stall_count),
+            message=f"{edition.harvest_stall_count} consecutive zero-progress jobs",
+            harvested_count=harvested,
+            expected_count=expected,
+            gap_remaining=gap,
+            stall_count=edition.harvest_stall_count,
+            years_complete=years_complete,
+            years_incomplete=years_incomplete,
+            years_harvesting=years_harvesting,
+            years_total=years_total,
+            has_overflow_years=bool(breakdown and breakdown.overflow),
+            diagnosis=diagnosis,
+        ))
+
+    if now_complete:
+        await db.execute(
+            update(Edition).where(Edition.id.in_(now_complete)).values(
+                harvest_stall_count=0,
+                harvest_complete=True,
+                harvest_complete_reason="exhausted",
+            )
+        )
+        await db.commit()
+
+    # Alert: Long-running jobs (> 45 min)
+    for harvest in active_harvests:
+        if harvest.running_minutes > 45:
+            alerts.append(DashboardAlert(
+                type="long_running_job",
+                paper_id=harvest.paper_id,
+                paper_title=harvest.paper_title,
+                job_id=harvest.job_id,
+                value=float(harvest.running_minutes),
+                message=f"Running for {harvest.running_minutes} minutes",
+            ))
+
+    # Alert: Repeated failures (3+ failed jobs for same paper in 24h)
+    for paper_id, fail_count in failed_papers:
+        if paper_id not in paper_info:
+            continue
+        alerts.append(DashboardAlert(
+            type="repeated_failures",
+            paper_id=paper_id,
+            paper_title=_title(paper_info, paper_id, 60),
+            value=float(fail_count),
+            message=f"{fail_count} failed jobs in last 24h",
+        ))
+
+    return HarvestDashboardResponse(
+        system_health=system_health,
+        active_harvests=active_harvests,
+        recently_completed=recently_completed,
+        alerts=alerts,
+        job_history_summary=job_history,
+    )
+
+
+class DashboardSnapshot:
+    """
+    Holds the latest dashboard and refreshes it in the background.
+
+    get() serves the cached snapshot; if there is none yet, or the refresh task
+    has fallen behind (older than two intervals), the first caller rebuilds it
+    and concurrent callers wait for that build instead of starting their own.
+    """
+
+    def __init__(self, refresh_seconds: float):
+        self.refresh_seconds = refresh_seconds
+        self._body: Optional[bytes] = None
+        self._etag: Optional[str] = None
+        self._built_at: Optional[datetime] = None
+        self._built_monotonic: float = 0.0
+        self._lock = asyncio.Lock()
+        self._stats = {"builds": 0, "errors": 0, "served": 0, "not_modified": 0, "last_build_ms": None}
+
+    def _is_fresh(self) -> bool:
+        return self._body is not None and time.monotonic() - self._built_monotonic < self.refresh_seconds * 2
+
+    async def refresh(self):
+        """Build a new snapshot now"""
+        from ..database import async_session
+
+        start = time.monotonic()
+        async with async_session() as db:
+            dashboard = await build_dashboard(db)
+        body = dashboard.model_dump_json().encode()
+        self._body = body
+        self._etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        self._built_at = datetime.utcnow()
+        self._built_monotonic = time.monotonic()
+        self._stats["builds"] += 1
+        self._stats["last_build_ms"] = round((time.monotonic() - start) * 1000)
+
+    async def get(self) -> Tuple[bytes, str, datetime]:
+        """Current snapshot as (JSON body, ETag, built_at), rebuilding it if stale"""
+        if not self._is_fresh():
+            async with self._lock:
+                if not self._is_fresh():
+                    await self.refresh()
+        self._stats["served"] += 1
+        return self._body, self._etag, self._built_at
+
+    def record_not_modified(self):
+        self._stats["not_modified"] += 1
+
+    async def run(self):
+        from ..database import bind_db_role
+        bind_db_role("maintenance")
+        while True:
+            try:
+                async with self._lock:
+                    await self.refresh()
+            except Exception as e:
+                self._stats["errors"] += 1
+                log_now(f"Dashboard refresh failed: {e}", "error")
+            await asyncio.sleep(self.refresh_seconds)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "refresh_seconds": self.refresh_seconds,
+            "built_at": self._built_at.isoformat() if self._built_at else None,
+        }
+
+
+# Singleton instance
+_snapshot: Optional[DashboardSnapshot] = None
+
+
+def get_dashboard_snapshot() -> DashboardSnapshot:
+    """Get the process-wide dashboard snapshot"""
+    global _snapshot
+    if _snapshot is None:
+        _snapshot = DashboardSnapshot(refresh_seconds=get_settings().dashboard_refresh_seconds)
+    return _snapshot
+
+
+# Background refresh task
+_refresh_task = None
+
+async def start_dashboard_refresher():
+    """Start the periodic dashboard snapshot refresh"""
+    global _refresh_task
+    _refresh_task = asyncio.create_task(get_dashboard_snapshot().run())
+    logger.info("Dashboard snapshot refresher started")
+
+
+async def stop_dashboard_refresher():
+    """Stop the periodic dashboard snapshot refresh"""
+    global _refresh_task
+    if _refresh_task:
+        _refresh_task.cancel()
+        try:
+            await _refresh_task
+        except asyncio.CancelledError:
+            pass
+        _refresh_task = None
@@ -15,9 +15,9 @@ import json
 import logging
 import re
 from typing import Optional, Dict, Any, List
-import anthropic
 
 from ..config import get_settings
+from .llm_gateway import get_llm_gateway
 from .scholar_search import get_scholar_service
 
 logger = logging.getLogger(__name__)
@@ -79,6 +79,47 @@ LANGUAGE_TO_HL_CODE = {
     "indonesian": "id",
 }
 
+# Discovery runs its Scholar queries and evaluation batches concurrently.
+# Oxylabs traffic is still paced by the process-wide limiter, LLM calls by the gateway.
+QUERY_CONCURRENCY = 8
+EVALUATION_CONCURRENCY = 4
+
+
+class ResultIndex:
+    """
+    Deduplicated search results in first-seen order.
+
+    A result is a duplicate of an earlier one with the same normalized title or
+    the same scholarId - looked up in two dicts instead of scanning every result.
+    """
+
+    def __init__(self):
+        self.results: List[Dict[str, Any]] = []
+        self._by_title: Dict[str, int] = {}
+        self._by_scholar_id: Dict[str, int] = {}
+
+    @staticmethod
+    def normalize_title(title: Optional[str]) -> str:
+        return " ".join((title or "").lower().split())
+
+    def find(self, paper: Dict[str, Any]) -> Optional[int]:
+        title = self.normalize_title(paper.get("title"))
+        if title and title in self._by_title:
+            return self._by_title[title]
+        scholar_id = paper.get("scholarId")
+        if scholar_id and scholar_id in self._by_scholar_id:
+            return self._by_scholar_id[scholar_id]
+        return None
+
+    def add(self, result: Dict[str, Any]):
+        idx = len(self.results)
+        self.results.append(result)
+        title = self.normalize_title(result.get("title"))
+        if title:
+            self._by_title.setdefault(title, idx)
+        if result.get("scholarId"):
+            self._by_scholar_id.setdefault(result["scholarId"], idx)
+
 
 class EditionDiscoveryService:
     """LLM-driven edition discovery service"""
@@ -88,7 +129,6 @@ class EditionDiscoveryService:
         language_strategy: str = "major_languages",
         custom_languages: Optional[List[str]] = None,
     ):
-        self.client = anthropic.Anthropic(api_key=settings.anthropic_api_key)
         self.model = "claude-sonnet-4-5-20250929"
         self.scholar = get_scholar_service()
         self.language_strategy = language_strategy
@@ -123,77 +163,80 @@ class EditionDiscoveryService:
         queries = await self._generate_queries(paper)
         logger.info(f"[LLM-Discovery] Generated {len(queries)} queries")
 
-        # Step 2: Execute all queries and collect results
-        all_results = []
-        query_results = []
+        # Step 2: Execute all queries concurrently, then merge in query order
+        semaphore = asyncio.Semaphore(QUERY_CONCURRENCY)
+        completed = 0
 
-        for i, q in enumerate(queries):
+        async def run_query(i: int, q: Dict[str, str]) -> Dict[str, Any]:
+            nonlocal completed
             query_text = q.get("query", "")
             rationale = q.get("rationale", "")
             query_lang = q.get("lang", "english").lower()
             # Convert language name to Google Scholar hl code
             hl_code = LANGUAGE_TO_HL_CODE.get(query_lang, "en")
 
+            async with semaphore:
+                logger.info(f"[LLM-Discovery] Executing query {i+1}/{len(queries)} [{query_lang}]: {query_text[:60]}...")
+                try:
+                    results = await self.scholar.search(query_text, language=hl_code, max_results=30)
+                    papers = results.get("papers", [])
+
+                    logger.info(f"  Query {i+1} found: {len(papers)} results")
+
+                    # Retry with reformulated query if low results
+                    if len(papers) < 5:
+                        reformulated = await self._reformulate_query(paper, query_text, rationale, len(papers), query_lang)
+                        if reformulated and reformulated.get("query") != query_text:
+                            logger.info(f"  [RETRY] New query [{query_lang}]: {reformulated['query'][:60]}...")
+                            retry_results = await self.scholar.search(reformulated["query"], language=hl_code, max_results=30)
+                            retry_papers = retry_results.get("papers", [])
+                            if len(retry_papers) > len(papers):
+                                papers = retry_papers
+                                query_text = reformulated["query"]
+                                rationale = f"{rationale} → Reformulated: {reformulated.get('rationale', '')}"
+
+                    outcome = {
+                        "query": query_text,
+                        "rationale": rationale,
+                        "resultCount": len(papers),
+                        "results": papers,
+                        "lang": query_lang,
+                    }
+                except Exception as e:
+                    logger.error(f"  Query {i+1} ERROR: {e}")
+                    outcome = {
+                        "query": query_text,
+                        "rationale": rationale,
+                        "error": str(e),
+                    }
+
+            completed += 1
             if progress_callback:
                 await progress_callback({
                     "stage": "searching",
-                    "query": i + 1,
+                    "query": completed,
                     "total_queries": len(queries),
                     "current_query": query_text[:60],
                 })
+            return outcome
 
-            logger.info(f"[LLM-Discovery] Executing query {i+1}/{len(queries)} [{query_lang}]: {query_text[:60]}...")
-
-            try:
-                results = await self.scholar.search(query_text, language=hl_code, max_results=30)
-                papers = results.get("papers", [])
-
-                logger.info(f"  Found: {len(papers)} results")
-
-                # Retry with reformulated query if low results
-                if len(papers) < 5:
-                    reformulated = await self._reformulate_query(paper, query_text, rationale, len(papers), query_lang)
-                    if reformulated and reformulated.get("query") != query_text:
-                        logger.info(f"  [RETRY] New query [{query_lang}]: {reformulated['query'][:60]}...")
-                        retry_results = await self.scholar.search(reformulated["query"], language=hl_code, max_results=30)
-                        retry_papers = retry_results.get("papers", [])
-                        if len(retry_papers) > len(papers):
-                            papers = retry_papers
-                            query_text = reformulated["query"]
-                            rationale = f"{rationale} → Reformulated: {reformulated.get('rationale', '')}"
-
-                query_results.append({
-                    "query": query_text,
-                    "rationale": rationale,
-                    "resultCount": len(papers),
-                    "results": papers,
-                })
+        outcomes = await asyncio.gather(*(run_query(i, q) for i, q in enumerate(queries)))
 
-                # Add to combined results with deduplication
-                for p in papers:
-                    existing_idx = next(
-                        (j for j, r in enumerate(all_results)
-                         if r.get("title", "").lower() == p.get("title", "").lower() or
-                         r.get("scholarId") == p.get("scholarId")),
-                        None
-                    )
-                    if existing_idx is None:
-                        # Tag with the language of the query that found it
-                        all_results.append({**p, "foundBy": [query_text], "queryLanguage": query_lang})
-                    else:
-                        all_results[existing_idx]["foundBy"].append(query_text)
-                        # Keep first language found (more specific query usually runs first)
-
-            except Exception as e:
-                logger.error(f"  ERROR: {e}")
-                query_results.append({
-                    "query": query_text,
-                    "rationale": rationale,
-                    "error": str(e),
-                })
-
-            # Rate limiting between queries
-            await asyncio.sleep(2)
+        # Combine results with deduplication (query order, so earlier queries keep their language tag)
+        index = ResultIndex()
+        query_results = []
+        for outcome in outcomes:
+            query_lang = outcome.pop("lang", None)
+            query_results.append(outcome)
+            for p in outcome.get("results", []):
+                existing_idx = index.find(p)
+                if existing_idx is None:
+                    # Tag with the language of the query that found it
+                    index.add({**p, "foundBy": [outcome["query"]], "queryLanguage": query_lang})
+                else:
+                    index.results[existing_idx]["foundBy"].append(outcome["query"])
+                    # Keep first language found (more specific query usually runs first)
+        all_results = index.results
 
         logger.info(f"[LLM-Discovery] Total unique results: {len(all_results)}")
 
@@ -349,7 +392,9 @@ Include "lang" field: english, german, french, spanish, portuguese, italian, rus
 ONLY return the JSON array, no other text."""
 
         try:
-            response = self.client.messages.create(
+            response = await get_llm_gateway().create(
+                purpose="edition_discovery.queries",
+                cache=True,
                 model=self.model,
                 max_tokens=4096,
                 messages=[{"role": "user", "content": prompt}]
@@ -400,25 +445,25 @@ ONLY return the JSON array, no other text."""
         all_reasoning = []
 
         num_batches = (len(results) + batch_size - 1) // batch_size
+        semaphore = asyncio.Semaphore(EVALUATION_CONCURRENCY)
 
-        for batch_idx in range(num_batches):
+        async def evaluate_batch(batch_idx: int) -> Dict[str, Any]:
             start_idx = batch_idx * batch_size
             end_idx = min(start_idx + batch_size, len(results))
             batch = results[start_idx:end_idx]
 
-            logger.info(f"[LLM-Discovery] Processing batch {batch_idx + 1}/{num_batches} (indices {start_idx}-{end_idx - 1})")
+            async with semaphore:
+                logger.info(f"[LLM-Discovery] Processing batch {batch_idx + 1}/{num_batches} (indices {start_idx}-{end_idx - 1})")
+                return await self._evaluate_single_batch(target_paper, batch, start_idx)
 
-            batch_result = await self._evaluate_single_batch(target_paper, batch, start_idx)
+        batch_results = await asyncio.gather(*(evaluate_batch(i) for i in range(num_batches)))
 
+        for batch_idx, batch_result in enumerate(batch_results):
             all_high_confidence.extend(batch_result.get("highConfidence", []))
             all_uncertain.extend(batch_result.get("uncertain", []))
             all_rejected.extend(batch_result.get("rejected", []))
             all_reasoning.append(f"Batch {batch_idx + 1}: {batch_result.get('reasoning', '')}")
 
-            # Small delay between batches
-            if batch_idx < num_batches - 1:
-                await asyncio.sleep(1)
-
         genuine_editions = all_high_confidence + all_uncertain
 
         # Log language breakdown
@@ -533,7 +578,9 @@ Return JSON:
 ONLY return the JSON object."""
 
         try:
-            response = self.client.messages.create(
+            response = await get_llm_gateway().create(
+                purpose="edition_discovery.evaluate",
+                cache=True,
                 model=self.model,
                 max_tokens=8192,
                 messages=[{"role": "user", "content": prompt}]
@@ -637,7 +684,9 @@ If you cannot think of a good alternative, return:
 ONLY return the JSON object, no other text."""
 
         try:
-            response = self.client.messages.create(
+            response = await get_llm_gateway().create(
+                purpose="edition_discovery.reformulate",
+                cache=True,
                 model=self.model,
                 max_tokens=512,
                 messages=[{"role": "user", "content": prompt}]
@@ -701,7 +750,6 @@ ONLY return the JSON object, no other text."""
                 "primaryMarkets": ["english"],
             }
 
-        client = anthropic.Anthropic(api_key=settings.anthropic_api_key)
         title = paper.get("title", "")
         author = paper.get("author") or paper.get("authors", "")
         year = paper.get("year")
@@ -730,7 +778,9 @@ Return a JSON object:
 ONLY return the JSON object, no other text."""
 
         try:
-            response = client.messages.create(
+            response = await get_llm_gateway().create(
+                purpose="edition_discovery.languages",
+                cache=True,
                 model="claude-sonnet-4-5-20250929",
                 max_tokens=1024,
                 messages=[{"role": "user", "content": prompt}]
@@ -792,44 +842,42 @@ ONLY return the JSON object, no other text."""
         queries = await self._generate_targeted_queries(paper, target_language)
         logger.info(f"[LLM-Discovery] Generated {len(queries)} {target_language} queries")
 
-        # Execute queries
-        all_results = []
-        queries_used = []
+        # Execute queries concurrently, then merge in query order
+        queries_used = [q.get("query", "") for q in queries]
         hl_code = LANGUAGE_TO_HL_CODE.get(target_language, "en")
-
-        for i, q in enumerate(queries):
-            query_text = q.get("query", "")
-            queries_used.append(query_text)
-
+        semaphore = asyncio.Semaphore(QUERY_CONCURRENCY)
+        completed = 0
+
+        async def run_query(i: int, query_text: str) -> List[Dict[str, Any]]:
+            nonlocal completed
+            papers = []
+            async with semaphore:
+                logger.info(f"[LLM-Discovery] Query {i+1}/{len(queries)}: {query_text[:60]}...")
+                try:
+                    results = await self.scholar.search(query_text, language=hl_code, max_results=30)
+                    papers = results.get("papers", [])
+                    logger.info(f"  Query {i+1} found: {len(papers)} results")
+                except Exception as e:
+                    logger.error(f"  Query {i+1} ERROR: {e}")
+
+            completed += 1
             if progress_callback:
                 await progress_callback({
                     "stage": "searching",
-                    "query": i + 1,
+                    "query": completed,
                     "total_queries": len(queries),
                     "current_query": query_text[:50],
                 })
+            return papers
 
-            logger.info(f"[LLM-Discovery] Query {i+1}/{len(queries)}: {query_text[:60]}...")
-
-            try:
-                results = await self.scholar.search(query_text, language=hl_code, max_results=30)
-                papers = results.get("papers", [])
-                logger.info(f"  Found: {len(papers)} results")
-
-                for p in papers:
-                    existing_idx = next(
-                        (j for j, r in enumerate(all_results)
-                         if r.get("title", "").lower() == p.get("title", "").lower() or
-                         r.get("scholarId") == p.get("scholarId")),
-                        None
-                    )
-                    if existing_idx is None:
-                        all_results.append({**p, "queryLanguage": target_language})
-
-            except Exception as e:
-                logger.error(f"  ERROR: {e}")
+        outcomes = await asyncio.gather(*(run_query(i, text) for i, text in enumerate(queries_used)))
 
-            await asyncio.sleep(2)
+        index = ResultIndex()
+        for papers in outcomes:
+            for p in papers:
+                if index.find(p) is None:
+                    index.add({**p, "queryLanguage": target_language})
+        all_results = index.results
 
         logger.info(f"[LLM-Discovery] Total unique results for {target_language}: {len(all_results)}")
 
@@ -915,7 +963,9 @@ Return JSON array:
 ONLY return the JSON array."""
 
         try:
-            response = self.client.messages.create(
+            response = await get_llm_gateway().create(
+                purpose="edition_discovery.targeted_queries",
+                cache=True,
                 model=self.model,
                 max_tokens=2048,
                 messages=[{"role": "user", "content": prompt}]
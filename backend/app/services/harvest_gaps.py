@@ -0,0 +1,146 @@
+"""
+Harvest Gaps - the precomputed per-edition gap table behind auto-resume
+
+edition_harvest_gaps holds, per edition, everything auto-resume filters on:
+missing count, harvestable, stall count, paused, harvest target counts and
+active extract_citations jobs. Triggers keep it current as editions,
+harvest_targets, papers and jobs change (see database.py migrations), so
+picking resume candidates is one scan of a partial index ordered by gap size.
+
+The counters are maintained incrementally, so a crash mid-transaction can't
+skew them, but a race with the periodic rebuild can. rebuild_harvest_gaps()
+recomputes every row from the source tables (and backfills the table on first
+run); it runs every GAP_REBUILD_MINUTES. active_jobs is only a pre-filter -
+the unique index on active jobs is what actually prevents duplicates.
+"""
+import logging
+import sys
+import time
+from datetime import datetime
+from typing import Optional, List
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models import EditionHarvestGap
+
+logger = logging.getLogger(__name__)
+
+
+def log_now(msg: str, level: str = "info"):
+    """Log message and immediately flush to stdout"""
+    timestamp = datetime.utcnow().strftime("%H:%M:%S")
+    print(f"{timestamp} | harvest_gaps | {level.upper()} | {msg}", flush=True)
+    sys.stdout.flush()
+
+
+GAP_REBUILD_MINUTES = 60
+
+_last_rebuild: Optional[float] = None
+
+# Full recompute from the source tables. Rows that didn't change aren't rewritten.
+_REBUILD_SQL = text("""
+    INSERT INTO edition_harvest_gaps (
+        edition_id, paper_id, citation_count, missing_count, harvestable, stall_count,
+        paused, targets_total, targets_incomplete, active_jobs, updated_at
+    )
+    SELECT
+        e.id,
+        e.paper_id,
+        COALESCE(e.citation_count, 0),
+        COALESCE(e.citation_count, 0) - COALESCE(e.harvested_citation_count, 0),
+        (e.selected IS TRUE AND e.scholar_id IS NOT NULL
+         AND e.citation_count > 0 AND e.citation_count <= 50000
+         AND e.harvest_complete IS NOT TRUE),
+        COALESCE(e.harvest_stall_count, 0),
+        COALESCE(p.harvest_paused, FALSE),
+        COALESCE(t.total, 0),
+        COALESCE(t.incomplete, 0),
+        COALESCE(j.active, 0),
+        now() AT TIME ZONE 'utc'
+    FROM editions e
+    LEFT JOIN papers p ON p.id = e.paper_id
+    LEFT JOIN (
+        SELECT edition_id,
+               count(*) AS total,
+               count(*) FILTER (WHERE status <> 'complete'
+                                AND (expected_count > 0 OR (expected_count = 0 AND actual_count = 0))) AS incomplete
+        FROM harvest_targets
+        GROUP BY edition_id
+    ) t ON t.edition_id = e.id
+    LEFT JOIN (
+        SELECT paper_id, count(*) AS active
+        FROM jobs
+        WHERE job_type = 'extract_citations' AND status IN ('pending', 'running') AND paper_id IS NOT NULL
+        GROUP BY paper_id
+    ) j ON j.paper_id = e.paper_id
+    ON CONFLICT (edition_id) DO UPDATE SET
+        paper_id = EXCLUDED.paper_id,
+        citation_count = EXCLUDED.citation_count,
+        missing_count = EXCLUDED.missing_count,
+        harvestable = EXCLUDED.harvestable,
+        stall_count = EXCLUDED.stall_count,
+        paused = EXCLUDED.paused,
+        targets_total = EXCLUDED.targets_total,
+        targets_incomplete = EXCLUDED.targets_incomplete,
+        active_jobs = EXCLUDED.active_jobs,
+        updated_at = EXCLUDED.updated_at
+    WHERE (edition_harvest_gaps.paper_id, edition_harvest_gaps.citation_count, edition_harvest_gaps.missing_count,
+           edition_harvest_gaps.harvestable, edition_harvest_gaps.stall_count, edition_harvest_gaps.paused,
+           edition_harvest_gaps.targets_total, edition_harvest_gaps.targets_incomplete, edition_harvest_gaps.active_jobs)
+          IS DISTINCT FROM
+          (EXCLUDED.paper_id, EXCLUDED.citation_count, EXCLUDED.missing_count,
+           EXCLUDED.harvestable, EXCLUDED.stall_count, EXCLUDED.paused,
+           EXCLUDED.targets_total, EXCLUDED.targets_incomplete, EXCLUDED.active_jobs)
+""")
+
+
+async def rebuild_harvest_gaps(db: AsyncSession) -> int:
+    """Recompute edition_harvest_gaps from the source tables. Returns rows changed."""
+    global _last_rebuild
+    start = time.monotonic()
+    result = await db.execute(_REBUILD_SQL)
+    await db.commit()
+    _last_rebuild = time.monotonic()
+    changed = result.rowcount or 0
+    log_now(f"Rebuilt harvest gaps: {changed} rows changed in {(_last_rebuild - start) * 1000:.0f}ms")
+    return changed
+
+
+async def rebuild_harvest_gaps_if_due(db: AsyncSession) -> int:
+    """Rebuild on first use (backfill) and every GAP_REBUILD_MINUTES after"""
+    if _last_rebuild is not None and time.monotonic() - _last_rebuild < GAP_REBUILD_MINUTES * 60:
+        return 0
+    return await rebuild_harvest_gaps(db)
+
+
+async def find_resume_candidates(
+    db: AsyncSession,
+    limit: int,
+    min_missing: int,
+    min_percent: float,
+    max_stall_count: int,
+) -> List[EditionHarvestGap]:
+    """
+    Editions auto-resume should queue, largest gap first. One scan of
+    ix_edition_harvest_gaps_resumable - the first conditions repeat its predicate.
+    """
+    result = await db.execute(
+        select(EditionHarvestGap)
+        .where(
+            EditionHarvestGap.harvestable == True,
+            EditionHarvestGap.paused == False,
+            EditionHarvestGap.active_jobs <= 0,
+            EditionHarvestGap.missing_count > 0,
+            # Real work to do: no targets yet, or at least one incomplete target
+            # (all targets complete = the gap is GS duplicates we correctly dedupe)
+            (EditionHarvestGap.targets_total == 0) | (EditionHarvestGap.targets_incomplete > 0),
+            # Not stalled, and the gap is significant
+            EditionHarvestGap.stall_count < max_stall_count,
+            (EditionHarvestGap.missing_count >= min_missing)
+            | (EditionHarvestGap.missing_count >= EditionHarvestGap.citation_count * min_percent),
+        )
+        .order_by(EditionHarvestGap.missing_count.desc())
+        .limit(limit)
+    )
+    return list(result.scalars().all())
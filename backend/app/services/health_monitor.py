@@ -13,12 +13,12 @@ import time
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any, List
 
-import anthropic
 from sqlalchemy import select, update, func, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..config import get_settings
 from ..models import Job, Edition, Paper, FailedFetch, HealthMonitorLog
+from .llm_gateway import get_llm_gateway
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -71,6 +71,8 @@ async def collect_diagnostics(db: AsyncSession) -> Dict[str, Any]:
                 "progress_message": j.progress_message,
                 "started_at": j.started_at.isoformat() if j.started_at else None,
                 "duration_minutes": round((now - j.started_at).total_seconds() / 60, 1) if j.started_at else None,
+                "worker_id": j.worker_id,
+                "lease_expired": j.lease_expires_at is not None and j.lease_expires_at < now,
             }
             for j in running_jobs
         ]
@@ -286,7 +288,7 @@ DB HEALTH:
 Based on this, identify the root cause and recommend ONE action.
 
 AVAILABLE ACTIONS:
-1. RESTART_ZOMBIE_JOBS - Reset jobs stuck in "running" for >30min back to "pending"
+1. RESTART_ZOMBIE_JOBS - Reset "running" jobs whose worker lease has expired (lease_expired=true) back to "pending"
 2. CANCEL_STUCK_JOBS - Cancel jobs making no progress (params: job_ids to cancel)
 3. RESET_STALL_COUNTS - Reset stall counters on editions to allow retries
 4. RETRY_FAILED_FETCHES - Force queue a job to retry failed page fetches
@@ -320,11 +322,10 @@ async def call_llm_diagnosis(prompt: str) -> Dict[str, Any]:
         logger.error("No Anthropic API key configured")
         return {"error": "No API key", "action": "NO_ACTION"}
 
-    client = anthropic.AsyncAnthropic(api_key=settings.anthropic_api_key)
-
     try:
         start_time = time.time()
-        response = await client.messages.create(
+        response = await get_llm_gateway().create(
+            purpose="health_monitor",
             model=LLM_MODEL,
             max_tokens=LLM_MAX_TOKENS,
             messages=[{"role": "user", "content": prompt}]
@@ -384,16 +385,16 @@ async def execute_action(db: AsyncSession, action: str, params: Dict[str, Any])
 
     try:
         if action == "RESTART_ZOMBIE_JOBS":
-            # Reset jobs stuck in "running" for >30min
-            timeout_threshold = datetime.utcnow() - timedelta(minutes=30)
+            # Reset "running" jobs whose worker lease expired (unleased: no heartbeat for >30min)
+            # Jobs owned by a live worker - in this process or another - are left alone
+            from .job_worker import expired_lease_condition
+            now = datetime.utcnow()
             update_result = await db.execute(
                 update(Job)
-                .where(
-                    Job.status == "running",
-                    Job.started_at < timeout_threshold
-                )
-                .values(status="pending", started_at=None)
+                .where(expired_lease_condition(now, now - timedelta(minutes=30)))
+                .values(status="pending", started_at=None, worker_id=None, lease_expires_at=None)
                 .returning(Job.id)
+                .execution_options(synchronize_session=False)
             )
             reset_ids = [r[0] for r in update_result.fetchall()]
             await db.commit()
@@ -557,6 +558,8 @@ async def health_monitor_loop():
     """
     Main loop that runs health checks periodically.
     """
+    from ..database import bind_db_role
+    bind_db_role("maintenance")
     logger.info(f"Health monitor started (interval: {settings.health_monitor_interval_minutes} min)")
 
     while True:
@@ -0,0 +1,235 @@
+"""
+Job Notifications - push-based job dispatch via Postgres LISTEN/NOTIFY
+
+A trigger on the jobs table (see database.py migrations) sends a NOTIFY on
+JOB_CHANNEL whenever a job becomes pending (created, reset, re-queued), is
+cancelled or finishes - from any code path, process or host. A finished job
+only wakes the worker if its type is capped by the scheduler (a cap slot came
+free); scheduler weight changes are announced on the same channel. The worker keeps one
+connection LISTENing and sleeps on wait_for_job_event() instead of polling, so
+a new interactive job starts within milliseconds.
+
+Polling stays as a safety net: every job_poll_interval_seconds while the
+listener is connected, every 5 seconds (the old cadence) while it is not.
+"""
+import asyncio
+import json
+import logging
+import sys
+import time
+from datetime import datetime
+from typing import Optional, Dict, Any, Set
+
+from ..config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+def log_now(msg: str, level: str = "info"):
+    """Log message and immediately flush to stdout"""
+    timestamp = datetime.utcnow().strftime("%H:%M:%S")
+    print(f"{timestamp} | job_notify | {level.upper()} | {msg}", flush=True)
+    sys.stdout.flush()
+
+
+JOB_CHANNEL = "job_events"
+DISCONNECTED_POLL_SECONDS = 5  # Poll cadence while LISTEN is down (same as before push dispatch)
+HEALTH_CHECK_SECONDS = 30  # Ping the listener connection this often
+RECONNECT_BACKOFF_MAX = 60
+
+
+class JobEventListener:
+    """Holds the LISTEN connection and wakes the worker loop on job events"""
+
+    def __init__(self, poll_interval: float, capped_types: Set[str]):
+        self.poll_interval = poll_interval
+        self.capped_types = capped_types
+        self.connected = False
+        self._wake = asyncio.Event()
+        self._lost = asyncio.Event()
+        self._cancelled: Set[int] = set()  # Job IDs cancelled since the worker last looked
+
+        self._stats = {
+            "notifications": 0,
+            "pending_events": 0,
+            "cancelled_events": 0,
+            "finished_events": 0,
+            "weight_events": 0,
+            "local_wakes": 0,
+            "connects": 0,
+            "disconnects": 0,
+        }
+        self._wake_latency_ms = []  # NOTIFY received -> worker woke (last 200)
+        self._notified_at: Optional[float] = None
+        self._last_event_at: Optional[str] = None
+
+    # ============== WORKER SIDE ==============
+
+    async def wait(self) -> bool:
+        """
+        Sleep until a job event arrives or the safety-net poll interval passes.
+        Returns True if woken by an event.
+        """
+        timeout = self.poll_interval if self.connected else DISCONNECTED_POLL_SECONDS
+        try:
+            await asyncio.wait_for(self._wake.wait(), timeout)
+            woken = True
+        except asyncio.TimeoutError:
+            woken = False
+        self._wake.clear()
+        if woken and self._notified_at is not None:
+            self._wake_latency_ms = self._wake_latency_ms[-199:] + [(time.monotonic() - self._notified_at) * 1000]
+        self._notified_at = None
+        return woken
+
+    def wake(self):
+        """Wake the worker from inside this process (e.g. a job slot freed up)"""
+        self._stats["local_wakes"] += 1
+        self._wake.set()
+
+    def pop_cancelled(self) -> Set[int]:
+        cancelled, self._cancelled = self._cancelled, set()
+        return cancelled
+
+    # ============== LISTEN CONNECTION ==============
+
+    def _on_notify(self, connection, pid, channel, payload):
+        self._stats["notifications"] += 1
+        self._last_event_at = datetime.utcnow().isoformat()
+        try:
+            event = json.loads(payload)
+        except (TypeError, ValueError):
+            event = {}
+        status = event.get("status")
+        if status == "finished":
+            self._stats["finished_events"] += 1
+            if event.get("job_type") not in self.capped_types:
+                return  # Frees no cap - and local slots are woken by the worker itself
+        elif status == "weights":
+            self._stats["weight_events"] += 1
+        elif status == "cancelled":
+            self._stats["cancelled_events"] += 1
+            if event.get("id") is not None:
+                self._cancelled.add(event["id"])
+        else:
+            self._stats["pending_events"] += 1
+        if self._notified_at is None:
+            self._notified_at = time.monotonic()
+        self._wake.set()
+
+    def _on_termination(self, connection):
+        self._lost.set()
+
+    async def run(self):
+        """Keep a LISTEN connection open, reconnecting with backoff"""
+        from ..database import get_engine
+
+        backoff = 1
+        while True:
+            conn = None
+            try:
+                conn = await get_engine("worker").connect()
+                raw = (await conn.get_raw_connection()).driver_connection
+                self._lost.clear()
+                await raw.add_listener(JOB_CHANNEL, self._on_notify)
+                raw.add_termination_listener(self._on_termination)
+
+                self.connected = True
+                self._stats["connects"] += 1
+                backoff = 1
+                log_now(f"Listening for job events on '{JOB_CHANNEL}'")
+                # Anything created while we were disconnected: let the worker poll once now
+                self._wake.set()
+
+                while not self._lost.is_set():
+                    try:
+                        await asyncio.wait_for(self._lost.wait(), HEALTH_CHECK_SECONDS)
+                    except asyncio.TimeoutError:
+                        await raw.execute("SELECT 1")
+                raise ConnectionError("listener connection terminated")
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if self.connected:
+                    self._stats["disconnects"] += 1
+                log_now(f"Job event listener down ({type(e).__name__}: {e}) - polling every "
+                        f"{DISCONNECTED_POLL_SECONDS}s, reconnecting in {backoff}s", "warn")
+            finally:
+                self.connected = False
+                if conn is not None:
+                    try:
+                        await conn.invalidate()  # Never return a LISTENing connection to the pool
+                        await conn.close()
+                    except Exception:
+                        pass
+
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, RECONNECT_BACKOFF_MAX)
+
+    def get_stats(self) -> Dict[str, Any]:
+        latencies = sorted(self._wake_latency_ms)
+        return {
+            "connected": self.connected,
+            "channel": JOB_CHANNEL,
+            "poll_interval_seconds": self.poll_interval if self.connected else DISCONNECTED_POLL_SECONDS,
+            **self._stats,
+            "last_event_at": self._last_event_at,
+            "wake_latency_ms_p50": round(latencies[len(latencies) // 2], 2) if latencies else None,
+        }
+
+
+# Singleton instance
+_listener: Optional[JobEventListener] = None
+
+
+def get_job_listener() -> JobEventListener:
+    """Get the process-wide job event listener"""
+    global _listener
+    if _listener is None:
+        settings = get_settings()
+        _listener = JobEventListener(
+            poll_interval=settings.job_poll_interval_seconds,
+            capped_types=set(settings.get_scheduler_type_caps()),
+        )
+    return _listener
+
+
+async def notify_job_event(db, status: str):
+    """Send a job event from application code (e.g. status="weights") - caller commits"""
+    from sqlalchemy import text
+
+    await db.execute(
+        text("SELECT pg_notify(:channel, :payload)"),
+        {"channel": JOB_CHANNEL, "payload": json.dumps({"status": status})},
+    )
+
+
+async def wait_for_job_event() -> bool:
+    """Sleep until there may be new work (event or safety-net poll). True if woken by an event."""
+    return await get_job_listener().wait()
+
+
+# Background LISTEN task
+_listener_task = None
+
+async def start_job_listener():
+    """Start the LISTEN connection task (no-op when job_notify_enabled is off - the worker then polls)"""
+    global _listener_task
+    if not get_settings().job_notify_enabled:
+        logger.info("Job notifications disabled - worker polls every %ss", DISCONNECTED_POLL_SECONDS)
+        return
+    _listener_task = asyncio.create_task(get_job_listener().run())
+    logger.info("Job event listener started")
+
+
+async def stop_job_listener():
+    """Stop the LISTEN connection task"""
+    global _listener_task
+    if _listener_task:
+        _listener_task.cancel()
+        try:
+            await _listener_task
+        except asyncio.CancelledError:
+            pass
+        _listener_task = None
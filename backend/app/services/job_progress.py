@@ -0,0 +1,263 @@
+"""
+Job Progress Reporter - coalesced, rate-limited progress / heartbeat writes
+
+Jobs used to write progress straight to the jobs row on every call: read
+params, merge progress_details, write the whole JSON blob back and commit -
+and the citation page callback did it twice per page (progress details, then
+resume state). Now jobs call report() (update_job_progress does), which only
+updates the latest state for the job in memory. A flusher task writes each
+job at most once per job_progress_flush_seconds, and all due jobs in one
+batched UPDATE.
+
+Progress details and resume state live in their own columns
+(jobs.progress_details, jobs.resume_state) instead of params, and every flush
+stamps jobs.heartbeat_at - the real "job is making progress" heartbeat that
+used to be overloaded onto started_at.
+
+Call flush_job() before writing a job's final status, so a late flush can't
+overwrite it and the last progress is not lost.
+"""
+import asyncio
+import json
+import logging
+import sys
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Optional, Dict, Any, Iterable
+
+from sqlalchemy import bindparam, update, func
+
+from ..config import get_settings
+from ..models import Job
+
+logger = logging.getLogger(__name__)
+
+
+def log_now(msg: str, level: str = "info"):
+    """Log message and immediately flush to stdout"""
+    timestamp = datetime.utcnow().strftime("%H:%M:%S")
+    print(f"{timestamp} | job_progress | {level.upper()} | {msg}", flush=True)
+    sys.stdout.flush()
+
+
+FLUSH_TICK = 0.5  # How often the flusher looks for due jobs
+
+# One executemany for all due jobs. A None value keeps the column as it is, so a
+# job that only reported details doesn't clobber its progress (and vice versa).
+# Only running jobs still leased to this worker are touched - never resurrect a
+# finished or cancelled one, or write over a worker that took over the job.
+_jobs = Job.__table__
+_FLUSH_STMT = (
+    update(_jobs)
+    .where(
+        _jobs.c.id == bindparam("b_id"),
+        _jobs.c.status == "running",
+        _jobs.c.worker_id == bindparam("b_worker"),
+    )
+    .values(
+        progress=func.coalesce(bindparam("b_progress", type_=_jobs.c.progress.type), _jobs.c.progress),
+        progress_message=func.coalesce(bindparam("b_message", type_=_jobs.c.progress_message.type), _jobs.c.progress_message),
+        progress_details=func.coalesce(bindparam("b_details", type_=_jobs.c.progress_details.type), _jobs.c.progress_details),
+        resume_state=func.coalesce(bindparam("b_resume", type_=_jobs.c.resume_state.type), _jobs.c.resume_state),
+        heartbeat_at=bindparam("b_heartbeat", type_=_jobs.c.heartbeat_at.type),
+        lease_expires_at=bindparam("b_lease", type_=_jobs.c.lease_expires_at.type),
+    )
+)
+
+
+class ProgressReporter:
+    """Latest unflushed progress per job + the batching flusher"""
+
+    def __init__(self, flush_interval: float):
+        self.flush_interval = flush_interval
+        self._dirty: Dict[int, Dict[str, Any]] = {}  # job_id -> latest unflushed values
+        self._last_flush: Dict[int, float] = {}  # job_id -> monotonic time of its last flush
+        self._lock = asyncio.Lock()
+
+        self._stats = {
+            "reports": 0,
+            "flushes": 0,
+            "rows_written": 0,
+            "flush_errors": 0,
+        }
+        self._flush_ms = deque(maxlen=200)
+
+    def report(
+        self,
+        job_id: int,
+        progress: Optional[float] = None,
+        message: Optional[str] = None,
+        details: Optional[Dict[str, Any]] = None,
+        resume_state: Optional[Dict[str, Any]] = None,
+    ):
+        """Record the latest progress for a job (no DB write). Non-None fields replace earlier ones."""
+        self._stats["reports"] += 1
+        entry = self._dirty.setdefault(job_id, {})
+        if progress is not None:
+            entry["progress"] = progress
+        if message is not None:
+            entry["message"] = message
+        if details is not None:
+            entry["details"] = details
+        if resume_state is not None:
+            entry["resume"] = resume_state
+
+    def _take(self, job_ids: Iterable[int]) -> list:
+        from .job_worker import JOB_LEASE_SECONDS, WORKER_ID
+
+        now = datetime.utcnow()
+        lease = now + timedelta(seconds=JOB_LEASE_SECONDS)
+        rows = []
+        for job_id in job_ids:
+            entry = self._dirty.pop(job_id, None)
+            if entry is None:
+                continue
+            rows.append({
+                "b_id": job_id,
+                "b_worker": WORKER_ID,
+                "b_progress": entry.get("progress"),
+                "b_message": entry.get("message"),
+                "b_details": json.dumps(entry["details"]) if "details" in entry else None,
+                "b_resume": json.dumps(entry["resume"]) if "resume" in entry else None,
+                "b_heartbeat": now,
+                "b_lease": lease,  # Progress also renews the worker lease
+            })
+            self._last_flush[job_id] = time.monotonic()
+        return rows
+
+    async def _write(self, rows: list):
+        from ..database import async_session
+
+        start = time.monotonic()
+        async with async_session() as db:
+            await db.execute(_FLUSH_STMT, rows)
+            await db.commit()
+        self._stats["flushes"] += 1
+        self._stats["rows_written"] += len(rows)
+        self._flush_ms.append((time.monotonic() - start) * 1000)
+
+    async def flush(self, force: bool = False) -> int:
+        """Write every job whose flush interval has passed (all dirty jobs if force). Returns rows written."""
+        async with self._lock:
+            now = time.monotonic()
+            due = [
+                job_id for job_id in self._dirty
+                if force or now - self._last_flush.get(job_id, 0.0) >= self.flush_interval
+            ]
+            rows = self._take(due)
+            if not rows:
+                return 0
+            try:
+                await self._write(rows)
+            except Exception as e:
+                self._stats["flush_errors"] += 1
+                # Keep the values for the next tick unless newer ones arrived meanwhile
+                for row in rows:
+                    entry = self._dirty.setdefault(row["b_id"], {})
+                    for key, col in (("progress", "b_progress"), ("message", "b_message")):
+                        if row[col] is not None:
+                            entry.setdefault(key, row[col])
+                    for key, col in (("details", "b_details"), ("resume", "b_resume")):
+                        if row[col] is not None:
+                            entry.setdefault(key, json.loads(row[col]))
+                log_now(f"Progress flush of {len(rows)} jobs failed (will retry): {e}", "warn")
+                return 0
+            return len(rows)
+
+    async def flush_job(self, job_id: int):
+        """Write a job's pending progress now (call before setting its final status)"""
+        async with self._lock:
+            rows = self._take([job_id])
+            self._last_flush.pop(job_id, None)
+            if rows:
+                try:
+                    await self._write(rows)
+                except Exception as e:
+                    self._stats["flush_errors"] += 1
+                    log_now(f"Final progress flush for job {job_id} failed: {e}", "warn")
+
+    def discard(self, job_id: int):
+        """Forget a job's unflushed progress"""
+        self._dirty.pop(job_id, None)
+        self._last_flush.pop(job_id, None)
+
+    async def run(self):
+        from ..database import bind_db_role
+        bind_db_role("worker")
+        while True:
+            await asyncio.sleep(FLUSH_TICK)
+            if self._dirty:
+                try:
+                    await self.flush()
+                except Exception as e:
+                    log_now(f"Progress flusher error: {e}", "error")
+
+    def get_stats(self) -> Dict[str, Any]:
+        flush_ms = list(self._flush_ms)
+        return {
+            **self._stats,
+            "flush_interval_seconds": self.flush_interval,
+            "jobs_dirty": len(self._dirty),
+            # Reports that never hit the DB on their own
+            "coalesced": max(self._stats["reports"] - self._stats["rows_written"] - len(self._dirty), 0),
+            "avg_rows_per_flush": round(self._stats["rows_written"] / self._stats["flushes"], 1) if self._stats["flushes"] else 0,
+            "flush_ms_avg": round(sum(flush_ms) / len(flush_ms), 1) if flush_ms else 0,
+        }
+
+
+def merged_job_params(job: Job) -> Optional[Dict[str, Any]]:
+    """
+    Job params as the API returns them: params JSON with progress_details and
+    resume_state folded back in from their columns (the UI reads params.progress_details).
+    """
+    try:
+        params = json.loads(job.params) if job.params else None
+    except (TypeError, ValueError):
+        params = None
+    for key in ("progress_details", "resume_state"):
+        raw = getattr(job, key, None)
+        if raw:
+            try:
+                params = {**(params or {}), key: json.loads(raw)}
+            except (TypeError, ValueError):
+                pass
+    return params
+
+
+# Singleton instance
+_reporter: Optional[ProgressReporter] = None
+
+
+def get_progress_reporter() -> ProgressReporter:
+    """Get the process-wide progress reporter"""
+    global _reporter
+    if _reporter is None:
+        _reporter = ProgressReporter(flush_interval=get_settings().job_progress_flush_seconds)
+    return _reporter
+
+
+# Background flusher task
+_flush_task = None
+
+async def start_progress_flusher():
+    """Start the background progress flusher"""
+    global _flush_task
+    _flush_task = asyncio.create_task(get_progress_reporter().run())
+    logger.info("Job progress flusher started")
+
+
+async def stop_progress_flusher():
+    """Stop the flusher and write whatever is still pending"""
+    global _flush_task
+    if _flush_task:
+        _flush_task.cancel()
+        try:
+            await _flush_task
+        except asyncio.CancelledError:
+            pass
+        _flush_task = None
+    try:
+        await get_progress_reporter().flush(force=True)
+    except Exception as e:
+        logger.warning(f"Final progress flush failed: {e}")
@@ -0,0 +1,312 @@
+"""
+Job Scheduler - weighted fair share across tenants, per-type caps, aging
+
+The worker used to claim pending jobs by `priority DESC, created_at ASC`, so a
+thinker with hundreds of priority-100 auto-resume jobs (or focus mode, which
+halted everyone else) starved every other paper. The scheduler decides which
+pending jobs fill the free slots:
+
+- Every job belongs to a tenant: the thinker whose accepted work the paper is
+  (or the thinker_id in the job params), else the paper's collection, else
+  "unassigned".
+- Free slots go to the tenant with the lowest running / weight, so each tenant
+  with work gets its weighted share of the worker. Thinker tenants default to
+  scheduler_thinker_weight; focus mode just gives one thinker
+  scheduler_focus_weight. Weight overrides live in scheduler_weights, so every
+  worker applies them; they are reloaded each round and announced by NOTIFY.
+- Per-job-type caps (scheduler_type_caps) bound how many jobs of a type run at
+  once across all workers, e.g. so resolve jobs can't take every slot.
+- Within a tenant, jobs run by effective priority: priority plus
+  scheduler_aging_per_minute for every minute the job has waited, so low
+  priority work still drains.
+
+Caps and shares count running jobs from the database (all workers), so two
+workers picking at the same instant can overshoot a cap by a job or two.
+"""
+import logging
+import sys
+from collections import deque
+from datetime import datetime
+from typing import Optional, Dict, Any, List, Tuple
+
+from sqlalchemy import select, delete, func, cast, literal, Integer, DateTime
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config import get_settings
+from ..models import Job, Paper, Dossier, ThinkerWork, SchedulerWeight
+from .job_notify import notify_job_event
+
+logger = logging.getLogger(__name__)
+
+
+def log_now(msg: str, level: str = "info"):
+    """Log message and immediately flush to stdout"""
+    timestamp = datetime.utcnow().strftime("%H:%M:%S")
+    print(f"{timestamp} | job_scheduler | {level.upper()} | {msg}", flush=True)
+    sys.stdout.flush()
+
+
+UNASSIGNED = "unassigned"
+
+
+def tenant_key(thinker_id: Optional[int], collection_id: Optional[int]) -> str:
+    if thinker_id is not None:
+        return f"thinker:{thinker_id}"
+    if collection_id is not None:
+        return f"collection:{collection_id}"
+    return UNASSIGNED
+
+
+def _tenant_columns():
+    """(thinker_id, collection_id) SQL expressions for a job; the query must outer join Paper and Dossier"""
+    paper_thinker = (
+        select(func.min(ThinkerWork.thinker_id))
+        .where(ThinkerWork.paper_id == Job.paper_id, ThinkerWork.decision == "accepted")
+        .correlate(Job)
+        .scalar_subquery()
+    )
+    # Thinker jobs without a paper carry {"thinker_id": N} in params
+    params_thinker = cast(func.substring(Job.params, r'"thinker_id":\s*(\d+)'), Integer)
+    thinker_id = func.coalesce(paper_thinker, params_thinker)
+    collection_id = func.coalesce(Dossier.collection_id, Paper.collection_id)
+    return thinker_id, collection_id
+
+
+class FairShareScheduler:
+    """Picks which pending jobs to claim next"""
+
+    def __init__(self, type_caps: Dict[str, int], thinker_weight: float, aging_per_minute: float, candidate_limit: int):
+        self.type_caps = type_caps
+        self.thinker_weight = thinker_weight
+        self.aging_per_minute = aging_per_minute
+        self.candidate_limit = candidate_limit
+        self._weights: Dict[str, float] = {}  # tenant -> weight override (focus mode), as of the last round
+
+        self._stats = {
+            "rounds": 0,
+            "jobs_picked": 0,
+            "cap_deferrals": 0,  # Times a tenant's next job was skipped because its type was at cap
+        }
+        self._decisions = deque(maxlen=50)
+        self._last_snapshot: Dict[str, Any] = {"at": None, "tenants": {}, "job_types": {}}
+
+    # ============== WEIGHTS ==============
+
+    def weight(self, tenant: str) -> float:
+        if tenant in self._weights:
+            return self._weights[tenant]
+        if tenant.startswith("thinker:"):
+            return self.thinker_weight
+        return 1.0
+
+    async def load_weights(self, db: AsyncSession) -> Dict[str, float]:
+        result = await db.execute(select(SchedulerWeight.tenant, SchedulerWeight.weight))
+        self._weights = {tenant: weight for tenant, weight in result}
+        return self._weights
+
+    async def set_weight(self, db: AsyncSession, tenant: str, weight: float,
+                         reason: Optional[str] = None, paper_count: Optional[int] = None):
+        """Persist a weight override and tell every worker (commits)"""
+        values = {"weight": weight, "reason": reason, "paper_count": paper_count, "updated_at": datetime.utcnow()}
+        await db.execute(
+            pg_insert(SchedulerWeight).values(tenant=tenant, **values)
+            .on_conflict_do_update(index_elements=["tenant"], set_=values)
+        )
+        await notify_job_event(db, "weights")
+        await db.commit()
+        self._weights[tenant] = weight
+        log_now(f"Weight for {tenant} set to {weight}")
+
+    async def clear_weights(self, db: AsyncSession, reason: Optional[str] = None, tenant: Optional[str] = None) -> List[str]:
+        """Drop weight overrides (all, or by reason / tenant) and tell every worker (commits)"""
+        stmt = delete(SchedulerWeight).returning(SchedulerWeight.tenant)
+        if reason is not None:
+            stmt = stmt.where(SchedulerWeight.reason == reason)
+        if tenant is not None:
+            stmt = stmt.where(SchedulerWeight.tenant == tenant)
+        cleared = list((await db.execute(stmt)).scalars())
+        if cleared:
+            await notify_job_event(db, "weights")
+        await db.commit()
+        for t in cleared:
+            self._weights.pop(t, None)
+            log_now(f"Weight override for {t} cleared")
+        return cleared
+
+    # ============== PLANNING ==============
+
+    def _has_room(self, job_type: str, running_by_type: Dict[str, int]) -> bool:
+        cap = self.type_caps.get(job_type)
+        return cap is None or running_by_type.get(job_type, 0) < cap
+
+    def plan(
+        self,
+        candidates: List[Dict[str, Any]],
+        running_by_type: Dict[str, int],
+        running_by_tenant: Dict[str, int],
+        slots: int,
+    ) -> List[Dict[str, Any]]:
+        """
+        Choose up to `slots` candidates. Each candidate is a dict with job_id,
+        job_type, tenant and effective_priority. Pure - no DB access.
+        """
+        queues: Dict[str, List[Dict[str, Any]]] = {}
+        for c in sorted(candidates, key=lambda c: -c["effective_priority"]):
+            queues.setdefault(c["tenant"], []).append(c)
+
+        running_by_type = dict(running_by_type)
+        running_by_tenant = dict(running_by_tenant)
+        picks = []
+        while len(picks) < slots:
+            best: Optional[Tuple[float, float, str, int]] = None
+            for tenant, queue in queues.items():
+                # The tenant's best job whose type still has room
+                index = next((i for i, c in enumerate(queue) if self._has_room(c["job_type"], running_by_type)), None)
+                if index is None:
+                    continue
+                share = running_by_tenant.get(tenant, 0) / self.weight(tenant)
+                key = (share, -queue[index]["effective_priority"], tenant, index)
+                if best is None or key < best:
+                    best = key
+            if best is None:
+                break
+
+            share, _, tenant, index = best
+            if index > 0:
+                self._stats["cap_deferrals"] += 1
+            job = queues[tenant].pop(index)
+            if not queues[tenant]:
+                del queues[tenant]
+            running_by_type[job["job_type"]] = running_by_type.get(job["job_type"], 0) + 1
+            running_by_tenant[tenant] = running_by_tenant.get(tenant, 0) + 1
+            picks.append({**job, "share": round(share, 2)})
+        return picks
+
+    # ============== DATABASE ==============
+
+    async def _load(self, db: AsyncSession, slots: int, now: datetime):
+        """Queue depth / running counts per (tenant, type), and the best pending candidates"""
+        thinker_id, collection_id = _tenant_columns()
+        active = (
+            select(
+                Job.id, Job.status, Job.job_type, Job.priority, Job.created_at,
+                thinker_id.label("thinker_id"), collection_id.label("collection_id"),
+            )
+            .select_from(Job)
+            .outerjoin(Paper, Paper.id == Job.paper_id)
+            .outerjoin(Dossier, Dossier.id == Paper.dossier_id)
+            .where(Job.status.in_(["pending", "running"]))
+            .subquery()
+        )
+
+        counts = await db.execute(
+            select(active.c.status, active.c.job_type, active.c.thinker_id, active.c.collection_id, func.count())
+            .group_by(active.c.status, active.c.job_type, active.c.thinker_id, active.c.collection_id)
+        )
+
+        # The top `slots` jobs of each (tenant, type) are all one round can use
+        waited_minutes = func.extract("epoch", literal(now, DateTime) - active.c.created_at) / 60.0
+        effective = func.coalesce(active.c.priority, 0) + waited_minutes * self.aging_per_minute
+        ranked = (
+            select(
+                active.c.id, active.c.job_type, active.c.thinker_id, active.c.collection_id,
+                effective.label("effective_priority"),
+                func.row_number().over(
+                    partition_by=(active.c.thinker_id, active.c.collection_id, active.c.job_type),
+                    order_by=(effective.desc(), active.c.id.asc()),
+                ).label("rank"),
+            )
+            .where(active.c.status == "pending")
+            .subquery()
+        )
+        candidates = await db.execute(
+            select(ranked)
+            .where(ranked.c.rank <= slots)
+            .order_by(ranked.c.effective_priority.desc())
+            .limit(self.candidate_limit)
+        )
+        return counts.all(), candidates.all()
+
+    async def select_jobs(self, db: AsyncSession, slots: int) -> List[int]:
+        """Pick up to `slots` pending job IDs to claim, in start order"""
+        if slots <= 0:
+            return []
+
+        now = datetime.utcnow()
+        await self.load_weights(db)
+        count_rows, candidate_rows = await self._load(db, slots, now)
+
+        tenants: Dict[str, Dict[str, Any]] = {}
+        job_types: Dict[str, Dict[str, int]] = {}
+        running_by_type: Dict[str, int] = {}
+        running_by_tenant: Dict[str, int] = {}
+        for status, job_type, t_id, c_id, n in count_rows:
+            tenant = tenant_key(t_id, c_id)
+            tenants.setdefault(tenant, {"pending": 0, "running": 0})[status] += n
+            job_types.setdefault(job_type, {"pending": 0, "running": 0})[status] += n
+            if status == "running":
+                running_by_type[job_type] = running_by_type.get(job_type, 0) + n
+                running_by_tenant[tenant] = running_by_tenant.get(tenant, 0) + n
+
+        candidates = [
+            {
+                "job_id": r.id,
+                "job_type": r.job_type,
+                "tenant": tenant_key(r.thinker_id, r.collection_id),
+                "effective_priority": float(r.effective_priority or 0),
+            }
+            for r in candidate_rows
+        ]
+        picks = self.plan(candidates, running_by_type, running_by_tenant, slots)
+
+        for tenant, depth in tenants.items():
+            depth["weight"] = self.weight(tenant)
+        for job_type, depth in job_types.items():
+            depth["cap"] = self.type_caps.get(job_type)
+        self._last_snapshot = {"at": now.isoformat(), "tenants": tenants, "job_types": job_types}
+
+        self._stats["rounds"] += 1
+        self._stats["jobs_picked"] += len(picks)
+        for p in picks:
+            self._decisions.append({
+                "at": now.isoformat(),
+                "job_id": p["job_id"],
+                "job_type": p["job_type"],
+                "tenant": p["tenant"],
+                "share": p["share"],  # Tenant's running / weight when picked
+                "effective_priority": round(p["effective_priority"], 1),
+            })
+        if picks:
+            log_now(f"Picked {len(picks)}/{slots} slots: " +
+                    ", ".join(f"{p['job_id']} ({p['job_type']}, {p['tenant']})" for p in picks[:10]))
+        return [p["job_id"] for p in picks]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "type_caps": self.type_caps,
+            "thinker_weight": self.thinker_weight,
+            "weight_overrides": dict(self._weights),
+            "aging_per_minute": self.aging_per_minute,
+            "queue": self._last_snapshot,
+            "recent_decisions": list(self._decisions)[-20:],
+        }
+
+
+# Singleton instance
+_scheduler: Optional[FairShareScheduler] = None
+
+
+def get_job_scheduler() -> FairShareScheduler:
+    """Get the process-wide job scheduler"""
+    global _scheduler
+    if _scheduler is None:
+        settings = get_settings()
+        _scheduler = FairShareScheduler(
+            type_caps=settings.get_scheduler_type_caps(),
+            thinker_weight=settings.scheduler_thinker_weight,
+            aging_per_minute=settings.scheduler_aging_per_minute,
+            candidate_limit=settings.scheduler_candidate_limit,
+        )
+    return _scheduler
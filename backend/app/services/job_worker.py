@@ -8,20 +8,31 @@ Includes watchdog for stuck jobs.
 import asyncio
 import json
 import logging
+import os
+import socket
 import traceback
 import sys
+import time
+import uuid
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any, List, Tuple
 from sqlalchemy import select, update, func, and_, or_, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..models import Job, Paper, Edition, Citation, RawSearchResult, FailedFetch, HarvestTarget, HarvestQuery, Thinker, ThinkerWork, ThinkerHarvestRun
-from ..database import async_session
+from ..models import Job, Paper, Edition, Citation, RawSearchResult, FailedFetch, HarvestTarget, HarvestQuery, Thinker, ThinkerWork, ThinkerHarvestRun, SchedulerWeight
+from ..database import async_session, bind_db_role
 from .edition_discovery import EditionDiscoveryService
 from .scholar_search import get_scholar_service
 from .citation_buffer import get_buffer, BufferedPage
+from .citation_ingest import get_ingest_queue, bulk_upsert_citations, PageAck
+from .citation_counters import apply_citation_deltas
 from .api_logger import log_api_call, log_harvest_query
 from .overflow_harvester import harvest_with_author_letter_strategy
+from .job_notify import get_job_listener, wait_for_job_event
+from .job_progress import get_progress_reporter
+from .job_scheduler import get_job_scheduler
+from .harvest_gaps import find_resume_candidates, rebuild_harvest_gaps_if_due
+from .known_ids import load_known_ids, KnownPageStop, pages_saved
 from ..config import get_settings
 
 logger = logging.getLogger(__name__)
@@ -104,7 +115,13 @@ def log_now(msg: str, level: str = "info"):
 # Job timeout settings
 JOB_TIMEOUT_MINUTES = 30  # Mark job as failed if no progress for this long
 HEARTBEAT_INTERVAL = 60  # Seconds between heartbeat updates
-ZOMBIE_CHECK_INTERVAL_MINUTES = 5  # How often to check for zombie jobs
+ZOMBIE_CHECK_INTERVAL_MINUTES = 1  # How often to check for zombie jobs (one indexed UPDATE - cheap)
+
+# Worker leases: a job is claimed by one worker process and owned until its lease expires
+# The owner renews every HEARTBEAT_INTERVAL, so a lease only expires if the owner is dead or hung
+JOB_LEASE_SECONDS = 300
+# Unique per process - several workers can share a host (multiple dynos, uvicorn --workers)
+WORKER_ID = os.environ.get("WORKER_ID") or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
 
 # Staleness threshold (for UI indicators)
 STALENESS_THRESHOLD_DAYS = 90
@@ -116,6 +133,7 @@ YEAR_BY_YEAR_THRESHOLD = 1000  # Legacy name kept for backwards compatibility
 # Global worker state
 _worker_task: Optional[asyncio.Task] = None
 _watchdog_task: Optional[asyncio.Task] = None
+_lease_task: Optional[asyncio.Task] = None
 _worker_running = False
 _last_job_processed: Optional[datetime] = None  # Track last successful job processing
 
@@ -125,49 +143,56 @@ _job_semaphore: Optional[asyncio.Semaphore] = None
 _running_tasks: Dict[int, Tuple[asyncio.Task, datetime]] = {}  # job_id -> (task, started_at) for cancellation
 JOB_HARD_TIMEOUT_HOURS = 4  # Cancel tasks that run longer than this
 _running_jobs: set = set()  # Track currently running job IDs
+_claimed_jobs: set = set()  # Job IDs this worker holds a lease on (claimed, running or waiting for a slot)
+_lease_stats = {"claimed": 0, "renewals": 0, "lost": 0, "zombies_reset": 0, "last_renewal": None}
 _last_zombie_check: Optional[datetime] = None  # Track when we last checked for zombies
 
-# Focus Mode: When set, ONLY jobs for this thinker's papers are processed
-# All other jobs are halted, auto-resume is disabled
-_focus_mode_thinker_id: Optional[int] = None
-_focus_mode_paper_ids: set = set()  # Pre-fetched paper IDs for focused thinker
-
-
-def enable_focus_mode(thinker_id: int, paper_ids: List[int]) -> Dict:
-    """Enable focus mode for a specific thinker. Only their jobs will run."""
-    global _focus_mode_thinker_id, _focus_mode_paper_ids
-    _focus_mode_thinker_id = thinker_id
-    _focus_mode_paper_ids = set(paper_ids)
-    log_now(f"[FOCUS MODE] ✓ ENABLED for thinker {thinker_id} with {len(paper_ids)} papers")
+# Focus Mode: the focused thinker gets scheduler_focus_weight in the fair-share
+# scheduler, so their jobs take most slots while everyone else still drains.
+# Stored as a scheduler_weights row (reason "focus") so every worker applies it.
+FOCUS_REASON = "focus"
+
+
+async def enable_focus_mode(db: AsyncSession, thinker_id: int, paper_ids: List[int]) -> Dict:
+    """Enable focus mode for a specific thinker: give their jobs the focus weight."""
+    scheduler = get_job_scheduler()
+    tenant = f"thinker:{thinker_id}"
+    previous = [t for t in await scheduler.clear_weights(db, reason=FOCUS_REASON) if t != tenant]
+    weight = get_settings().scheduler_focus_weight
+    await scheduler.set_weight(db, tenant, weight, reason=FOCUS_REASON, paper_count=len(paper_ids))
+    log_now(f"[FOCUS MODE] ✓ ENABLED for thinker {thinker_id} with {len(paper_ids)} papers (weight {weight})"
+            + (f", moved from {', '.join(previous)}" if previous else ""))
     return {
         "enabled": True,
         "thinker_id": thinker_id,
         "paper_count": len(paper_ids),
-        "message": f"Focus mode enabled. Only jobs for thinker {thinker_id} will run."
+        "weight": weight,
+        "message": f"Focus mode enabled. Thinker {thinker_id}'s jobs get weight {weight} in the scheduler."
     }
 
 
-def disable_focus_mode() -> Dict:
-    """Disable focus mode. All jobs will run normally."""
-    global _focus_mode_thinker_id, _focus_mode_paper_ids
-    old_thinker = _focus_mode_thinker_id
-    _focus_mode_thinker_id = None
-    _focus_mode_paper_ids = set()
+async def disable_focus_mode(db: AsyncSession) -> Dict:
+    """Disable focus mode. All tenants go back to their default weights."""
+    cleared = await get_job_scheduler().clear_weights(db, reason=FOCUS_REASON)
+    old_thinker = int(cleared[0].split(":", 1)[1]) if cleared else None
     log_now(f"[FOCUS MODE] ✗ DISABLED (was thinker {old_thinker})")
     return {
         "enabled": False,
         "previous_thinker_id": old_thinker,
-        "message": "Focus mode disabled. All jobs will run normally."
+        "message": "Focus mode disabled. All jobs are scheduled with their default weights."
     }
 
 
-def get_focus_mode_status() -> Dict:
+async def get_focus_mode_status(db: AsyncSession) -> Dict:
     """Get current focus mode status."""
+    result = await db.execute(select(SchedulerWeight).where(SchedulerWeight.reason == FOCUS_REASON))
+    focus = result.scalars().first()
     return {
-        "enabled": _focus_mode_thinker_id is not None,
-        "thinker_id": _focus_mode_thinker_id,
-        "paper_count": len(_focus_mode_paper_ids),
-        "paper_ids": list(_focus_mode_paper_ids) if len(_focus_mode_paper_ids) <= 50 else f"{len(_focus_mode_paper_ids)} papers"
+        "enabled": focus is not None,
+        "thinker_id": int(focus.tenant.split(":", 1)[1]) if focus else None,
+        "paper_count": (focus.paper_count or 0) if focus else 0,
+        "weight": focus.weight if focus else None,
+        "since": focus.updated_at.isoformat() if focus and focus.updated_at else None,
     }
 
 
@@ -178,30 +203,20 @@ async def update_job_progress(
     message: str,
     details: Optional[Dict[str, Any]] = None,
 ):
-    """Update job progress in database with heartbeat timestamp and optional detailed progress data"""
-    log_now(f"[Job {job_id}] Progress: {progress:.1f}% - {message}")
+    """
+    Report job progress (and optional detailed progress data for the UI).
 
-    values = {
-        "progress": progress,
-        "progress_message": message,
-        "started_at": datetime.utcnow(),  # Use started_at as heartbeat (hacky but works)
-    }
+    Goes through the progress reporter: the latest values are kept in memory and
+    written - with the heartbeat - at most every job_progress_flush_seconds.
+    Still ends the caller's open transaction, as before; callers rely on that to
+    persist their own changes between progress updates.
+    """
+    log_now(f"[Job {job_id}] Progress: {progress:.1f}% - {message}")
 
-    # If details provided, merge into existing params under 'progress_details' key
-    if details:
-        # Get existing params
-        result = await db.execute(select(Job.params).where(Job.id == job_id))
-        existing_params_str = result.scalar()
-        existing_params = json.loads(existing_params_str) if existing_params_str else {}
-        existing_params["progress_details"] = details
-        values["params"] = json.dumps(existing_params)
+    get_progress_reporter().report(job_id, progress=progress, message=message, details=details)
 
-    await db.execute(
-        update(Job)
-        .where(Job.id == job_id)
-        .values(**values)
-    )
-    await db.commit()
+    if db.in_transaction():
+        await db.commit()
 
 
 async def save_buffered_citations(page: 'BufferedPage') -> int:
@@ -209,50 +224,20 @@ async def save_buffered_citations(page: 'BufferedPage') -> int:
     Save citations from a buffered page to the database.
 
     Called by the retry mechanism to process failed saves.
-    Returns count of citations saved.
+    Returns count of citations saved (new + duplicate encounters).
     """
-    from sqlalchemy.dialects.postgresql import insert as pg_insert
-
     papers = page.papers
     paper_id = page.paper_id
     target_edition_id = page.target_edition_id
 
     log_now(f"[RETRY] Processing buffered page {page.page_num} for job {page.job_id}: {len(papers)} papers")
 
-    saved_count = 0
-
     async with async_session() as db:
         try:
-            for paper_data in papers:
-                if not isinstance(paper_data, dict):
-                    continue
-
-                scholar_id = paper_data.get("scholarId")
-                if not scholar_id:
-                    continue
-
-                stmt = pg_insert(Citation).values(
-                    paper_id=paper_id,
-                    edition_id=target_edition_id,
-                    scholar_id=scholar_id,
-                    title=paper_data.get("title", "Unknown"),
-                    authors=paper_data.get("authorsRaw"),
-                    year=paper_data.get("year"),
-                    venue=paper_data.get("venue"),
-                    abstract=paper_data.get("abstract"),
-                    link=paper_data.get("link"),
-                    citation_count=paper_data.get("citationCount", 0),
-                    intersection_count=1,
-                    encounter_count=1,
-                ).on_conflict_do_update(
-                    index_elements=['paper_id', 'scholar_id'],
-                    set_={'encounter_count': Citation.encounter_count + 1}
-                )
-                await db.execute(stmt)
-                saved_count += 1
-
+            inserted, duplicates = await bulk_upsert_citations(db, paper_id, target_edition_id, papers)
             await db.commit()
-            log_now(f"[RETRY] ✓ Saved {saved_count} citations from buffered page {page.page_num}")
+            saved_count = len(inserted) + len(duplicates)
+            log_now(f"[RETRY] ✓ Saved {saved_count} citations from buffered page {page.page_num} ({len(inserted)} new, {len(duplicates)} duplicates)")
             return saved_count
 
         except Exception as e:
@@ -265,98 +250,46 @@ async def save_buffered_citations(page: 'BufferedPage') -> int:
 
 
 async def update_edition_harvest_stats(db: AsyncSession, edition_id: int):
-    """Update edition harvest tracking after citation extraction"""
-    from sqlalchemy import func
+    """Update edition harvest tracking after citation extraction.
 
+    harvested_citation_count is maintained by apply_citation_deltas as citations
+    are inserted, so this only stamps the harvest time.
+    """
     current_year = datetime.now().year
 
-    # Count actual harvested citations for this edition
     result = await db.execute(
-        select(func.count(Citation.id)).where(Citation.edition_id == edition_id)
-    )
-    harvested_count = result.scalar() or 0
-
-    # Update edition
-    await db.execute(
         update(Edition)
         .where(Edition.id == edition_id)
         .values(
             last_harvested_at=datetime.utcnow(),
             last_harvest_year=current_year,
-            harvested_citation_count=harvested_count
         )
+        .returning(Edition.harvested_citation_count)
     )
+    harvested_count = result.scalar() or 0
     await db.commit()
     log_now(f"[Harvest] Updated edition {edition_id}: last_harvested_at=now, year={current_year}, count={harvested_count}")
 
 
 async def update_paper_harvest_stats(db: AsyncSession, paper_id: int):
-    """Update paper-level aggregate harvest stats from edition data"""
+    """Update paper-level harvest time from edition data (citation totals are delta-maintained)"""
     from sqlalchemy import func
 
-    # Get aggregates from editions
     result = await db.execute(
-        select(
-            func.max(Edition.last_harvested_at),
-            func.sum(Edition.harvested_citation_count)
-        ).where(Edition.paper_id == paper_id)
+        select(func.max(Edition.last_harvested_at)).where(Edition.paper_id == paper_id)
     )
-    row = result.first()
+    any_harvested_at = result.scalar()
 
-    any_harvested_at = row[0] if row else None
-    total_harvested = row[1] or 0 if row else 0
-
-    # Update paper
-    await db.execute(
+    result = await db.execute(
         update(Paper)
         .where(Paper.id == paper_id)
-        .values(
-            any_edition_harvested_at=any_harvested_at,
-            total_harvested_citations=int(total_harvested)
-        )
+        .values(any_edition_harvested_at=any_harvested_at)
+        .returning(Paper.total_harvested_citations)
     )
+    total_harvested = result.scalar() or 0
     await db.commit()
     log_now(f"[Harvest] Updated paper {paper_id}: any_harvested_at={any_harvested_at}, total={total_harvested}")
 
-    # Update thinker total_citations if this paper belongs to a thinker
-    await update_thinker_citation_stats(db, paper_id)
-
-
-async def update_thinker_citation_stats(db: AsyncSession, paper_id: int):
-    """Update thinker's total_citations if this paper belongs to a thinker work."""
-    from sqlalchemy import func
-
-    # Find if this paper is linked to a thinker work
-    result = await db.execute(
-        select(ThinkerWork.thinker_id)
-        .where(ThinkerWork.paper_id == paper_id)
-        .where(ThinkerWork.decision == "accepted")
-    )
-    thinker_id = result.scalar()
-
-    if not thinker_id:
-        return  # Not a thinker paper
-
-    # Calculate total citations for this thinker
-    citation_result = await db.execute(
-        select(func.count(Citation.id.distinct()))
-        .select_from(ThinkerWork)
-        .join(Paper, ThinkerWork.paper_id == Paper.id)
-        .join(Citation, Citation.paper_id == Paper.id)
-        .where(ThinkerWork.thinker_id == thinker_id)
-        .where(ThinkerWork.decision == "accepted")
-    )
-    total_citations = citation_result.scalar() or 0
-
-    # Update thinker
-    await db.execute(
-        update(Thinker)
-        .where(Thinker.id == thinker_id)
-        .values(total_citations=total_citations)
-    )
-    await db.commit()
-    log_now(f"[Harvest] Updated thinker {thinker_id} total_citations: {total_citations}")
-
 
 async def create_or_update_harvest_target(
     db: AsyncSession,
@@ -703,6 +636,8 @@ async def process_retry_failed_fetches_job(job: Job, db: AsyncSession) -> Dict[s
                     existing_ids.add(scholar_id)
                     new_count += 1
 
+                await db.flush()
+                await apply_citation_deltas(db, {(edition.paper_id, edition.id): new_count})
                 await db.commit()
 
                 # Mark as succeeded
@@ -739,9 +674,6 @@ async def process_retry_failed_fetches_job(job: Job, db: AsyncSession) -> Dict[s
             await db.commit()
             failed_again += 1
 
-        # Small delay between retries
-        await asyncio.sleep(3)
-
     log_now(f"[RetryFailed] Complete: {succeeded} succeeded, {failed_again} failed, {total_recovered} citations recovered")
 
     return {
@@ -834,7 +766,7 @@ def monitor_job_creation_rate(paper_id: int, job_type: str) -> None:
         )
 
 
-async def find_incomplete_harvests(db: AsyncSession) -> List[Edition]:
+async def find_incomplete_harvests(db: AsyncSession, limit: int = MAX_CONCURRENT_JOBS) -> List[Edition]:
     """Find editions with incomplete harvests that should be resumed.
 
     Returns editions where:
@@ -848,85 +780,69 @@ async def find_incomplete_harvests(db: AsyncSession) -> List[Edition]:
     - Harvest is not stalled (harvest_stall_count < AUTO_RESUME_MAX_STALL_COUNT)
     - Harvest is not marked complete (harvest_complete = False - gap is GS's fault)
     - Has real work to do (either no harvest_targets, or at least one incomplete target)
-    """
-    from sqlalchemy import and_, or_, not_, exists
-    from sqlalchemy.orm import joinedload
 
-    # Subquery: papers with pending/running extract_citations jobs
-    papers_with_jobs = (
-        select(Job.paper_id)
-        .where(
-            Job.job_type == "extract_citations",
-            Job.status.in_(["pending", "running"])
-        )
+    All of that is precomputed in edition_harvest_gaps, so this is one index scan
+    plus a primary-key fetch of the editions (largest gap first).
+    """
+    gaps = await find_resume_candidates(
+        db,
+        limit=limit,
+        min_missing=AUTO_RESUME_MIN_MISSING,
+        min_percent=AUTO_RESUME_MIN_PERCENT,
+        max_stall_count=AUTO_RESUME_MAX_STALL_COUNT,
     )
+    if not gaps:
+        return []
 
-    # Subquery: paused papers
-    paused_papers = (
-        select(Paper.id)
-        .where(Paper.harvest_paused == True)
-    )
+    result = await db.execute(select(Edition).where(Edition.id.in_([g.edition_id for g in gaps])))
+    editions = {e.id: e for e in result.scalars().all()}
+    return [editions[g.edition_id] for g in gaps if g.edition_id in editions]
 
-    # Subquery: check if edition has no harvest_targets at all
-    has_no_targets = ~exists(
-        select(HarvestTarget.id).where(HarvestTarget.edition_id == Edition.id)
-    )
 
-    # Subquery: check if edition has at least one incomplete harvest_target
-    # Include targets with expected_count=0 (never queried yet) OR expected_count > 0 and not complete
-    has_incomplete_target = exists(
-        select(HarvestTarget.id).where(
-            HarvestTarget.edition_id == Edition.id,
-            HarvestTarget.status != 'complete',
-            or_(
-                HarvestTarget.expected_count > 0,  # Has known work to do
-                and_(HarvestTarget.expected_count == 0, HarvestTarget.actual_count == 0)  # Never queried
-            )
-        )
-    )
+async def bulk_create_resume_jobs(db: AsyncSession, editions_by_paper: Dict[int, List[Edition]]) -> Dict[int, int]:
+    """
+    Queue one auto-resume extract_citations job per paper in a single INSERT.
+
+    Papers that already have a pending/running extract_citations job are skipped
+    by the ix_jobs_active_paper_type unique index (ON CONFLICT DO NOTHING), the
+    same guarantee create_extract_citations_job relies on. Returns {paper_id: job_id}
+    for the jobs actually created. The caller commits.
+    """
+    from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+    if not editions_by_paper:
+        return {}
+
+    now = datetime.utcnow()
+    rows = []
+    for paper_id, paper_editions in editions_by_paper.items():
+        total_missing = sum(e.citation_count - (e.harvested_citation_count or 0) for e in paper_editions)
+        rows.append({
+            "paper_id": paper_id,
+            "job_type": "extract_citations",
+            "status": "pending",
+            "priority": 0,
+            "params": json.dumps({
+                "edition_ids": [e.id for e in paper_editions],
+                "max_citations_per_edition": 1000,
+                "skip_threshold": 50000,
+                "is_resume": True,
+            }),
+            "progress": 0,
+            "progress_message": f"Auto-resume: {len(paper_editions)} editions, {total_missing:,} citations remaining",
+            "created_at": now,
+        })
 
-    # Find incomplete editions
     result = await db.execute(
-        select(Edition)
-        .where(
-            Edition.selected == True,
-            Edition.scholar_id.isnot(None),  # Must have scholar_id to harvest
-            Edition.citation_count.isnot(None),
-            Edition.citation_count > 0,
-            Edition.citation_count <= 50000,  # Skip very large editions (matches skip_threshold)
-            Edition.harvested_citation_count < Edition.citation_count,
-            # Gap must be significant
-            or_(
-                Edition.citation_count - Edition.harvested_citation_count >= AUTO_RESUME_MIN_MISSING,
-                (Edition.citation_count - Edition.harvested_citation_count) * 1.0 / Edition.citation_count >= AUTO_RESUME_MIN_PERCENT
-            ),
-            # No active job for this paper
-            Edition.paper_id.notin_(papers_with_jobs),
-            # Paper is not paused
-            Edition.paper_id.notin_(paused_papers),
-            # Harvest is not stalled (too many zero-progress jobs)
-            or_(
-                Edition.harvest_stall_count.is_(None),
-                Edition.harvest_stall_count < AUTO_RESUME_MAX_STALL_COUNT
-            ),
-            # Harvest is not already marked complete (gap is GS's fault, not ours)
-            or_(
-                Edition.harvest_complete.is_(None),
-                Edition.harvest_complete == False
-            ),
-            # Must have real work to do: either no targets yet, or incomplete targets
-            # This filters out "false gap" editions where all harvest_targets are complete
-            # (gap is due to duplicate citations in Google Scholar that we correctly deduplicate)
-            or_(has_no_targets, has_incomplete_target)
-        )
-        .order_by(
-            # Prioritize: larger gaps first
-            (Edition.citation_count - Edition.harvested_citation_count).desc()
-        )
-        .limit(MAX_CONCURRENT_JOBS)  # Don't queue more than we can process
+        pg_insert(Job)
+        .values(rows)
+        .on_conflict_do_nothing()
+        .returning(Job.id, Job.paper_id)
     )
-
-    return list(result.scalars().all())
+    created = {r.paper_id: r.id for r in result.all()}
+    for paper_id in created:
+        monitor_job_creation_rate(paper_id, "extract_citations")
+    return created
 
 
 async def auto_resume_incomplete_harvests(db: AsyncSession) -> int:
@@ -943,113 +859,37 @@ async def auto_resume_incomplete_harvests(db: AsyncSession) -> int:
         return 0
     _last_auto_resume_check = now
 
+    # Backfill the gap table on first run, then correct any counter drift now and then
+    try:
+        await rebuild_harvest_gaps_if_due(db)
+    except Exception as e:
+        await db.rollback()
+        log_now(f"[AutoResume] Harvest gap rebuild failed: {e}", "warn")
+
     incomplete = await find_incomplete_harvests(db)
-    log_now(f"[AutoResume] find_incomplete_harvests returned {len(incomplete) if incomplete else 0} editions")
     if not incomplete:
-        log_now("[AutoResume] No incomplete harvests found - all caught up!")
         return 0
 
-    # Safety filter: double-check that editions have real work to do
-    # (The query now filters this, but we keep this as a sanity check)
-    actually_incomplete = []
-    log_now(f"[AutoResume] Verifying {len(incomplete)} editions have real work...")
-    for edition in incomplete:
-        # Check if this edition has any incomplete harvest_targets with expected > 0
-        result = await db.execute(
-            select(HarvestTarget)
-            .where(HarvestTarget.edition_id == edition.id)
-            .where(HarvestTarget.status != 'complete')
-            .where(HarvestTarget.expected_count > 0)
-            .limit(1)  # Just need to know if ANY exist
-        )
-        has_incomplete = result.scalar_one_or_none() is not None
-
-        # Also check: if edition has NO harvest_targets at all, it needs to be harvested
-        if not has_incomplete:
-            count_result = await db.execute(
-                select(func.count(HarvestTarget.id))
-                .where(HarvestTarget.edition_id == edition.id)
-            )
-            has_any_targets = count_result.scalar() > 0
-
-            if has_any_targets:
-                # Has targets but all complete - skip this edition
-                log_now(f"[AutoResume] Skipping edition {edition.id}: all harvest_targets complete (gap is inflated metrics)")
-                continue
-            # else: No targets yet - needs harvesting
-
-        actually_incomplete.append(edition)
-
-    if not actually_incomplete:
-        log_now(f"[AutoResume] Found {len(incomplete)} editions with gaps, but all harvest_targets are complete - no real work to do")
-        return 0
-
-    if len(actually_incomplete) < len(incomplete):
-        log_now(f"[AutoResume] Filtered {len(incomplete)} candidates down to {len(actually_incomplete)} with incomplete harvest_targets")
-
     # GROUP editions by paper_id to avoid duplicate jobs for same paper
     # This is critical - multiple editions of same paper share citations!
     editions_by_paper: Dict[int, List[Edition]] = {}
-    for edition in actually_incomplete:
-        if edition.paper_id not in editions_by_paper:
-            editions_by_paper[edition.paper_id] = []
-        editions_by_paper[edition.paper_id].append(edition)
-
-    log_now(f"[AutoResume] Found {len(actually_incomplete)} incomplete editions across {len(editions_by_paper)} papers")
-
-    # Pre-fetch which papers belong to thinkers (for priority boost)
-    paper_ids = list(editions_by_paper.keys())
-    thinker_paper_result = await db.execute(
-        select(ThinkerWork.paper_id)
-        .where(ThinkerWork.paper_id.in_(paper_ids))
-        .where(ThinkerWork.decision == "accepted")
-    )
-    thinker_papers = set(row[0] for row in thinker_paper_result.fetchall())
-    if thinker_papers:
-        log_now(f"[AutoResume] {len(thinker_papers)} papers belong to thinkers - will get priority 100")
+    for edition in incomplete:
+        editions_by_paper.setdefault(edition.paper_id, []).append(edition)
 
-    jobs_queued = 0
-    jobs_skipped_existing = 0
+    log_now(f"[AutoResume] Found {len(incomplete)} incomplete editions across {len(editions_by_paper)} papers")
     for paper_id, paper_editions in editions_by_paper.items():
-        # Log all editions for this paper
-        total_missing = sum(e.citation_count - e.harvested_citation_count for e in paper_editions)
-        edition_ids = [e.id for e in paper_editions]
-        is_thinker_paper = paper_id in thinker_papers
-        priority = 100 if is_thinker_paper else 0
-        log_now(f"[AutoResume] Paper {paper_id}: {len(paper_editions)} editions with {total_missing:,} total missing citations (priority={priority})")
-        for e in paper_editions:
-            missing = e.citation_count - e.harvested_citation_count
-            log_now(f"[AutoResume]   - Edition {e.id}: {e.harvested_citation_count}/{e.citation_count} harvested ({missing} missing)")
-
-        # Use create_extract_citations_job with duplicate prevention
-        # This returns existing job if one exists, preventing duplicates
-        before_create = datetime.utcnow()
-        job = await create_extract_citations_job(
-            db=db,
-            paper_id=paper_id,
-            edition_ids=edition_ids,
-            max_citations_per_edition=1000,
-            skip_threshold=50000,
-            is_resume=True,
-            resume_message=f"Auto-resume: {len(paper_editions)} editions, {total_missing:,} citations remaining",
-            priority=priority,
-        )
+        total_missing = sum(e.citation_count - (e.harvested_citation_count or 0) for e in paper_editions)
+        log_now(f"[AutoResume] Paper {paper_id}: {len(paper_editions)} editions with {total_missing:,} total missing citations "
+                f"(editions {', '.join(str(e.id) for e in paper_editions)})")
 
-        # Check if this was an existing job (created before our call) or a new one
-        # Job is new if created_at >= before_create (job was created during our call)
-        is_new_job = job.created_at and job.created_at >= before_create
-        if is_new_job:
-            jobs_queued += 1
-            log_now(f"[AutoResume] Queued job {job.id} for paper {paper_id} covering {len(paper_editions)} editions")
-        else:
-            jobs_skipped_existing += 1
-            log_now(f"[AutoResume] Paper {paper_id}: existing job {job.id} found (status={job.status}), skipping duplicate")
-
-    if jobs_queued > 0 or jobs_skipped_existing > 0:
-        await db.commit()
-        log_now(f"[AutoResume] Queued {jobs_queued} new jobs, skipped {jobs_skipped_existing} (existing jobs found)")
+    # No priority boost for thinker papers: the scheduler already gives thinker
+    # tenants scheduler_thinker_weight, and a flat 100 starved everything else
+    created = await bulk_create_resume_jobs(db, editions_by_paper)
+    await db.commit()
 
-    return jobs_queued
+    jobs_skipped_existing = len(editions_by_paper) - len(created)
+    log_now(f"[AutoResume] Queued {len(created)} new jobs, skipped {jobs_skipped_existing} (existing jobs found)")
+    return len(created)
 
 
 async def process_fetch_more_job(job: Job, db: AsyncSession) -> Dict[str, Any]:
@@ -1356,6 +1196,11 @@ async def process_extract_citations_job(job: Job, db: AsyncSession) -> Dict[str,
     # Stats tracking
     total_new_citations = 0
     total_updated_citations = 0
+    buffer_seq = 0  # Local buffer key for queued pages (see save_page_citations)
+
+    # Incremental refresh: standard editions page newest-first and stop at known citations
+    known_ids = None  # Loaded on first use - KnownIdFilter of the paper's harvested scholar_ids
+    refresh_stats = {"editions_early_stop": 0, "stopped_early": 0, "pages_fetched": 0, "pages_saved": 0}
 
     scholar_service = get_scholar_service()
     total_editions = len(valid_editions)
@@ -1373,11 +1218,13 @@ async def process_extract_citations_job(job: Job, db: AsyncSession) -> Dict[str,
         # but for merged editions it points to their canonical edition
         target_edition_id = edition.id
 
-        # First, update harvest stats to capture any zombie job progress (citations saved but stats not updated)
+        # Stamp the harvest and reload the edition: harvested_citation_count moves in the
+        # same transaction as every citation insert, so it includes a dead job's saved pages
+        previous_harvested_at = edition.last_harvested_at
         await update_edition_harvest_stats(db, edition.id)
         await db.refresh(edition)
 
-        # Calculate resume page from ACTUAL harvested count (updated by update_edition_harvest_stats above)
+        # Calculate resume page from ACTUAL harvested count
         # This handles zombie jobs where server died but citations were saved
         calculated_resume_page = 0
         if edition.harvested_citation_count and edition.harvested_citation_count > 0:
@@ -1385,10 +1232,11 @@ async def process_extract_citations_job(job: Job, db: AsyncSession) -> Dict[str,
             calculated_resume_page = edition.harvested_citation_count // 10
             log_now(f"[Worker] Edition {edition.id} has {edition.harvested_citation_count} harvested citations -> calculated page {calculated_resume_page}")
 
-        # Also check resume_state from job params (may be stale if created before stats updated)
+        # Also check the job's saved resume state (may be stale if created before stats updated)
+        # Lives in jobs.resume_state; older jobs kept it in params
         params_resume_page = 0
-        if params.get("resume_state"):
-            resume_state = params["resume_state"]
+        resume_state = json.loads(job.resume_state) if job.resume_state else params.get("resume_state")
+        if resume_state:
             if resume_state.get("edition_id") == edition.id:
                 params_resume_page = resume_state.get("last_page", 0)
                 log_now(f"[Worker] Job params specify resume from page {params_resume_page}")
@@ -1398,11 +1246,12 @@ async def process_extract_citations_job(job: Job, db: AsyncSession) -> Dict[str,
         if resume_page > 0:
             log_now(f"[Worker] ✓ Resuming edition {edition.id} from page {resume_page}")
 
-        # Callback to save citations IMMEDIATELY after each page
-        # IMPORTANT: Uses fresh DB session to avoid greenlet context issues
-        # when callback is invoked from within scholar_search after async context switches
+        # Callback to hand each page to the write-behind ingest queue
+        # The page is buffered locally first, then queued; the scraper moves on while the
+        # ingest writer batches it into an upsert. Counters, progress and resume state are
+        # advanced in on_page_saved - i.e. only after the page is durably written.
         async def save_page_citations(page_num: int, papers: List[Dict]):
-            nonlocal total_new_citations, total_updated_citations, existing_scholar_ids, params, target_edition_id
+            nonlocal existing_scholar_ids, buffer_seq
 
             log_now(f"[CALLBACK] ═══════════════════════════════════════════════")
             log_now(f"[CALLBACK] save_page_citations called")
@@ -1419,200 +1268,132 @@ async def process_extract_citations_job(job: Job, db: AsyncSession) -> Dict[str,
                 log_now(f"[CALLBACK] First paper: {papers[0]}")
                 log_now(f"[CALLBACK] First paper type: {type(papers[0])}")
 
-            new_count = 0
+            # Citations already sent earlier in this run are not re-sent
+            # (their encounter was counted then)
+            to_upsert = []
             skipped_no_id = 0
-
-            # STEP 1: Save to local buffer FIRST (resilient to DB timeouts)
+            skipped_seen = 0
+            for idx, paper_data in enumerate(papers):
+                if not isinstance(paper_data, dict):
+                    log_now(f"[CALLBACK] Paper {idx} is not a dict! Type: {type(paper_data)}, Value: {paper_data}")
+                    continue
+                scholar_id = paper_data.get("scholarId")
+                if not scholar_id:
+                    skipped_no_id += 1
+                elif scholar_id in existing_scholar_ids:
+                    skipped_seen += 1
+                else:
+                    to_upsert.append(paper_data)
+                    existing_scholar_ids.add(scholar_id)
+
+            # STEP 1: Save to local buffer FIRST (survives a crash while the page is queued)
+            # Keyed by a per-job sequence, not page_num: partitions restart at page 0 and
+            # several pages of the same job can be queued at once
+            buffer_seq += 1
+            buffer_key = buffer_seq
             buffer = get_buffer()
             buffer.save_page(
                 job_id=job.id,
                 paper_id=paper_id,
                 edition_id=edition.id,
                 target_edition_id=target_edition_id,
-                page_num=page_num,
-                papers=papers
+                page_num=buffer_key,
+                papers=to_upsert
             )
-            log_now(f"[CALLBACK] ✓ Buffered page {page_num + 1} locally ({len(papers)} papers)")
-
-            # STEP 2: Try to save to DB
-            # Use a FRESH session to avoid greenlet context issues
-            # The parent session's greenlet context can be lost during async operations
-            # (rate limits, retries) in scholar_search.py
-            # CRITICAL: Wrap the entire session block in try/except to catch CancelledError
-            # which can occur during DB connection and corrupts greenlet state
-            try:
-                async with async_session() as callback_db:
-                    for idx, paper_data in enumerate(papers):
-                        if not isinstance(paper_data, dict):
-                            log_now(f"[CALLBACK] Paper {idx} is not a dict! Type: {type(paper_data)}, Value: {paper_data}")
-                            continue
-
-                        scholar_id = paper_data.get("scholarId")
-                        if not scholar_id:
-                            skipped_no_id += 1
-                            continue
-
-                        if scholar_id in existing_scholar_ids:
-                            # Already exists in memory - skip
-                            total_updated_citations += 1
-                        else:
-                            # NEW citation - use INSERT ON CONFLICT DO UPDATE to track duplicate encounters
-                            # This helps reconcile our count vs GS count (GS tolerates duplicates, we don't)
-                            from sqlalchemy import text
-                            from sqlalchemy.dialects.postgresql import insert as pg_insert
-
-                            # Use target_edition_id - allows merged editions to redirect citations to canonical
-                            from datetime import datetime as dt
-                            stmt = pg_insert(Citation).values(
-                                paper_id=paper_id,
-                                edition_id=target_edition_id,  # May differ from edition.id for merged editions
-                                scholar_id=scholar_id,
-                                title=paper_data.get("title", "Unknown"),
-                                authors=paper_data.get("authorsRaw"),
-                                year=paper_data.get("year"),
-                                venue=paper_data.get("venue"),
-                                abstract=paper_data.get("abstract"),
-                                link=paper_data.get("link"),
-                                citation_count=paper_data.get("citationCount", 0),
-                                intersection_count=1,
-                                encounter_count=1,
-                                created_at=dt.utcnow(),  # MUST set explicitly for pg_insert (ORM defaults don't apply)
-                            ).on_conflict_do_update(
-                                index_elements=['paper_id', 'scholar_id'],
-                                set_={'encounter_count': Citation.encounter_count + 1}
-                            )
-                            result = await callback_db.execute(stmt)
-
-                            # rowcount is always 1 for upserts (insert or update)
-                            # We need to check xmax to determine if this was an insert
-                            # For now, track based on memory set (if not in set, it's new to this run)
-                            if scholar_id not in existing_scholar_ids:
-                                new_count += 1
-                                total_new_citations += 1
-                            else:
-                                # Duplicate detected - already exists from concurrent job or earlier in this run
-                                total_updated_citations += 1
-
-                            existing_scholar_ids.add(scholar_id)
-
-                    # COMMIT IMMEDIATELY after each page
-                    await callback_db.commit()
-
-                    # STEP 3: DB save successful - remove from buffer
-                    buffer.mark_saved(job.id, page_num)
-                    log_now(f"[CALLBACK] ✓ DB save successful, buffer cleared")
-                    log_now(f"[CALLBACK] ✓ Page {page_num + 1} complete: {new_count} new, {skipped_no_id} skipped (no ID), total: {total_new_citations}")
-
-                    # Log citation saves for activity stats
-                    if new_count > 0:
-                        asyncio.create_task(log_api_call(
-                            call_type='citation_save',
-                            job_id=job.id,
-                            edition_id=target_edition_id,
-                            count=new_count,
-                            success=True
-                        ))
-
-                    # Update job progress with current state for resume
-                    # Cap progress at 90% (leave 10% for completion), handle author-letter mode with many pages
-                    raw_progress = 10 + ((i + min(page_num / 100, 0.9)) / total_editions) * 80
-                    progress_pct = min(raw_progress, 90)
-                    year_info = f" ({current_harvest_year['year']})" if current_harvest_year['year'] else ""
-
-                    # Update job progress using fresh session
-                    # Store progress details in params["progress_details"] (Job model has no 'details' column)
-                    # Build current query for UI visibility
-                    current_query = f"cites:{edition.scholar_id}"
-                    if current_harvest_year.get("year"):
-                        current_query += f" year:{current_harvest_year['year']}"
-                    elif effective_year_low:
-                        current_query += f" year_low:{effective_year_low}"
-
-                    params["progress_details"] = {
-                        "edition_index": i + 1,
-                        "editions_total": total_editions,
-                        "edition_id": edition.id,
-                        "edition_title": edition.title[:80] if edition.title else "Unknown",
-                        "edition_language": edition.language,
-                        "edition_citation_count": edition.citation_count,
-                        "current_page": page_num + 1,
-                        "current_year": current_harvest_year.get("year"),
-                        "harvest_mode": current_harvest_year.get("mode", "standard"),
-                        "citations_saved": total_new_citations,
-                        "citations_this_edition": total_new_citations - edition_start_citations,
-                        "citations_updated": total_updated_citations,
-                        "stage": "harvesting",
-                        # CRITICAL: Include these for UI display (was missing, causing "Already Had: 0" bug)
-                        "previously_harvested": total_previously_harvested,
-                        "target_citations_total": total_target_citations,
-                        # Real-time query visibility
-                        "current_query": current_query,
-                    }
-                    await callback_db.execute(
-                        update(Job)
-                        .where(Job.id == job.id)
-                        .values(
-                            progress=progress_pct,
-                            progress_message=f"Edition {i+1}/{total_editions}{year_info}, page {page_num + 1}: {total_new_citations} citations saved",
-                            params=json.dumps(params),
-                        )
-                    )
-                    await callback_db.commit()
-
-                    # REAL-TIME STATS UPDATE: Every 10 pages, update edition and thinker totals
-                    # This keeps the UI in sync without excessive DB writes
-                    if (page_num + 1) % 10 == 0 or new_count >= 5:
-                        try:
-                            # Update edition's harvested_citation_count
-                            actual_count_result = await callback_db.execute(
-                                text("SELECT COUNT(*) FROM citations WHERE edition_id = :ed_id"),
-                                {"ed_id": target_edition_id}
-                            )
-                            actual_count = actual_count_result.scalar() or 0
-                            await callback_db.execute(
-                                update(Edition)
-                                .where(Edition.id == target_edition_id)
-                                .values(harvested_citation_count=actual_count)
-                            )
-
-                            # Update thinker total if this is a thinker paper
-                            await update_thinker_citation_stats(callback_db, paper_id)
-                            await callback_db.commit()
-                            log_now(f"[CALLBACK] ✓ Real-time stats updated: edition {target_edition_id} = {actual_count}")
-                        except Exception as stats_err:
-                            log_now(f"[CALLBACK] Stats update failed (non-fatal): {stats_err}")
-
-                    # Save resume state (update params dict and serialize to job)
-                    # MUST be inside fresh session block to avoid greenlet issues
-                    params["resume_state"] = {
-                        "edition_id": edition.id,
-                        "last_page": page_num + 1,
-                        "total_citations": total_new_citations,
-                    }
-                    await callback_db.execute(
-                        update(Job)
-                        .where(Job.id == job.id)
-                        .values(params=json.dumps(params))
-                    )
-                    await callback_db.commit()
-
-                # Return count of new citations for harvest tracking (used by overflow_harvester)
-                return new_count
-
-            except asyncio.CancelledError:
-                # Task was cancelled (timeout, shutdown, etc.) - this corrupts greenlet state
-                # Mark for buffer retry and re-raise to propagate cancellation
-                log_now(f"[CALLBACK] ⚠ Task cancelled during DB save - page {page_num + 1} buffered for retry")
-                buffer.mark_failed(job.id, page_num, "CancelledError during DB save")
-                raise
+            log_now(f"[CALLBACK] ✓ Buffered page {page_num + 1} locally ({len(to_upsert)} to write, {skipped_seen} already sent, {skipped_no_id} no ID)")
+
+            # Snapshot loop state now - the ack runs later
+            page_edition = edition
+            page_edition_index = i
+            page_target_edition_id = target_edition_id
+            page_year = current_harvest_year.get("year")
+            page_mode = current_harvest_year.get("mode", "standard")
+            page_year_low = effective_year_low
+
+            async def on_page_saved(ack: PageAck):
+                """Runs in the ingest writer after the page is committed"""
+                nonlocal total_new_citations, total_updated_citations
+
+                new_count = ack.new_count
+                total_new_citations += new_count
+                # Already sent this run, or already in DB (another edition, concurrent job, earlier run)
+                total_updated_citations += skipped_seen + len(ack.duplicates)
+                log_now(f"[CALLBACK] ✓ Page {page_num + 1} saved: {new_count} new, {len(ack.duplicates)} duplicates, {skipped_no_id} skipped (no ID), total: {total_new_citations}")
+
+                # Log citation saves for activity stats
+                if new_count > 0:
+                    asyncio.create_task(log_api_call(
+                        call_type='citation_save',
+                        job_id=job.id,
+                        edition_id=page_target_edition_id,
+                        count=new_count,
+                        success=True
+                    ))
+
+                # Update job progress with current state for resume
+                # Cap progress at 90% (leave 10% for completion), handle author-letter mode with many pages
+                raw_progress = 10 + ((page_edition_index + min(page_num / 100, 0.9)) / total_editions) * 80
+                progress_pct = min(raw_progress, 90)
+                year_info = f" ({page_year})" if page_year else ""
+
+                # Build current query for UI visibility
+                current_query = f"cites:{page_edition.scholar_id}"
+                if page_year:
+                    current_query += f" year:{page_year}"
+                elif page_year_low:
+                    current_query += f" year_low:{page_year_low}"
+
+                # Progress details + resume state go to the progress reporter: coalesced with
+                # other pages and written in one batched UPDATE at most every few seconds
+                progress_details = {
+                    "edition_index": page_edition_index + 1,
+                    "editions_total": total_editions,
+                    "edition_id": page_edition.id,
+                    "edition_title": page_edition.title[:80] if page_edition.title else "Unknown",
+                    "edition_language": page_edition.language,
+                    "edition_citation_count": page_edition.citation_count,
+                    "current_page": page_num + 1,
+                    "current_year": page_year,
+                    "harvest_mode": page_mode,
+                    "citations_saved": total_new_citations,
+                    "citations_this_edition": total_new_citations - edition_start_citations,
+                    "citations_updated": total_updated_citations,
+                    "stage": "harvesting",
+                    # CRITICAL: Include these for UI display (was missing, causing "Already Had: 0" bug)
+                    "previously_harvested": total_previously_harvested,
+                    "target_citations_total": total_target_citations,
+                    # Real-time query visibility
+                    "current_query": current_query,
+                }
+                # Save resume state - the page is durable, so it's safe to move past it
+                resume_state = {
+                    "edition_id": page_edition.id,
+                    "last_page": page_num + 1,
+                    "total_citations": total_new_citations,
+                }
+                get_progress_reporter().report(
+                    job.id,
+                    progress=progress_pct,
+                    message=f"Edition {page_edition_index+1}/{total_editions}{year_info}, page {page_num + 1}: {total_new_citations} citations saved",
+                    details=progress_details,
+                    resume_state=resume_state,
+                )
 
-            except Exception as insert_err:
-                log_now(f"[CALLBACK] ✗ Error inserting citations: {insert_err}")
+                # Edition / paper / thinker totals are updated by the ingest writer in
+                # the same transaction as the page, so there is nothing to recount here
 
-                # STEP 3b: DB save failed - mark in buffer for retry
-                buffer.mark_failed(job.id, page_num, str(insert_err))
-                log_now(f"[CALLBACK] ⚠ Marked for retry in buffer")
-                raise  # Re-raise to be handled by caller
+            # STEP 2: Queue for the ingest writer (blocks only if the queue is full)
+            # Returns the ack future - get_cited_by waits for it before returning, and the
+            # overflow harvester counts new citations from it
+            return await get_ingest_queue().submit(
+                job_id=job.id,
+                paper_id=paper_id,
+                edition_id=target_edition_id,  # May differ from edition.id for merged editions
+                page_num=page_num,
+                papers=to_upsert,
+                on_ack=on_page_saved,
+                buffer_key=buffer_key,
+            )
 
         try:
             log_now(f"[EDITION {i+1}/{total_editions}] ═══════════════════════════════════════════════")
@@ -1662,29 +1443,22 @@ async def process_extract_citations_job(job: Job, db: AsyncSession) -> Dict[str,
                 async def on_overflow_progress(partition_type: str, partition_key: str, query_str: str):
                     """Update job progress with current query for UI visibility."""
                     try:
-                        async with async_session() as progress_db:
-                            # Update just the progress_details with current query
-                            params["progress_details"] = {
-                                "stage": "harvesting",
-                                "harvest_mode": "author_letter",
-                                "edition_index": i + 1,
-                                "editions_total": total_editions,
-                                "edition_id": edition.id,
-                                "edition_title": edition.title[:80] if edition.title else "Unknown",
-                                "edition_citation_count": edition.citation_count,
-                                "citations_saved": total_new_citations,
-                                "target_citations_total": total_target_citations,
-                                "previously_harvested": total_previously_harvested,
-                                "current_partition_type": partition_type,
-                                "current_partition": partition_key,
-                                "current_query": query_str,
-                            }
-                            await progress_db.execute(
-                                update(Job)
-                                .where(Job.id == job.id)
-                                .values(params=json.dumps(params))
-                            )
-                            await progress_db.commit()
+                        # Update just the progress_details with current query
+                        get_progress_reporter().report(job.id, details={
+                            "stage": "harvesting",
+                            "harvest_mode": "author_letter",
+                            "edition_index": i + 1,
+                            "editions_total": total_editions,
+                            "edition_id": edition.id,
+                            "edition_title": edition.title[:80] if edition.title else "Unknown",
+                            "edition_citation_count": edition.citation_count,
+                            "citations_saved": total_new_citations,
+                            "target_citations_total": total_target_citations,
+                            "previously_harvested": total_previously_harvested,
+                            "current_partition_type": partition_type,
+                            "current_partition": partition_key,
+                            "current_query": query_str,
+                        })
                     except Exception as e:
                         log_now(f"[PROGRESS] Failed to update query progress: {e}")
 
@@ -1757,6 +1531,22 @@ async def process_extract_citations_job(job: Job, db: AsyncSession) -> Dict[str,
                         effective_year_low = edition.last_harvest_year
                         log_now(f"[EDITION {i+1}] REFRESH: Using year_low={effective_year_low} from edition last harvest")
 
+                # Early-stop refresh: newest results first, stop after K pages of known citations.
+                # Only when the last harvest is within the window Scholar's date sort lists.
+                known_stop = None
+                settings = get_settings()
+                if (
+                    is_refresh
+                    and previous_harvested_at
+                    and (edition.harvested_citation_count or 0) > 0
+                    and datetime.utcnow() - previous_harvested_at <= timedelta(days=settings.refresh_date_sort_max_days)
+                ):
+                    if known_ids is None:
+                        known_ids = await load_known_ids(db, paper_id)
+                        log_now(f"[Worker] Loaded {len(known_ids)} known citation IDs ({known_ids.size_bytes // 1024} KB)")
+                    known_stop = KnownPageStop(known_ids, settings.refresh_known_stop_pages)
+                    log_now(f"[EDITION {i+1}] REFRESH: newest first, stopping after {known_stop.pages} pages of known citations")
+
                 log_now(f"[EDITION {i+1}] Calling scholar_service.get_cited_by(year_low={effective_year_low})...")
 
                 # Track standard harvest failures
@@ -1801,9 +1591,23 @@ async def process_extract_citations_job(job: Job, db: AsyncSession) -> Dict[str,
                     year_low=effective_year_low,  # Pass year_low for refresh filtering
                     on_page_complete=save_page_citations,
                     on_page_failed=on_page_failed_standard,
-                    start_page=resume_page,
+                    # Newest-first paging starts over - the early stop keeps that cheap
+                    start_page=0 if known_stop else resume_page,
+                    sort_by_date=known_stop is not None,
+                    stop_after_page=known_stop,
+                    # Serial, so no prefetched page is paid for past the stop
+                    prefetch_window=1 if known_stop else None,
                 )
 
+                if known_stop and isinstance(result, dict):
+                    saved = pages_saved(result, edition.citation_count, max_citations_per_edition)
+                    refresh_stats["editions_early_stop"] += 1
+                    refresh_stats["stopped_early"] += 1 if result.get("stopped_early") else 0
+                    refresh_stats["pages_fetched"] += result.get("pages_fetched", 0)
+                    refresh_stats["pages_saved"] += saved
+                    log_now(f"[EDITION {i+1}] REFRESH: {result.get('pages_fetched', 0)} pages fetched, "
+                            f"{known_stop.new_ids} new IDs, {saved} pages saved by early stop")
+
                 # Log harvest query for traceability
                 query_str = f"cites:{edition.scholar_id}"
                 if effective_year_low:
@@ -1837,19 +1641,29 @@ async def process_extract_citations_job(job: Job, db: AsyncSession) -> Dict[str,
                     )
                     std_actual_count = std_actual_result.scalar() or 0
 
-                    # Include gap tracking data for diagnostics
-                    await update_harvest_target_progress(
-                        db=db,
-                        edition_id=edition.id,
-                        year=None,  # Standard harvest = all years
-                        actual_count=std_actual_count,  # Total in DB, not just new this job
-                        pages_succeeded=result.get("pages_succeeded", 0),
-                        pages_failed=result.get("pages_failed", 0),
-                        pages_attempted=result.get("pages_fetched", 0),
-                        mark_complete=True,
-                        first_gs_count=result.get("first_gs_count"),
-                        last_gs_count=result.get("last_gs_count"),
-                    )
+                    if known_stop:
+                        # The date-sorted listing only covers ~the last year: its GS counts and
+                        # page totals say nothing about the edition, so only the DB count moves
+                        await db.execute(
+                            update(HarvestTarget)
+                            .where(HarvestTarget.edition_id == edition.id, HarvestTarget.year.is_(None))
+                            .values(actual_count=std_actual_count, updated_at=datetime.utcnow())
+                        )
+                        await db.commit()
+                    else:
+                        # Include gap tracking data for diagnostics
+                        await update_harvest_target_progress(
+                            db=db,
+                            edition_id=edition.id,
+                            year=None,  # Standard harvest = all years
+                            actual_count=std_actual_count,  # Total in DB, not just new this job
+                            pages_succeeded=result.get("pages_succeeded", 0),
+                            pages_failed=result.get("pages_failed", 0),
+                            pages_attempted=result.get("pages_fetched", 0),
+                            mark_complete=True,
+                            first_gs_count=result.get("first_gs_count"),
+                            last_gs_count=result.get("last_gs_count"),
+                        )
 
             edition_citations = total_new_citations - edition_start_citations
             log_now(f"[EDITION {i+1}] ✓ Complete: {edition_citations} new citations saved")
@@ -1885,18 +1699,10 @@ async def process_extract_citations_job(job: Job, db: AsyncSession) -> Dict[str,
                         merged_ed.last_harvested_at = datetime.utcnow()
                         merged_ed.redirected_harvest_count = (merged_ed.redirected_harvest_count or 0) + merged_contribution
                         await db.commit()
-
-                        # Small delay between merged editions
-                        await asyncio.sleep(2)
                     except Exception as merged_err:
                         log_now(f"[MERGED] ⚠️ Error harvesting merged edition {merged_ed.id}: {merged_err}", "warning")
                         # Continue with other merged editions
 
-            # Rate limit between editions
-            if i < total_editions - 1:
-                log_now(f"[EDITION {i+1}] Sleeping 3 seconds before next edition...")
-                await asyncio.sleep(3)
-
         except Exception as e:
             log_now(f"[EDITION {i+1}] ✗✗✗ EXCEPTION ✗✗✗")
             log_now(f"[EDITION {i+1}] Error type: {type(e).__name__}")
@@ -2019,10 +1825,14 @@ async def process_extract_citations_job(job: Job, db: AsyncSession) -> Dict[str,
     await db.commit()
 
     # Clear resume state on successful completion
-    if params.get("resume_state"):
+    # (flush first so a queued progress report can't write it back; explicit UPDATE because
+    # the reporter wrote the column behind this session's back)
+    await get_progress_reporter().flush_job(job.id)
+    await db.execute(update(Job).where(Job.id == job.id).values(resume_state=None))
+    if params.get("resume_state"):  # Jobs from before the resume_state column
         params.pop("resume_state", None)
         job.params = json.dumps(params)
-        await db.commit()
+    await db.commit()
 
     return {
         "paper_id": paper_id,
@@ -2032,6 +1842,7 @@ async def process_extract_citations_job(job: Job, db: AsyncSession) -> Dict[str,
         "new_citations_added": total_new_citations,
         "duplicates_skipped": total_updated_citations,
         "is_refresh": is_refresh,
+        "refresh_early_stop": refresh_stats if refresh_stats["editions_early_stop"] else None,
     }
 
 
@@ -2150,6 +1961,8 @@ async def process_partition_harvest_test(job: Job, db: AsyncSession) -> Dict[str
             existing_scholar_ids.add(scholar_id)
             new_count += 1
 
+        await db.flush()
+        await apply_citation_deltas(db, {(edition.paper_id, edition_id): new_count})
         await db.commit()
         new_citations_count["total"] += new_count
 
@@ -2380,12 +2193,12 @@ async def process_verify_and_repair_job(job: Job, db: AsyncSession) -> Dict[str,
                                 existing_scholar_ids.add(cit_scholar_id)
                                 new_count += 1
 
+                            await db.flush()
+                            await apply_citation_deltas(db, {(paper_id, edition.id): new_count})
                             await db.commit()
                             year_recovered += new_count
                             log_now(f"[VerifyRepair] Year {year}, page start={page_start}: recovered {new_count} new citations")
 
-                        await asyncio.sleep(2)  # Rate limit
-
                     edition_recovered += year_recovered
                     total_recovered += year_recovered
                     edition_gap_details.append({
@@ -2423,8 +2236,6 @@ async def process_verify_and_repair_job(job: Job, db: AsyncSession) -> Dict[str,
             else:
                 log_now(f"[VerifyRepair] Year {year}: OK - Scholar has {verified_count}, we have {our_count}")
 
-            await asyncio.sleep(3)  # Rate limit between years
-
         # Update edition harvest stats after processing
         await update_edition_harvest_stats(db, edition.id)
         all_gap_details.extend(edition_gap_details)
@@ -2569,7 +2380,7 @@ async def process_thinker_discover_works(job: Job, db: AsyncSession) -> Dict[str
             page_count[0] = page_num + 1
 
             # Skip papers we've already seen
-            # Note: _parse_scholar_page returns camelCase keys: scholarId, authorsRaw, etc.
+            # Note: scholar_parser returns camelCase keys: scholarId, authorsRaw, etc.
             new_papers = []
             for p in papers:
                 sid = p.get("scholarId")  # camelCase from parser
@@ -3031,8 +2842,175 @@ async def process_thinker_harvest_citations(job: Job, db: AsyncSession) -> Dict[
     }
 
 
+# ============== Job Claiming & Worker Leases ==============
+
+def expired_lease_condition(now: datetime, unleased_before: Optional[datetime]):
+    """
+    Running jobs whose owner is gone: lease expired, or (rows claimed before leases
+    existed) no lease and no heartbeat since unleased_before.
+    """
+    unleased = Job.lease_expires_at.is_(None)
+    if unleased_before is not None:
+        last_seen = func.coalesce(Job.heartbeat_at, Job.started_at)
+        unleased = and_(unleased, or_(last_seen.is_(None), last_seen < unleased_before))
+    return and_(Job.status == "running", or_(Job.lease_expires_at < now, unleased))
+
+
+async def claim_pending_jobs(limit: int, job_ids: Optional[List[int]] = None) -> List[int]:
+    """
+    Atomically claim up to `limit` pending jobs for this worker.
+
+    One UPDATE ... WHERE id IN (SELECT ... FOR UPDATE SKIP LOCKED) marks the jobs
+    running and stamps worker_id + lease, so concurrent workers (other processes
+    or hosts) never claim the same job. With job_ids (the scheduler's picks) only
+    those jobs are claimed (ones another worker got first are skipped), returned
+    in the given order; otherwise in priority order.
+    """
+    if limit <= 0:
+        return []
+
+    now = datetime.utcnow()
+    candidates = (
+        select(Job.id)
+        .where(Job.status == "pending")
+        .order_by(Job.priority.desc(), Job.created_at.asc())
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    if job_ids is not None:
+        candidates = candidates.where(Job.id.in_(job_ids))
+
+    async with async_session() as db:
+        result = await db.execute(
+            update(Job)
+            .where(Job.id.in_(candidates))
+            .values(
+                status="running",
+                worker_id=WORKER_ID,
+                lease_expires_at=now + timedelta(seconds=JOB_LEASE_SECONDS),
+                started_at=now,
+                heartbeat_at=now,
+                progress=0,
+                progress_message="Starting...",
+            )
+            .returning(Job.id, Job.priority, Job.created_at)
+            .execution_options(synchronize_session=False)
+        )
+        claimed = sorted(result.all(), key=lambda r: (-(r.priority or 0), r.created_at))
+        await db.commit()
+
+    claimed_ids = [r.id for r in claimed]
+    if job_ids is not None:
+        order = {job_id: i for i, job_id in enumerate(job_ids)}
+        claimed_ids.sort(key=order.__getitem__)
+    _claimed_jobs.update(claimed_ids)
+    _lease_stats["claimed"] += len(claimed_ids)
+    return claimed_ids
+
+
+async def renew_job_leases() -> int:
+    """
+    Heartbeat: extend the lease on every job this worker holds.
+
+    A claimed job that no longer matches (cancelled, finished elsewhere, or reset
+    as a zombie and picked up by another worker) is dropped; if another worker now
+    owns it, the local task is cancelled so the job doesn't run twice.
+    """
+    if not _claimed_jobs:
+        return 0
+
+    now = datetime.utcnow()
+    held = list(_claimed_jobs)
+    async with async_session() as db:
+        result = await db.execute(
+            update(Job)
+            .where(
+                Job.id.in_(held),
+                Job.status == "running",
+                Job.worker_id == WORKER_ID,
+            )
+            .values(lease_expires_at=now + timedelta(seconds=JOB_LEASE_SECONDS))
+            .returning(Job.id)
+            .execution_options(synchronize_session=False)
+        )
+        renewed = {row[0] for row in result.all()}
+
+        lost = set(held) - renewed
+        stolen = set()
+        if lost:
+            owners = await db.execute(
+                select(Job.id).where(
+                    Job.id.in_(lost),
+                    Job.status == "running",
+                    Job.worker_id != WORKER_ID,
+                )
+            )
+            stolen = {row[0] for row in owners.all()}
+        await db.commit()
+
+    _lease_stats["renewals"] += 1
+    _lease_stats["last_renewal"] = now.isoformat()
+
+    # Only forget jobs still claimed when the UPDATE ran - a job may have finished meanwhile
+    lost &= _claimed_jobs
+    if lost:
+        _lease_stats["lost"] += len(lost)
+        _claimed_jobs.difference_update(lost)
+        for job_id in stolen & lost:
+            entry = _running_tasks.get(job_id)
+            if entry:
+                log_now(f"[LEASE] Job {job_id} is now owned by another worker - cancelling local task", "warning")
+                entry[0].cancel()
+        log_now(f"[LEASE] Released {len(lost)} jobs no longer leased to this worker: {sorted(lost)}")
+    return len(renewed)
+
+
+async def release_job_leases() -> int:
+    """
+    Hand this worker's jobs back to the queue (graceful shutdown), so another
+    worker can resume them immediately instead of waiting for the lease to expire.
+    """
+    if not _claimed_jobs:
+        return 0
+    try:
+        async with async_session() as db:
+            result = await db.execute(
+                update(Job)
+                .where(
+                    Job.id.in_(list(_claimed_jobs)),
+                    Job.status == "running",
+                    Job.worker_id == WORKER_ID,
+                )
+                .values(status="pending", started_at=None, worker_id=None, lease_expires_at=None)
+                .returning(Job.id)
+                .execution_options(synchronize_session=False)
+            )
+            released = [row[0] for row in result.all()]
+            await db.commit()
+        _claimed_jobs.clear()
+        if released:
+            log_now(f"[LEASE] Released {len(released)} jobs back to pending on shutdown: {released}")
+        return len(released)
+    except Exception as e:
+        log_now(f"[LEASE] Failed to release job leases: {e}", "error")
+        return 0
+
+
+async def lease_heartbeat_loop():
+    """Renew this worker's job leases every HEARTBEAT_INTERVAL seconds"""
+    bind_db_role("worker")
+    while True:
+        try:
+            await renew_job_leases()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            log_now(f"[LEASE] Lease renewal failed: {e}", "error")
+        await asyncio.sleep(HEARTBEAT_INTERVAL)
+
+
 async def process_single_job(job_id: int):
-    """Process a single job by ID with concurrency control"""
+    """Process a single job by ID with concurrency control. The job must already be claimed by this worker."""
     global _job_semaphore, _running_jobs, _running_tasks
 
     # Acquire semaphore to limit concurrent jobs
@@ -3058,17 +3036,11 @@ async def process_single_job(job_id: int):
                         log_now(f"[Worker] Job {job_id} not found")
                         return
 
-                    if job.status != "pending":
-                        log_now(f"[Worker] Job {job_id} status is {job.status}, skipping")
+                    # Claimed by claim_pending_jobs (already marked running) - still ours?
+                    if job.status != "running" or job.worker_id != WORKER_ID:
+                        log_now(f"[Worker] Job {job_id} status is {job.status} (worker {job.worker_id}), skipping")
                         return
 
-                    # Mark as running
-                    job.status = "running"
-                    job.started_at = datetime.utcnow()
-                    job.progress = 0
-                    job.progress_message = "Starting..."
-                    await db.commit()
-
                     log_now(f"[Worker] Starting job {job_id} ({job.job_type})")
 
                     # Process based on job type
@@ -3091,12 +3063,14 @@ async def process_single_job(job_id: int):
                     else:
                         raise ValueError(f"Unknown job type: {job.job_type}")
 
-                    # Mark as completed
+                    # Mark as completed (last progress first - a later flush must not overwrite the final state)
+                    await get_progress_reporter().flush_job(job_id)
                     job.status = "completed"
                     job.progress = 100
                     job.progress_message = "Completed"
                     job.result = json.dumps(result)
                     job.completed_at = datetime.utcnow()
+                    job.lease_expires_at = None
                     await db.commit()
 
                     log_now(f"[Worker] Completed job {job_id}")
@@ -3111,9 +3085,11 @@ async def process_single_job(job_id: int):
                     log_now(f"[Worker] Traceback: {traceback.format_exc()}")
                     # Mark as failed
                     try:
+                        await get_progress_reporter().flush_job(job_id)
                         job.status = "failed"
                         job.error = str(e)
                         job.completed_at = datetime.utcnow()
+                        job.lease_expires_at = None
                         await db.commit()
 
                         # Send webhook callback for failure if configured
@@ -3123,30 +3099,38 @@ async def process_single_job(job_id: int):
                     except:
                         pass
         finally:
-            # Always remove from running set and task tracking
+            # Always remove from running set, task tracking and held leases
             _running_jobs.discard(job_id)
             _running_tasks.pop(job_id, None)
+            _claimed_jobs.discard(job_id)
+            get_progress_reporter().discard(job_id)
+            get_job_listener().wake()  # A slot is free - let the worker claim the next job
             log_now(f"[Worker] Job {job_id} released slot ({len(_running_jobs)}/{MAX_CONCURRENT_JOBS} running)")
 
 
-async def check_and_reset_zombie_jobs() -> int:
+async def check_and_reset_zombie_jobs(include_unleased: bool = False) -> int:
     """
     Periodically check for zombie jobs - jobs marked as 'running' in the database
-    but not actually being processed by this worker instance.
+    whose worker lease has expired, i.e. no live worker is renewing them.
 
     This catches jobs that got stuck due to:
-    - Worker crashes mid-job
+    - Worker crashes mid-job (this process or any other worker)
     - Unhandled exceptions that didn't properly release the job
     - Database connection issues
 
+    Lease-based, so it is safe with several workers: a job owned by a live worker
+    (in this process or another) is never reset. Running jobs without a lease
+    (claimed before leases existed) count as zombies once their heartbeat is older
+    than JOB_TIMEOUT_MINUTES - or immediately when include_unleased is set (startup).
+
     Returns the number of zombie jobs reset.
     """
-    global _last_zombie_check, _running_jobs
+    global _last_zombie_check
 
     now = datetime.utcnow()
 
     # Only check every ZOMBIE_CHECK_INTERVAL_MINUTES
-    if _last_zombie_check and (now - _last_zombie_check).total_seconds() < ZOMBIE_CHECK_INTERVAL_MINUTES * 60:
+    if not include_unleased and _last_zombie_check and (now - _last_zombie_check).total_seconds() < ZOMBIE_CHECK_INTERVAL_MINUTES * 60:
         return 0
 
     _last_zombie_check = now
@@ -3154,38 +3138,23 @@ async def check_and_reset_zombie_jobs() -> int:
 
     try:
         async with async_session() as db:
-            # Find jobs that are "running" in DB but:
-            # 1. Not in our in-memory _running_jobs set, OR
-            # 2. Have been running for longer than JOB_TIMEOUT_MINUTES
-            timeout_threshold = now - timedelta(minutes=JOB_TIMEOUT_MINUTES)
-
+            unleased_before = None if include_unleased else now - timedelta(minutes=JOB_TIMEOUT_MINUTES)
+            # One UPDATE: concurrent checks on other workers can't double-reset, and a
+            # lease renewed in the meantime no longer matches
             result = await db.execute(
-                select(Job).where(
-                    Job.status == "running",
-                    Job.started_at < timeout_threshold
-                )
+                update(Job)
+                .where(expired_lease_condition(now, unleased_before))
+                .values(status="pending", started_at=None, worker_id=None, lease_expires_at=None)
+                .returning(Job.id)
+                .execution_options(synchronize_session=False)
             )
-            stale_jobs = result.scalars().all()
-
-            if stale_jobs:
-                # Filter to only jobs not in our running set (true zombies)
-                zombie_jobs = [j for j in stale_jobs if j.id not in _running_jobs]
-
-                if zombie_jobs:
-                    zombie_ids = [j.id for j in zombie_jobs]
-                    zombie_count = len(zombie_jobs)
-
-                    log_now(f"[ZOMBIE CHECK] Found {zombie_count} zombie jobs: {zombie_ids}")
-
-                    # Reset them to pending
-                    await db.execute(
-                        update(Job)
-                        .where(Job.id.in_(zombie_ids))
-                        .values(status="pending", started_at=None)
-                    )
-                    await db.commit()
+            zombie_ids = [row[0] for row in result.all()]
+            await db.commit()
 
-                    log_now(f"[ZOMBIE CHECK] Reset {zombie_count} zombie jobs to 'pending'")
+            if zombie_ids:
+                zombie_count = len(zombie_ids)
+                _lease_stats["zombies_reset"] += zombie_count
+                log_now(f"[ZOMBIE CHECK] Reset {zombie_count} jobs with expired leases to 'pending': {zombie_ids}")
 
     except Exception as e:
         log_now(f"[ZOMBIE CHECK] Error checking for zombies: {e}", "error")
@@ -3225,11 +3194,12 @@ async def cancel_stuck_tasks() -> int:
             async with async_session() as db:
                 await db.execute(
                     update(Job)
-                    .where(Job.id == job_id)
+                    .where(Job.id == job_id, Job.worker_id == WORKER_ID)
                     .values(
                         status="failed",
                         error=f"Cancelled: task stuck for {running_hours:.1f} hours (timeout={JOB_HARD_TIMEOUT_HOURS}h)",
-                        completed_at=now
+                        completed_at=now,
+                        lease_expires_at=None,
                     )
                 )
                 await db.commit()
@@ -3253,35 +3223,20 @@ async def worker_loop():
     _last_zombie_check = None  # Reset on startup so first check runs immediately after startup detection
     _running_jobs = set()
 
-    log_now(f"[Worker] Starting parallel job worker (max {MAX_CONCURRENT_JOBS} concurrent jobs)")
+    # Sessions opened by this loop and every job task it spawns use the worker pool
+    bind_db_role("worker")
 
-    # ZOMBIE JOB DETECTION: Reset any "running" jobs to "pending"
-    # Since this worker just started, any "running" jobs are zombies from a previous worker
-    try:
-        async with async_session() as db:
-            result = await db.execute(
-                select(Job).where(Job.status == "running")
-            )
-            zombie_jobs = result.scalars().all()
-
-            if zombie_jobs:
-                zombie_count = len(zombie_jobs)
-                zombie_ids = [j.id for j in zombie_jobs]
-                log_now(f"[Worker] ZOMBIE DETECTION: Found {zombie_count} jobs stuck in 'running' state")
-                log_now(f"[Worker] ZOMBIE DETECTION: Job IDs: {zombie_ids}")
+    log_now(f"[Worker] Starting parallel job worker (max {MAX_CONCURRENT_JOBS} concurrent jobs)")
 
-                # Reset them to pending so they get picked up again
-                await db.execute(
-                    update(Job)
-                    .where(Job.status == "running")
-                    .values(status="pending", started_at=None)
-                )
-                await db.commit()
-                log_now(f"[Worker] ZOMBIE DETECTION: Reset {zombie_count} zombie jobs to 'pending'")
-            else:
-                log_now("[Worker] ZOMBIE DETECTION: No zombie jobs found - clean startup")
-    except Exception as e:
-        log_now(f"[Worker] ZOMBIE DETECTION ERROR: {e}")
+    # ZOMBIE JOB DETECTION: Reset "running" jobs whose owner is gone
+    # Other workers may be alive, so only expired leases count - plus unleased rows
+    # left by a pre-lease worker, which nothing will ever renew
+    log_now(f"[Worker] Worker ID: {WORKER_ID} (lease {JOB_LEASE_SECONDS}s)")
+    zombie_count = await check_and_reset_zombie_jobs(include_unleased=True)
+    if zombie_count:
+        log_now(f"[Worker] ZOMBIE DETECTION: Reset {zombie_count} zombie jobs to 'pending'")
+    else:
+        log_now("[Worker] ZOMBIE DETECTION: No zombie jobs found - clean startup")
 
     # ORPHAN DETECTION: Log editions with partial harvests
     # NOTE: This is informational only - the author-letter strategy tracks progress
@@ -3327,55 +3282,32 @@ async def worker_loop():
     except Exception as e:
         log_now(f"[Worker] OVERFLOW STATUS ERROR: {e}")
 
+    last_running_sync = 0.0
+
     while _worker_running:
         try:
             # Calculate how many slots are available
-            available_slots = MAX_CONCURRENT_JOBS - len(_running_jobs)
+            # Jobs claimed but still waiting for a semaphore slot also occupy capacity
+            available_slots = MAX_CONCURRENT_JOBS - len(_running_jobs | _claimed_jobs)
 
             if available_slots > 0:
                 async with async_session() as db:
-                    # FOCUS MODE: Only get jobs for the focused thinker's papers
-                    if _focus_mode_thinker_id is not None and _focus_mode_paper_ids:
-                        result = await db.execute(
-                            select(Job)
-                            .where(Job.status == "pending")
-                            .where(Job.paper_id.in_(_focus_mode_paper_ids))
-                            .order_by(Job.priority.desc(), Job.created_at.asc())
-                            .limit(available_slots)
-                        )
-                        pending_jobs = result.scalars().all()
-                        if pending_jobs:
-                            log_now(f"[Worker] FOCUS MODE (thinker {_focus_mode_thinker_id}): Found {len(pending_jobs)} jobs, {available_slots} slots")
-                    else:
-                        # Normal mode: get all pending jobs
-                        result = await db.execute(
-                            select(Job)
-                            .where(Job.status == "pending")
-                            .order_by(Job.priority.desc(), Job.created_at.asc())
-                            .limit(available_slots)
-                        )
-                        pending_jobs = result.scalars().all()
-                        if pending_jobs:
-                            log_now(f"[Worker] Found {len(pending_jobs)} pending jobs, {available_slots} slots available")
-
+                    # Fair-share scheduler picks which pending jobs fill the free slots
+                    picked = await get_job_scheduler().select_jobs(db, available_slots)
+                    pending_jobs = await claim_pending_jobs(len(picked), job_ids=picked) if picked else []
                     if pending_jobs:
-                        # Start all pending jobs in parallel
-                        for job in pending_jobs:
-                            if job.id not in _running_jobs:
-                                asyncio.create_task(process_single_job(job.id))
-                                await asyncio.sleep(0.5)  # Small stagger to avoid race conditions
+                        log_now(f"[Worker] Claimed {len(pending_jobs)} pending jobs, {available_slots} slots available")
+                    elif picked:
+                        continue  # Another worker claimed our picks first - pick again
 
-                        await asyncio.sleep(2)  # Brief pause before checking for more
-
-                    # FOCUS MODE: Skip all auto-resume and auto-retry functionality
-                    if _focus_mode_thinker_id is not None:
-                        if not pending_jobs:
-                            await asyncio.sleep(5)  # Wait before checking again
-                        continue  # Skip auto-resume entirely in focus mode
+                    # Start all claimed jobs in parallel (claiming is atomic - no stagger needed)
+                    for job_id in pending_jobs:
+                        if job_id not in _running_jobs:
+                            asyncio.create_task(process_single_job(job_id))
 
                     # Check for incomplete harvests if we have spare capacity
                     # BUT skip if there are high-priority jobs pending (like thinker_harvest_citations)
-                    remaining_slots = MAX_CONCURRENT_JOBS - len(_running_jobs) - len(pending_jobs)
+                    remaining_slots = MAX_CONCURRENT_JOBS - len(_running_jobs | _claimed_jobs)
                     if remaining_slots > 0:
                         # Check for high-priority pending jobs - let them run first
                         high_priority_pending = await db.execute(
@@ -3412,15 +3344,25 @@ async def worker_loop():
                         except Exception as e:
                             log_now(f"[Worker] Citation buffer retry failed: {e}")
 
-                    # If no pending jobs at all, wait before checking again
+                    # If no pending jobs at all, sleep until a job event (or the safety-net poll)
                     if not pending_jobs:
-                        await asyncio.sleep(5)
+                        await wait_for_job_event()
             else:
-                # All slots full, wait for one to free up
-                await asyncio.sleep(3)
-
-            # Sync _running_jobs with database - remove jobs that were cancelled externally
-            if _running_jobs:
+                # All slots full, wait for one to free up (process_single_job wakes us)
+                await wait_for_job_event()
+
+            # Jobs cancelled externally (pushed by NOTIFY) no longer hold a slot
+            listener = get_job_listener()
+            cancelled_ids = listener.pop_cancelled() & _running_jobs
+            if cancelled_ids:
+                log_now(f"[Worker] Cleaning {len(cancelled_ids)} cancelled job IDs from _running_jobs: {cancelled_ids}")
+                _running_jobs.difference_update(cancelled_ids)
+
+            # Safety net: sync _running_jobs with database on the slow poll cadence
+            # (claimed jobs lost to another worker are handled by renew_job_leases)
+            now_mono = time.monotonic()
+            if _running_jobs and (not listener.connected or now_mono - last_running_sync >= listener.poll_interval):
+                last_running_sync = now_mono
                 async with async_session() as sync_db:
                     actually_running = await sync_db.execute(
                         select(Job.id).where(
@@ -3460,6 +3402,7 @@ async def worker_watchdog():
     """
     global _worker_task, _worker_running
 
+    bind_db_role("worker")
     log_now("[Watchdog] Worker watchdog started - monitoring worker health")
 
     while _worker_running:
@@ -3486,8 +3429,8 @@ async def worker_watchdog():
 
 
 def start_worker():
-    """Start the background worker and watchdog (called at app startup)"""
-    global _worker_task, _watchdog_task, _worker_running
+    """Start the background worker, watchdog and lease heartbeat (called at app startup)"""
+    global _worker_task, _watchdog_task, _lease_task, _worker_running
     _worker_running = True
 
     if _worker_task is None or _worker_task.done():
@@ -3498,12 +3441,23 @@ def start_worker():
     if _watchdog_task is None or _watchdog_task.done():
         _watchdog_task = asyncio.create_task(worker_watchdog())
 
+    # Keep this worker's job leases alive
+    if _lease_task is None or _lease_task.done():
+        _lease_task = asyncio.create_task(lease_heartbeat_loop())
+
 
 def stop_worker():
-    """Stop the background worker and watchdog"""
-    global _worker_running, _worker_task, _watchdog_task
+    """
+    Stop the background worker, watchdog and lease heartbeat.
+    Call release_job_leases() afterwards to hand running jobs to other workers.
+    """
+    global _worker_running, _worker_task, _watchdog_task, _lease_task
     _worker_running = False
 
+    if _lease_task:
+        _lease_task.cancel()
+        _lease_task = None
+
     if _watchdog_task:
         _watchdog_task.cancel()
         _watchdog_task = None
@@ -3534,6 +3488,14 @@ def is_worker_healthy() -> dict:
         "watchdog_alive": watchdog_alive,
         "worker_running_flag": _worker_running,
         "running_jobs_count": len(_running_jobs),
+        "worker_id": WORKER_ID,
+        "weight_overrides": get_job_scheduler().get_stats()["weight_overrides"],  # Focus mode, as of the last round
+        "leases": {
+            "held": len(_claimed_jobs),
+            "lease_seconds": JOB_LEASE_SECONDS,
+            "heartbeat_alive": _lease_task is not None and not _lease_task.done(),
+            **_lease_stats,
+        },
     }
 
 
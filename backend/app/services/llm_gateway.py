@@ -0,0 +1,335 @@
+"""
+LLM Gateway - shared async access to the Anthropic API
+
+Most LLM calls used the synchronous anthropic.Anthropic client inside async
+code, so every call froze the event loop - and every running harvest job -
+for the full LLM latency. All calls now go through one gateway:
+
+- AsyncAnthropic client (never blocks the loop)
+- Global concurrency limit (llm_max_concurrency) across all callers
+- Retries with jittered exponential backoff for rate limits, overload,
+  5xx and connection errors (honours retry-after)
+- Token and latency accounting per purpose (GET /api/admin/llm/stats)
+- Content-addressed response cache for callers that opt in (cache=True):
+  keyed on the SHA-256 of the full request, held in a memory LRU and in the
+  search_cache table (expired rows are dropped by the Scholar cache sweeper).
+  Identical concurrent requests share one API call.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import random
+import sys
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from typing import Optional, Dict, Any, Set, Tuple
+
+import anthropic
+from anthropic.types import Message
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from ..config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+def log_now(msg: str, level: str = "info"):
+    """Log message and immediately flush to stdout"""
+    timestamp = datetime.utcnow().strftime("%H:%M:%S")
+    print(f"{timestamp} | llm | {level.upper()} | {msg}", flush=True)
+    sys.stdout.flush()
+
+
+RETRY_BASE_SECONDS = 2.0
+RETRY_CAP_SECONDS = 60.0
+CACHE_MEMORY_MAX_ENTRIES = 500
+CACHE_KEY_PREFIX = "llm:"  # search_cache.query for LLM entries, e.g. "llm:exclusion_terms:claude-..."
+
+RETRYABLE_ERRORS = (
+    anthropic.RateLimitError,
+    anthropic.InternalServerError,  # 5xx, including 529 overloaded
+    anthropic.APIConnectionError,  # Includes APITimeoutError
+)
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    try:
+        return float(response.headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class LLMGateway:
+    """Concurrency-limited, retrying, accounted and (optionally) cached Messages API access"""
+
+    def __init__(self, api_key: str, max_concurrency: int, max_retries: int, cache_ttl_hours: float):
+        self.client = anthropic.AsyncAnthropic(api_key=api_key, max_retries=0)
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.cache_ttl = timedelta(hours=cache_ttl_hours)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._in_flight = 0
+        self._waiting = 0
+        self._memory: "OrderedDict[str, Tuple[datetime, Dict[str, Any]]]" = OrderedDict()
+        self._pending: Dict[str, asyncio.Task] = {}  # Shared in-flight cached calls
+        self._by_purpose: Dict[str, Dict[str, Any]] = {}
+        self._writes: Set[asyncio.Task] = set()  # In-flight cache persists (the loop only keeps weak refs)
+
+    # ---------- accounting ----------
+
+    def _counters(self, purpose: str) -> Dict[str, Any]:
+        return self._by_purpose.setdefault(purpose, {
+            "calls": 0, "cache_hits": 0, "errors": 0, "retries": 0,
+            "input_tokens": 0, "output_tokens": 0,
+            "latency_ms_total": 0, "latency_ms_max": 0,
+        })
+
+    def _record(self, purpose: str, started: float, usage=None):
+        counters = self._counters(purpose)
+        latency_ms = round((time.monotonic() - started) * 1000)
+        counters["calls"] += 1
+        counters["latency_ms_total"] += latency_ms
+        counters["latency_ms_max"] = max(counters["latency_ms_max"], latency_ms)
+        if usage is not None:
+            counters["input_tokens"] += getattr(usage, "input_tokens", 0) or 0
+            counters["output_tokens"] += getattr(usage, "output_tokens", 0) or 0
+
+    @asynccontextmanager
+    async def _slot(self):
+        self._waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._waiting -= 1
+        self._in_flight += 1
+        try:
+            yield
+        finally:
+            self._in_flight -= 1
+            self._semaphore.release()
+
+    async def _backoff(self, purpose: str, attempt: int, error: Exception):
+        self._counters(purpose)["retries"] += 1
+        delay = _retry_after(error)
+        if delay is None:
+            delay = random.uniform(RETRY_BASE_SECONDS, min(RETRY_CAP_SECONDS, RETRY_BASE_SECONDS * 3 ** attempt))
+        log_now(f"[{purpose}] {type(error).__name__} - retry {attempt + 1}/{self.max_retries} in {delay:.1f}s", "warn")
+        await asyncio.sleep(delay)
+
+    # ---------- calls ----------
+
+    async def create(self, purpose: str, cache: bool = False, **request) -> Message:
+        """
+        messages.create() through the gateway. request is passed to the SDK as-is.
+
+        With cache=True an identical earlier request (same model, prompt, params)
+        is answered from the cache - use it for deterministic lookups, not for
+        calls whose caller wants a fresh sample.
+        """
+        if not cache:
+            return await self._call(purpose, request)
+
+        key = self._cache_key(request)
+        cached = await self._cache_get(key)
+        if cached is not None:
+            self._counters(purpose)["cache_hits"] += 1
+            return Message.model_validate(cached)
+
+        # Identical request already in flight - share its result. The call runs as
+        # its own task so a caller going away (originator included) doesn't cancel it
+        # for everyone else; _pending holds the reference until it finishes.
+        task = self._pending.get(key)
+        if task is not None:
+            self._counters(purpose)["cache_hits"] += 1
+        else:
+            task = asyncio.create_task(self._call_and_cache(key, purpose, request))
+            self._pending[key] = task
+            task.add_done_callback(lambda done: self._settle(key, done))
+        return Message.model_validate(await asyncio.shield(task))
+
+    async def _call_and_cache(self, key: str, purpose: str, request: Dict[str, Any]) -> Dict[str, Any]:
+        response = await self._call(purpose, request)
+        payload = response.model_dump(mode="json")
+        self._cache_put(key, purpose, request.get("model", ""), payload)
+        return payload
+
+    def _settle(self, key: str, task: asyncio.Task):
+        if self._pending.get(key) is task:
+            del self._pending[key]
+        if not task.cancelled():
+            task.exception()  # Mark retrieved - every caller may have gone away
+
+    async def _call(self, purpose: str, request: Dict[str, Any]) -> Message:
+        attempt = 0
+        while True:
+            started = time.monotonic()
+            try:
+                async with self._slot():
+                    response = await self.client.messages.create(**request)
+            except RETRYABLE_ERRORS as e:
+                if attempt >= self.max_retries:
+                    self._counters(purpose)["errors"] += 1
+                    raise
+                await self._backoff(purpose, attempt, e)
+                attempt += 1
+                continue
+            except Exception:
+                self._counters(purpose)["errors"] += 1
+                raise
+            self._record(purpose, started, response.usage)
+            return response
+
+    @asynccontextmanager
+    async def stream(self, purpose: str, **request):
+        """
+        messages.stream() through the gateway: `async with gateway.stream(...) as stream`.
+
+        Holds a concurrency slot for the life of the stream. Only opening the
+        stream is retried - a stream that fails midway raises to the caller.
+        """
+        attempt = 0
+        opened = False
+        while True:
+            started = time.monotonic()
+            try:
+                async with self._slot():
+                    async with self.client.messages.stream(**request) as stream:
+                        opened = True
+                        try:
+                            yield stream
+                        finally:
+                            snapshot = getattr(stream, "current_message_snapshot", None)
+                            self._record(purpose, started, getattr(snapshot, "usage", None))
+                return
+            except RETRYABLE_ERRORS as e:
+                # Once the caller has the stream, errors are theirs (we can't yield twice)
+                if opened or attempt >= self.max_retries:
+                    self._counters(purpose)["errors"] += 1
+                    raise
+                await self._backoff(purpose, attempt, e)
+                attempt += 1
+            except Exception:
+                if not opened:
+                    self._counters(purpose)["errors"] += 1
+                raise
+
+    # ---------- cache ----------
+
+    @staticmethod
+    def _cache_key(request: Dict[str, Any]) -> str:
+        canonical = json.dumps(request, sort_keys=True, default=str, ensure_ascii=False)
+        return hashlib.sha256(f"{CACHE_KEY_PREFIX}{canonical}".encode("utf-8")).hexdigest()
+
+    async def _cache_get(self, key: str) -> Optional[Dict[str, Any]]:
+        now = datetime.utcnow()
+        entry = self._memory.get(key)
+        if entry:
+            expires_at, payload = entry
+            if expires_at > now:
+                self._memory.move_to_end(key)
+                return payload
+            del self._memory[key]
+
+        try:
+            from ..database import async_session
+            from ..models import SearchCache
+
+            async with async_session() as db:
+                result = await db.execute(
+                    select(SearchCache.results, SearchCache.expires_at)
+                    .where(SearchCache.query_hash == key)
+                    .where(SearchCache.expires_at > now)
+                )
+                row = result.first()
+            if row:
+                payload = json.loads(row.results)
+                self._remember(key, row.expires_at, payload)
+                return payload
+        except Exception as e:
+            log_now(f"Cache lookup failed (treating as miss): {e}", "warn")
+        return None
+
+    def _remember(self, key: str, expires_at: datetime, payload: Dict[str, Any]):
+        self._memory[key] = (expires_at, payload)
+        self._memory.move_to_end(key)
+        while len(self._memory) > CACHE_MEMORY_MAX_ENTRIES:
+            self._memory.popitem(last=False)
+
+    def _cache_put(self, key: str, purpose: str, model: str, payload: Dict[str, Any]):
+        now = datetime.utcnow()
+        expires_at = now + self.cache_ttl
+        self._remember(key, expires_at, payload)
+        task = asyncio.create_task(self._persist(key, f"{CACHE_KEY_PREFIX}{purpose}:{model}", payload, now, expires_at))
+        self._writes.add(task)
+        task.add_done_callback(self._writes.discard)
+
+    async def _persist(self, key: str, query: str, payload: Dict[str, Any], now: datetime, expires_at: datetime):
+        try:
+            from ..database import async_session
+            from ..models import SearchCache
+
+            results_json = json.dumps(payload)
+            async with async_session() as db:
+                stmt = pg_insert(SearchCache).values(
+                    query_hash=key,
+                    query=query,
+                    results=results_json,
+                    result_count=0,
+                    created_at=now,
+                    expires_at=expires_at,
+                ).on_conflict_do_update(
+                    index_elements=["query_hash"],
+                    set_={"results": results_json, "created_at": now, "expires_at": expires_at},
+                )
+                await db.execute(stmt)
+                await db.commit()
+        except Exception as e:
+            logger.warning(f"Failed to persist LLM cache entry: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        by_purpose = {}
+        for purpose, counters in self._by_purpose.items():
+            requests = counters["calls"] + counters["cache_hits"]
+            by_purpose[purpose] = {
+                **counters,
+                "latency_ms_avg": round(counters["latency_ms_total"] / counters["calls"]) if counters["calls"] else None,
+                "cache_hit_rate": round(counters["cache_hits"] / requests, 3) if requests else None,
+            }
+        return {
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self._in_flight,
+            "waiting": self._waiting,
+            "max_retries": self.max_retries,
+            "cache_ttl_hours": self.cache_ttl.total_seconds() / 3600,
+            "cache_memory_entries": len(self._memory),
+            "totals": {
+                key: sum(c[key] for c in self._by_purpose.values())
+                for key in ("calls", "cache_hits", "errors", "retries", "input_tokens", "output_tokens")
+            },
+            "by_purpose": by_purpose,
+        }
+
+
+# Singleton instance
+_gateway: Optional[LLMGateway] = None
+
+
+def get_llm_gateway() -> LLMGateway:
+    """Get the process-wide LLM gateway"""
+    global _gateway
+    if _gateway is None:
+        settings = get_settings()
+        _gateway = LLMGateway(
+            api_key=settings.anthropic_api_key,
+            max_concurrency=settings.llm_max_concurrency,
+            max_retries=settings.llm_max_retries,
+            cache_ttl_hours=settings.llm_cache_ttl_hours,
+        )
+    return _gateway
@@ -0,0 +1,114 @@
+"""
+Event Loop Monitor - measures how long the asyncio loop is blocked
+
+A probe task sleeps for a fixed interval and records how late it wakes up. Any
+lateness is time the loop spent running something synchronous (HTML parsing,
+JSON encoding of big payloads, blocking calls) instead of serving requests,
+heartbeats and job progress. Stats are exposed on /api/admin/worker/status so
+the effect of changes like the parse executor can be compared before/after.
+"""
+import asyncio
+import logging
+import sys
+import time
+from collections import deque
+from datetime import datetime
+from typing import Optional, Dict, Any
+
+logger = logging.getLogger(__name__)
+
+
+def log_now(msg: str, level: str = "info"):
+    """Log message and immediately flush to stdout"""
+    timestamp = datetime.utcnow().strftime("%H:%M:%S")
+    print(f"{timestamp} | loop | {level.upper()} | {msg}", flush=True)
+    sys.stdout.flush()
+
+
+PROBE_INTERVAL = 0.25  # Seconds between probes
+WINDOW_SAMPLES = 2400  # ~10 minutes of samples at 0.25s
+STALL_THRESHOLDS_MS = (100, 500, 1000)  # Lag buckets counted since startup
+STALL_LOG_MS = 1000  # Log individual stalls at least this long
+
+
+class LoopLagMonitor:
+    """Rolling window of event loop lag samples"""
+
+    def __init__(self):
+        self._samples = deque(maxlen=WINDOW_SAMPLES)  # Lag in seconds
+        self._max_lag = 0.0
+        self._stalls = {ms: 0 for ms in STALL_THRESHOLDS_MS}
+        self._started_at: Optional[float] = None
+
+    def record(self, lag: float):
+        lag = max(lag, 0.0)
+        self._samples.append(lag)
+        self._max_lag = max(self._max_lag, lag)
+        lag_ms = lag * 1000
+        for ms in STALL_THRESHOLDS_MS:
+            if lag_ms >= ms:
+                self._stalls[ms] += 1
+        if lag_ms >= STALL_LOG_MS:
+            log_now(f"Event loop blocked for {lag_ms:.0f}ms", "warn")
+
+    async def run(self):
+        self._started_at = time.monotonic()
+        while True:
+            expected = time.monotonic() + PROBE_INTERVAL
+            await asyncio.sleep(PROBE_INTERVAL)
+            self.record(time.monotonic() - expected)
+
+    def get_stats(self) -> Dict[str, Any]:
+        samples = sorted(self._samples)
+
+        def pct(p: float) -> float:
+            return round(samples[min(len(samples) - 1, int(len(samples) * p))] * 1000, 1) if samples else 0
+
+        return {
+            "probe_interval_ms": int(PROBE_INTERVAL * 1000),
+            "window_seconds": round(len(samples) * PROBE_INTERVAL),
+            "lag_ms": {
+                "last": round(self._samples[-1] * 1000, 1) if self._samples else 0,
+                "avg": round(sum(samples) / len(samples) * 1000, 1) if samples else 0,
+                "p95": pct(0.95),
+                "p99": pct(0.99),
+                "window_max": round(samples[-1] * 1000, 1) if samples else 0,
+                "max_since_start": round(self._max_lag * 1000, 1),
+            },
+            "stalls_since_start": {f"over_{ms}ms": count for ms, count in self._stalls.items()},
+            "uptime_seconds": round(time.monotonic() - self._started_at) if self._started_at else 0,
+        }
+
+
+# Singleton instance
+_monitor: Optional[LoopLagMonitor] = None
+
+
+def get_loop_monitor() -> LoopLagMonitor:
+    """Get the singleton loop lag monitor"""
+    global _monitor
+    if _monitor is None:
+        _monitor = LoopLagMonitor()
+    return _monitor
+
+
+# Background probe task
+_monitor_task = None
+
+async def start_loop_monitor():
+    """Start the background loop lag probe"""
+    global _monitor_task
+    _monitor_task = asyncio.create_task(get_loop_monitor().run())
+    logger.info("Event loop lag monitor started")
+
+
+async def stop_loop_monitor():
+    """Stop the background loop lag probe"""
+    global _monitor_task
+    if _monitor_task:
+        _monitor_task.cancel()
+        try:
+            await _monitor_task
+        except asyncio.CancelledError:
+            pass
+        _monitor_task = None
@@ -16,9 +16,9 @@ import re
 from typing import Dict, Any, List, Optional, Tuple, Set
 from dataclasses import dataclass, field
 from difflib import SequenceMatcher
-import anthropic
 
 from ..config import get_settings
+from .llm_gateway import get_llm_gateway
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -295,8 +295,6 @@ async def validate_matches_with_llm(
         }
 
     try:
-        client = anthropic.Anthropic(api_key=settings.anthropic_api_key)
-
         # Build prompt
         prompt_parts = [f"You are validating name matches{f' for {context}' if context else ''}."]
 
@@ -342,7 +340,9 @@ Rules:
 
         prompt = "\n".join(prompt_parts)
 
-        response = client.messages.create(
+        response = await get_llm_gateway().create(
+            purpose="name_matcher.validate",
+            cache=True,
             model="claude-sonnet-4-5-20250929",
             max_tokens=4096,
             messages=[{"role": "user", "content": prompt}]
@@ -13,8 +13,10 @@ CRITICAL: This module now persists EVERYTHING to the database:
 Strategy:
 1. Detect overflow (>1000 results for a year)
 2. Create PartitionRun record (status: pending)
-3. LLM suggests common terms to exclude - ALL calls logged to PartitionLLMCall
-4. Test each term with -intitle:"term" - EACH test logged to PartitionTermAttempt
+3. Rank candidate terms from the term index (what worked on other editions) - the LLM
+   suggests more only when those run out - ALL calls logged to PartitionLLMCall
+4. Test candidates with -intitle:"term", a batch at a time concurrently, and keep them
+   greedily (set cover) - EACH test logged to PartitionTermAttempt
 5. CRITICAL: Do NOT start harvesting until exclusion_set_count < 1000
 6. Harvest the exclusion set - Logged to PartitionQuery
 7. Build OR inclusion query and get count
@@ -28,15 +30,21 @@ import json
 import logging
 import re
 import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
 from datetime import datetime
-from typing import Dict, Any, List, Set, Optional, Callable, Tuple
+from typing import Dict, Any, List, Set, Optional, Callable, Tuple, Awaitable
 from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from sqlalchemy.exc import DBAPIError, OperationalError
 
+from ..config import get_settings
 from ..models import PartitionRun, PartitionTermAttempt, PartitionQuery, PartitionLLMCall, Citation, Edition
 from .api_logger import log_harvest_query
+from .citation_ingest import ack_new_count
+from .llm_gateway import get_llm_gateway
+from .term_index import get_term_index, load_term_context
 
 logger = logging.getLogger(__name__)
 
@@ -140,6 +148,7 @@ TARGET_THRESHOLD = 990  # Just need to be below 1000 - previous 850 was too aggr
 MAX_RECURSION_DEPTH = 3
 MAX_TERM_ATTEMPTS = 200  # Safety limit - keep trying until below 1000
 MAX_CONSECUTIVE_ZERO_REDUCTIONS = 15  # Give up if 15 terms in a row have 0 reduction
+TERM_TEST_BATCH = 6  # Candidate terms count-probed concurrently per round of find_exclusion_set
 LLM_MODEL = "claude-sonnet-4-5-20250929"
 
 # Language filter constants for stratified harvesting
@@ -243,7 +252,6 @@ async def suggest_exclusion_terms_llm(
 
     Returns tuple of (terms_list, llm_call_record)
     """
-    import anthropic
     import os
 
     already_excluded = already_excluded or []
@@ -306,12 +314,13 @@ Return ONLY the JSON array:"""
         return terms, llm_call
 
     try:
-        client = anthropic.Anthropic(api_key=api_key)
         start_time = time.time()
 
         log_now(f"LLM call #{call_number} for PartitionRun #{partition_run.id}...")
 
-        response = client.messages.create(
+        response = await get_llm_gateway().create(
+            purpose="exclusion_terms",
+            cache=True,
             model=LLM_MODEL,
             max_tokens=500,
             messages=[{"role": "user", "content": prompt}]
@@ -541,88 +550,105 @@ async def execute_harvest_query(
 # ============== TERM TESTING WITH FULL LOGGING ==============
 
 
-async def test_exclusion_term(
+async def test_exclusion_terms_concurrently(
     db: AsyncSession,
     partition_run: PartitionRun,
     scholar_service,
     scholar_id: str,
     year: int,
-    term: str,
+    terms: List[str],
     current_exclusions: List[str],
     count_before: int,
-    order_tried: int,
-    source: str,
-    llm_call_id: Optional[int] = None,
+    first_order: int,
+    sources: Dict[str, Tuple[str, Optional[int]]],
     language_filter: Optional[str] = None
-) -> Tuple[int, bool, PartitionTermAttempt]:
+) -> List[Tuple[str, Optional[int], PartitionTermAttempt]]:
     """
-    Test adding a term to the exclusion list.
+    Test several candidate terms at once, each added alone to current_exclusions.
 
-    Returns tuple of (new_count, kept, term_attempt_record)
-    """
-    # Build test query
-    test_exclusions = current_exclusions + [term]
-    test_query = " ".join([f'-intitle:"{t}"' for t in test_exclusions])
+    The count probes run concurrently; the PartitionTermAttempt / PartitionQuery
+    records are written before and after them (one session can't be shared
+    between tasks). kept is left for the caller to decide.
 
-    # Create term attempt record
-    term_attempt = PartitionTermAttempt(
-        partition_run_id=partition_run.id,
-        term=term,
-        order_tried=order_tried,
-        source=source,
-        llm_call_id=llm_call_id,
-        test_query=test_query,
-        count_before=count_before,
-        count_after=0,
-        reduction=0,
-        reduction_percent=0.0,
-        kept=False,
-    )
-    db.add(term_attempt)
+    sources: term -> (source, llm_call_id)
+    Returns [(term, count_after or None on error, term_attempt)] in input order
+    """
+    records = []
+    for offset, term in enumerate(terms):
+        test_query = " ".join([f'-intitle:"{t}"' for t in current_exclusions + [term]])
+        source, llm_call_id = sources.get(term, ("fallback", None))
+        term_attempt = PartitionTermAttempt(
+            partition_run_id=partition_run.id,
+            term=term,
+            order_tried=first_order + offset,
+            source=source,
+            llm_call_id=llm_call_id,
+            test_query=test_query,
+            count_before=count_before,
+            count_after=0,
+            reduction=0,
+            reduction_percent=0.0,
+            kept=False,
+        )
+        query_record = PartitionQuery(
+            partition_run_id=partition_run.id,
+            query_type="term_test",
+            scholar_id=scholar_id,
+            year=year,
+            additional_query=test_query,
+            purpose=f"Testing exclusion of '{term}'",
+            status="pending",
+            started_at=datetime.utcnow(),
+        )
+        db.add(term_attempt)
+        db.add(query_record)
+        records.append((term, test_query, term_attempt, query_record))
     await safe_flush(db)
 
-    try:
+    async def probe(test_query: str) -> Tuple[int, int]:
         start_time = time.time()
-
-        count_after, query_record = await execute_count_query(
-            db=db,
-            partition_run=partition_run,
-            scholar_service=scholar_service,
+        result = await scholar_service.get_cited_by(
             scholar_id=scholar_id,
-            year=year,
-            query_suffix=test_query,
-            query_type="term_test",
-            purpose=f"Testing exclusion of '{term}'",
+            max_results=10,  # Just first page for count
+            year_low=year,
+            year_high=year,
+            additional_query=test_query,
             language_filter=language_filter,
         )
+        count = result.get('totalResults', 0) if isinstance(result, dict) else 0
+        return count, int((time.time() - start_time) * 1000)
 
-        latency_ms = int((time.time() - start_time) * 1000)
-        reduction = count_before - count_after
-        reduction_pct = (reduction / count_before * 100) if count_before > 0 else 0
+    outcomes = await asyncio.gather(*(probe(r[1]) for r in records), return_exceptions=True)
+    # Keep DB connection alive after the Scholar queries
+    await db_keepalive(db)
+
+    results = []
+    for (term, _, term_attempt, query_record), outcome in zip(records, outcomes):
+        query_record.completed_at = datetime.utcnow()
+        if isinstance(outcome, BaseException):
+            query_record.status = "failed"
+            query_record.error_message = str(outcome)[:1000]
+            term_attempt.skip_reason = f"error: {str(outcome)[:80]}"
+            log_now(f"  Term '{term}': ERROR - {outcome}", "warning")
+            results.append((term, None, term_attempt))
+            continue
 
+        count_after, latency_ms = outcome
+        reduction = count_before - count_after
+        query_record.actual_count = count_after
+        query_record.latency_ms = latency_ms
+        query_record.status = "completed"
         term_attempt.count_after = count_after
         term_attempt.reduction = reduction
-        term_attempt.reduction_percent = reduction_pct
+        term_attempt.reduction_percent = (reduction / count_before * 100) if count_before > 0 else 0
         term_attempt.latency_ms = latency_ms
-
-        # Decide whether to keep this term
-        kept = count_after < count_before  # Only keep if it actually reduces count
-        term_attempt.kept = kept
-
-        if not kept:
+        if reduction <= 0:
             term_attempt.skip_reason = "no_reduction" if reduction == 0 else "negative_reduction"
+        log_now(f"  Term '{term}': {count_before} -> {count_after} (reduction: {reduction})")
+        results.append((term, count_after, term_attempt))
 
-        await safe_flush(db)
-
-        log_now(f"  Term '{term}': {count_before} -> {count_after} (reduction: {reduction}, {'KEPT' if kept else 'SKIPPED'})")
-
-        return count_after, kept, term_attempt
-
-    except Exception as e:
-        term_attempt.skip_reason = f"error: {str(e)[:80]}"
-        await safe_flush(db)
-        log_now(f"  Term '{term}': ERROR - {e}", "warning")
-        return count_before, False, term_attempt
+    await safe_flush(db, "term batch completion")
+    return results
 
 
 # ============== MAIN PARTITION LOGIC ==============
@@ -660,21 +686,19 @@ async def find_exclusion_set(
     llm_call_number = 0
     consecutive_zero_reductions = 0  # Track when we're stuck
 
-    # Get initial term suggestions from LLM
-    llm_call_number += 1
-    suggested_terms, llm_call = await suggest_exclusion_terms_llm(
-        db=db,
-        partition_run=partition_run,
-        edition_title=edition_title,
-        year=year,
-        current_count=current_count,
-        already_excluded=excluded_terms,
-        call_number=llm_call_number
-    )
-    # Keep DB connection alive after LLM call (can take 30-60 seconds)
-    await db_keepalive(db)
-
-    term_index = 0
+    # Candidates before any probing: terms that worked on other editions, ranked for this
+    # edition's context, then the generic fallback list. The LLM is only asked once these run out.
+    term_index = get_term_index()
+    await term_index.ensure_fresh(db)
+    context = await load_term_context(db, partition_run.edition_id)
+    ranked = term_index.rank(context)
+    sources: Dict[str, Tuple[str, Optional[int]]] = {term: ("index", None) for term, _ in ranked}
+    for term in get_fallback_exclusion_terms(edition_title):
+        sources.setdefault(term.lower(), ("fallback", None))
+    candidates = list(sources)
+    tried: Set[str] = set()
+    log_now(f"Term index: {len(ranked)} ranked candidates for context {context}"
+            + (f" (top: {[t for t, _ in ranked[:5]]})" if ranked else ""))
 
     # CRITICAL: Keep trying until we're below the HARD LIMIT (1000), not the ideal target (950)
     # The target threshold is a safety margin, but if we can't reach it, being below 1000 is still OK
@@ -684,12 +708,10 @@ async def find_exclusion_set(
         if consecutive_zero_reductions >= MAX_CONSECUTIVE_ZERO_REDUCTIONS:
             log_now(f"STUCK: {MAX_CONSECUTIVE_ZERO_REDUCTIONS} consecutive terms with 0 reduction. Requesting fresh batch from LLM...")
             consecutive_zero_reductions = 0  # Reset and try a fresh batch
-            # Clear remaining suggested terms to force new LLM call
-            suggested_terms = suggested_terms[:term_index]  # Keep only already-tried terms
+            candidates = []  # Drop the remaining candidates to force a new LLM call
 
-        # Get next term to try
-        if term_index >= len(suggested_terms):
-            # Need more terms from LLM
+        if not candidates:
+            # Last resort: more terms from the LLM
             log_now(f"Requesting more terms from LLM (attempt {term_order + 1}, count={current_count})...")
             llm_call_number += 1
             more_terms, llm_call = await suggest_exclusion_terms_llm(
@@ -703,41 +725,90 @@ async def find_exclusion_set(
             )
             # Keep DB connection alive after LLM call
             await db_keepalive(db)
-            if not more_terms:
+            source = ("llm", llm_call.id) if llm_call and llm_call.status == "completed" else ("fallback", None)
+            new_terms = [t for t in dict.fromkeys(t.lower() for t in more_terms) if t not in tried]
+            if not new_terms:
                 log_now(f"LLM returned no new terms after {llm_call_number} calls. Stopping at {current_count}", "warning")
                 break
-            suggested_terms.extend(more_terms)
-            log_now(f"LLM provided {len(more_terms)} new terms to try")
-
-        next_term = suggested_terms[term_index]
-        term_index += 1
-        term_order += 1
-
-        # Test this term
-        new_count, kept, term_attempt = await test_exclusion_term(
+            for term in new_terms:
+                sources[term] = source
+            candidates = new_terms
+            log_now(f"LLM provided {len(new_terms)} new terms to try")
+
+        # Test the next batch concurrently, each against the current exclusion set
+        batch_size = min(TERM_TEST_BATCH, MAX_TERM_ATTEMPTS - term_order)
+        batch, candidates = candidates[:batch_size], candidates[batch_size:]
+        tried.update(batch)
+        results = await test_exclusion_terms_concurrently(
             db=db,
             partition_run=partition_run,
             scholar_service=scholar_service,
             scholar_id=scholar_id,
             year=year,
-            term=next_term,
+            terms=batch,
             current_exclusions=excluded_terms,
             count_before=current_count,
-            order_tried=term_order,
-            source="llm" if llm_call else "fallback",
-            llm_call_id=llm_call.id if llm_call else None,
+            first_order=term_order + 1,
+            sources=sources,
             language_filter=language_filter,
         )
+        term_order += len(batch)
+
+        # Greedy set cover: take the terms that remove the most results first, until the
+        # estimated count (treating terms as independent) is below the target
+        reducing = sorted(
+            [(term, count_after, attempt) for term, count_after, attempt in results
+             if count_after is not None and count_after < current_count],
+            key=lambda r: r[1],
+        )
+        if not reducing:
+            consecutive_zero_reductions += len(batch)
+            continue
+        consecutive_zero_reductions = 0
+
+        selected = []
+        estimate = float(current_count)
+        for term, count_after, attempt in reducing:
+            selected.append((term, attempt))
+            estimate *= count_after / current_count
+            if estimate < TARGET_THRESHOLD:
+                break
 
-        if kept:
-            excluded_terms.append(next_term)
-            current_count = new_count
-            consecutive_zero_reductions = 0  # Reset - we made progress
-        else:
-            consecutive_zero_reductions += 1
+        new_count = reducing[0][1]  # A single term was already measured exactly
+        if len(selected) > 1:
+            # Terms overlap - verify the combined exclusion count
+            try:
+                new_count, _ = await execute_count_query(
+                    db=db,
+                    partition_run=partition_run,
+                    scholar_service=scholar_service,
+                    scholar_id=scholar_id,
+                    year=year,
+                    query_suffix=" ".join([f'-intitle:"{t}"' for t in excluded_terms + [t for t, _ in selected]]),
+                    query_type="term_set_verify",
+                    purpose=f"Verifying exclusion of {len(selected)} selected terms",
+                    language_filter=language_filter,
+                )
+            except Exception as e:
+                log_now(f"  Verifying selected terms failed ({e}) - keeping only the best term", "warning")
+                selected = selected[:1]
+
+        for term, attempt in selected:
+            attempt.kept = True
+        excluded_terms.extend(term for term, _ in selected)
+        log_now(f"  Kept {[t for t, _ in selected]}: {current_count} -> {new_count}")
+        current_count = new_count
+
+        # Reducing terms that weren't needed this round go back to the front - re-tested
+        # against the larger exclusion set if the count is still too high
+        unselected = [term for term, _, attempt in reducing[len(selected):]]
+        for _, _, attempt in reducing[len(selected):]:
+            attempt.skip_reason = "not_selected"
+        candidates = unselected + candidates
+        tried.difference_update(unselected)
+        await safe_flush(db)
 
-        # Rate limit
-        await asyncio.sleep(1)
+    term_index.invalidate()  # This partition's attempts are new evidence
 
     # Log final status
     if current_count < TARGET_THRESHOLD:
@@ -979,9 +1050,6 @@ async def harvest_partition(
             pass
         return stats
 
-    # Rate limit between phases
-    await asyncio.sleep(3)
-
     # Step 3: Build and check INCLUSION query (items WITH at least one term)
     inclusion_query = build_inclusion_query(excluded_terms)
     if base_query:
@@ -1241,21 +1309,14 @@ async def harvest_with_language_stratification(
             total_non_english_new += lang_new
             log_now(f"  {lang_code}: +{lang_new} new papers (total non-English: {total_non_english_new})")
 
-            # Rate limit between languages
-            await asyncio.sleep(2)
-
         except Exception as e:
             log_now(f"  {lang_code}: ERROR - {e}", "error")
             # Continue with next language
-            await asyncio.sleep(3)
 
     stats["non_english_harvested"] = total_non_english_new
     log_now(f"✓ Total non-English harvested: {total_non_english_new} new papers")
     await safe_commit(db)
 
-    # Rate limit before English phase
-    await asyncio.sleep(3)
-
     # ========== STEP 2: Check ENGLISH-ONLY count ==========
     log_now(f"Step 2: Checking English-only papers...")
 
@@ -1360,8 +1421,6 @@ async def harvest_with_language_stratification(
             log_now(f"✓ Harvested {exclusion_new} new English papers (exclusion set)")
             await safe_commit(db)
 
-            await asyncio.sleep(3)
-
             # Build and harvest INCLUSION set (English papers WITH at least one term)
             inclusion_query = build_inclusion_query(excluded_terms)
 
@@ -1569,6 +1628,126 @@ async def get_query_count(
     return result.get('totalResults', 0)
 
 
+# Partition census: an edition's count probes run concurrently before harvesting (see partition_planner)
+CENSUS_CONCURRENCY = 16  # Probes in flight per edition - the Oxylabs limiter still paces them globally
+
+
+def author_letter_partitions() -> Dict[str, Tuple[str, str]]:
+    """Every partition the author-letter strategy may harvest: key -> (additional_query, language_filter)"""
+    partitions = {f"lang_{lang_code}": ("", lang_code) for lang_code in NON_ENGLISH_LANGUAGE_LIST}
+    partitions["lang_en"] = ("", ENGLISH_ONLY)
+    partitions["_"] = (build_letter_exclusion_query(exclude_all_letters=True), ENGLISH_ONLY)
+    for letter in AUTHOR_LETTERS:
+        partitions[letter] = (build_letter_exclusion_query(exclude_all_letters=False, include_letter=letter), ENGLISH_ONLY)
+    return partitions
+
+
+async def run_partition_census(
+    scholar_service,
+    scholar_id: str,
+    partitions: Dict[str, Tuple[str, str]],
+) -> Dict[str, Optional[int]]:
+    """
+    Count every partition concurrently (at most CENSUS_CONCURRENCY at a time).
+
+    Returns partition key -> result count; None where the probe failed, so the
+    caller can re-probe that partition when it gets to it.
+    """
+    semaphore = asyncio.Semaphore(CENSUS_CONCURRENCY)
+
+    async def probe(key: str, additional_query: str, language_filter: str) -> Optional[int]:
+        async with semaphore:
+            try:
+                return await get_query_count(scholar_service, scholar_id, additional_query, language_filter)
+            except Exception as e:
+                log_now(f"  Census probe '{key}' failed: {e}", "warn")
+                return None
+
+    keys = list(partitions)
+    counts = await asyncio.gather(*(probe(key, *partitions[key]) for key in keys))
+    return dict(zip(keys, counts))
+
+
+# Harvests one partition in the given session, returns new citations
+PartitionWork = Callable[[AsyncSession], Awaitable[int]]
+
+# Process-wide cap on open partition sessions (overflow_partition_sessions), so concurrent
+# overflow jobs can't outgrow the worker pool. A partition harvesting sub-partitions (an
+# author letter's pools) already holds a slot - its children run under it.
+_partition_slots: Optional[asyncio.Semaphore] = None
+_holding_partition_slot: ContextVar[bool] = ContextVar("holding_partition_slot", default=False)
+
+
+def _get_partition_slots() -> asyncio.Semaphore:
+    global _partition_slots
+    if _partition_slots is None:
+        _partition_slots = asyncio.Semaphore(max(1, get_settings().overflow_partition_sessions))
+    return _partition_slots
+
+
+@asynccontextmanager
+async def _partition_slot():
+    if _holding_partition_slot.get():
+        yield
+        return
+    async with _get_partition_slots():
+        token = _holding_partition_slot.set(True)
+        try:
+            yield
+        finally:
+            _holding_partition_slot.reset(token)
+
+
+async def harvest_partitions_concurrently(
+    work: Dict[str, PartitionWork],
+    concurrency: int,
+    on_partition_done: Optional[Callable[[str, int, AsyncSession], Awaitable[None]]] = None,
+) -> Dict[str, int]:
+    """
+    Harvest disjoint partitions of one edition concurrently, at most `concurrency` at a time.
+
+    Each partition runs in its own session (an AsyncSession can't be shared
+    between tasks), and holds one of the process-wide overflow_partition_sessions
+    slots while it does; on_partition_done runs in that session so a partition's
+    completion is committed together with its harvest_targets row. The Oxylabs
+    limiter paces the requests of every partition of every job.
+
+    A failing partition doesn't cancel its siblings - the first error is
+    re-raised once they have all finished, so their completions are recorded.
+
+    Returns: partition key -> new citations
+    """
+    from ..database import async_session
+
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run(key: str, harvest: PartitionWork) -> int:
+        async with semaphore, _partition_slot():
+            async with async_session() as session:
+                new = await harvest(session)
+                if on_partition_done:
+                    await on_partition_done(key, new, session)
+                await safe_commit(session, f"partition {key}")
+                return new
+
+    keys = list(work)
+    if len(keys) > 1:
+        log_now(f"  Harvesting {len(keys)} partitions, {min(len(keys), concurrency)} at a time")
+    outcomes = await asyncio.gather(*(run(key, work[key]) for key in keys), return_exceptions=True)
+
+    results: Dict[str, int] = {}
+    errors = []
+    for key, outcome in zip(keys, outcomes):
+        if isinstance(outcome, BaseException):
+            log_now(f"  Partition '{key}' raised: {outcome}", "error")
+            errors.append(outcome)
+        else:
+            results[key] = outcome
+    if errors:
+        raise errors[0]
+    return results
+
+
 async def harvest_query_partition(
     db: AsyncSession,
     scholar_service,
@@ -1611,11 +1790,11 @@ async def harvest_query_partition(
             pages_failed=0,
         )
         db.add(target)
-        await safe_flush(db)
     else:
         target.expected_count = expected_count
         target.status = "harvesting"
-        await safe_flush(db)
+    # Commit now: the target shows as harvesting, and the session holds no connection during the scrape
+    await safe_commit(db)
 
     log_now(f"  Harvesting partition '{partition_key}': {expected_count} expected")
 
@@ -1652,8 +1831,15 @@ async def harvest_query_partition(
         pages_succeeded += 1
         # Call the original callback
         result = await on_page_complete(page_num, papers)
-        if isinstance(result, int):
-            new_citations += result
+        if asyncio.isfuture(result):
+            # Write-behind save - count new citations once the page is durably written
+            # (get_cited_by waits for these acks before returning)
+            def count_saved(ack):
+                nonlocal new_citations
+                new_citations += ack_new_count(ack)
+            result.add_done_callback(count_saved)
+        else:
+            new_citations += ack_new_count(result)
         return result
 
     try:
@@ -1680,6 +1866,8 @@ async def harvest_query_partition(
 
         # Update target
         target.actual_count = new_citations
+        if actual_count:
+            target.final_gs_count = actual_count  # Seeds the partition planner's next estimate
         target.pages_attempted = pages_succeeded + pages_failed
         target.pages_succeeded = pages_succeeded
         target.pages_failed = pages_failed
@@ -1720,11 +1908,6 @@ async def find_source_exclusions_with_llm(
 
     Returns: List of additional source terms to exclude
     """
-    import anthropic
-    import os
-
-    client = anthropic.Anthropic(api_key=os.environ.get("ANTHROPIC_API_KEY"))
-
     prompt = f"""You are helping partition Google Scholar citation results to get below 1000 results.
 
 CONTEXT:
@@ -1747,7 +1930,9 @@ Suggest 10-20 terms that are likely to have significant coverage in this citatio
 """
 
     try:
-        response = client.messages.create(
+        response = await get_llm_gateway().create(
+            purpose="source_exclusions",
+            cache=True,
             model="claude-opus-4-5-20251101",
             max_tokens=16000,
             thinking={
@@ -1782,7 +1967,6 @@ Suggest 10-20 terms that are likely to have significant coverage in this citatio
 
 
 async def harvest_letter_with_subdivision(
-    db: AsyncSession,
     scholar_service,
     scholar_id: str,
     edition_id: int,
@@ -1804,6 +1988,10 @@ async def harvest_letter_with_subdivision(
     - If 2000-3000: Split into 3 pools using extended exclusions
     - If > 3000: Use LLM to find more exclusion terms
 
+    Both pools are counted first, then harvested one after the other (each in its
+    own session): this runs inside a partition slot of the letter phase, so
+    harvesting the pools side by side would multiply overflow_partition_concurrency.
+
     Returns: Total new citations harvested
     """
     total_new = 0
@@ -1858,26 +2046,6 @@ async def harvest_letter_with_subdivision(
         )
         log_now(f"  Pool A after LLM: {pool_a_count} results")
 
-    # Harvest Pool A if under 1000
-    if pool_a_count < 1000 and pool_a_count > 0:
-        new, _ = await harvest_query_partition(
-            db=db,
-            scholar_service=scholar_service,
-            scholar_id=scholar_id,
-            edition_id=edition_id,
-            paper_id=paper_id,
-            partition_key=f"{letter}_excl",
-            additional_query=pool_a_query,
-            language_filter=language_filter,
-            existing_scholar_ids=existing_scholar_ids,
-            on_page_complete=on_page_complete,
-            expected_count=pool_a_count,
-            partition_run=partition_run,
-            on_progress=on_progress,
-        )
-        total_new += new
-        await asyncio.sleep(3)
-
     # Build inclusion query (Pool B: everything IN excluded sources)
     inclusion_source_query = build_source_inclusion_query(exclusions)
     pool_b_query = f"{letter_query} ({inclusion_source_query})"
@@ -1888,43 +2056,39 @@ async def harvest_letter_with_subdivision(
     )
     log_now(f"  Pool B (inclusion): {pool_b_count} results")
 
-    if pool_b_count < 1000 and pool_b_count > 0:
-        new, _ = await harvest_query_partition(
-            db=db,
-            scholar_service=scholar_service,
-            scholar_id=scholar_id,
-            edition_id=edition_id,
-            paper_id=paper_id,
-            partition_key=f"{letter}_incl",
-            additional_query=pool_b_query,
-            language_filter=language_filter,
-            existing_scholar_ids=existing_scholar_ids,
-            on_page_complete=on_page_complete,
-            expected_count=pool_b_count,
-            partition_run=partition_run,
-            on_progress=on_progress,
-        )
-        total_new += new
-    elif pool_b_count >= 1000:
+    def pool_harvest(partition_key: str, pool_query: str, expected_count: int) -> PartitionWork:
+        async def harvest(session: AsyncSession) -> int:
+            new, _ = await harvest_query_partition(
+                db=session,
+                scholar_service=scholar_service,
+                scholar_id=scholar_id,
+                edition_id=edition_id,
+                paper_id=paper_id,
+                partition_key=partition_key,
+                additional_query=pool_query,
+                language_filter=language_filter,
+                existing_scholar_ids=existing_scholar_ids,
+                on_page_complete=on_page_complete,
+                expected_count=expected_count,
+                partition_run=partition_run,
+                on_progress=on_progress,
+            )
+            return new
+        return harvest
+
+    pools: Dict[str, PartitionWork] = {}
+    if pool_a_count < 1000 and pool_a_count > 0:
+        pools[f"{letter}_excl"] = pool_harvest(f"{letter}_excl", pool_a_query, pool_a_count)
+    if pool_b_count >= 1000:
         # Pool B still too large - need to recursively subdivide
         # For now, just harvest first 1000 and log warning
         log_now(f"  WARNING: Pool B has {pool_b_count} results, harvesting first 1000", "warn")
-        new, _ = await harvest_query_partition(
-            db=db,
-            scholar_service=scholar_service,
-            scholar_id=scholar_id,
-            edition_id=edition_id,
-            paper_id=paper_id,
-            partition_key=f"{letter}_incl",
-            additional_query=pool_b_query,
-            language_filter=language_filter,
-            existing_scholar_ids=existing_scholar_ids,
-            on_page_complete=on_page_complete,
-            expected_count=min(pool_b_count, 1000),
-            partition_run=partition_run,
-            on_progress=on_progress,
-        )
-        total_new += new
+    if pool_b_count > 0:
+        pools[f"{letter}_incl"] = pool_harvest(f"{letter}_incl", pool_b_query, min(pool_b_count, 1000))
+
+    # One at a time - the letter already holds one of the phase's overflow_partition_concurrency slots
+    harvested = await harvest_partitions_concurrently(pools, concurrency=1)
+    total_new += sum(harvested.values())
 
     return total_new
 
@@ -1958,6 +2122,10 @@ async def harvest_with_author_letter_strategy(
             - If < 1000: harvest directly
             - If >= 1000: use source-based subdivision
 
+    Partition sizes come from the partition planner up front (known counts reused,
+    stale ones probed concurrently); the partitions of each level are then
+    harvested overflow_partition_concurrency at a time.
+
     Returns: Stats dict with harvest results
     """
     log_now(f"╔{'═'*60}╗")
@@ -1994,21 +2162,29 @@ async def harvest_with_author_letter_strategy(
         except json.JSONDecodeError:
             log_now(f"Warning: Invalid resume state JSON, starting fresh")
 
-    async def mark_partition_complete(partition_key: str, new_citations: int):
-        """Mark a partition as complete in the resume state."""
-        nonlocal resume_state, completed_partitions
-        completed_partitions.add(partition_key)
-        resume_state["completed_partitions"] = list(completed_partitions)
-        resume_state["last_updated"] = datetime.utcnow().isoformat()
-        resume_state.setdefault("partition_stats", {})[partition_key] = new_citations
+    # Concurrent partitions share resume_state - each completion writes (and commits)
+    # the whole state under this lock, so a later snapshot can't be overtaken by an earlier one
+    resume_lock = asyncio.Lock()
 
+    async def save_resume_state(session: Optional[AsyncSession] = None):
+        session = session or db
+        resume_state["last_updated"] = datetime.utcnow().isoformat()
         if edition:
-            await db.execute(
+            await session.execute(
                 update(Edition)
                 .where(Edition.id == edition_id)
                 .values(harvest_resume_state=json.dumps(resume_state))
             )
-            await safe_commit(db)
+            await safe_commit(session)
+
+    async def mark_partition_complete(partition_key: str, new_citations: int, session: Optional[AsyncSession] = None):
+        """Mark a partition as complete in the resume state (committed with the session's pending writes)."""
+        async with resume_lock:
+            completed_partitions.add(partition_key)
+            resume_state["completed_partitions"] = list(completed_partitions)
+            resume_state.setdefault("partition_stats", {})[partition_key] = new_citations
+            await save_resume_state(session)
+        if edition:
             log_now(f"  ✓ Marked partition '{partition_key}' complete ({new_citations} citations)")
 
     # Create partition run for tracking
@@ -2058,12 +2234,85 @@ async def harvest_with_author_letter_strategy(
         await safe_commit(db)
         return stats
 
+    # === PLAN: size every partition that matters - reusing known counts, probing the rest concurrently ===
+    from .partition_planner import build_author_letter_plan, census_from_plan, harvest_count
+
+    partitions = author_letter_partitions()
+    plan = await build_author_letter_plan(
+        db, scholar_service, scholar_id, total_citation_count,
+        partitions, completed_partitions, resume_state.get("census") or {},
+    )
+    plan_nodes = plan["nodes"]
+    partition_run.plan = json.dumps(plan)
+    resume_state["census"] = census_from_plan(plan)
+    await save_resume_state()
+    await safe_commit(db)  # The plan is stored even when there is no edition to save resume state on
+    stats["plan"] = {k: plan[k] for k in ("probes", "reused_counts", "expected_calls", "duration_ms")}
+
+    async def partition_count(key: str) -> int:
+        """Planned size of a partition (probed now if its probe failed or the plan didn't need it)"""
+        node = plan_nodes[key]
+        if node["count"] is None:
+            additional_query, language_filter = partitions[key]
+            node["count"] = await get_query_count(scholar_service, scholar_id, additional_query, language_filter)
+            node["source"] = "probe"
+        return node["count"]
+
+    partition_concurrency = get_settings().overflow_partition_concurrency
+
+    def direct_harvest(partition_key: str, additional_query: str, language: str, expected_count: int) -> PartitionWork:
+        async def harvest(session: AsyncSession) -> int:
+            new, _ = await harvest_query_partition(
+                db=session,
+                scholar_service=scholar_service,
+                scholar_id=scholar_id,
+                edition_id=edition_id,
+                paper_id=paper_id,
+                partition_key=partition_key,
+                additional_query=additional_query,
+                language_filter=language,
+                existing_scholar_ids=existing_scholar_ids,
+                on_page_complete=on_page_complete,
+                expected_count=expected_count,
+                partition_run=partition_run,
+                on_progress=on_progress,
+            )
+            return new
+        return harvest
+
+    def subdivided_harvest(letter: str, letter_count: int) -> PartitionWork:
+        async def harvest(session: AsyncSession) -> int:
+            return await harvest_letter_with_subdivision(
+                scholar_service=scholar_service,
+                scholar_id=scholar_id,
+                edition_id=edition_id,
+                paper_id=paper_id,
+                edition_title=edition_title,
+                letter=letter,
+                letter_count=letter_count,
+                language_filter=ENGLISH_ONLY,
+                existing_scholar_ids=existing_scholar_ids,
+                on_page_complete=on_page_complete,
+                partition_run=partition_run,
+                on_progress=on_progress,
+            )
+        return harvest
+
+    async def harvest_concurrently(work: Dict[str, PartitionWork]) -> int:
+        if not work:
+            return 0
+        # End the job session's transaction first - partitions commit edition rows from their own sessions
+        await safe_commit(db)
+        harvested = await harvest_partitions_concurrently(work, partition_concurrency, mark_partition_complete)
+        return sum(harvested.values())
+
     # === LEVEL 1: Try language stratification first ===
     log_now(f"Total >= 1000 - checking language stratification...")
 
     # Check non-English languages
     non_english_total = 0
     non_english_harvested = 0
+    language_work: Dict[str, PartitionWork] = {}
 
     for lang_code in NON_ENGLISH_LANGUAGE_LIST:
         partition_key = f"lang_{lang_code}"
@@ -2075,31 +2324,17 @@ async def harvest_with_author_letter_strategy(
             non_english_harvested += prev_count
             continue
 
-        lang_count = await get_query_count(scholar_service, scholar_id, "", lang_code)
+        lang_count = await partition_count(partition_key)
         if lang_count > 0:
             log_now(f"  {lang_code}: {lang_count} results")
             non_english_total += lang_count
 
             if lang_count < GOOGLE_SCHOLAR_LIMIT:
-                new, _ = await harvest_query_partition(
-                    db=db,
-                    scholar_service=scholar_service,
-                    scholar_id=scholar_id,
-                    edition_id=edition_id,
-                    paper_id=paper_id,
-                    partition_key=partition_key,
-                    additional_query="",
-                    language_filter=lang_code,
-                    existing_scholar_ids=existing_scholar_ids,
-                    on_page_complete=on_page_complete,
-                    expected_count=lang_count,
-                    partition_run=partition_run,
-                    on_progress=on_progress,
+                language_work[partition_key] = direct_harvest(
+                    partition_key, "", lang_code, harvest_count(plan_nodes[partition_key])
                 )
-                await mark_partition_complete(partition_key, new)
-                non_english_harvested += new
-                await asyncio.sleep(2)
 
+    non_english_harvested += await harvest_concurrently(language_work)
     log_now(f"Non-English: {non_english_harvested} harvested of {non_english_total} expected")
     stats["non_english_harvested"] = non_english_harvested
 
@@ -2114,7 +2349,7 @@ async def harvest_with_author_letter_strategy(
         stats["skipped_resume"] = True
         return stats
 
-    english_count = await get_query_count(scholar_service, scholar_id, "", ENGLISH_ONLY)
+    english_count = await partition_count("lang_en")
     log_now(f"English: {english_count} results")
 
     if english_count < GOOGLE_SCHOLAR_LIMIT:
@@ -2131,7 +2366,7 @@ async def harvest_with_author_letter_strategy(
             language_filter=ENGLISH_ONLY,
             existing_scholar_ids=existing_scholar_ids,
             on_page_complete=on_page_complete,
-            expected_count=english_count,
+            expected_count=harvest_count(plan_nodes["lang_en"]),
             partition_run=partition_run,
             on_progress=on_progress,
         )
@@ -2148,6 +2383,8 @@ async def harvest_with_author_letter_strategy(
     stats["strategy_used"] = "author_letter"
 
     english_harvested = 0
+    # Non-letter items and the letters are disjoint - collected here, harvested concurrently
+    letter_work: Dict[str, PartitionWork] = {}
 
     # Step 1: Harvest non-letter items (rare edge case)
     # Check if already complete (resume)
@@ -2156,32 +2393,13 @@ async def harvest_with_author_letter_strategy(
         log_now(f"Non-letter items: SKIPPING (already complete, {prev_count} citations)")
         english_harvested += prev_count
     else:
-        no_letter_query = build_letter_exclusion_query(exclude_all_letters=True)
-        no_letter_count = await get_query_count(
-            scholar_service, scholar_id, no_letter_query, ENGLISH_ONLY
-        )
+        no_letter_query = partitions["_"][0]
+        no_letter_count = await partition_count("_")
 
         if no_letter_count > 0:
             log_now(f"Non-letter items: {no_letter_count}")
             if no_letter_count < GOOGLE_SCHOLAR_LIMIT:
-                new, _ = await harvest_query_partition(
-                    db=db,
-                    scholar_service=scholar_service,
-                    scholar_id=scholar_id,
-                    edition_id=edition_id,
-                    paper_id=paper_id,
-                    partition_key="_",
-                    additional_query=no_letter_query,
-                    language_filter=ENGLISH_ONLY,
-                    existing_scholar_ids=existing_scholar_ids,
-                    on_page_complete=on_page_complete,
-                    expected_count=no_letter_count,
-                    partition_run=partition_run,
-                    on_progress=on_progress,
-                )
-                await mark_partition_complete("_", new)
-                english_harvested += new
-                await asyncio.sleep(2)
+                letter_work["_"] = direct_harvest("_", no_letter_query, ENGLISH_ONLY, harvest_count(plan_nodes["_"]))
 
     # Step 2: Process each letter a-z
     for letter in AUTHOR_LETTERS:
@@ -2193,10 +2411,8 @@ async def harvest_with_author_letter_strategy(
             stats["letters_processed"].append({"letter": letter, "count": prev_count, "skipped": True})
             continue
 
-        letter_query = build_letter_exclusion_query(exclude_all_letters=False, include_letter=letter)
-        letter_count = await get_query_count(
-            scholar_service, scholar_id, letter_query, ENGLISH_ONLY
-        )
+        letter_query = partitions[letter][0]
+        letter_count = await partition_count(letter)
 
         if letter_count == 0:
             log_now(f"Letter '{letter}': 0 results - skipping")
@@ -2208,44 +2424,12 @@ async def harvest_with_author_letter_strategy(
 
         if letter_count < GOOGLE_SCHOLAR_LIMIT:
             # Direct harvest for this letter
-            new, _ = await harvest_query_partition(
-                db=db,
-                scholar_service=scholar_service,
-                scholar_id=scholar_id,
-                edition_id=edition_id,
-                paper_id=paper_id,
-                partition_key=letter,
-                additional_query=letter_query,
-                language_filter=ENGLISH_ONLY,
-                existing_scholar_ids=existing_scholar_ids,
-                on_page_complete=on_page_complete,
-                expected_count=letter_count,
-                partition_run=partition_run,
-                on_progress=on_progress,
-            )
-            await mark_partition_complete(letter, new)
-            english_harvested += new
+            letter_work[letter] = direct_harvest(letter, letter_query, ENGLISH_ONLY, harvest_count(plan_nodes[letter]))
         else:
             # Need subdivision for this letter
-            new = await harvest_letter_with_subdivision(
-                db=db,
-                scholar_service=scholar_service,
-                scholar_id=scholar_id,
-                edition_id=edition_id,
-                paper_id=paper_id,
-                edition_title=edition_title,
-                letter=letter,
-                letter_count=letter_count,
-                language_filter=ENGLISH_ONLY,
-                existing_scholar_ids=existing_scholar_ids,
-                on_page_complete=on_page_complete,
-                partition_run=partition_run,
-                on_progress=on_progress,
-            )
-            await mark_partition_complete(letter, new)
-            english_harvested += new
+            letter_work[letter] = subdivided_harvest(letter, letter_count)
 
-        await asyncio.sleep(3)  # Rate limit between letters
+    english_harvested += await harvest_concurrently(letter_work)
 
     stats["english_harvested"] = english_harvested
     stats["total_harvested"] = non_english_harvested + english_harvested
@@ -0,0 +1,233 @@
+"""
+Oxylabs Circuit Breaker - shared failure state for all Oxylabs requests
+
+When Oxylabs degrades, every page of every running job used to retry on its own
+(up to 50 attempts each), burning credits in parallel. This module keeps one
+process-wide view of Oxylabs health:
+
+- closed:    normal operation, outcomes recorded in a rolling window
+- open:      error rate crossed the threshold - bulk callers park, interactive
+             callers fail fast with CircuitOpenError
+- half_open: cooldown elapsed - a single probe request is let through; success
+             closes the circuit, failure re-opens it with a longer cooldown
+
+Retry backoff is jittered and driven by the error class (HTTP 4xx vs 5xx vs
+rate-limited vs faulted jobs vs timeouts) and the observed request latency.
+"""
+import asyncio
+import logging
+import random
+import sys
+import time
+from collections import deque
+from datetime import datetime
+from typing import Optional, Dict, Any
+
+from .oxylabs_limiter import current_lane
+
+logger = logging.getLogger(__name__)
+
+
+def log_now(msg: str, level: str = "info"):
+    """Log message and immediately flush to stdout"""
+    timestamp = datetime.utcnow().strftime("%H:%M:%S")
+    print(f"{timestamp} | breaker | {level.upper()} | {msg}", flush=True)
+    sys.stdout.flush()
+
+
+# Breaker thresholds
+BREAKER_WINDOW_SECONDS = 60  # Rolling window for error-rate calculation
+BREAKER_MIN_REQUESTS = 10  # Don't judge error rate on fewer outcomes than this
+BREAKER_ERROR_RATE = 0.5  # Open when >= 50% of recent outcomes failed
+BREAKER_COOLDOWN_SECONDS = 30  # First open period
+BREAKER_MAX_COOLDOWN_SECONDS = 300  # Cooldown doubles on each failed probe, up to this
+BREAKER_PROBE_INTERVAL = 15  # Min seconds between half-open probes
+
+# Backoff base per error class (seconds) - the decorrelated-jitter floor
+BACKOFF_BASE = {
+    "rate_limited": 5.0,  # HTTP 429 - Oxylabs is telling us to slow down
+    "http_5xx": 1.0,
+    "faulted": 2.0,  # Oxylabs job faulted - usually Google pushback
+    "timeout": 2.0,
+    "network": 1.0,
+    "bad_response": 1.0,
+}
+BACKOFF_CAP = 30.0
+
+# Error classes that say nothing about Oxylabs health (our request was bad)
+NON_BREAKER_KINDS = {"http_4xx"}
+
+
+class OxylabsError(Exception):
+    """An Oxylabs failure with a classified kind (drives retry and breaker decisions)"""
+
+    def __init__(self, message: str, kind: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.kind = kind
+        self.status_code = status_code
+
+    @property
+    def retryable(self) -> bool:
+        # Plain 4xx (bad URL/payload) and auth failures will not fix themselves
+        return self.kind not in ("http_4xx", "auth")
+
+
+class CircuitOpenError(Exception):
+    """Raised to interactive callers while the circuit is open"""
+
+
+def classify_status(status_code: int) -> str:
+    """Map an Oxylabs HTTP status to an error kind"""
+    if status_code == 429:
+        return "rate_limited"
+    if status_code in (401, 403):
+        return "auth"
+    if 400 <= status_code < 500:
+        return "http_4xx"
+    return "http_5xx"
+
+
+class OxylabsCircuitBreaker:
+    """Process-wide circuit breaker and backoff policy for Oxylabs"""
+
+    def __init__(self):
+        self.state = "closed"
+        self._outcomes = deque()  # (monotonic_ts, ok: bool)
+        self._opened_at = 0.0
+        self._cooldown = BREAKER_COOLDOWN_SECONDS
+        self._last_probe_at = 0.0
+        self._latency_ewma: Optional[float] = None
+
+        self._times_opened = 0
+        self._failures_by_kind: Dict[str, int] = {}
+        self._successes = 0
+        self._rejected = 0  # Interactive calls failed fast while open
+        self._parked = 0  # Bulk calls that had to wait for the circuit
+
+    def _trim(self, now: float):
+        while self._outcomes and now - self._outcomes[0][0] > BREAKER_WINDOW_SECONDS:
+            self._outcomes.popleft()
+
+    def _error_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        failures = sum(1 for _, ok in self._outcomes if not ok)
+        return failures / len(self._outcomes)
+
+    def _open(self, reason: str):
+        self.state = "open"
+        self._opened_at = time.monotonic()
+        self._times_opened += 1
+        log_now(f"Circuit OPEN for {self._cooldown}s ({reason})", "warn")
+
+    def _probe_allowed(self, now: float) -> bool:
+        if self.state == "open" and now - self._opened_at >= self._cooldown:
+            self.state = "half_open"
+            log_now("Circuit HALF-OPEN - allowing probe request")
+        if self.state == "half_open" and now - self._last_probe_at >= BREAKER_PROBE_INTERVAL:
+            self._last_probe_at = now
+            return True
+        return False
+
+    async def before_request(self):
+        """
+        Gate a request attempt.
+
+        Closed: returns immediately. Open/half-open: interactive callers get
+        CircuitOpenError; bulk callers park until a probe slot or closed circuit.
+        """
+        parked = False
+        while self.state != "closed":
+            now = time.monotonic()
+            if self._probe_allowed(now):
+                return
+            if current_lane() == "interactive":
+                self._rejected += 1
+                raise CircuitOpenError("Oxylabs circuit open - upstream is failing, try again shortly")
+            if not parked:
+                parked = True
+                self._parked += 1
+            remaining = max(self._cooldown - (now - self._opened_at), 0)
+            await asyncio.sleep(min(max(remaining, 1.0), 5.0) + random.uniform(0, 1.0))
+
+    def record_success(self, latency_seconds: float):
+        now = time.monotonic()
+        self._successes += 1
+        self._outcomes.append((now, True))
+        self._trim(now)
+        self._latency_ewma = latency_seconds if self._latency_ewma is None else (
+            0.8 * self._latency_ewma + 0.2 * latency_seconds
+        )
+        if self.state != "closed":
+            log_now(f"Circuit CLOSED - probe succeeded in {latency_seconds:.1f}s")
+            self.state = "closed"
+            self._cooldown = BREAKER_COOLDOWN_SECONDS
+            self._outcomes.clear()
+
+    def record_failure(self, kind: str):
+        now = time.monotonic()
+        self._failures_by_kind[kind] = self._failures_by_kind.get(kind, 0) + 1
+        if kind in NON_BREAKER_KINDS:
+            return
+
+        if self.state == "half_open":
+            self._cooldown = min(self._cooldown * 2, BREAKER_MAX_COOLDOWN_SECONDS)
+            self._open(f"probe failed: {kind}")
+            return
+
+        self._outcomes.append((now, False))
+        self._trim(now)
+        if (self.state == "closed" and len(self._outcomes) >= BREAKER_MIN_REQUESTS
+                and self._error_rate() >= BREAKER_ERROR_RATE):
+            self._open(f"error rate {self._error_rate():.0%} over {len(self._outcomes)} requests, last: {kind}")
+
+    def backoff(self, kind: str, previous: Optional[float] = None) -> float:
+        """
+        Decorrelated-jitter backoff: random between base and 3x the previous delay.
+
+        The base comes from the error class and is raised when Oxylabs is slow
+        (a quarter of the observed latency), so slow upstream = slower retries.
+        """
+        base = BACKOFF_BASE.get(kind, 1.0)
+        if self._latency_ewma:
+            base = max(base, self._latency_ewma * 0.25)
+        upper = max(base, (previous or base) * 3)
+        return min(BACKOFF_CAP, random.uniform(base, upper))
+
+    def poll_delay(self) -> float:
+        """Delay between async job status polls - jittered, stretched when Oxylabs is slow/unhealthy"""
+        base = 2.0
+        if self._latency_ewma:
+            base = max(base, min(self._latency_ewma * 0.1, 5.0))
+        if self.state != "closed":
+            base *= 2
+        return base + random.uniform(0, base * 0.5)
+
+    def get_stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        self._trim(now)
+        return {
+            "state": self.state,
+            "error_rate": round(self._error_rate(), 3),
+            "window_requests": len(self._outcomes),
+            "cooldown_seconds": self._cooldown,
+            "open_for_seconds": round(now - self._opened_at) if self.state != "closed" else 0,
+            "times_opened": self._times_opened,
+            "successes": self._successes,
+            "failures_by_kind": dict(self._failures_by_kind),
+            "rejected_interactive": self._rejected,
+            "parked_bulk": self._parked,
+            "latency_ewma_seconds": round(self._latency_ewma, 2) if self._latency_ewma else None,
+        }
+
+
+# Singleton instance
+_breaker: Optional[OxylabsCircuitBreaker] = None
+
+
+def get_oxylabs_breaker() -> OxylabsCircuitBreaker:
+    """Get the process-wide Oxylabs circuit breaker"""
+    global _breaker
+    if _breaker is None:
+        _breaker = OxylabsCircuitBreaker()
+    return _breaker
@@ -0,0 +1,181 @@
+"""
+Oxylabs Limiter - process-wide rate limiter and concurrency governor
+
+Every Oxylabs request goes through one limiter instead of ad-hoc sleeps:
+- Token bucket caps the request rate (requests/second with a small burst)
+- In-flight cap bounds concurrent requests across ALL jobs and endpoints
+- Priority lanes: "interactive" requests (edition discovery, quick-add) are
+  granted before any waiting "bulk" harvest request
+
+The lane is carried in a ContextVar, so an endpoint only has to wrap its work in
+`with oxylabs_lane("interactive"):` - tasks spawned inside (e.g. page prefetch)
+inherit it.
+"""
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import Optional, Dict, Any
+
+from ..config import get_settings
+
+logger = logging.getLogger(__name__)
+
+LANES = ("interactive", "bulk")
+_LANE_RANK = {lane: rank for rank, lane in enumerate(LANES)}
+
+_current_lane: ContextVar[str] = ContextVar("oxylabs_lane", default="bulk")
+
+
+@contextmanager
+def oxylabs_lane(lane: str):
+    """Run the enclosed code (and tasks it spawns) in the given priority lane"""
+    token = _current_lane.set(lane)
+    try:
+        yield
+    finally:
+        _current_lane.reset(token)
+
+
+def current_lane() -> str:
+    return _current_lane.get()
+
+
+class OxylabsLimiter:
+    """Token bucket + in-flight cap with strict priority between lanes (FIFO within a lane)"""
+
+    def __init__(self, rate_per_second: float, burst: int, max_in_flight: int):
+        self.rate = max(rate_per_second, 0.01)
+        self.burst = max(burst, 1)
+        self.max_in_flight = max(max_in_flight, 1)
+
+        self._tokens = float(self.burst)
+        self._last_refill = time.monotonic()
+        self._in_flight = 0
+        self._waiters = []  # heap of (lane_rank, seq, future, lane, enqueued_at)
+        self._seq = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+        self._granted = {lane: 0 for lane in LANES}
+        self._waits = {lane: deque(maxlen=500) for lane in LANES}  # Recent wait times (seconds)
+        self._max_wait = {lane: 0.0 for lane in LANES}
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    def _dispatch(self):
+        """Grant slots to waiters in priority order while tokens and in-flight capacity allow"""
+        self._timer = None
+        self._refill()
+
+        while self._waiters and self._in_flight < self.max_in_flight:
+            _, _, fut, lane, enqueued_at = self._waiters[0]
+            if fut.done():
+                # Waiter was cancelled while queued
+                heapq.heappop(self._waiters)
+                continue
+
+            if self._tokens < 1:
+                # Wake up when the next token is available
+                delay = (1 - self._tokens) / self.rate
+                self._timer = asyncio.get_running_loop().call_later(delay, self._dispatch)
+                return
+
+            heapq.heappop(self._waiters)
+            self._tokens -= 1
+            self._in_flight += 1
+
+            waited = time.monotonic() - enqueued_at
+            self._granted[lane] += 1
+            self._waits[lane].append(waited)
+            self._max_wait[lane] = max(self._max_wait[lane], waited)
+
+            fut.set_result(None)
+
+    async def acquire(self, lane: Optional[str] = None):
+        """Wait for a request slot. Must be paired with release()."""
+        lane = lane or current_lane()
+        if lane not in _LANE_RANK:
+            lane = "bulk"
+
+        fut = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (_LANE_RANK[lane], next(self._seq), fut, lane, time.monotonic()))
+        if self._timer is None:
+            self._dispatch()
+
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                # Slot was granted just as we got cancelled - hand it back
+                self.release()
+            raise
+
+    def release(self):
+        self._in_flight = max(0, self._in_flight - 1)
+        if self._timer is None:
+            self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, lane: Optional[str] = None):
+        """async with limiter.slot(): ... - holds one in-flight slot for the block"""
+        await self.acquire(lane)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        self._refill()
+        queue_depth = {lane: 0 for lane in LANES}
+        for _, _, fut, lane, _ in self._waiters:
+            if not fut.done():
+                queue_depth[lane] += 1
+
+        wait_ms = {}
+        for lane in LANES:
+            waits = sorted(self._waits[lane])
+            wait_ms[lane] = {
+                "avg": round(sum(waits) / len(waits) * 1000) if waits else 0,
+                "p95": round(waits[min(len(waits) - 1, int(len(waits) * 0.95))] * 1000) if waits else 0,
+                "max": round(self._max_wait[lane] * 1000),
+                "samples": len(waits),
+            }
+
+        return {
+            "rate_per_second": self.rate,
+            "burst": self.burst,
+            "max_in_flight": self.max_in_flight,
+            "in_flight": self._in_flight,
+            "tokens_available": round(self._tokens, 2),
+            "queue_depth": queue_depth,
+            "granted": dict(self._granted),
+            "wait_ms": wait_ms,
+        }
+
+
+# Singleton instance
+_limiter: Optional[OxylabsLimiter] = None
+
+
+def get_oxylabs_limiter() -> OxylabsLimiter:
+    """Get the process-wide Oxylabs limiter"""
+    global _limiter
+    if _limiter is None:
+        settings = get_settings()
+        _limiter = OxylabsLimiter(
+            rate_per_second=settings.oxylabs_rate_per_second,
+            burst=settings.oxylabs_burst,
+            max_in_flight=settings.oxylabs_max_in_flight,
+        )
+        logger.info(
+            f"Oxylabs limiter: {settings.oxylabs_rate_per_second}/s, burst {settings.oxylabs_burst}, "
+            f"max in-flight {settings.oxylabs_max_in_flight}"
+        )
+    return _limiter
@@ -9,9 +9,9 @@ Handles:
 """
 import logging
 from typing import Optional, Dict, Any, List
-import anthropic
 
 from ..config import get_settings
+from .llm_gateway import get_llm_gateway
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -42,8 +42,6 @@ async def verify_scholar_match(
         return {"verified": True, "confidence": 0.5, "reason": "LLM verification skipped (no API key)"}
 
     try:
-        client = anthropic.Anthropic(api_key=settings.anthropic_api_key)
-
         # Format primary result
         primary_text = f"""
 Title: "{primary_result.get('title', 'Unknown')}"
@@ -96,7 +94,9 @@ Important:
 
 ONLY return the JSON object, no other text."""
 
-        response = client.messages.create(
+        response = await get_llm_gateway().create(
+            purpose="paper_verification",
+            cache=True,
             model="claude-sonnet-4-5-20250929",
             max_tokens=512,
             messages=[{"role": "user", "content": prompt}]
@@ -0,0 +1,179 @@
+"""
+Parse Executor - runs Scholar HTML parsing off the event loop
+
+The single asyncio loop serves the API, the job worker, every running harvest,
+the health monitor and the api_logger flush. Parsing a 200KB Scholar page on
+that loop stalls all of them, so parsing goes through this stage:
+
+- "process": ProcessPoolExecutor (default) - parsing runs in parallel with the
+             loop, no GIL contention
+- "thread":  ThreadPoolExecutor - lighter, but shares the GIL with the loop
+- "inline":  parse directly on the loop (tests, debugging, the old behaviour)
+
+Parse functions must be module-level (picklable) - see scholar_parser. Pool
+workers import only what unpickling them needs: app.services resolves its
+service exports lazily, so a child never loads the scraping and LLM stack. If the
+process pool breaks (worker killed, OOM), it is recreated and the call is parsed
+inline so the page is not lost.
+"""
+import asyncio
+import logging
+import multiprocessing
+import sys
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from typing import Optional, Dict, Any, Callable
+
+from ..config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+def log_now(msg: str, level: str = "info"):
+    """Log message and immediately flush to stdout"""
+    timestamp = datetime.utcnow().strftime("%H:%M:%S")
+    print(f"{timestamp} | parse | {level.upper()} | {msg}", flush=True)
+    sys.stdout.flush()
+
+
+EXECUTOR_MODES = ("process", "thread", "inline")
+
+
+def _warm_up() -> bool:
+    """Run in each pool worker at startup so the first real parse doesn't pay the parser's import cost"""
+    from .scholar_parser import extract_result_count
+
+    extract_result_count("")
+    return True
+
+
+class ParseExecutor:
+    """Runs parse functions in the configured executor and tracks how long they take"""
+
+    def __init__(self, mode: str, workers: int):
+        if mode not in EXECUTOR_MODES:
+            logger.warning(f"Unknown parse executor mode {mode!r} - using 'process'")
+            mode = "process"
+        self.mode = mode
+        self.workers = max(workers, 1)
+        self._executor: Optional[Executor] = None
+
+        self._calls = 0
+        self._in_flight = 0
+        self._max_in_flight = 0
+        self._failures = 0
+        self._pool_restarts = 0
+        self._durations = deque(maxlen=500)  # Recent round-trip times (seconds)
+        self._max_duration = 0.0
+
+    def _get_executor(self) -> Optional[Executor]:
+        if self.mode == "inline":
+            return None
+        if self._executor is None:
+            if self.mode == "process":
+                # spawn, not fork: the parent has a running loop and thread pools
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="parse")
+        return self._executor
+
+    async def start(self):
+        """Create the pool and warm up its workers"""
+        executor = self._get_executor()
+        if executor is None:
+            return
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*[loop.run_in_executor(executor, _warm_up) for _ in range(self.workers)])
+        logger.info(f"Parse executor started: {self.mode} x{self.workers}")
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def run(self, fn: Callable, *args):
+        """Run fn(*args) in the executor and return its result"""
+        start = time.monotonic()
+        self._calls += 1
+        self._in_flight += 1
+        self._max_in_flight = max(self._max_in_flight, self._in_flight)
+        try:
+            executor = self._get_executor()
+            if executor is None:
+                return fn(*args)
+            try:
+                return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+            except BrokenProcessPool:
+                self._failures += 1
+                self._pool_restarts += 1
+                log_now("Parse process pool broke - recreating it and parsing this page inline", "warn")
+                self._executor = None
+                return fn(*args)
+        finally:
+            self._in_flight -= 1
+            elapsed = time.monotonic() - start
+            self._durations.append(elapsed)
+            self._max_duration = max(self._max_duration, elapsed)
+
+    def get_stats(self) -> Dict[str, Any]:
+        durations = sorted(self._durations)
+        return {
+            "mode": self.mode,
+            "workers": self.workers if self.mode != "inline" else 0,
+            "calls": self._calls,
+            "in_flight": self._in_flight,
+            "max_in_flight": self._max_in_flight,
+            "failures": self._failures,
+            "pool_restarts": self._pool_restarts,
+            # Round trip including queueing; in inline mode this is time the loop was blocked
+            "duration_ms": {
+                "avg": round(sum(durations) / len(durations) * 1000, 1) if durations else 0,
+                "p95": round(durations[min(len(durations) - 1, int(len(durations) * 0.95))] * 1000, 1) if durations else 0,
+                "max": round(self._max_duration * 1000, 1),
+                "samples": len(durations),
+            },
+        }
+
+
+# Singleton instance
+_parse_executor: Optional[ParseExecutor] = None
+
+
+def get_parse_executor() -> ParseExecutor:
+    """Get the process-wide parse executor"""
+    global _parse_executor
+    if _parse_executor is None:
+        settings = get_settings()
+        _parse_executor = ParseExecutor(
+            mode=settings.scholar_parse_executor,
+            workers=settings.scholar_parse_workers,
+        )
+    return _parse_executor
+
+
+async def run_parse(fn: Callable, *args):
+    """Run a module-level parse function through the shared parse executor"""
+    return await get_parse_executor().run(fn, *args)
+
+
+async def start_parse_executor():
+    """Create and warm up the parse pool (falls back to inline parsing if that fails)"""
+    executor = get_parse_executor()
+    try:
+        await executor.start()
+    except Exception as e:
+        log_now(f"Could not start {executor.mode} parse pool ({e}) - parsing inline", "warn")
+        executor.shutdown()
+        executor.mode = "inline"
+
+
+async def stop_parse_executor():
+    """Shut down the parse pool"""
+    if _parse_executor is not None:
+        _parse_executor.shutdown()
@@ -0,0 +1,232 @@
+"""
+Partition Planner - cost-model-driven planning for the author-letter harvest strategy
+
+The author-letter strategy needs the size of every partition of an overflow
+edition (each language, then '_' and a-z within English) before it can decide
+what to harvest directly and what to split further. Probing all of them costs
+~40 Oxylabs calls per edition on every re-harvest and refresh, although
+harvest_targets already records what Scholar reported for each partition the
+last time round.
+
+The planner sizes the partition tree with as few count probes as it can:
+
+- Known counts are seeded from harvest_targets (same scholar_id, same
+  partition key - which determines the query) and from the counts a previous
+  run of this harvest persisted in its resume state
+- Only stale nodes are re-probed: unknown, older than PLAN_MAX_AGE_HOURS, or
+  close enough to the 1000-result limit that growth could flip the decision.
+  Counts only grow, so a partition well over the limit stays over it
+- Letters are only probed once English is known to overflow - when English
+  fits in one query, the 27 letter probes are never spent
+- Each node records the action the strategy will take on it (harvest / split /
+  subdivide / skip / done) and an estimate of its Oxylabs calls (probe + pages).
+  The plan is descriptive: the estimate is reported, not optimised over - how
+  an overflowing letter is subdivided is still decided by
+  harvest_letter_with_subdivision. The plan is stored on the PartitionRun and
+  served by GET /api/admin/partition-runs/{id}
+"""
+import math
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Any, Set, Tuple
+
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models import Edition, HarvestTarget
+from .overflow_harvester import (
+    GOOGLE_SCHOLAR_LIMIT,
+    NON_ENGLISH_LANGUAGE_LIST,
+    AUTHOR_LETTERS,
+    log_now,
+    run_partition_census,
+)
+
+PLAN_MAX_AGE_HOURS = 24 * 7  # Known counts older than this are re-probed (unless well over the limit)
+PLAN_HEADROOM = 0.1  # Counts within 10% of the limit are re-probed; harvests of reused counts allow 10% growth
+RESULTS_PER_PAGE = 10
+SUBDIVISION_PROBES = 2  # Pool A + pool B counts when a letter is subdivided by source
+
+
+def expected_pages(count: int) -> int:
+    return math.ceil(min(count, GOOGLE_SCHOLAR_LIMIT) / RESULTS_PER_PAGE)
+
+
+def is_fresh(count: int, observed_at: datetime, now: datetime) -> bool:
+    """Can a known count stand in for a probe?"""
+    if count >= GOOGLE_SCHOLAR_LIMIT * (1 + PLAN_HEADROOM):
+        return True  # Counts only grow - an overflowing partition stays overflowing
+    if now - observed_at > timedelta(hours=PLAN_MAX_AGE_HOURS):
+        return False
+    return count <= GOOGLE_SCHOLAR_LIMIT * (1 - PLAN_HEADROOM)
+
+
+async def load_known_counts(
+    db: AsyncSession,
+    scholar_id: str,
+    keys: Set[str],
+    census: Dict[str, Any],
+) -> Dict[str, Tuple[int, datetime, str]]:
+    """
+    Latest known count per partition key: key -> (count, observed_at, source).
+
+    Sources: harvest_targets rows of any edition with this scholar_id (the last
+    count Scholar showed while harvesting, else the count it was planned with),
+    and the census persisted in this edition's resume state.
+    """
+    known: Dict[str, Tuple[int, datetime, str]] = {}
+
+    result = await db.execute(
+        select(
+            HarvestTarget.letter,
+            func.coalesce(HarvestTarget.final_gs_count, HarvestTarget.expected_count).label("count"),
+            HarvestTarget.updated_at,
+        )
+        .join(Edition, Edition.id == HarvestTarget.edition_id)
+        .where(Edition.scholar_id == scholar_id)
+        .where(HarvestTarget.year.is_(None))
+        .where(HarvestTarget.letter.in_(keys))
+        .order_by(HarvestTarget.updated_at)
+    )
+    for row in result:
+        if row.count is not None and row.updated_at is not None:
+            known[row.letter] = (row.count, row.updated_at, "harvest_targets")
+
+    for key, entry in census.items():
+        try:
+            observed_at = datetime.fromisoformat(entry["observed_at"])
+            count = int(entry["count"])
+        except (KeyError, TypeError, ValueError):
+            continue
+        if key in keys and (key not in known or observed_at > known[key][1]):
+            known[key] = (count, observed_at, "census")
+
+    return known
+
+
+async def build_author_letter_plan(
+    db: AsyncSession,
+    scholar_service,
+    scholar_id: str,
+    total_count: int,
+    partitions: Dict[str, Tuple[str, str]],
+    completed: Set[str],
+    census: Dict[str, Any],
+) -> Dict[str, Any]:
+    """
+    Plan an author-letter harvest: size every partition that matters, probing as
+    few as possible, and estimate the Oxylabs calls the harvest will make.
+
+    partitions: key -> (additional_query, language_filter), as from author_letter_partitions()
+    census: counts persisted by an earlier run of this harvest (see census_from_plan)
+
+    Returns the plan: nodes keyed by partition key (count, source, action,
+    expected_calls...) plus totals. A node's count is None if its probe failed.
+    """
+    started = time.time()
+    now = datetime.utcnow()
+    letter_keys = ["_"] + AUTHOR_LETTERS
+    level1_keys = [f"lang_{lang_code}" for lang_code in NON_ENGLISH_LANGUAGE_LIST] + ["lang_en"]
+
+    known = await load_known_counts(db, scholar_id, set(partitions), census)
+    nodes: Dict[str, Dict[str, Any]] = {}
+    for key, (additional_query, language_filter) in partitions.items():
+        node = {
+            "parent": "lang_en" if key in letter_keys else "_all",
+            "query": additional_query,
+            "language": language_filter,
+            "count": None,
+            "source": None,
+            "observed_at": None,
+        }
+        if key in known:
+            count, observed_at, source = known[key]
+            if key in completed or is_fresh(count, observed_at, now):
+                node.update(count=count, source=source, observed_at=observed_at.isoformat())
+        nodes[key] = node
+
+    def stale(keys) -> Dict[str, Tuple[str, str]]:
+        return {k: partitions[k] for k in keys if k not in completed and nodes[k]["count"] is None}
+
+    async def probe(keys) -> int:
+        to_probe = stale(keys)
+        if to_probe:
+            counts = await run_partition_census(scholar_service, scholar_id, to_probe)
+            observed_at = datetime.utcnow().isoformat()
+            for key, count in counts.items():
+                nodes[key].update(count=count, source="probe" if count is not None else "probe_failed", observed_at=observed_at)
+        return len(to_probe)
+
+    def english_overflows() -> bool:
+        english = nodes["lang_en"]["count"]
+        return english is not None and english >= GOOGLE_SCHOLAR_LIMIT
+
+    # Wave 1: languages (+ letters too when English is already known to overflow)
+    wave1 = level1_keys + (letter_keys if english_overflows() else [])
+    probes = await probe(wave1)
+    # Wave 2: letters, only needed if English turned out to overflow
+    if english_overflows():
+        probes += await probe(letter_keys)
+
+    # Actions and expected Oxylabs calls per node
+    total_pages = 0
+    for key, node in nodes.items():
+        count = node["count"]
+        in_english = key in letter_keys
+        if key in completed:
+            action = "done"
+        elif in_english and not english_overflows():
+            action = "not_needed"  # English is harvested in one query
+        elif count is None:
+            action = "probe_at_harvest"  # Probe failed - the strategy counts it live
+        elif count == 0:
+            action = "skip"
+        elif count < GOOGLE_SCHOLAR_LIMIT:
+            action = "harvest"
+        elif key == "lang_en":
+            action = "split"  # Into '_' and a-z
+        elif in_english and key != "_":
+            action = "subdivide"  # By source exclusions
+        else:
+            action = "skip_overflow"  # Not harvested by the strategy (non-English or '_' >= 1000)
+
+        pages = 0
+        if action == "harvest":
+            pages = expected_pages(count)
+        elif action == "subdivide":
+            pages = expected_pages(count) + SUBDIVISION_PROBES
+        node["action"] = action
+        node["expected_calls"] = pages + (1 if node["source"] in ("probe", "probe_failed") else 0)
+        total_pages += pages
+
+    reused = sum(1 for node in nodes.values() if node["source"] in ("harvest_targets", "census"))
+    plan = {
+        "scholar_id": scholar_id,
+        "total_count": total_count,
+        "created_at": now.isoformat(),
+        "probes": probes,
+        "reused_counts": reused,
+        "expected_pages": total_pages,
+        "expected_calls": probes + total_pages,
+        "duration_ms": int((time.time() - started) * 1000),
+        "nodes": nodes,
+    }
+    log_now(f"Plan: {probes} probes, {reused} counts reused, ~{plan['expected_calls']} Oxylabs calls expected")
+    return plan
+
+
+def harvest_count(node: Dict[str, Any]) -> int:
+    """Expected count to harvest a node with - reused counts allow for growth since they were observed"""
+    count = node["count"] or 0
+    if node["source"] in ("harvest_targets", "census"):
+        return min(count + int(GOOGLE_SCHOLAR_LIMIT * PLAN_HEADROOM), GOOGLE_SCHOLAR_LIMIT)
+    return count
+
+
+def census_from_plan(plan: Dict[str, Any]) -> Dict[str, Any]:
+    """Counts worth persisting in the resume state: key -> {count, observed_at}"""
+    return {
+        key: {"count": node["count"], "observed_at": node["observed_at"]}
+        for key, node in plan["nodes"].items()
+        if node["count"] is not None and node["observed_at"]
+    }
@@ -0,0 +1,264 @@
+"""
+Scholar Page Cache - two-tier cache for parsed Google Scholar result pages
+
+Every Scholar page we fetch costs an Oxylabs credit and 10-20 seconds. Overflow
+partition probing, verify/repair and edition discovery re-issue the same URLs
+constantly, so parsed pages are cached keyed on the fully-built Scholar URL:
+
+- Tier 1: bounded in-memory LRU (per process, fastest)
+- Tier 2: the search_cache table (survives restarts and deploys)
+
+Entries carry a per-call-type TTL. A background sweeper deletes expired rows
+using the ix_cache_expires index.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import sys
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Optional, Dict, Any, Set, Tuple
+
+from sqlalchemy import select, delete
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+logger = logging.getLogger(__name__)
+
+
+def log_now(msg: str, level: str = "info"):
+    """Log message and immediately flush to stdout"""
+    timestamp = datetime.utcnow().strftime("%H:%M:%S")
+    print(f"{timestamp} | cache | {level.upper()} | {msg}", flush=True)
+    sys.stdout.flush()
+
+
+# TTL per call type (seconds)
+CACHE_TTLS = {
+    "search": 7 * 24 * 3600,     # Keyword searches (edition discovery) - results barely move
+    "cited_by": 6 * 3600,        # Cited-by harvest pages
+    "count": 12 * 3600,          # First-page count probes (partition planning)
+    "year_count": 24 * 3600,     # Per-year count lookups for gap analysis
+    "specific_page": 3600,       # Gap-filling page fetches - want fairly fresh data
+    "verify": 15 * 60,           # Last-page verification must reflect current Scholar state
+}
+DEFAULT_TTL = 3600
+MEMORY_MAX_ENTRIES = 2000  # ~10-20KB per parsed page
+SWEEP_INTERVAL = 600  # Delete expired rows every 10 minutes
+
+
+class ScholarPageCache:
+    """Bounded LRU in front of the search_cache table, keyed on Scholar URL"""
+
+    def __init__(self, max_entries: int = MEMORY_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._memory: "OrderedDict[str, Tuple[datetime, Dict[str, Any]]]" = OrderedDict()
+        self._stats = {
+            "memory_hits": 0,
+            "db_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "evictions": 0,
+            "expired": 0,
+            "db_errors": 0,
+            "swept_rows": 0,
+        }
+        self._by_type: Dict[str, Dict[str, int]] = {}
+        self._writes: Set[asyncio.Task] = set()  # In-flight background persists (the loop only keeps weak refs)
+
+    @staticmethod
+    def url_hash(url: str) -> str:
+        """SHA-256 of the full Scholar URL (fits search_cache.query_hash)"""
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _record(self, call_type: str, outcome: str):
+        counters = self._by_type.setdefault(call_type, {"hits": 0, "misses": 0})
+        counters[outcome] += 1
+
+    def _remember(self, key: str, expires_at: datetime, payload: Dict[str, Any]):
+        """Insert into the in-memory LRU, evicting the oldest entries if full"""
+        self._memory[key] = (expires_at, payload)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    async def get(self, url: str, call_type: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a parsed page. Checks memory first, then the search_cache table.
+
+        Returns the cached payload ({"papers": [...], "total_results": N}) or None.
+        """
+        key = self.url_hash(url)
+        now = datetime.utcnow()
+
+        entry = self._memory.get(key)
+        if entry:
+            expires_at, payload = entry
+            if expires_at > now:
+                self._memory.move_to_end(key)
+                self._stats["memory_hits"] += 1
+                self._record(call_type, "hits")
+                return payload
+            del self._memory[key]
+            self._stats["expired"] += 1
+
+        row = None
+        try:
+            from ..database import async_session
+            from ..models import SearchCache
+
+            async with async_session() as db:
+                result = await db.execute(
+                    select(SearchCache.results, SearchCache.expires_at)
+                    .where(SearchCache.query_hash == key)
+                    .where(SearchCache.expires_at > now)
+                )
+                row = result.first()
+        except Exception as e:
+            self._stats["db_errors"] += 1
+            log_now(f"DB lookup failed (treating as miss): {e}", "warn")
+
+        if row:
+            try:
+                payload = json.loads(row.results)
+            except (TypeError, json.JSONDecodeError):
+                payload = None
+            if payload is not None:
+                self._remember(key, row.expires_at, payload)
+                self._stats["db_hits"] += 1
+                self._record(call_type, "hits")
+                return payload
+
+        self._stats["misses"] += 1
+        self._record(call_type, "misses")
+        return None
+
+    async def put(self, url: str, call_type: str, payload: Dict[str, Any], ttl: Optional[int] = None):
+        """Store a parsed page in memory and (in the background) in search_cache"""
+        ttl = ttl or CACHE_TTLS.get(call_type, DEFAULT_TTL)
+        now = datetime.utcnow()
+        expires_at = now + timedelta(seconds=ttl)
+        key = self.url_hash(url)
+
+        self._remember(key, expires_at, payload)
+        self._stats["stores"] += 1
+
+        # Persist without holding up the page pipeline
+        task = asyncio.create_task(self._persist(key, url, payload, now, expires_at))
+        self._writes.add(task)
+        task.add_done_callback(self._writes.discard)
+
+    async def _persist(self, key: str, url: str, payload: Dict[str, Any], now: datetime, expires_at: datetime):
+        try:
+            from ..database import async_session
+            from ..models import SearchCache
+
+            results_json = json.dumps(payload)
+            result_count = payload.get("total_results") or len(payload.get("papers") or [])
+
+            async with async_session() as db:
+                stmt = pg_insert(SearchCache).values(
+                    query_hash=key,
+                    query=url,
+                    results=results_json,
+                    result_count=result_count,
+                    created_at=now,
+                    expires_at=expires_at,
+                ).on_conflict_do_update(
+                    index_elements=["query_hash"],
+                    set_={
+                        "results": results_json,
+                        "result_count": result_count,
+                        "created_at": now,
+                        "expires_at": expires_at,
+                    },
+                )
+                await db.execute(stmt)
+                await db.commit()
+        except Exception as e:
+            self._stats["db_errors"] += 1
+            logger.warning(f"Failed to persist cache entry: {e}")
+
+    async def sweep(self) -> int:
+        """Drop expired entries from memory and the search_cache table. Returns rows deleted."""
+        now = datetime.utcnow()
+
+        expired_keys = [k for k, (expires_at, _) in self._memory.items() if expires_at <= now]
+        for k in expired_keys:
+            del self._memory[k]
+        self._stats["expired"] += len(expired_keys)
+
+        from ..database import async_session
+        from ..models import SearchCache
+
+        async with async_session() as db:
+            result = await db.execute(
+                delete(SearchCache).where(SearchCache.expires_at < now)
+            )
+            await db.commit()
+            deleted = result.rowcount or 0
+
+        self._stats["swept_rows"] += deleted
+        if deleted or expired_keys:
+            log_now(f"Swept {deleted} expired rows, {len(expired_keys)} memory entries")
+        return deleted
+
+    def get_stats(self) -> Dict[str, Any]:
+        hits = self._stats["memory_hits"] + self._stats["db_hits"]
+        lookups = hits + self._stats["misses"]
+        return {
+            **self._stats,
+            "hits": hits,
+            "hit_rate": round(hits / lookups, 3) if lookups else None,
+            "memory_entries": len(self._memory),
+            "memory_max_entries": self.max_entries,
+            "pending_writes": len(self._writes),
+            "by_call_type": self._by_type,
+            "ttls_seconds": CACHE_TTLS,
+        }
+
+
+# Singleton instance
+_page_cache: Optional[ScholarPageCache] = None
+
+
+def get_page_cache() -> ScholarPageCache:
+    """Get the singleton page cache instance"""
+    global _page_cache
+    if _page_cache is None:
+        _page_cache = ScholarPageCache()
+    return _page_cache
+
+
+# Background task to periodically sweep expired entries
+_sweep_task = None
+
+async def start_cache_sweeper():
+    """Start background task to periodically delete expired cache entries"""
+    global _sweep_task
+
+    async def sweep_loop():
+        from ..database import bind_db_role
+        bind_db_role("maintenance")
+        while True:
+            await asyncio.sleep(SWEEP_INTERVAL)
+            try:
+                await get_page_cache().sweep()
+            except Exception as e:
+                logger.warning(f"Cache sweep error: {e}")
+
+    _sweep_task = asyncio.create_task(sweep_loop())
+    logger.info("Scholar page cache sweeper started")
+
+
+async def stop_cache_sweeper():
+    """Stop the background sweeper"""
+    global _sweep_task
+    if _sweep_task:
+        _sweep_task.cancel()
+        try:
+            await _sweep_task
+        except asyncio.CancelledError:
+            pass
+        _sweep_task = None
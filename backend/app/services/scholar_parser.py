@@ -0,0 +1,594 @@
+"""
+Scholar HTML Parsers - pluggable engines for result pages and author profiles
+
+Two engines produce identical output dicts:
+- "selectolax": lexbor-backed C parser (default when installed)
+- "bs4": the original BeautifulSoup html.parser implementation, kept as the
+         verified fallback
+
+Both engines extract the same raw strings per result and share the field
+post-processing (_build_paper / _build_publication), so output cannot drift
+between them. If the fast engine raises, or finds no results on a page that
+clearly has result markup, the page is re-parsed with bs4.
+
+scripts/benchmark_scholar_parser.py checks both engines against golden files of
+saved Scholar pages and reports per-page parse time and allocations.
+
+These are plain module-level functions over HTML strings so they can run in a
+worker process as well as on the event loop.
+"""
+import logging
+import re
+import sys
+from datetime import datetime
+from typing import Optional, List, Dict, Any, Tuple
+
+from bs4 import BeautifulSoup
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # Optional dependency - bs4 path still works
+    LexborHTMLParser = None
+
+logger = logging.getLogger(__name__)
+
+
+def log_now(msg: str, level: str = "info"):
+    """Log message and immediately flush to stdout"""
+    timestamp = datetime.utcnow().strftime("%H:%M:%S")
+    print(f"{timestamp} | scholar | {level.upper()} | {msg}", flush=True)
+    sys.stdout.flush()
+
+
+PARSER_ENGINES = ("selectolax", "bs4")
+
+# Paper container selectors, tried in order
+RESULT_SELECTORS = [".gs_ri", ".gs_r.gs_scl", "div[data-cid]", ".gs_or"]
+
+# Precompiled patterns (these run per result / per page)
+WHITESPACE_RE = re.compile(r"\s+")
+YEAR_ONLY_RE = re.compile(r"^\d{4}$")
+YEAR_RE = re.compile(r"\b(19|20)\d{2}\b")
+DIGITS_RE = re.compile(r"(\d+)")
+CITES_ID_RE = re.compile(r"cites=(\d+)")
+CITATION_FOR_VIEW_RE = re.compile(r"citation_for_view=([^&]+)")
+COUNT_CLEAN_RE = re.compile(r"[,\.\s]")
+RESULTS_CONTEXT_RE = re.compile(r".{0,30}results.{0,30}", re.IGNORECASE)
+RESULT_COUNT_PATTERNS = [
+    re.compile(r"About\s+([\d,\.\s]+)\s+results?", re.IGNORECASE),  # Added \s to capture space-separated thousands
+    re.compile(r"([\d,\.\s]+)\s+results?\s*\(", re.IGNORECASE),
+    re.compile(r"Environ\s+([\d\s]+)\s+résultats?", re.IGNORECASE),  # French
+    re.compile(r"Aproximadamente\s+([\d,\.]+)\s+resultados?", re.IGNORECASE),  # Spanish
+    re.compile(r"Ungefähr\s+([\d,\.]+)\s+Ergebnisse?", re.IGNORECASE),  # German
+]
+
+# Markup that means "this page has results" - used to catch fast-parser misses
+RESULT_MARKERS = ('class="gs_ri"', 'class="gs_r ', "data-cid=")
+
+_warned_missing_engine = False
+
+
+def resolve_engine(engine: Optional[str] = None) -> str:
+    """Pick the parser engine: explicit arg, then settings, falling back to bs4 if selectolax is missing"""
+    global _warned_missing_engine
+    if engine is None:
+        from ..config import get_settings
+        engine = get_settings().scholar_parser_engine
+    if engine not in PARSER_ENGINES:
+        engine = "bs4"
+    if engine == "selectolax" and LexborHTMLParser is None:
+        if not _warned_missing_engine:
+            logger.warning("selectolax not installed - using BeautifulSoup parser")
+            _warned_missing_engine = True
+        engine = "bs4"
+    return engine
+
+
+# ============== SHARED FIELD POST-PROCESSING ==============
+
+
+def _normalize(text: str) -> str:
+    return WHITESPACE_RE.sub(" ", text).strip()
+
+
+def _build_paper(
+    cluster_id: Optional[str],
+    title: str,
+    link: Optional[str],
+    authors_raw: str,
+    author_links: List[Tuple[str, str]],
+    abstract: Optional[str],
+    cited_text: Optional[str],
+    cited_href: Optional[str],
+) -> Dict[str, Any]:
+    """Turn the raw strings of one result into the result dict (identical for all engines)"""
+    # Extract author profile URLs from .gs_a links
+    # Links to Scholar profiles have href like "/citations?user=ABC123&..."
+    author_profiles = []
+    for name, href in author_links:
+        if name and "citations?user=" in href:
+            # Convert relative URL to absolute
+            if href.startswith("/"):
+                href = f"https://scholar.google.com{href}"
+            author_profiles.append({"name": name, "profile_url": href})
+        elif name and not href.startswith("http"):
+            # Author without Scholar profile
+            author_profiles.append({"name": name, "profile_url": None})
+
+    # Parse authors: "Author1, Author2 - Publication, Year - Publisher"
+    parts = authors_raw.split(" - ")
+    authors_part = parts[0] if parts else ""
+    publication_part = parts[1] if len(parts) > 1 else ""
+
+    authors = [a.strip() for a in authors_part.split(",") if a.strip() and not YEAR_ONLY_RE.match(a.strip())]
+
+    year_match = YEAR_RE.search(authors_raw)
+    year = int(year_match.group(0)) if year_match else None
+
+    # Venue
+    venue = None
+    if publication_part:
+        venue = YEAR_RE.sub("", publication_part).strip().rstrip(",")
+
+    # Citation count and Scholar ID
+    citation_count = 0
+    scholar_id = None
+    if cited_text is not None:
+        # Match citation count in multiple languages:
+        # English: "Cited by 123", Spanish: "Citado por 123",
+        # French: "Cité 123 fois", German: "Zitiert von: 123", etc.
+        count_match = DIGITS_RE.search(cited_text)
+        if count_match:
+            citation_count = int(count_match.group(1))
+
+        id_match = CITES_ID_RE.search(cited_href or "")
+        if id_match:
+            scholar_id = id_match.group(1)
+
+    # If no scholar_id from cited-by, use cluster_id
+    if not scholar_id and cluster_id:
+        scholar_id = cluster_id
+
+    return {
+        "id": scholar_id or f"{title[:50].replace(' ', '-')}-{year}",
+        "scholarId": scholar_id,
+        "clusterId": cluster_id,
+        "title": title,
+        "authors": authors,
+        "authorsRaw": authors_raw,
+        "authorProfiles": author_profiles,  # [{name, profile_url}, ...]
+        "year": year,
+        "abstract": abstract,
+        "citationCount": citation_count,
+        "link": link,
+        "venue": venue,
+        "source": "google_scholar",
+    }
+
+
+def _build_publication(
+    title: str,
+    href: str,
+    gray_texts: List[str],
+    cite_text: Optional[str],
+    cite_href: Optional[str],
+    year_text: Optional[str],
+) -> Dict[str, Any]:
+    """Turn the raw strings of one profile publication row into the publication dict"""
+    pub = {"title": title}
+    if href:
+        # Convert relative URL to absolute
+        if href.startswith("/"):
+            pub["link"] = f"https://scholar.google.com{href}"
+        else:
+            pub["link"] = href
+        # Extract citation ID from URL (e.g., citation_for_view=USER:CITATION_ID)
+        cid_match = CITATION_FOR_VIEW_RE.search(href)
+        if cid_match:
+            pub["scholar_id"] = cid_match.group(1)
+
+    # Authors and venue - in div.gs_gray elements
+    if len(gray_texts) >= 1:
+        pub["authors"] = gray_texts[0]
+    if len(gray_texts) >= 2:
+        pub["venue"] = gray_texts[1]
+
+    # IMPORTANT: The "Cited by" link also contains the cluster ID needed for citation harvesting!
+    # The href looks like: /scholar?cites=12204165771334060032&...
+    if cite_text is not None:
+        pub["citations"] = int(cite_text) if cite_text.isdigit() else 0
+        cluster_match = CITES_ID_RE.search(cite_href or "")
+        if cluster_match:
+            pub["cluster_id"] = cluster_match.group(1)
+    else:
+        pub["citations"] = 0
+
+    if year_text and year_text.isdigit():
+        pub["year"] = int(year_text)
+
+    return pub
+
+
+def _empty_profile(scholar_user_id: str, profile_url: str) -> Dict[str, Any]:
+    return {
+        "scholar_user_id": scholar_user_id,
+        "profile_url": profile_url,
+        "full_name": None,
+        "affiliation": None,
+        "homepage_url": None,
+        "topics": [],
+        "publications": [],
+    }
+
+
+# ============== RESULT COUNT ==============
+
+
+def extract_result_count(html: str) -> Optional[int]:
+    """Extract total result count from Scholar HTML"""
+    for pattern in RESULT_COUNT_PATTERNS:
+        match = pattern.search(html)
+        if match:
+            raw_match = match.group(1)
+            # Clean number - remove commas, dots, spaces
+            clean_num = COUNT_CLEAN_RE.sub("", raw_match)
+            try:
+                count = int(clean_num)
+                if count > 0:
+                    # Log for debugging parsing issues (catches truncation bugs)
+                    log_now(f"[COUNT PARSE] raw='{raw_match}' -> clean='{clean_num}' -> {count}")
+                    return count
+            except ValueError:
+                log_now(f"[COUNT PARSE ERROR] raw='{raw_match}' -> clean='{clean_num}' FAILED")
+                continue
+
+    # Log when no count found - helps debug HTML format changes
+    # Look for any "results" text to see what format Scholar is using
+    results_context = RESULTS_CONTEXT_RE.search(html)
+    if results_context:
+        log_now(f"[COUNT PARSE] No match found. Context: '{results_context.group(0)}'")
+
+    return None
+
+
+# ============== BEAUTIFULSOUP ENGINE (fallback) ==============
+
+
+def _parse_scholar_page_bs4(html: str) -> List[Dict[str, Any]]:
+    soup = BeautifulSoup(html, "html.parser")
+    papers = []
+
+    elements = []
+    for selector in RESULT_SELECTORS:
+        elements = soup.select(selector)
+        if elements:
+            log_now(f"Found {len(elements)} papers using selector: {selector}")
+            break
+
+    if not elements:
+        log_now("No papers found with any selector")
+        return papers
+
+    for el in elements:
+        try:
+            # Get cluster ID (data-cid attribute)
+            cluster_id = el.get("data-cid")
+            if not cluster_id:
+                parent = el.find_parent(attrs={"data-cid": True})
+                if parent:
+                    cluster_id = parent.get("data-cid")
+
+            # Title and link
+            title_el = el.select_one(".gs_rt a") or el.select_one(".gs_rt span[id]") or el.select_one("h3 a")
+            if not title_el:
+                continue
+
+            # Use separator=' ' to preserve spaces between nested elements
+            title = _normalize(title_el.get_text(separator=' ', strip=True))
+            link = title_el.get("href")
+            if not title:
+                continue
+
+            # Authors and publication info
+            authors_el = el.select_one(".gs_a")
+            authors_raw = _normalize(authors_el.get_text(separator=' ', strip=True)) if authors_el else ""
+            author_links = []
+            if authors_el:
+                for author_link in authors_el.find_all("a"):
+                    author_links.append((author_link.get_text(strip=True), author_link.get("href", "")))
+
+            # Abstract
+            abstract_el = el.select_one(".gs_rs")
+            abstract = _normalize(abstract_el.get_text(separator=' ', strip=True)) if abstract_el else None
+
+            # Cited-by link
+            cited_by_link = el.select_one("a[href*='cites=']")
+            cited_text = cited_by_link.get_text(strip=True) if cited_by_link else None
+            cited_href = cited_by_link.get("href", "") if cited_by_link else None
+
+            papers.append(_build_paper(
+                cluster_id, title, link, authors_raw, author_links, abstract, cited_text, cited_href,
+            ))
+
+        except Exception as e:
+            log_now(f"Error parsing paper element: {e}")
+            continue
+
+    return papers
+
+
+def _parse_author_profile_bs4(html: str, scholar_user_id: str, profile_url: str) -> Dict[str, Any]:
+    soup = BeautifulSoup(html, "html.parser")
+    result = _empty_profile(scholar_user_id, profile_url)
+
+    # Full name - in div#gsc_prf_in
+    name_el = soup.select_one("#gsc_prf_in")
+    if name_el:
+        result["full_name"] = name_el.get_text(strip=True)
+
+    # Affiliation - first link with class gsc_prf_ila (institution link)
+    affiliation_el = soup.select_one("a.gsc_prf_ila")
+    if affiliation_el:
+        result["affiliation"] = affiliation_el.get_text(strip=True)
+
+    # Homepage URL - the external link labelled "Homepage" in the profile info section
+    for link in soup.select("a"):
+        href = link.get("href", "")
+        if link.get_text(strip=True).lower() == "homepage" and href.startswith("http"):
+            result["homepage_url"] = href
+            break
+
+    # Topics/Research interests - links with class gsc_prf_inta (interest tag)
+    for topic_el in soup.select("a.gsc_prf_inta"):
+        topic = topic_el.get_text(strip=True)
+        if topic:
+            result["topics"].append(topic)
+
+    # Publications - each row has class gsc_a_tr with title, authors, venue, citations, year
+    for row in soup.select("tr.gsc_a_tr"):
+        try:
+            title_el = row.select_one("a.gsc_a_at")
+            title = title_el.get_text(strip=True) if title_el else ""
+            if not title:
+                continue
+
+            cite_el = row.select_one("td.gsc_a_c a")
+            year_el = row.select_one("td.gsc_a_y span")
+            result["publications"].append(_build_publication(
+                title=title,
+                href=title_el.get("href", ""),
+                gray_texts=[d.get_text(strip=True) for d in row.select("td.gsc_a_t div.gs_gray")],
+                cite_text=cite_el.get_text(strip=True) if cite_el else None,
+                cite_href=cite_el.get("href", "") if cite_el else None,
+                year_text=year_el.get_text(strip=True) if year_el else None,
+            ))
+        except Exception as e:
+            log_now(f"[AUTHOR PROFILE] Error parsing publication row: {e}")
+            continue
+
+    return result
+
+
+# ============== SELECTOLAX ENGINE (default) ==============
+
+
+def _lx_text(node, separator: str = "") -> str:
+    """Equivalent of BeautifulSoup get_text(separator, strip=True): stripped, non-empty text nodes, no script/style"""
+    parts = []
+    for child in node.traverse(include_text=True):
+        if child.is_text_node:
+            parent = child.parent
+            if parent is not None and parent.tag in ("script", "style"):
+                continue
+            text = child.text_content.strip()
+            if text:
+                parts.append(text)
+    return separator.join(parts)
+
+
+def _lx_attr(node, name: str, default: Optional[str] = None) -> Optional[str]:
+    """Attribute value, with valueless attributes as "" (BeautifulSoup html.parser semantics)"""
+    attrs = node.attributes
+    if name not in attrs:
+        return default
+    value = attrs[name]
+    return value if value is not None else ""
+
+
+def _parse_scholar_page_selectolax(html: str) -> List[Dict[str, Any]]:
+    tree = LexborHTMLParser(html)
+    papers = []
+
+    elements = []
+    for selector in RESULT_SELECTORS:
+        elements = tree.css(selector)
+        if elements:
+            log_now(f"Found {len(elements)} papers using selector: {selector}")
+            break
+
+    if not elements:
+        log_now("No papers found with any selector")
+        return papers
+
+    for el in elements:
+        try:
+            # Get cluster ID (data-cid attribute), from the nearest ancestor if needed
+            cluster_id = _lx_attr(el, "data-cid")
+            if not cluster_id:
+                parent = el.parent
+                while parent is not None and parent.tag != "-document":
+                    if "data-cid" in parent.attributes:
+                        cluster_id = _lx_attr(parent, "data-cid")
+                        break
+                    parent = parent.parent
+
+            title_el = el.css_first(".gs_rt a") or el.css_first(".gs_rt span[id]") or el.css_first("h3 a")
+            if not title_el:
+                continue
+
+            title = _normalize(_lx_text(title_el, " "))
+            link = _lx_attr(title_el, "href")
+            if not title:
+                continue
+
+            authors_el = el.css_first(".gs_a")
+            authors_raw = _normalize(_lx_text(authors_el, " ")) if authors_el else ""
+            author_links = []
+            if authors_el:
+                for author_link in authors_el.css("a"):
+                    author_links.append((_lx_text(author_link), _lx_attr(author_link, "href", "")))
+
+            abstract_el = el.css_first(".gs_rs")
+            abstract = _normalize(_lx_text(abstract_el, " ")) if abstract_el else None
+
+            cited_by_link = el.css_first("a[href*='cites=']")
+            cited_text = _lx_text(cited_by_link) if cited_by_link else None
+            cited_href = _lx_attr(cited_by_link, "href", "") if cited_by_link else None
+
+            papers.append(_build_paper(
+                cluster_id, title, link, authors_raw, author_links, abstract, cited_text, cited_href,
+            ))
+
+        except Exception as e:
+            log_now(f"Error parsing paper element: {e}")
+            continue
+
+    return papers
+
+
+def _parse_author_profile_selectolax(html: str, scholar_user_id: str, profile_url: str) -> Dict[str, Any]:
+    tree = LexborHTMLParser(html)
+    result = _empty_profile(scholar_user_id, profile_url)
+
+    name_el = tree.css_first("#gsc_prf_in")
+    if name_el:
+        result["full_name"] = _lx_text(name_el)
+
+    affiliation_el = tree.css_first("a.gsc_prf_ila")
+    if affiliation_el:
+        result["affiliation"] = _lx_text(affiliation_el)
+
+    for link in tree.css("a"):
+        href = _lx_attr(link, "href", "")
+        if _lx_text(link).lower() == "homepage" and href.startswith("http"):
+            result["homepage_url"] = href
+            break
+
+    for topic_el in tree.css("a.gsc_prf_inta"):
+        topic = _lx_text(topic_el)
+        if topic:
+            result["topics"].append(topic)
+
+    for row in tree.css("tr.gsc_a_tr"):
+        try:
+            title_el = row.css_first("a.gsc_a_at")
+            title = _lx_text(title_el) if title_el else ""
+            if not title:
+                continue
+
+            cite_el = row.css_first("td.gsc_a_c a")
+            year_el = row.css_first("td.gsc_a_y span")
+            result["publications"].append(_build_publication(
+                title=title,
+                href=_lx_attr(title_el, "href", ""),
+                gray_texts=[_lx_text(d) for d in row.css("td.gsc_a_t div.gs_gray")],
+                cite_text=_lx_text(cite_el) if cite_el else None,
+                cite_href=_lx_attr(cite_el, "href", "") if cite_el else None,
+                year_text=_lx_text(year_el) if year_el else None,
+            ))
+        except Exception as e:
+            log_now(f"[AUTHOR PROFILE] Error parsing publication row: {e}")
+            continue
+
+    return result
+
+
+# ============== ENTRY POINTS ==============
+
+
+def parse_scholar_page(html: str, engine: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Parse a Scholar results page into result dicts using the configured engine"""
+    engine = resolve_engine(engine)
+    if engine == "bs4":
+        return _parse_scholar_page_bs4(html)
+
+    try:
+        papers = _parse_scholar_page_selectolax(html)
+    except Exception as e:
+        log_now(f"[PARSER] selectolax failed ({type(e).__name__}: {e}) - falling back to BeautifulSoup", "warn")
+        return _parse_scholar_page_bs4(html)
+
+    if not papers and any(marker in html for marker in RESULT_MARKERS):
+        log_now("[PARSER] selectolax found no results on a page with result markup - re-parsing with BeautifulSoup", "warn")
+        return _parse_scholar_page_bs4(html)
+
+    return papers
+
+
+def parse_results_page(html: str, engine: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+    """Parse a results page and its result count in one call (one executor round trip)"""
+    return parse_scholar_page(html, engine), extract_result_count(html)
+
+
+def extract_allintitle_abstract(html: str) -> Optional[Dict[str, Any]]:
+    """
+    Pull the best available abstract from an allintitle: results page.
+
+    Returns {"abstract", "is_snippet"} or None. Prefers the expanded publisher
+    abstract (.gs_fma_abs), then the expanded snippet, then the standard snippet.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+
+    # Look for the expanded abstract in .gs_fma_abs
+    # This is shown when Scholar has full abstract data from publishers
+    abstract_el = soup.select_one(".gs_fma_abs")
+    if abstract_el:
+        # Get all text from the abstract div, including nested elements
+        abstract = _normalize(abstract_el.get_text(separator=' ', strip=True))
+        if abstract and len(abstract) > 50:  # Reasonable abstract length
+            return {"abstract": abstract, "is_snippet": False, "kind": "abstract"}
+
+    # Fallback: try .gs_rs (standard abstract snippet) - less complete but sometimes available
+    snippet_el = soup.select_one(".gs_rs.gs_fma_s")
+    if snippet_el:
+        snippet = _normalize(snippet_el.get_text(separator=' ', strip=True))
+        # Remove trailing "..." and common truncation markers
+        snippet = re.sub(r'\s*…\s*$', '', snippet)
+        snippet = re.sub(r'\s*\.\.\.\s*$', '', snippet)
+        if snippet and len(snippet) > 50:
+            return {"abstract": snippet, "is_snippet": True, "kind": "snippet"}
+
+    # Also try the standard .gs_rs selector
+    standard_snippet = soup.select_one(".gs_rs")
+    if standard_snippet:
+        snippet = _normalize(standard_snippet.get_text(separator=' ', strip=True))
+        if snippet and len(snippet) > 50:
+            return {"abstract": snippet, "is_snippet": True, "kind": "standard snippet"}
+
+    return None
+
+
+def parse_author_profile(html: str, scholar_user_id: str, profile_url: str, engine: Optional[str] = None) -> Dict[str, Any]:
+    """Parse a Scholar author profile page using the configured engine"""
+    engine = resolve_engine(engine)
+    if engine == "selectolax":
+        try:
+            result = _parse_author_profile_selectolax(html, scholar_user_id, profile_url)
+        except Exception as e:
+            log_now(f"[PARSER] selectolax profile parse failed ({e}) - falling back to BeautifulSoup", "warn")
+            result = _parse_author_profile_bs4(html, scholar_user_id, profile_url)
+    else:
+        result = _parse_author_profile_bs4(html, scholar_user_id, profile_url)
+
+    if result["full_name"]:
+        log_now(f"[AUTHOR PROFILE] Name: {result['full_name']}")
+    if result["affiliation"]:
+        log_now(f"[AUTHOR PROFILE] Affiliation: {result['affiliation']}")
+    if result["homepage_url"]:
+        log_now(f"[AUTHOR PROFILE] Homepage: {result['homepage_url']}")
+    if result["topics"]:
+        log_now(f"[AUTHOR PROFILE] Topics: {', '.join(result['topics'][:3])}...")
+    if result["publications"]:
+        log_now(f"[AUTHOR PROFILE] Publications: {len(result['publications'])} found")
+
+    return result
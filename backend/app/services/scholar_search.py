@@ -15,13 +15,21 @@ import re
 import logging
 import traceback
 import sys
+import time
 from datetime import datetime
-from typing import Optional, List, Dict, Any
-from bs4 import BeautifulSoup
+from typing import Optional, List, Dict, Any, Tuple
 from urllib.parse import urlencode, quote_plus
 
 from ..config import get_settings
 from .api_logger import log_api_call
+from .scholar_cache import get_page_cache
+from .oxylabs_limiter import get_oxylabs_limiter
+from .oxylabs_breaker import get_oxylabs_breaker, OxylabsError, CircuitOpenError, classify_status
+from .scholar_parser import (
+    parse_author_profile,
+    parse_results_page, extract_allintitle_abstract, resolve_engine,
+)
+from .parse_executor import run_parse
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -38,13 +46,15 @@ HTTP_TIMEOUT = 45.0  # 45s per HTTP request (increased for complex queries)
 SEARCH_TOTAL_TIMEOUT = 180.0  # 3 minutes max per search query
 FETCH_RETRY_TIMEOUT = 150.0  # 150s max for all retries combined
 
+# Cited-by prefetch: once page 0 reports the GS count, every remaining page URL is
+# known, so keep up to this many page requests in flight per query. Pages are still
+# handed to on_page_complete strictly in order. 1 = serial fetching.
+CITED_BY_PREFETCH_WINDOW = 3
+
 
 class ScholarSearchService:
     """Service for searching Google Scholar via Oxylabs"""
 
-    # Class-level cache for queries
-    _query_cache: Dict[str, Dict] = {}
-
     def __init__(self):
         self.oxylabs_endpoint = "https://realtime.oxylabs.io/v1/queries"
         self.username = settings.oxylabs_username
@@ -69,9 +79,32 @@ class ScholarSearchService:
         if self._client and not self._client.is_closed:
             await self._client.aclose()
 
-    def _get_cache_key(self, query: str, language: str = "en") -> str:
-        """Generate cache key for query"""
-        return f"{language}:{query.lower().strip()}"
+    async def _fetch_page(self, url: str, call_type: str) -> Tuple[List[Dict[str, Any]], Optional[int], bool]:
+        """
+        Fetch and parse a Scholar results page, serving from the page cache when possible.
+
+        call_type selects the cache TTL (see scholar_cache.CACHE_TTLS).
+
+        Returns:
+            (papers, total_results, from_cache)
+        """
+        cache = get_page_cache() if settings.scholar_cache_enabled else None
+
+        if cache:
+            cached = await cache.get(url, call_type)
+            if cached is not None:
+                papers = cached.get("papers") or []
+                log_now(f"[CACHE HIT] {call_type}: {len(papers)} papers, total={cached.get('total_results')}")
+                return papers, cached.get("total_results"), True
+
+        html = await self._fetch_with_retry(url)
+        papers, total_results = await self._parse_results(html)
+
+        # Don't cache pages that yielded nothing - usually a block/CAPTCHA page
+        if cache and (papers or total_results is not None):
+            await cache.put(url, call_type, {"papers": papers, "total_results": total_results})
+
+        return papers, total_results, False
 
     async def search(
         self,
@@ -113,18 +146,7 @@ class ScholarSearchService:
         year_low: Optional[int],
         year_high: Optional[int],
     ) -> Dict[str, Any]:
-        """Internal search implementation"""
-
-        # Check cache
-        cache_key = self._get_cache_key(query, language)
-        if cache_key in self._query_cache:
-            cached = self._query_cache[cache_key]
-            if cached.get("papers"):
-                log_now(f"[CACHE HIT] {len(cached['papers'])} papers from cache")
-                return {
-                    "papers": cached["papers"][:max_results],
-                    "totalResults": cached.get("totalResults", len(cached["papers"]))
-                }
+        """Internal search implementation (pages served from the page cache when fresh)"""
 
         # Build URL
         params = {
@@ -149,12 +171,10 @@ class ScholarSearchService:
             page_url = base_url if current_page == 0 else f"{base_url}&start={current_page * 10}"
 
             log_now(f"Fetching page {current_page + 1}/{max_pages}...")
-            html = await self._fetch_with_retry(page_url)
+            extracted, page_count, from_cache = await self._fetch_page(page_url, "search")
 
             if current_page == 0:
-                total_results = self._extract_result_count(html)
-
-            extracted = self._parse_scholar_page(html)
+                total_results = page_count
 
             if not extracted:
                 log_now(f"No results on page {current_page + 1}, stopping")
@@ -164,16 +184,7 @@ class ScholarSearchService:
             papers.extend(extracted)
             current_page += 1
 
-            # Rate limit between pages
-            if current_page < max_pages and len(papers) < max_results:
-                await asyncio.sleep(2)
-
-        # Cache results
-        if papers:
-            self._query_cache[cache_key] = {
-                "papers": papers,
-                "totalResults": total_results or len(papers),
-            }
+            # No sleep between pages - the Oxylabs limiter paces requests
 
         log_now(f"Search complete: {len(papers)} papers found")
 
@@ -193,6 +204,9 @@ class ScholarSearchService:
         additional_query: Optional[str] = None,
         on_page_failed: Optional[callable] = None,
         language_filter: Optional[str] = None,
+        prefetch_window: Optional[int] = None,
+        sort_by_date: bool = False,
+        stop_after_page: Optional[callable] = None,
     ) -> Dict[str, Any]:
         """
         Get papers that cite a given paper - WITH PAGE-BY-PAGE CALLBACK
@@ -207,10 +221,15 @@ class ScholarSearchService:
             on_page_failed: Callback(page_num, url, error) called when page fails - STORE FOR RETRY
             language_filter: Language restriction (e.g., "lang_en" for English only,
                            "lang_zh-CN|lang_zh-TW|lang_fr|..." for multiple non-English)
+            prefetch_window: Max page requests in flight (default CITED_BY_PREFETCH_WINDOW, 1 = serial)
+            sort_by_date: Newest results first (scisbd=1 - Scholar then only lists roughly the last year)
+            stop_after_page: Predicate(page_num, papers) -> bool checked after each saved page;
+                           paging stops once it returns True (e.g. a refresh reached known citations)
 
         Returns:
             Dict with 'papers' list, 'totalResults' count, 'last_page' for resume,
             plus 'failed_pages' list with details of pages that failed all retries
+            and 'stopped_early' when stop_after_page ended the paging
         """
         log_now(f"╔{'═'*60}╗")
         log_now(f"║  GET_CITED_BY ENTRY POINT")
@@ -223,11 +242,15 @@ class ScholarSearchService:
         log_now(f"║  language_filter: {language_filter}")
         log_now(f"║  on_page_complete callback: {'SET' if on_page_complete else 'NOT SET'}")
         log_now(f"║  on_page_failed callback: {'SET' if on_page_failed else 'NOT SET'}")
+        log_now(f"║  prefetch_window: {prefetch_window or CITED_BY_PREFETCH_WINDOW}")
+        if sort_by_date or stop_after_page:
+            log_now(f"║  sort_by_date: {sort_by_date}, stop_after_page: {'SET' if stop_after_page else 'NOT SET'}")
         log_now(f"╚{'═'*60}╝")
 
         # No timeout wrapper - let it run, save pages as we go
         return await self._get_cited_by_impl(
-            scholar_id, max_results, year_low, year_high, on_page_complete, start_page, additional_query, on_page_failed, language_filter
+            scholar_id, max_results, year_low, year_high, on_page_complete, start_page, additional_query, on_page_failed, language_filter,
+            prefetch_window, sort_by_date, stop_after_page,
         )
 
     async def _get_cited_by_impl(
@@ -241,6 +264,9 @@ class ScholarSearchService:
         additional_query: Optional[str] = None,
         on_page_failed: Optional[callable] = None,  # NEW: callback for failed pages
         language_filter: Optional[str] = None,  # Language restriction (e.g., "lang_en" or "lang_zh-CN|lang_fr|...")
+        prefetch_window: Optional[int] = None,
+        sort_by_date: bool = False,
+        stop_after_page: Optional[callable] = None,
     ) -> Dict[str, Any]:
         """Internal cited-by implementation with page-by-page callback for immediate DB saves
 
@@ -250,6 +276,10 @@ class ScholarSearchService:
             language_filter: Language restriction parameter (lr=). Examples:
                            "lang_en" for English only
                            "lang_zh-CN|lang_zh-TW|lang_fr|lang_de|..." for multiple languages
+            prefetch_window: Max page requests in flight. The first page is always fetched
+                           alone (it tells us the GS count); after that the next pages up to
+                           the known last page are fetched ahead while earlier pages are
+                           being saved. Callbacks still run strictly in page order.
         """
         # Build URL exactly like gs-harvester JS version
         # CRITICAL: scipsc=1 tells Scholar to search WITHIN citations, not just the paper
@@ -272,6 +302,8 @@ class ScholarSearchService:
             base_url += f"&as_ylo={year_low}"
         if year_high:
             base_url += f"&as_yhi={year_high}"
+        if sort_by_date:
+            base_url += "&scisbd=1"
 
         # Add exclusion/additional query terms (for overflow harvesting)
         if additional_query:
@@ -292,119 +324,162 @@ class ScholarSearchService:
         consecutive_failures = 0
         max_consecutive_failures = 3
         pages_succeeded = 0
+        stopped_early = False
+
+        # Single-page calls are count probes (overflow partitioning) - cache them longer
+        call_type = "count" if max_pages == 1 else "cited_by"
 
         log_now(f"[CITED_BY_IMPL] max_pages calculated: {max_pages}")
         log_now(f"[CITED_BY_IMPL] Starting page loop...")
 
-        while len(all_papers) < max_results and current_page < max_pages:
-            page_url = base_url if current_page == 0 else f"{base_url}&start={current_page * 10}"
+        window = max(1, prefetch_window or CITED_BY_PREFETCH_WINDOW)
+        in_flight: Dict[int, asyncio.Task] = {}  # page number -> prefetch task
+        pending_writes: List[asyncio.Future] = []  # Write-behind acks returned by on_page_complete
 
-            log_now(f"[PAGE {current_page + 1}/{max_pages}] ───────────────────────────────")
-            log_now(f"[PAGE {current_page + 1}] URL: {page_url}")
+        def page_url_for(page: int) -> str:
+            return base_url if page == 0 else f"{base_url}&start={page * 10}"
 
-            try:
-                log_now(f"[PAGE {current_page + 1}] Calling _fetch_with_retry...")
-                html = await self._fetch_with_retry(page_url)
-                log_now(f"[PAGE {current_page + 1}] HTML received, length: {len(html)} bytes")
-                log_now(f"[PAGE {current_page + 1}] HTML preview: {html[:500]}...")
+        def schedule_prefetch():
+            """Top up in-flight requests for the pages after current_page"""
+            if window <= 1 or total_results is None:
+                return  # Serial mode, or page count not known yet
+            # Don't request pages beyond what GS says exists (or the 1000-result cap)
+            last_page = min(max_pages, (total_results + 9) // 10)
+            for page in range(current_page + 1, min(current_page + window, last_page)):
+                if page not in in_flight:
+                    in_flight[page] = asyncio.create_task(self._fetch_page(page_url_for(page), call_type))
 
-                # Extract GS count from EVERY page to detect estimate changes
-                page_gs_count = self._extract_result_count(html)
-                log_now(f"[PAGE {current_page + 1}] GS reports: {page_gs_count} results")
+        try:
+            while len(all_papers) < max_results and current_page < max_pages:
+                page_url = page_url_for(current_page)
+                schedule_prefetch()
 
-                if current_page == 0 or total_results is None:
-                    total_results = page_gs_count
-                    first_gs_count = page_gs_count
-                    log_now(f"[PAGE {current_page + 1}] First GS count: {first_gs_count}")
+                log_now(f"[PAGE {current_page + 1}/{max_pages}] ───────────────────────────────")
+                log_now(f"[PAGE {current_page + 1}] URL: {page_url}")
 
-                # Always track the most recent GS count (may differ from first)
-                if page_gs_count is not None:
-                    if last_gs_count is not None and page_gs_count != last_gs_count:
-                        log_now(f"[PAGE {current_page + 1}] ⚠️ GS COUNT CHANGED: {last_gs_count} → {page_gs_count}")
-                    last_gs_count = page_gs_count
+                try:
+                    prefetched = in_flight.pop(current_page, None)
+                    if prefetched is not None:
+                        log_now(f"[PAGE {current_page + 1}] Awaiting prefetched page...")
+                        extracted, page_gs_count, from_cache = await prefetched
+                    else:
+                        log_now(f"[PAGE {current_page + 1}] Calling _fetch_page...")
+                        extracted, page_gs_count, from_cache = await self._fetch_page(page_url, call_type)
 
-                log_now(f"[PAGE {current_page + 1}] Calling _parse_scholar_page...")
-                extracted = self._parse_scholar_page(html)
-                log_now(f"[PAGE {current_page + 1}] Parse returned {len(extracted)} papers")
+                    # GS count is extracted from EVERY page to detect estimate changes
+                    log_now(f"[PAGE {current_page + 1}] GS reports: {page_gs_count} results")
 
-                if not extracted:
-                    log_now(f"[PAGE {current_page + 1}] *** NO PAPERS EXTRACTED - stopping loop ***")
-                    log_now(f"[PAGE {current_page + 1}] HTML snippet for debugging: {html[500:2000]}...")
-                    break
+                    if current_page == 0 or total_results is None:
+                        total_results = page_gs_count
+                        first_gs_count = page_gs_count
+                        log_now(f"[PAGE {current_page + 1}] First GS count: {first_gs_count}")
 
-                log_now(f"[PAGE {current_page + 1}] ✓ Extracted {len(extracted)} citing papers")
-                for idx, paper in enumerate(extracted[:3]):
-                    log_now(f"[PAGE {current_page + 1}]   [{idx}] {paper.get('title', 'NO TITLE')[:60]}...")
+                    # Always track the most recent GS count (may differ from first)
+                    if page_gs_count is not None:
+                        if last_gs_count is not None and page_gs_count != last_gs_count:
+                            log_now(f"[PAGE {current_page + 1}] ⚠️ GS COUNT CHANGED: {last_gs_count} → {page_gs_count}")
+                        last_gs_count = page_gs_count
 
-                # IMMEDIATE CALLBACK - save to DB NOW before anything can fail
-                if on_page_complete:
-                    log_now(f"[PAGE {current_page + 1}] Calling on_page_complete callback...")
-                    log_now(f"[PAGE {current_page + 1}] Callback type: {type(on_page_complete)}")
-                    log_now(f"[PAGE {current_page + 1}] Papers to save: {len(extracted)}")
-                    try:
-                        await on_page_complete(current_page, extracted)
-                        log_now(f"[PAGE {current_page + 1}] ✓ Callback completed successfully")
-                        # Log successful page fetch for activity stats
-                        asyncio.create_task(log_api_call(
-                            call_type='page_fetch',
-                            count=1,
-                            success=True,
-                            extra_info=f"papers={len(extracted)}"
-                        ))
-                    except Exception as save_error:
-                        log_now(f"[PAGE {current_page + 1}] ✗✗✗ CALLBACK FAILED ✗✗✗")
-                        log_now(f"[PAGE {current_page + 1}] Error type: {type(save_error).__name__}")
-                        log_now(f"[PAGE {current_page + 1}] Error message: {save_error}")
-                        log_now(f"[PAGE {current_page + 1}] Traceback: {traceback.format_exc()}")
-                        # Continue anyway - at least we tried
-                else:
-                    log_now(f"[PAGE {current_page + 1}] No callback set - papers not saved to DB")
+                    log_now(f"[PAGE {current_page + 1}] Parse returned {len(extracted)} papers{' (cached)' if from_cache else ''}")
 
-                all_papers.extend(extracted)
-                current_page += 1
-                consecutive_failures = 0
-                pages_succeeded += 1
-                log_now(f"[PROGRESS] Total papers so far: {len(all_papers)}")
+                    if not extracted:
+                        log_now(f"[PAGE {current_page + 1}] *** NO PAPERS EXTRACTED - stopping loop ***")
+                        break
 
-                if current_page < max_pages and len(all_papers) < max_results:
-                    log_now(f"[RATE LIMIT] Sleeping 4 seconds before next page...")
-                    await asyncio.sleep(4)
+                    log_now(f"[PAGE {current_page + 1}] ✓ Extracted {len(extracted)} citing papers")
+                    for idx, paper in enumerate(extracted[:3]):
+                        log_now(f"[PAGE {current_page + 1}]   [{idx}] {paper.get('title', 'NO TITLE')[:60]}...")
+
+                    # IMMEDIATE CALLBACK - save to DB NOW before anything can fail
+                    if on_page_complete:
+                        log_now(f"[PAGE {current_page + 1}] Calling on_page_complete callback...")
+                        log_now(f"[PAGE {current_page + 1}] Callback type: {type(on_page_complete)}")
+                        log_now(f"[PAGE {current_page + 1}] Papers to save: {len(extracted)}")
+                        try:
+                            callback_result = await on_page_complete(current_page, extracted)
+                            if asyncio.isfuture(callback_result):
+                                # Page was queued for a write-behind save - keep scraping
+                                pending_writes.append(callback_result)
+                            log_now(f"[PAGE {current_page + 1}] ✓ Callback completed successfully")
+                            # Log successful page fetch for activity stats
+                            asyncio.create_task(log_api_call(
+                                call_type='page_fetch',
+                                count=1,
+                                success=True,
+                                extra_info=f"papers={len(extracted)}"
+                            ))
+                        except Exception as save_error:
+                            log_now(f"[PAGE {current_page + 1}] ✗✗✗ CALLBACK FAILED ✗✗✗")
+                            log_now(f"[PAGE {current_page + 1}] Error type: {type(save_error).__name__}")
+                            log_now(f"[PAGE {current_page + 1}] Error message: {save_error}")
+                            log_now(f"[PAGE {current_page + 1}] Traceback: {traceback.format_exc()}")
+                            # Continue anyway - at least we tried
+                    else:
+                        log_now(f"[PAGE {current_page + 1}] No callback set - papers not saved to DB")
 
-            except Exception as e:
-                error_msg = f"{type(e).__name__}: {str(e)}"
-                consecutive_failures += 1
-                log_now(f"[PAGE {current_page + 1}] ✗ FETCH FAILED ({consecutive_failures}/{max_consecutive_failures})")
-                log_now(f"[PAGE {current_page + 1}] Error type: {type(e).__name__}")
-                log_now(f"[PAGE {current_page + 1}] Error: {e}")
-                log_now(f"[PAGE {current_page + 1}] Traceback: {traceback.format_exc()}")
-
-                # RECORD THE FAILED PAGE for later retry
-                failed_page_info = {
-                    "page_number": current_page,
-                    "url": page_url,
-                    "error": error_msg,
-                    "year_low": year_low,
-                    "year_high": year_high,
-                }
-                failed_pages.append(failed_page_info)
-                log_now(f"[PAGE {current_page + 1}] 📝 Recorded failed page for retry: page {current_page}")
+                    all_papers.extend(extracted)
+                    current_page += 1
+                    consecutive_failures = 0
+                    pages_succeeded += 1
+                    log_now(f"[PROGRESS] Total papers so far: {len(all_papers)}")
 
-                # Call the failure callback if provided (to store in DB immediately)
-                if on_page_failed:
-                    try:
-                        await on_page_failed(current_page, page_url, error_msg)
-                        log_now(f"[PAGE {current_page + 1}] ✓ Failure recorded via callback")
-                    except Exception as cb_err:
-                        log_now(f"[PAGE {current_page + 1}] ⚠️ Failed to record failure: {cb_err}")
+                    if stop_after_page and stop_after_page(current_page - 1, extracted):
+                        log_now(f"[PAGE {current_page}] Stop condition met - stopping early")
+                        stopped_early = True
+                        break
 
-                if consecutive_failures >= max_consecutive_failures:
-                    log_now(f"[CITED_BY_IMPL] ✗✗✗ TOO MANY CONSECUTIVE FAILURES - STOPPING ✗✗✗")
-                    log_now(f"[CITED_BY_IMPL] Stopped at page {current_page}. Saved {len(all_papers)} papers.")
-                    log_now(f"[CITED_BY_IMPL] Failed pages recorded: {len(failed_pages)} - will retry later")
-                    break
+                except Exception as e:
+                    error_msg = f"{type(e).__name__}: {str(e)}"
+                    consecutive_failures += 1
+                    log_now(f"[PAGE {current_page + 1}] ✗ FETCH FAILED ({consecutive_failures}/{max_consecutive_failures})")
+                    log_now(f"[PAGE {current_page + 1}] Error type: {type(e).__name__}")
+                    log_now(f"[PAGE {current_page + 1}] Error: {e}")
+                    log_now(f"[PAGE {current_page + 1}] Traceback: {traceback.format_exc()}")
+
+                    # RECORD THE FAILED PAGE for later retry
+                    failed_page_info = {
+                        "page_number": current_page,
+                        "url": page_url,
+                        "error": error_msg,
+                        "year_low": year_low,
+                        "year_high": year_high,
+                    }
+                    failed_pages.append(failed_page_info)
+                    log_now(f"[PAGE {current_page + 1}] 📝 Recorded failed page for retry: page {current_page}")
+
+                    # Call the failure callback if provided (to store in DB immediately)
+                    if on_page_failed:
+                        try:
+                            await on_page_failed(current_page, page_url, error_msg)
+                            log_now(f"[PAGE {current_page + 1}] ✓ Failure recorded via callback")
+                        except Exception as cb_err:
+                            log_now(f"[PAGE {current_page + 1}] ⚠️ Failed to record failure: {cb_err}")
+
+                    if consecutive_failures >= max_consecutive_failures:
+                        log_now(f"[CITED_BY_IMPL] ✗✗✗ TOO MANY CONSECUTIVE FAILURES - STOPPING ✗✗✗")
+                        log_now(f"[CITED_BY_IMPL] Stopped at page {current_page}. Saved {len(all_papers)} papers.")
+                        log_now(f"[CITED_BY_IMPL] Failed pages recorded: {len(failed_pages)} - will retry later")
+                        break
 
-                current_page += 1
-                await asyncio.sleep(5)
+                    current_page += 1
+
+        finally:
+            # Stop/cancel/error: don't leave orphaned page requests running
+            for task in in_flight.values():
+                task.cancel()
+            if in_flight:
+                await asyncio.gather(*in_flight.values(), return_exceptions=True)
+                log_now(f"[CITED_BY_IMPL] Cancelled {len(in_flight)} unused prefetched pages")
+
+        # Durability barrier: callers treat a returned harvest as saved, so wait for
+        # every queued page write to be acked before reporting back
+        pages_write_failed = 0
+        if pending_writes:
+            log_now(f"[CITED_BY_IMPL] Waiting for {len(pending_writes)} queued page writes...")
+            write_results = await asyncio.gather(*pending_writes, return_exceptions=True)
+            pages_write_failed = sum(1 for r in write_results if isinstance(r, BaseException))
+            if pages_write_failed:
+                log_now(f"[CITED_BY_IMPL] ⚠️ {pages_write_failed} page writes failed - kept in local buffer for retry")
 
         # Determine if GS count changed during pagination (explains gaps)
         gs_count_changed = (first_gs_count is not None and last_gs_count is not None
@@ -430,11 +505,13 @@ class ScholarSearchService:
             "pages_succeeded": pages_succeeded,
             "pages_failed": len(failed_pages),
             "failed_pages": failed_pages,  # Include failed page details
+            "pages_write_failed": pages_write_failed,  # Scraped OK but DB write failed (in local buffer)
             "last_page": current_page,  # For resume
             # Gap tracking fields
             "first_gs_count": first_gs_count,  # GS count from page 0
             "last_gs_count": last_gs_count,    # GS count from final page (may differ)
             "gs_count_changed": gs_count_changed,  # True if estimate changed during scraping
+            "stopped_early": stopped_early,  # stop_after_page ended the paging
         }
 
     async def verify_last_page(
@@ -525,9 +602,7 @@ class ScholarSearchService:
         log_now(f"[VERIFY_LAST_PAGE] Fetching last page: {page_url}")
 
         try:
-            html = await self._fetch_with_retry(page_url)
-            verified_count = self._extract_result_count(html)
-            papers = self._parse_scholar_page(html)
+            papers, verified_count, _ = await self._fetch_page(page_url, "verify")
 
             result = {
                 "verified_count": verified_count,
@@ -589,9 +664,7 @@ class ScholarSearchService:
         page_url = f"{base_url}&start={page_start}" if page_start > 0 else base_url
 
         try:
-            html = await self._fetch_with_retry(page_url)
-            total_results = self._extract_result_count(html)
-            papers = self._parse_scholar_page(html)
+            papers, total_results, _ = await self._fetch_page(page_url, "specific_page")
 
             log_now(f"[FETCH_SPECIFIC_PAGE] Got {len(papers)} papers from start={page_start}")
 
@@ -620,50 +693,107 @@ class ScholarSearchService:
         Oxylabs is reliable - transient faults recover quickly with retries.
         Direct scraping fallback is unreliable (Google blocks it), so we
         prioritize persistent Oxylabs retries.
+
+        All attempts go through the shared circuit breaker: when Oxylabs is
+        failing across the board, bulk callers park instead of hammering it and
+        interactive callers fail fast. Backoff is jittered and depends on the
+        error class (4xx/429/5xx/faulted/timeout) and observed latency. Plain
+        4xx and auth errors are not retried. Time parked by the breaker doesn't
+        count against FETCH_RETRY_TIMEOUT, and while the circuit is open an
+        exhausted request raises CircuitOpenError instead of scraping directly.
         """
+        if not self.username or not self.password:
+            # Credentials not configured - retrying Oxylabs won't help
+            log_now("Oxylabs credentials not configured - falling back to direct fetch")
+            return await self._fetch_direct(url, max_retries=2)
+
+        breaker = get_oxylabs_breaker()
         last_error = None
         attempt = 0
-
-        try:
-            # Wrap all retries in a total timeout - keep trying until exhausted
-            async with asyncio.timeout(FETCH_RETRY_TIMEOUT):
-                while attempt < max_retries:
+        delay = None
+        spent = 0.0  # Seconds of the FETCH_RETRY_TIMEOUT budget used - time parked by the breaker doesn't count
+
+        while attempt < max_retries:
+            # Park outside the budget: a cooldown can outlast FETCH_RETRY_TIMEOUT, and a
+            # parked request must not time out into a direct fetch that bypasses the breaker
+            await breaker.before_request()
+            remaining = FETCH_RETRY_TIMEOUT - spent
+            if remaining <= 0:
+                break
+            started = time.monotonic()
+            try:
+                async with asyncio.timeout(remaining):
                     try:
                         html = await self._fetch_via_oxylabs(url)
+                        breaker.record_success(time.monotonic() - started)
                         if attempt > 0:
                             log_now(f"✓ Oxylabs succeeded on attempt {attempt + 1}")
                         return html
-                    except asyncio.TimeoutError:
+                    except OxylabsError as e:
+                        kind = e.kind
+                        last_error = e
+                        breaker.record_failure(kind)
+                        log_now(f"Attempt {attempt + 1} failed ({kind}): {e}")
+                        if not e.retryable:
+                            raise
+                    except (asyncio.TimeoutError, httpx.TimeoutException):
+                        # One outcome per attempt - including an async job whose polling ran out
+                        kind = "timeout"
                         last_error = TimeoutError(f"HTTP request timed out on attempt {attempt + 1}")
+                        breaker.record_failure(kind)
                         log_now(f"Attempt {attempt + 1} timed out")
                     except Exception as e:
+                        kind = "network"
                         last_error = e
+                        breaker.record_failure(kind)
                         log_now(f"Attempt {attempt + 1} failed: {e}")
 
                     attempt += 1
-                    # Exponential backoff capped at 8s: 1s, 2s, 4s, 8s, 8s, 8s...
-                    backoff = min(2 ** min(attempt - 1, 3), 8)
-                    log_now(f"  Retrying in {backoff}s...")
-                    await asyncio.sleep(backoff)
-
-        except asyncio.TimeoutError:
-            log_now(f"Oxylabs exhausted after {attempt} attempts and {FETCH_RETRY_TIMEOUT}s timeout")
-            # Only try direct as last resort
-            try:
-                return await self._fetch_direct(url, max_retries=2)
-            except Exception as direct_error:
-                log_now(f"Direct scraping also failed: {direct_error}")
-                raise last_error or TimeoutError(f"All retries exhausted after {FETCH_RETRY_TIMEOUT}s total timeout")
-
-        # If we somehow exit the loop (shouldn't happen with high max_retries)
-        log_now(f"Oxylabs exhausted after {attempt} attempts")
-        raise last_error or Exception("All retry attempts failed")
+                    delay = breaker.backoff(kind, delay)
+                    log_now(f"  Retrying in {delay:.1f}s...")
+                    await asyncio.sleep(delay)
+            except TimeoutError:
+                # The budget ran out mid-attempt or mid-backoff
+                spent = FETCH_RETRY_TIMEOUT
+                break
+            finally:
+                spent += time.monotonic() - started
+
+        log_now(f"Oxylabs exhausted after {attempt} attempts ({min(spent, FETCH_RETRY_TIMEOUT):.0f}s of {FETCH_RETRY_TIMEOUT}s)")
+        if breaker.state != "closed":
+            # Oxylabs is failing across the board - scraping Google directly is exactly
+            # the hammering the breaker exists to stop
+            raise CircuitOpenError("Oxylabs circuit open - not falling back to direct fetch")
+        # Only try direct as last resort
+        try:
+            return await self._fetch_direct(url, max_retries=2)
+        except Exception as direct_error:
+            log_now(f"Direct scraping also failed: {direct_error}")
+            raise last_error or TimeoutError(f"All retries exhausted after {FETCH_RETRY_TIMEOUT}s")
 
     async def _fetch_via_oxylabs(self, url: str) -> str:
-        """Fetch URL via Oxylabs SERP Scraper API - matches gs-harvester JS exactly"""
+        """
+        Fetch URL via Oxylabs, paced by the process-wide limiter.
+
+        The limiter slot is held until content comes back (including async job
+        polling), so in-flight counts reflect real outstanding Oxylabs work.
+        """
         if not self.username or not self.password:
             raise ValueError("Oxylabs credentials not configured")
 
+        async with get_oxylabs_limiter().slot():
+            return await self._oxylabs_request(url)
+
+    @staticmethod
+    def _oxylabs_json(response: httpx.Response) -> Dict[str, Any]:
+        """Decode an Oxylabs response body - malformed JSON is a retryable bad_response"""
+        try:
+            return response.json()
+        except ValueError as e:
+            raise OxylabsError(f"Malformed Oxylabs response: {e}", kind="bad_response", status_code=response.status_code)
+
+    async def _oxylabs_request(self, url: str) -> str:
+        """Fetch URL via Oxylabs SERP Scraper API - matches gs-harvester JS exactly"""
         # Match JS exactly: const payload = { source: 'google', url: url };
         # DO NOT add extra parameters like geo_location, user_agent_type
         payload = {
@@ -693,12 +823,16 @@ class ScholarSearchService:
         ))
 
         if response.status_code != 200:
-            raise Exception(f"Oxylabs API HTTP {response.status_code}")
+            raise OxylabsError(
+                f"Oxylabs API HTTP {response.status_code}",
+                kind=classify_status(response.status_code),
+                status_code=response.status_code,
+            )
 
-        data = response.json()
+        data = self._oxylabs_json(response)
 
         if data.get("error"):
-            raise Exception(f"Oxylabs API error: {data['error']}")
+            raise OxylabsError(f"Oxylabs API error: {data['error']}", kind="bad_response")
 
         if data.get("results") and data["results"][0]:
             result = data["results"][0]
@@ -710,21 +844,28 @@ class ScholarSearchService:
         if data.get("job") and data["job"].get("id"):
             job_status = data["job"].get("status")
             if job_status == "faulted":
-                raise Exception("Oxylabs job faulted")
+                raise OxylabsError("Oxylabs job faulted", kind="faulted")
 
             log_now(f"[OXYLABS] Job {data['job']['id']} status: {job_status}, polling...")
             return await self._poll_oxylabs_job(data["job"]["id"])
 
-        raise Exception("Invalid Oxylabs response format")
+        raise OxylabsError("Invalid Oxylabs response format", kind="bad_response")
 
     async def _poll_oxylabs_job(self, job_id: str, max_attempts: int = 15) -> str:
-        """Poll Oxylabs async job until completion (max 30 seconds)"""
+        """
+        Poll Oxylabs async job until completion (~30-60 seconds).
+
+        Shares the circuit breaker with _fetch_with_retry: poll spacing stretches
+        when Oxylabs is slow or the circuit is open. Nothing is recorded on the
+        breaker here - the caller records one outcome for the whole request.
+        """
+        breaker = get_oxylabs_breaker()
         auth_string = base64.b64encode(f"{self.username}:{self.password}".encode()).decode()
         client = await self._get_client()
 
         for attempt in range(max_attempts):
             if attempt > 0:
-                await asyncio.sleep(2)  # 2s between polls = 30s max total
+                await asyncio.sleep(breaker.poll_delay())
 
             try:
                 response = await client.get(
@@ -733,9 +874,13 @@ class ScholarSearchService:
                 )
 
                 if response.status_code != 200:
-                    raise Exception(f"Job status check failed: HTTP {response.status_code}")
+                    raise OxylabsError(
+                        f"Job status check failed: HTTP {response.status_code}",
+                        kind=classify_status(response.status_code),
+                        status_code=response.status_code,
+                    )
 
-                data = response.json()
+                data = self._oxylabs_json(response)
                 status = data.get("status")
 
                 log_now(f"[OXYLABS POLL] Attempt {attempt + 1}/{max_attempts}: status={status}")
@@ -748,25 +893,30 @@ class ScholarSearchService:
                     )
 
                     if results_response.status_code != 200:
-                        raise Exception(f"Results fetch failed: HTTP {results_response.status_code}")
+                        raise OxylabsError(
+                            f"Results fetch failed: HTTP {results_response.status_code}",
+                            kind=classify_status(results_response.status_code),
+                            status_code=results_response.status_code,
+                        )
 
-                    results_data = results_response.json()
+                    results_data = self._oxylabs_json(results_response)
                     if results_data.get("results") and results_data["results"][0]:
                         result = results_data["results"][0]
                         content = result.get("content") or result.get("html") or result.get("body")
                         if content:
                             return content
 
-                    raise Exception("Job completed but no content in results")
+                    raise OxylabsError("Job completed but no content in results", kind="bad_response")
 
                 if status == "faulted":
-                    raise Exception("Job faulted during processing")
+                    raise OxylabsError("Job faulted during processing", kind="faulted")
 
-            except asyncio.TimeoutError:
+            except (asyncio.TimeoutError, httpx.TimeoutException):
+                # Not recorded on the breaker here - _fetch_with_retry records one outcome per request
                 log_now(f"[OXYLABS POLL] Attempt {attempt + 1} timed out")
                 continue
 
-        raise TimeoutError(f"Oxylabs job polling timeout after {max_attempts} attempts (~{max_attempts * 2}s)")
+        raise TimeoutError(f"Oxylabs job polling timeout after {max_attempts} attempts")
 
     async def _fetch_direct(self, url: str, max_retries: int = 2) -> str:
         """
@@ -824,170 +974,13 @@ class ScholarSearchService:
 
         raise Exception("Direct scraping failed after all attempts")
 
-    def _parse_scholar_page(self, html: str) -> List[Dict[str, Any]]:
-        """Parse Google Scholar HTML page and extract paper metadata"""
-        soup = BeautifulSoup(html, "html.parser")
-        papers = []
-
-        # Try multiple selectors for paper containers
-        selectors = [".gs_ri", ".gs_r.gs_scl", "div[data-cid]", ".gs_or"]
-        elements = []
+    async def _parse_results(self, html: str) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """Parse a results page and its result count in the parse executor (off the event loop)"""
+        return await run_parse(parse_results_page, html, resolve_engine())
 
-        for selector in selectors:
-            elements = soup.select(selector)
-            if elements:
-                log_now(f"Found {len(elements)} papers using selector: {selector}")
-                break
-
-        if not elements:
-            log_now("No papers found with any selector")
-            return papers
-
-        for el in elements:
-            try:
-                # Get cluster ID (data-cid attribute)
-                cluster_id = el.get("data-cid")
-                if not cluster_id:
-                    parent = el.find_parent(attrs={"data-cid": True})
-                    if parent:
-                        cluster_id = parent.get("data-cid")
-
-                # Title and link
-                title_el = el.select_one(".gs_rt a") or el.select_one(".gs_rt span[id]") or el.select_one("h3 a")
-                if not title_el:
-                    continue
-
-                # Use separator=' ' to preserve spaces between nested elements
-                # Then normalize multiple spaces to single space
-                title = title_el.get_text(separator=' ', strip=True)
-                title = re.sub(r'\s+', ' ', title).strip()
-                link = title_el.get("href")
-
-                if not title:
-                    continue
-
-                # Authors and publication info
-                authors_el = el.select_one(".gs_a")
-                authors_raw = authors_el.get_text(separator=' ', strip=True) if authors_el else ""
-                authors_raw = re.sub(r'\s+', ' ', authors_raw).strip()
-
-                # Extract author profile URLs from .gs_a links
-                # Links to Scholar profiles have href like "/citations?user=ABC123&..."
-                author_profiles = []
-                if authors_el:
-                    for author_link in authors_el.find_all("a"):
-                        href = author_link.get("href", "")
-                        name = author_link.get_text(strip=True)
-                        if name and "citations?user=" in href:
-                            # Convert relative URL to absolute
-                            if href.startswith("/"):
-                                href = f"https://scholar.google.com{href}"
-                            author_profiles.append({"name": name, "profile_url": href})
-                        elif name and not href.startswith("http"):
-                            # Author without Scholar profile
-                            author_profiles.append({"name": name, "profile_url": None})
-
-                # Parse authors: "Author1, Author2 - Publication, Year - Publisher"
-                parts = authors_raw.split(" - ")
-                authors_part = parts[0] if parts else ""
-                publication_part = parts[1] if len(parts) > 1 else ""
-
-                authors = [a.strip() for a in authors_part.split(",") if a.strip() and not re.match(r"^\d{4}$", a.strip())]
-
-                year_match = re.search(r"\b(19|20)\d{2}\b", authors_raw)
-                year = int(year_match.group(0)) if year_match else None
-
-                # Venue
-                venue = None
-                if publication_part:
-                    venue = re.sub(r"\b(19|20)\d{2}\b", "", publication_part).strip().rstrip(",")
-
-                # Abstract
-                abstract_el = el.select_one(".gs_rs")
-                abstract = None
-                if abstract_el:
-                    abstract = abstract_el.get_text(separator=' ', strip=True)
-                    abstract = re.sub(r'\s+', ' ', abstract).strip()
-
-                # Citation count and Scholar ID
-                citation_count = 0
-                scholar_id = None
-
-                cited_by_link = el.select_one("a[href*='cites=']")
-                if cited_by_link:
-                    cited_text = cited_by_link.get_text(strip=True)
-                    # Match citation count in multiple languages:
-                    # English: "Cited by 123", Spanish: "Citado por 123",
-                    # French: "Cité 123 fois", German: "Zitiert von: 123", etc.
-                    count_match = re.search(r"(\d+)", cited_text)
-                    if count_match:
-                        citation_count = int(count_match.group(1))
-
-                    href = cited_by_link.get("href", "")
-                    id_match = re.search(r"cites=(\d+)", href)
-                    if id_match:
-                        scholar_id = id_match.group(1)
-
-                # If no scholar_id from cited-by, use cluster_id
-                if not scholar_id and cluster_id:
-                    scholar_id = cluster_id
-
-                papers.append({
-                    "id": scholar_id or f"{title[:50].replace(' ', '-')}-{year}",
-                    "scholarId": scholar_id,
-                    "clusterId": cluster_id,
-                    "title": title,
-                    "authors": authors,
-                    "authorsRaw": authors_raw,
-                    "authorProfiles": author_profiles,  # [{name, profile_url}, ...]
-                    "year": year,
-                    "abstract": abstract,
-                    "citationCount": citation_count,
-                    "link": link,
-                    "venue": venue,
-                    "source": "google_scholar",
-                })
-
-            except Exception as e:
-                log_now(f"Error parsing paper element: {e}")
-                continue
-
-        return papers
-
-    def _extract_result_count(self, html: str) -> Optional[int]:
-        """Extract total result count from Scholar HTML"""
-        # Patterns for different languages
-        patterns = [
-            r"About\s+([\d,\.\s]+)\s+results?",  # Added \s to capture space-separated thousands
-            r"([\d,\.\s]+)\s+results?\s*\(",
-            r"Environ\s+([\d\s]+)\s+résultats?",  # French
-            r"Aproximadamente\s+([\d,\.]+)\s+resultados?",  # Spanish
-            r"Ungefähr\s+([\d,\.]+)\s+Ergebnisse?",  # German
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, html, re.IGNORECASE)
-            if match:
-                raw_match = match.group(1)
-                # Clean number - remove commas, dots, spaces
-                clean_num = re.sub(r"[,\.\s]", "", raw_match)
-                try:
-                    count = int(clean_num)
-                    if count > 0:
-                        # Log for debugging parsing issues (catches truncation bugs)
-                        log_now(f"[COUNT PARSE] raw='{raw_match}' -> clean='{clean_num}' -> {count}")
-                        return count
-                except ValueError:
-                    log_now(f"[COUNT PARSE ERROR] raw='{raw_match}' -> clean='{clean_num}' FAILED")
-                    continue
-
-        # Log when no count found - helps debug HTML format changes
-        # Look for any "results" text to see what format Scholar is using
-        results_context = re.search(r'.{0,30}results.{0,30}', html, re.IGNORECASE)
-        if results_context:
-            log_now(f"[COUNT PARSE] No match found. Context: '{results_context.group(0)}'")
-
-        return None
+    async def _parse_profile(self, html: str, scholar_user_id: str, profile_url: str) -> Dict[str, Any]:
+        """Parse an author profile page in the parse executor (off the event loop)"""
+        return await run_parse(parse_author_profile, html, scholar_user_id, profile_url, resolve_engine())
 
     async def get_year_citation_count(self, scholar_id: str, year: int) -> Optional[int]:
         """
@@ -1006,11 +999,7 @@ class ScholarSearchService:
         url = f"https://scholar.google.com/scholar?hl=en&cites={scholar_id}&scipsc=1&as_ylo={year}&as_yhi={year}"
 
         try:
-            html = await self._fetch_with_retry(url)
-            if not html:
-                return None
-
-            count = self._extract_result_count(html)
+            _, count, _ = await self._fetch_page(url, "year_count")
             return count
         except Exception as e:
             log_now(f"Failed to get year count for {scholar_id}/{year}: {e}")
@@ -1039,7 +1028,7 @@ class ScholarSearchService:
                 log_now(f"[LOOKUP] No HTML returned for {scholar_id}")
                 return None
 
-            papers = self._parse_scholar_page(html)
+            papers, _ = await self._parse_results(html)
             if not papers:
                 log_now(f"[LOOKUP] No papers found for cluster {scholar_id}")
                 return None
@@ -1096,63 +1085,18 @@ class ScholarSearchService:
             # Fetch the page
             html = await self._fetch_with_retry(url)
 
-            # Parse the HTML
-            soup = BeautifulSoup(html, "html.parser")
-
-            # Check result count - this works best with single results
-            result_count_el = soup.select_one("#gs_ab_md")
-            result_text = result_count_el.get_text() if result_count_el else ""
-
-            # Look for the expanded abstract in .gs_fma_abs
-            # This is shown when Scholar has full abstract data from publishers
-            abstract_el = soup.select_one(".gs_fma_abs")
-
-            if abstract_el:
-                # Get all text from the abstract div, including nested elements
-                abstract = abstract_el.get_text(separator=' ', strip=True)
-                # Clean up whitespace
-                abstract = re.sub(r'\s+', ' ', abstract).strip()
-
-                if abstract and len(abstract) > 50:  # Reasonable abstract length
-                    log_now(f"[ALLINTITLE ABSTRACT] ✓ Found abstract ({len(abstract)} chars): {abstract[:100]}...")
-                    return {
-                        "abstract": abstract,
-                        "success": True,
-                        "source": "allintitle_scrape",
-                    }
-
-            # Fallback: try .gs_rs (standard abstract snippet) - less complete but sometimes available
-            snippet_el = soup.select_one(".gs_rs.gs_fma_s")
-            if snippet_el:
-                snippet = snippet_el.get_text(separator=' ', strip=True)
-                snippet = re.sub(r'\s+', ' ', snippet).strip()
-                # Remove trailing "..." and common truncation markers
-                snippet = re.sub(r'\s*…\s*$', '', snippet)
-                snippet = re.sub(r'\s*\.\.\.\s*$', '', snippet)
-
-                if snippet and len(snippet) > 50:
-                    log_now(f"[ALLINTITLE ABSTRACT] ✓ Found snippet ({len(snippet)} chars): {snippet[:100]}...")
-                    return {
-                        "abstract": snippet,
-                        "success": True,
-                        "source": "allintitle_scrape",
-                        "is_snippet": True,  # Indicate it might be truncated
-                    }
-
-            # Also try the standard .gs_rs selector
-            standard_snippet = soup.select_one(".gs_rs")
-            if standard_snippet:
-                snippet = standard_snippet.get_text(separator=' ', strip=True)
-                snippet = re.sub(r'\s+', ' ', snippet).strip()
-
-                if snippet and len(snippet) > 50:
-                    log_now(f"[ALLINTITLE ABSTRACT] ✓ Found standard snippet ({len(snippet)} chars)")
-                    return {
-                        "abstract": snippet,
-                        "success": True,
-                        "source": "allintitle_scrape",
-                        "is_snippet": True,
-                    }
+            found = await run_parse(extract_allintitle_abstract, html)
+            if found:
+                abstract = found["abstract"]
+                log_now(f"[ALLINTITLE ABSTRACT] ✓ Found {found['kind']} ({len(abstract)} chars): {abstract[:100]}...")
+                result = {
+                    "abstract": abstract,
+                    "success": True,
+                    "source": "allintitle_scrape",
+                }
+                if found["is_snippet"]:
+                    result["is_snippet"] = True  # Indicate it might be truncated
+                return result
 
             log_now("[ALLINTITLE ABSTRACT] ✗ No abstract found on page")
             return {
@@ -1318,8 +1262,10 @@ class ScholarSearchService:
             try:
                 html = await self._fetch_with_retry(page_url)
 
+                extracted, page_total = await self._parse_results(html)
+
                 if current_page == start_page:
-                    total_results = self._extract_result_count(html)
+                    total_results = page_total
                     log_now(f"[AUTHOR SEARCH] Total results reported by GS: {total_results}")
 
                     # Adjust max_pages if we now know the actual count
@@ -1329,8 +1275,6 @@ class ScholarSearchService:
                             max_pages = actual_max_pages
                             log_now(f"[AUTHOR SEARCH] Adjusted max_pages to {max_pages}")
 
-                extracted = self._parse_scholar_page(html)
-
                 if not extracted:
                     log_now(f"[AUTHOR PAGE {current_page + 1}] No results, stopping")
                     break
@@ -1350,10 +1294,6 @@ class ScholarSearchService:
                 consecutive_failures = 0
                 pages_succeeded += 1
 
-                # Rate limiting between pages
-                if current_page < max_pages and len(all_papers) < max_results:
-                    await asyncio.sleep(4)
-
             except Exception as e:
                 consecutive_failures += 1
                 log_now(f"[AUTHOR PAGE {current_page + 1}] ✗ Failed ({consecutive_failures}/{max_consecutive_failures}): {e}")
@@ -1363,7 +1303,6 @@ class ScholarSearchService:
                     break
 
                 current_page += 1
-                await asyncio.sleep(5)
 
         log_now(f"[AUTHOR SEARCH] Complete: {len(all_papers)} papers from {pages_succeeded} pages")
 
@@ -1411,7 +1350,7 @@ class ScholarSearchService:
                 log_now(f"[AUTHOR PROFILE] No HTML returned for {profile_url}")
                 return None
 
-            return self._parse_author_profile(html, scholar_user_id, profile_url)
+            return await self._parse_profile(html, scholar_user_id, profile_url)
 
         except Exception as e:
             log_now(f"[AUTHOR PROFILE] Error fetching {profile_url}: {e}")
@@ -1419,120 +1358,7 @@ class ScholarSearchService:
 
     def _parse_author_profile(self, html: str, scholar_user_id: str, profile_url: str) -> Dict[str, Any]:
         """Parse Google Scholar author profile HTML"""
-        soup = BeautifulSoup(html, "html.parser")
-
-        result = {
-            "scholar_user_id": scholar_user_id,
-            "profile_url": profile_url,
-            "full_name": None,
-            "affiliation": None,
-            "homepage_url": None,
-            "topics": [],
-            "publications": [],
-        }
-
-        # Full name - in div#gsc_prf_in
-        name_el = soup.select_one("#gsc_prf_in")
-        if name_el:
-            result["full_name"] = name_el.get_text(strip=True)
-            log_now(f"[AUTHOR PROFILE] Name: {result['full_name']}")
-
-        # Affiliation - first link with class gsc_prf_ila (institution link)
-        affiliation_el = soup.select_one("a.gsc_prf_ila")
-        if affiliation_el:
-            result["affiliation"] = affiliation_el.get_text(strip=True)
-            log_now(f"[AUTHOR PROFILE] Affiliation: {result['affiliation']}")
-
-        # Homepage URL - look for "Homepage" link in the profile info section
-        # It's typically in the div.gsc_prf_il containing "Verified email at..."
-        # The homepage link says "Homepage" and links externally
-        for link in soup.select("a"):
-            text = link.get_text(strip=True)
-            href = link.get("href", "")
-            if text.lower() == "homepage" and href.startswith("http"):
-                result["homepage_url"] = href
-                log_now(f"[AUTHOR PROFILE] Homepage: {href}")
-                break
-
-        # Topics/Research interests - links with class gsc_prf_inta (interest tag)
-        # These are the blue tags like "Corporate governance", "Industrial relations"
-        topic_els = soup.select("a.gsc_prf_inta")
-        for topic_el in topic_els:
-            topic = topic_el.get_text(strip=True)
-            if topic:
-                result["topics"].append(topic)
-
-        if result["topics"]:
-            log_now(f"[AUTHOR PROFILE] Topics: {', '.join(result['topics'][:3])}...")
-
-        # Publications - parse the articles table
-        # Each row has class gsc_a_tr with title, authors, venue, citations, year
-        pub_rows = soup.select("tr.gsc_a_tr")
-        for row in pub_rows:
-            try:
-                pub = {}
-
-                # Title and link - in td.gsc_a_t > a.gsc_a_at
-                title_el = row.select_one("a.gsc_a_at")
-                if title_el:
-                    pub["title"] = title_el.get_text(strip=True)
-                    href = title_el.get("href", "")
-                    if href:
-                        # Convert relative URL to absolute
-                        if href.startswith("/"):
-                            pub["link"] = f"https://scholar.google.com{href}"
-                        else:
-                            pub["link"] = href
-                        # Extract citation ID from URL (e.g., citation_for_view=USER:CITATION_ID)
-                        cid_match = re.search(r"citation_for_view=([^&]+)", href)
-                        if cid_match:
-                            pub["scholar_id"] = cid_match.group(1)
-
-                if not pub.get("title"):
-                    continue
-
-                # Authors and venue - in div.gs_gray elements
-                gray_divs = row.select("td.gsc_a_t div.gs_gray")
-                if len(gray_divs) >= 1:
-                    pub["authors"] = gray_divs[0].get_text(strip=True)
-                if len(gray_divs) >= 2:
-                    pub["venue"] = gray_divs[1].get_text(strip=True)
-
-                # Citations - in td.gsc_a_c > a
-                # IMPORTANT: This link also contains the cluster ID needed for citation harvesting!
-                # The href looks like: /scholar?cites=12204165771334060032&...
-                cite_el = row.select_one("td.gsc_a_c a")
-                if cite_el:
-                    cite_text = cite_el.get_text(strip=True)
-                    if cite_text.isdigit():
-                        pub["citations"] = int(cite_text)
-                    else:
-                        pub["citations"] = 0
-
-                    # Extract cluster ID from the "Cited by" link href
-                    cite_href = cite_el.get("href", "")
-                    cluster_match = re.search(r"cites=(\d+)", cite_href)
-                    if cluster_match:
-                        pub["cluster_id"] = cluster_match.group(1)
-                else:
-                    pub["citations"] = 0
-
-                # Year - in td.gsc_a_y > span
-                year_el = row.select_one("td.gsc_a_y span")
-                if year_el:
-                    year_text = year_el.get_text(strip=True)
-                    if year_text.isdigit():
-                        pub["year"] = int(year_text)
-
-                result["publications"].append(pub)
-            except Exception as e:
-                log_now(f"[AUTHOR PROFILE] Error parsing publication row: {e}")
-                continue
-
-        if result["publications"]:
-            log_now(f"[AUTHOR PROFILE] Publications: {len(result['publications'])} found")
-
-        return result
+        return parse_author_profile(html, scholar_user_id, profile_url)
 
     async def fetch_author_profile_with_publications(
         self, profile_url: str, max_publications: int = 100
@@ -1570,7 +1396,7 @@ class ScholarSearchService:
                 log_now(f"[AUTHOR PROFILE] No HTML returned for {enhanced_url}")
                 return None
 
-            return self._parse_author_profile(html, scholar_user_id, profile_url)
+            return await self._parse_profile(html, scholar_user_id, profile_url)
 
         except Exception as e:
             log_now(f"[AUTHOR PROFILE] Error fetching {enhanced_url}: {e}")
@@ -1620,7 +1446,7 @@ class ScholarSearchService:
                     log_now(f"[AUTHOR PROFILE] No HTML returned for page {page_num}")
                     break
 
-                parsed = self._parse_author_profile(html, scholar_user_id, profile_url)
+                parsed = await self._parse_profile(html, scholar_user_id, profile_url)
 
                 # Store profile metadata from first page
                 if page_num == 0:
@@ -1661,10 +1487,6 @@ class ScholarSearchService:
                 current_start += page_size
                 page_num += 1
 
-                # Rate limiting: 4 seconds between pages
-                if len(all_publications) < max_publications:
-                    await asyncio.sleep(4)
-
             except Exception as e:
                 log_now(f"[AUTHOR PROFILE] Error fetching page {page_num}: {e}")
                 break
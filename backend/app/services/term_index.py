@@ -0,0 +1,187 @@
+"""
+Term Index - cross-edition effectiveness statistics for exclusion terms
+
+find_exclusion_set used to start every overflow partition from scratch: ask the
+LLM for terms, then test them one live count query at a time. Yet every test
+ever run is in partition_term_attempts, with the count before and after.
+
+The index aggregates those attempts into a reduction ratio per term
+(reduction / count_before - the share of results a term removed when it was
+tried), overall and per context of the seed edition:
+
+- language: the edition's language
+- collection: the paper's collection (the schema's nearest thing to a field)
+- venue family: the seed's venue, normalised (lowercase, no digits/punctuation,
+  first three words) so "Duke University Press, 1991" and "Duke Univ. Press"
+  land together where they can
+
+rank() scores terms for a new partition by blending the context-specific means
+with the term's global mean (weighted by attempt counts, the global mean acting
+as a prior), so find_exclusion_set can test the most promising terms first.
+The index is rebuilt from the table at most every INDEX_TTL_SECONDS.
+"""
+import asyncio
+import logging
+import re
+import time
+from typing import Dict, Any, List, Optional, Tuple
+
+from sqlalchemy import select, func, Float, cast
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models import Edition, Paper, PartitionRun, PartitionTermAttempt
+
+logger = logging.getLogger(__name__)
+
+INDEX_TTL_SECONDS = 600
+PRIOR_WEIGHT = 3.0  # Global mean counts as this many attempts when blending with context means
+MIN_SCORE = 0.002  # Terms that removed less than 0.2% of results on average aren't worth a probe
+CONTEXT_DIMENSIONS = ("language", "collection", "venue_family")
+
+
+def venue_family(venue: Optional[str]) -> Optional[str]:
+    if not venue:
+        return None
+    words = re.sub(r"[^a-z\s]", " ", venue.lower()).split()
+    return " ".join(words[:3]) or None
+
+
+async def load_term_context(db: AsyncSession, edition_id: int) -> Dict[str, Any]:
+    """Context of an edition for rank(): language, collection and venue family"""
+    result = await db.execute(
+        select(Edition.language, Edition.venue, Paper.collection_id)
+        .join(Paper, Paper.id == Edition.paper_id)
+        .where(Edition.id == edition_id)
+    )
+    row = result.first()
+    if not row:
+        return {}
+    return {
+        "language": (row.language or "").lower() or None,
+        "collection": row.collection_id,
+        "venue_family": venue_family(row.venue),
+    }
+
+
+class TermIndex:
+    """In-memory term -> reduction ratio statistics, rebuilt from partition_term_attempts"""
+
+    def __init__(self):
+        # term -> [attempts, sum of ratios]
+        self._global: Dict[str, List[float]] = {}
+        # (dimension, value) -> term -> [attempts, sum of ratios]
+        self._by_context: Dict[Tuple[str, Any], Dict[str, List[float]]] = {}
+        self._built_at: Optional[float] = None
+        self._build_ms: Optional[int] = None
+        self._attempt_rows = 0
+        self._lock = asyncio.Lock()
+
+    def invalidate(self):
+        """Rebuild on next use (new attempts were recorded)"""
+        self._built_at = None
+
+    async def ensure_fresh(self, db: AsyncSession):
+        if self._built_at and time.monotonic() - self._built_at < INDEX_TTL_SECONDS:
+            return
+        async with self._lock:
+            if self._built_at and time.monotonic() - self._built_at < INDEX_TTL_SECONDS:
+                return
+            try:
+                await self._build(db)
+            except Exception as e:
+                # An empty or stale index only means more probing - never fail the harvest over it
+                logger.warning(f"Term index build failed: {e}")
+
+    async def _build(self, db: AsyncSession):
+        started = time.monotonic()
+        term = func.lower(PartitionTermAttempt.term)
+        ratio = cast(PartitionTermAttempt.reduction, Float) / PartitionTermAttempt.count_before
+        result = await db.execute(
+            select(
+                term.label("term"),
+                Edition.language,
+                Edition.venue,
+                Paper.collection_id,
+                func.count().label("attempts"),
+                func.sum(func.greatest(ratio, 0.0)).label("ratio_sum"),
+            )
+            .join(PartitionRun, PartitionRun.id == PartitionTermAttempt.partition_run_id)
+            .join(Edition, Edition.id == PartitionRun.edition_id)
+            .join(Paper, Paper.id == Edition.paper_id)
+            .where(PartitionTermAttempt.count_before > 0)
+            # Failed probes leave count_after at 0 with an error skip_reason - not evidence
+            .where(func.coalesce(PartitionTermAttempt.skip_reason, "").notlike("error:%"))
+            .group_by(term, Edition.language, Edition.venue, Paper.collection_id)
+        )
+
+        global_stats: Dict[str, List[float]] = {}
+        by_context: Dict[Tuple[str, Any], Dict[str, List[float]]] = {}
+        rows = 0
+        for row in result:
+            rows += 1
+            context = {
+                "language": (row.language or "").lower() or None,
+                "collection": row.collection_id,
+                "venue_family": venue_family(row.venue),
+            }
+            for stats in [global_stats] + [
+                by_context.setdefault((dim, value), {})
+                for dim, value in context.items() if value is not None
+            ]:
+                entry = stats.setdefault(row.term, [0, 0.0])
+                entry[0] += row.attempts
+                entry[1] += float(row.ratio_sum or 0.0)
+
+        self._global = global_stats
+        self._by_context = by_context
+        self._attempt_rows = rows
+        self._built_at = time.monotonic()
+        self._build_ms = int((self._built_at - started) * 1000)
+        logger.info(f"Term index built: {len(global_stats)} terms from {rows} groups in {self._build_ms}ms")
+
+    def score(self, term: str, context: Dict[str, Any]) -> Optional[float]:
+        """Expected reduction ratio of a term in this context (None if never tried)"""
+        term = term.lower()
+        global_entry = self._global.get(term)
+        if not global_entry:
+            return None
+        prior = global_entry[1] / global_entry[0]
+        weight, total = PRIOR_WEIGHT, PRIOR_WEIGHT * prior
+        for dim in CONTEXT_DIMENSIONS:
+            value = context.get(dim)
+            entry = self._by_context.get((dim, value), {}).get(term) if value is not None else None
+            if entry:
+                weight += entry[0]
+                total += entry[1]
+        return total / weight
+
+    def rank(self, context: Dict[str, Any], exclude: Optional[List[str]] = None, limit: int = 100) -> List[Tuple[str, float]]:
+        """Known-effective terms for this context, best first: [(term, expected reduction ratio)]"""
+        excluded = {t.lower() for t in (exclude or [])}
+        scored = [
+            (term, self.score(term, context))
+            for term in self._global if term not in excluded
+        ]
+        ranked = sorted(((t, s) for t, s in scored if s is not None and s >= MIN_SCORE), key=lambda x: -x[1])
+        return ranked[:limit]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "terms": len(self._global),
+            "contexts": len(self._by_context),
+            "attempt_groups": self._attempt_rows,
+            "age_seconds": round(time.monotonic() - self._built_at) if self._built_at else None,
+            "build_ms": self._build_ms,
+        }
+
+
+# Singleton instance
+_index: Optional[TermIndex] = None
+
+
+def get_term_index() -> TermIndex:
+    """Get the process-wide term index"""
+    global _index
+    if _index is None:
+        _index = TermIndex()
+    return _index
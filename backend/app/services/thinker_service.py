@@ -17,12 +17,12 @@ import re
 from datetime import datetime
 from typing import Optional, List, Dict, Any
 
-import anthropic
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..config import get_settings
 from ..models import Thinker, ThinkerWork, ThinkerHarvestRun, ThinkerLLMCall
+from .llm_gateway import get_llm_gateway
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -33,7 +33,6 @@ class ThinkerBibliographyService:
 
     def __init__(self, db: AsyncSession):
         self.db = db
-        self.client = anthropic.Anthropic(api_key=settings.anthropic_api_key)
         self.model_sonnet = "claude-sonnet-4-5-20250929"
         self.model_opus = "claude-opus-4-5-20251101"
 
@@ -121,7 +120,9 @@ ONLY return the JSON object, no other text."""
         start_time = datetime.utcnow()
 
         try:
-            response = self.client.messages.create(
+            response = await get_llm_gateway().create(
+                purpose="thinker.disambiguate",
+                cache=True,
                 model=self.model_sonnet,
                 max_tokens=2048,
                 messages=[{"role": "user", "content": prompt}]
@@ -372,7 +373,9 @@ ONLY return the JSON array, no other text."""
         start_time = datetime.utcnow()
 
         try:
-            response = self.client.messages.create(
+            response = await get_llm_gateway().create(
+                purpose="thinker.filter_page",
+                cache=True,
                 model=self.model_sonnet,
                 max_tokens=4096,
                 messages=[{"role": "user", "content": prompt}]
@@ -576,7 +579,8 @@ ONLY return the JSON object, no other text."""
             output_tokens = 0
             thinking_tokens = 0
 
-            with self.client.messages.stream(
+            async with get_llm_gateway().stream(
+                purpose="thinker.translations",
                 model=self.model_opus,
                 max_tokens=16000,
                 thinking={
@@ -585,7 +589,7 @@ ONLY return the JSON object, no other text."""
                 },
                 messages=[{"role": "user", "content": prompt}]
             ) as stream:
-                for event in stream:
+                async for event in stream:
                     if hasattr(event, 'type'):
                         if event.type == 'content_block_delta':
                             if hasattr(event.delta, 'thinking'):
@@ -594,7 +598,7 @@ ONLY return the JSON object, no other text."""
                                 response_text += event.delta.text
 
                 # Get final message for usage stats
-                final_message = stream.get_final_message()
+                final_message = await stream.get_final_message()
                 input_tokens = final_message.usage.input_tokens
                 output_tokens = final_message.usage.output_tokens
                 if hasattr(final_message.usage, 'thinking_tokens'):
@@ -836,7 +840,9 @@ ONLY return the JSON array, no other text."""
             start_time = datetime.utcnow()
 
             try:
-                response = self.client.messages.create(
+                response = await get_llm_gateway().create(
+                    purpose="thinker.retrospective_match",
+                    cache=True,
                     model=self.model_sonnet,
                     max_tokens=4096,
                     messages=[{"role": "user", "content": prompt}]
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Benchmark and verify the Scholar HTML parser engines against golden files.
+
+Works on a directory of saved Scholar pages (*.html). Each page has a golden
+file (*.golden.json) holding the expected parse output, generated from the
+BeautifulSoup engine. Every engine must reproduce the golden output exactly;
+per-page parse time and allocation peak are reported for each engine.
+
+Sample pages with golden files are committed in scripts/fixtures/scholar_pages
+(the default pages_dir): hand-built copies of Scholar's result and profile
+markup covering [PDF]/[BOOK]/[CITATION] results, author profile links, a
+French page, a page with no results and a profile. Capture real pages into
+another directory to benchmark on live markup.
+
+Pages whose name starts with "profile_" are parsed as author profiles,
+everything else as result pages.
+
+Usage:
+    # Save live pages (uses Oxylabs credentials from .env)
+    python scripts/benchmark_scholar_parser.py pages/ --capture "https://scholar.google.com/scholar?cites=123&hl=en"
+    python scripts/benchmark_scholar_parser.py pages/ --capture "https://scholar.google.com/citations?user=ABC&hl=en" --name profile_abc
+
+    # Write golden files from the bs4 engine (do this once, after checking the output)
+    python scripts/benchmark_scholar_parser.py pages/ --update-golden
+
+    # Verify + benchmark all engines (on the committed sample pages if no directory is given)
+    python scripts/benchmark_scholar_parser.py --runs 20
+    python scripts/benchmark_scholar_parser.py pages/ --runs 20
+"""
+import asyncio
+import argparse
+import hashlib
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from app.services import scholar_parser
+from app.services.scholar_parser import PARSER_ENGINES, extract_result_count
+
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures" / "scholar_pages"
+
+
+def parse_page(path: Path, html: str, engine: str):
+    if path.stem.startswith("profile_"):
+        # File name, not path, as the profile URL - golden files must not depend on the checkout location
+        return scholar_parser.parse_author_profile(html, path.stem, path.name, engine=engine)
+    return {
+        "papers": scholar_parser.parse_scholar_page(html, engine=engine),
+        "total_results": extract_result_count(html),
+    }
+
+
+def golden_path(path: Path) -> Path:
+    return path.with_suffix(".golden.json")
+
+
+async def capture(pages_dir: Path, url: str, name: str = None):
+    from app.services.scholar_search import ScholarSearchService
+
+    service = ScholarSearchService()
+    try:
+        html = await service._fetch_with_retry(url)
+    finally:
+        await service.close()
+
+    name = name or f"page_{hashlib.sha256(url.encode()).hexdigest()[:12]}"
+    out = pages_dir / f"{name}.html"
+    out.write_text(html, encoding="utf-8")
+    print(f"Saved {len(html):,} bytes to {out}")
+
+
+def update_golden(pages: list):
+    for path in pages:
+        html = path.read_text(encoding="utf-8")
+        result = parse_page(path, html, "bs4")
+        golden_path(path).write_text(json.dumps(result, indent=2, ensure_ascii=False), encoding="utf-8")
+        count = len(result.get("papers") or result.get("publications") or [])
+        print(f"  {path.name}: {count} items -> {golden_path(path).name}")
+
+
+def benchmark(pages: list, engines: list, runs: int) -> bool:
+    all_match = True
+    totals = {engine: [] for engine in engines}
+
+    for path in pages:
+        html = path.read_text(encoding="utf-8")
+        golden_file = golden_path(path)
+        golden = json.loads(golden_file.read_text(encoding="utf-8")) if golden_file.exists() else None
+
+        print(f"\n{path.name} ({len(html):,} bytes)")
+        for engine in engines:
+            result = parse_page(path, html, engine)
+            if golden is None:
+                status = "no golden file"
+            elif json.loads(json.dumps(result)) == golden:
+                status = "matches golden"
+            else:
+                status = "MISMATCH"
+                all_match = False
+
+            timings = []
+            for _ in range(runs):
+                start = time.perf_counter()
+                parse_page(path, html, engine)
+                timings.append(time.perf_counter() - start)
+
+            tracemalloc.start()
+            parse_page(path, html, engine)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            median_ms = statistics.median(timings) * 1000
+            totals[engine].append(median_ms)
+            print(f"  {engine:<11} median {median_ms:7.2f} ms   min {min(timings) * 1000:7.2f} ms   "
+                  f"peak alloc {peak / 1024:8.1f} KiB   {status}")
+
+    if pages:
+        print("\nMean of per-page medians:")
+        baseline = statistics.mean(totals["bs4"]) if totals.get("bs4") else None
+        for engine in engines:
+            mean_ms = statistics.mean(totals[engine])
+            speedup = f"  ({baseline / mean_ms:.1f}x vs bs4)" if baseline and engine != "bs4" else ""
+            print(f"  {engine:<11} {mean_ms:7.2f} ms{speedup}")
+
+    return all_match
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify and benchmark Scholar parser engines")
+    parser.add_argument("pages_dir", nargs="?", default=str(FIXTURES_DIR),
+                        help="Directory of saved Scholar pages (*.html, default: the committed sample pages)")
+    parser.add_argument("--capture", metavar="URL", help="Fetch URL via Oxylabs and save it into pages_dir")
+    parser.add_argument("--name", help="File name (without .html) for --capture")
+    parser.add_argument("--update-golden", action="store_true", help="Write golden files from the bs4 engine")
+    parser.add_argument("--engine", choices=PARSER_ENGINES, action="append", help="Engine(s) to benchmark (default: all)")
+    parser.add_argument("--runs", type=int, default=10, help="Timed runs per page per engine")
+    args = parser.parse_args()
+
+    pages_dir = Path(args.pages_dir)
+    pages_dir.mkdir(parents=True, exist_ok=True)
+
+    if args.capture:
+        asyncio.run(capture(pages_dir, args.capture, args.name))
+        return
+
+    pages = sorted(pages_dir.glob("*.html"))
+    if not pages:
+        print(f"No .html pages in {pages_dir} - save some with --capture first")
+        sys.exit(1)
+
+    # Keep parser logging out of the timing output
+    scholar_parser.log_now = lambda *a, **k: None
+
+    if args.update_golden:
+        update_golden(pages)
+        return
+
+    engines = args.engine or list(PARSER_ENGINES)
+    if "selectolax" in engines and scholar_parser.LexborHTMLParser is None:
+        print("selectolax is not installed - skipping it")
+        engines.remove("selectolax")
+
+    if not benchmark(pages, engines, args.runs):
+        print("\nFAILED: at least one engine does not reproduce the golden output")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()